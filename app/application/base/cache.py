@@ -0,0 +1,43 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CachedQueryResult:
+    value: Any
+    tags: tuple[str, ...]
+    # Версии тегов на момент начала чтения
+    tag_versions: tuple[int, ...]
+
+
+class BaseQueryCache(ABC):
+    """Хранилище результатов запросов с инвалидацией по тегам.
+
+    Инвалидация не удаляет записи, а повышает версии тегов: запись
+    действительна, пока версии ее тегов совпадают с сохраненными. Поэтому
+    результат, прочитанный до инвалидации и сохраненный после нее, не
+    выдается. Реализация может быть общей для всех процессов (например,
+    Redis), тогда инвалидация одного процесса видна остальным.
+
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> CachedQueryResult | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, result: CachedQueryResult, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def tag_versions(self, tags: Sequence[str]) -> tuple[int, ...]:
+        """Текущие версии тегов; версия тега только растет."""
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Iterable[str]) -> None: ...
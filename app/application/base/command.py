@@ -5,6 +5,7 @@ from abc import (
 from dataclasses import dataclass
 from typing import (
     Any,
+    ClassVar,
     Generic,
     TypeVar,
 )
@@ -20,5 +21,14 @@ CommandResultType = TypeVar("CommandResultType", bound=Any)
 
 @dataclass(frozen=True)
 class BaseCommandHandler(ABC, Generic[CommandType, CommandResultType]):
+    # Независимый обработчик не зависит от результатов остальных: медиатор
+    # выполняет его конкурентно с ними, в отдельном unit of work
+    independent: ClassVar[bool] = False
+    # False - обработчик сам открывает unit of work на каждую порцию работы
+    # (пачку импорта): медиатор не держит вокруг него одну транзакцию
+    transactional: ClassVar[bool] = True
+    # Пул соединений unit of work обработчика; None - пул вызывающего кода
+    pool: ClassVar[str | None] = None
+
     @abstractmethod
     async def handle(self, command: CommandType) -> CommandResultType: ...
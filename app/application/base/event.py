@@ -0,0 +1,39 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import (
+    ClassVar,
+    Generic,
+    TypeVar,
+)
+
+from application.base.unit_of_work import BACKGROUND_POOL
+from domain.base.events import BaseEvent
+
+
+EventType = TypeVar("EventType", bound=BaseEvent)
+
+
+@dataclass(frozen=True)
+class BaseEventHandler(ABC, Generic[EventType]):
+    """Подписчик на доменные события.
+
+    Вызывается вне запроса, в своем unit of work, и может получить одно и
+    то же событие повторно (at-least-once): обработка должна быть
+    идемпотентной.
+
+    """
+
+    pool: ClassVar[str] = BACKGROUND_POOL
+
+    @abstractmethod
+    async def handle(self, event: EventType) -> None: ...
+
+    async def handle_many(self, events: Sequence[EventType]) -> None:
+        """Обработать пачку событий одного типа. Переопределяется, когда
+        пачку выгоднее обработать одной операцией."""
+        for event in events:
+            await self.handle(event)
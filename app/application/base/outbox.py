@@ -0,0 +1,37 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import Sequence
+from uuid import UUID
+
+from domain.base.events import BaseEvent
+
+
+class BaseEventOutbox(ABC):
+    """Хранилище доменных событий, ожидающих доставки подписчикам.
+
+    События добавляются в транзакции команды, а доставляются позже:
+    событие выдается повторно, пока его не отметят опубликованным.
+
+    """
+
+    @abstractmethod
+    async def add(self, events: Sequence[BaseEvent]) -> None: ...
+
+    @abstractmethod
+    async def claim(self, limit: int, lease: float, max_attempts: int) -> list[BaseEvent]:
+        """Забрать до limit готовых к доставке событий в порядке появления.
+
+        Забранные события скрываются от других обработчиков на lease секунд:
+        если обработчик не успеет отметить их, они вернутся в очередь.
+        События, исчерпавшие max_attempts попыток, больше не выдаются.
+
+        """
+
+    @abstractmethod
+    async def mark_published(self, event_ids: Sequence[UUID]) -> None: ...
+
+    @abstractmethod
+    async def mark_failed(self, event_ids: Sequence[UUID], retry_delay: float) -> None:
+        """Вернуть события в очередь не раньше чем через retry_delay секунд."""
@@ -5,6 +5,7 @@ from abc import (
 from dataclasses import dataclass
 from typing import (
     Any,
+    ClassVar,
     Generic,
     TypeVar,
 )
@@ -20,5 +21,9 @@ QueryResultType = TypeVar("QueryResultType", bound=Any)
 
 @dataclass(frozen=True)
 class BaseQueryHandler(ABC, Generic[QueryType, QueryResultType]):
+    # Пул соединений запроса (ANALYTICS_POOL для тяжелых сводок и выгрузок);
+    # None - пул вызывающего кода
+    pool: ClassVar[str | None] = None
+
     @abstractmethod
     async def handle(self, query: QueryType) -> QueryResultType: ...
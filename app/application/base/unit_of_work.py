@@ -0,0 +1,67 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from contextlib import AbstractAsyncContextManager
+
+
+# Пулы соединений по типу нагрузки: запросы API, тяжелые сводки и выгрузки,
+# фоновые задачи. Нагрузка одного пула не отнимает соединения у другого
+INTERACTIVE_POOL = "interactive"
+ANALYTICS_POOL = "analytics"
+BACKGROUND_POOL = "background"
+
+
+class BaseUnitOfWork(ABC):
+    """Граница транзакции одного command/query.
+
+    Медиатор открывает unit of work на время обработки: репозитории,
+    вызванные внутри, работают в одной сессии, а изменения фиксируются один
+    раз при успешном завершении и откатываются целиком при ошибке.
+
+    """
+
+    @abstractmethod
+    def begin(
+        self,
+        read_only: bool = False,
+        pool: str | None = None,
+        statement_timeout: float | None = None,
+    ) -> AbstractAsyncContextManager[None]:
+        """Открывает unit of work; pool - пул соединений, из которого он
+        берет сессию (по умолчанию - пул вызывающего кода), statement_timeout -
+        лимит (сек) на каждый SQL-запрос внутри него."""
+
+    @abstractmethod
+    def requires_primary(self) -> bool:
+        """Должны ли чтения текущего запроса видеть последние записи - после
+        записи в этом запросе или недавней записи того же пользователя."""
+
+    @abstractmethod
+    def max_read_lag(self) -> float:
+        """На сколько секунд чтение может отставать от фиксированных записей:
+        больше нуля, если чтения идут на реплики."""
+
+    @abstractmethod
+    def detach(self) -> None:
+        """Отвязывает текущий контекст от открытого unit of work, не
+        закрывая его.
+
+        Вызывается в копии контекста задачи, которая должна открыть свой
+        unit of work: остальные переменные контекста (пул, ключ
+        согласованности чтений) она сохраняет.
+
+        """
+
+    @abstractmethod
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Откладывает callback до успешной фиксации открытого unit of work.
+
+        При откате callback не вызывается. Вне unit of work (или в read-only)
+        фиксировать нечего, и callback выполняется сразу.
+
+        """
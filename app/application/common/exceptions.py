@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from application.base.exception import LogicException
+from domain.base.exceptions import ApplicationException
 
 
 @dataclass(eq=False)
@@ -19,3 +20,29 @@ class QueryHandlerNotRegisteredException(LogicException):
     @property
     def message(self) -> str:
         return f"Query handler not registered for query type: {self.query_type.__name__}"
+
+
+@dataclass(eq=False)
+class ServiceUnavailableException(ApplicationException):
+    @property
+    def message(self) -> str:
+        return "Service is temporarily unavailable, retry later"
+
+
+@dataclass(eq=False)
+class DatabasePoolExhaustedException(ServiceUnavailableException):
+    @property
+    def message(self) -> str:
+        return "No database connection became available in time, retry later"
+
+
+@dataclass(eq=False)
+class QueryTimeoutException(ServiceUnavailableException):
+    query_type: str | None = None
+    budget: float | None = None
+
+    @property
+    def message(self) -> str:
+        if self.query_type is None:
+            return "Database statement timed out"
+        return f"Query {self.query_type} exceeded its {self.budget:g}s budget"
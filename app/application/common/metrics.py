@@ -0,0 +1,82 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+
+# Границы корзин (сек): от единиц миллисекунд до десятков секунд
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+MetricKey = str | tuple[str, ...]
+
+
+@dataclass
+class LatencyHistogram:
+    """Гистограмма длительностей с фиксированными корзинами.
+
+    bucket_counts[i] - число наблюдений не больше buckets[i], последний
+    элемент - наблюдения больше всех границ (+Inf).
+
+    """
+
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    bucket_counts: list[int] = field(init=False)
+    count: int = field(default=0, init=False)
+    total: float = field(default=0.0, init=False)
+    errors: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        self.bucket_counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if error:
+            self.errors += 1
+
+    def cumulative_counts(self) -> list[int]:
+        """Накопленные счетчики по границам, как в формате Prometheus."""
+        counts, running = [], 0
+        for bucket_count in self.bucket_counts:
+            running += bucket_count
+            counts.append(running)
+        return counts
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля: верхняя граница корзины, в которую он попал."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, count in zip(self.buckets, self.cumulative_counts(), strict=False):
+            if count >= rank:
+                return bound
+        return float("inf")
+
+
+@dataclass
+class LatencyHistograms:
+    """Набор гистограмм по ключу: типу команды или кортежу значений меток."""
+
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    histograms: dict[MetricKey, LatencyHistogram] = field(default_factory=dict, init=False)
+
+    def observe(self, key: MetricKey, seconds: float, error: bool = False) -> None:
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram(buckets=self.buckets)
+        histogram.observe(seconds, error=error)
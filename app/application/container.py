@@ -1,19 +1,59 @@
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from functools import lru_cache
 
+from infrastructure.cache import InMemoryQueryCache
+from infrastructure.database.gateways.pools import PoolSettings
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.repositories.organizations.cached_members import (
+    CachedOrganizationMemberRepository,
+    OrganizationMemberCache,
+)
 from infrastructure.database.repositories.organizations.members import SQLAlchemyOrganizationMemberRepository
 from infrastructure.database.repositories.organizations.organizations import SQLAlchemyOrganizationRepository
+from infrastructure.database.repositories.outbox import SQLAlchemyEventOutbox
 from infrastructure.database.repositories.sales.activities import SQLAlchemyActivityRepository
 from infrastructure.database.repositories.sales.contacts import SQLAlchemyContactRepository
 from infrastructure.database.repositories.sales.deals import SQLAlchemyDealRepository
 from infrastructure.database.repositories.sales.tasks import SQLAlchemyTaskRepository
 from infrastructure.database.repositories.users.users import SQLAlchemyUserRepository
+from infrastructure.database.search import (
+    BaseSearchBackend,
+    ILikeSearchBackend,
+    TrigramSearchBackend,
+)
+from infrastructure.database.unit_of_work import SQLAlchemyUnitOfWork
+from infrastructure.journal import QueuedActivityJournal
+from infrastructure.security import BcryptPasswordHasher
 from punq import (
     Container,
     Scope,
 )
 
+from application.base.cache import BaseQueryCache
+from application.base.outbox import BaseEventOutbox
+from application.base.unit_of_work import (
+    ANALYTICS_POOL,
+    BACKGROUND_POOL,
+    BaseUnitOfWork,
+    INTERACTIVE_POOL,
+)
+from application.events import (
+    EventDispatcher,
+    OutboxRelay,
+)
 from application.mediator import Mediator
+from application.middlewares import (
+    entity_tag,
+    MediatorMetrics,
+    organization_tag,
+    QueryCacheMetrics,
+    QueryCacheMiddleware,
+    SingleFlightMiddleware,
+    TimingMiddleware,
+)
 from application.organizations.commands import (
     AddMemberCommand,
     AddMemberCommandHandler,
@@ -29,6 +69,8 @@ from application.organizations.queries import (
     GetUserOrganizationsQueryHandler,
 )
 from application.sales.commands import (
+    BatchUpdateDealsCommand,
+    BatchUpdateDealsCommandHandler,
     CreateActivityCommand,
     CreateActivityCommandHandler,
     CreateCommentActivityCommand,
@@ -41,6 +83,10 @@ from application.sales.commands import (
     CreateTaskCommandHandler,
     DeleteContactCommand,
     DeleteContactCommandHandler,
+    ImportContactsCommand,
+    ImportContactsCommandHandler,
+    ImportDealsCommand,
+    ImportDealsCommandHandler,
     UpdateDealCommand,
     UpdateDealCommandHandler,
     UpdateDealStageCommand,
@@ -50,7 +96,18 @@ from application.sales.commands import (
     UpdateTaskCommand,
     UpdateTaskCommandHandler,
 )
+from application.sales.events import (
+    DealStageChangedEventHandler,
+    DealStatusChangedEventHandler,
+)
 from application.sales.queries import (
+    deal_analytics_key,
+    ExportContactsQuery,
+    ExportContactsQueryHandler,
+    ExportDealsQuery,
+    ExportDealsQueryHandler,
+    ExportTasksQuery,
+    ExportTasksQueryHandler,
     GetActivitiesByDealIdQuery,
     GetActivitiesByDealIdQueryHandler,
     GetContactByIdQuery,
@@ -86,6 +143,11 @@ from domain.organizations.services import (
     MemberService,
     OrganizationService,
 )
+from domain.sales.events import (
+    DealStageChangedEvent,
+    DealStatusChangedEvent,
+)
+from domain.sales.interfaces.activity_journal import BaseActivityJournal
 from domain.sales.interfaces.repositories import (
     BaseActivityRepository,
     BaseContactRepository,
@@ -96,8 +158,10 @@ from domain.sales.services import (
     ActivityService,
     ContactService,
     DealService,
+    SalesImportService,
     TaskService,
 )
+from domain.users.interfaces.password_hasher import BasePasswordHasher
 from domain.users.interfaces.repositories.users import BaseUserRepository
 from domain.users.services import UserService
 from settings.config import Config
@@ -117,22 +181,89 @@ def _init_container() -> Container:
 
     # Регистрируем Database
     def init_database() -> Database:
+        pools = {
+            INTERACTIVE_POOL: PoolSettings(
+                size=config.db_interactive_pool_size,
+                max_overflow=config.db_interactive_max_overflow,
+                timeout=config.db_interactive_pool_timeout,
+                recycle=config.db_pool_recycle,
+                statement_timeout=config.db_interactive_statement_timeout,
+                statement_cache_size=config.db_statement_cache_size,
+            ),
+            ANALYTICS_POOL: PoolSettings(
+                size=config.db_analytics_pool_size,
+                max_overflow=config.db_analytics_max_overflow,
+                timeout=config.db_analytics_pool_timeout,
+                recycle=config.db_pool_recycle,
+                statement_timeout=config.db_analytics_statement_timeout,
+                statement_cache_size=config.db_statement_cache_size,
+            ),
+            BACKGROUND_POOL: PoolSettings(
+                size=config.db_background_pool_size,
+                max_overflow=config.db_background_max_overflow,
+                timeout=config.db_background_pool_timeout,
+                recycle=config.db_pool_recycle,
+                statement_timeout=config.db_background_statement_timeout,
+                statement_cache_size=config.db_statement_cache_size,
+            ),
+        }
         return Database(
             url=config.postgres_connection_uri,
             ro_url=config.postgres_connection_uri,
+            replica_urls=config.postgres_replica_uris,
+            replica_selection=config.replica_selection,
+            replica_max_lag=config.replica_max_lag,
+            replica_lag_check_interval=config.replica_lag_check_interval,
+            read_your_writes_window=config.read_your_writes_window,
+            pools=pools,
         )
 
     container.register(Database, factory=init_database, scope=Scope.singleton)
+    container.register(BaseEventOutbox, SQLAlchemyEventOutbox)
+    container.register(BaseUnitOfWork, SQLAlchemyUnitOfWork, scope=Scope.singleton)
+
+    # Регистрируем бэкенд текстового поиска
+    def init_search_backend() -> BaseSearchBackend:
+        if config.search_backend == "ilike":
+            return ILikeSearchBackend()
+        return TrigramSearchBackend()
+
+    container.register(BaseSearchBackend, factory=init_search_backend, scope=Scope.singleton)
+
+    # Регистрируем хеширование паролей
+    def init_password_hasher() -> BasePasswordHasher:
+        executor_class = ProcessPoolExecutor if config.password_hasher_executor == "process" else ThreadPoolExecutor
+        return BcryptPasswordHasher(
+            executor=executor_class(max_workers=config.password_hasher_workers),
+            max_concurrency=config.password_hasher_max_concurrency,
+            rounds=config.password_hash_rounds,
+        )
+
+    container.register(BasePasswordHasher, factory=init_password_hasher, scope=Scope.singleton)
 
     # Регистрируем репозитории
     container.register(
         BaseOrganizationRepository,
         SQLAlchemyOrganizationRepository,
     )
-    container.register(
-        BaseOrganizationMemberRepository,
-        SQLAlchemyOrganizationMemberRepository,
-    )
+
+    # Членство проверяется на каждом запросе - репозиторий обернут в кэш
+    def init_member_cache() -> OrganizationMemberCache:
+        return OrganizationMemberCache(
+            ttl=config.membership_cache_ttl,
+            max_size=config.membership_cache_max_size,
+        )
+
+    container.register(OrganizationMemberCache, factory=init_member_cache, scope=Scope.singleton)
+    container.register(SQLAlchemyOrganizationMemberRepository)
+
+    def init_member_repository() -> BaseOrganizationMemberRepository:
+        return CachedOrganizationMemberRepository(
+            repository=container.resolve(SQLAlchemyOrganizationMemberRepository),
+            cache=container.resolve(OrganizationMemberCache),
+        )
+
+    container.register(BaseOrganizationMemberRepository, factory=init_member_repository)
     container.register(
         BaseUserRepository,
         SQLAlchemyUserRepository,
@@ -154,6 +285,22 @@ def _init_container() -> Container:
         SQLAlchemyActivityRepository,
     )
 
+    # Журнал активностей - один на процесс: его очередь разбирает фоновый писатель,
+    # запускаемый при старте приложения
+    def init_activity_journal() -> QueuedActivityJournal:
+        return QueuedActivityJournal(
+            activity_repository=container.resolve(BaseActivityRepository),
+            unit_of_work=container.resolve(BaseUnitOfWork),
+            max_queue_size=config.activity_journal_queue_size,
+            batch_size=config.activity_journal_batch_size,
+            flush_interval=config.activity_journal_flush_interval,
+            enqueue_timeout=config.activity_journal_enqueue_timeout,
+            max_retries=config.activity_journal_max_retries,
+        )
+
+    container.register(QueuedActivityJournal, factory=init_activity_journal, scope=Scope.singleton)
+    container.register(BaseActivityJournal, factory=lambda: container.resolve(QueuedActivityJournal))
+
     # Регистрируем доменные сервисы
     container.register(OrganizationService)
     container.register(MemberService)
@@ -162,6 +309,7 @@ def _init_container() -> Container:
     container.register(DealService)
     container.register(TaskService)
     container.register(ActivityService)
+    container.register(SalesImportService)
 
     # Регистрируем command handlers
     # Organizations
@@ -174,12 +322,15 @@ def _init_container() -> Container:
     # Sales - Contacts
     container.register(CreateContactCommandHandler)
     container.register(DeleteContactCommandHandler)
+    container.register(ImportContactsCommandHandler)
 
     # Sales - Deals
     container.register(CreateDealCommandHandler)
     container.register(UpdateDealStatusCommandHandler)
     container.register(UpdateDealStageCommandHandler)
     container.register(UpdateDealCommandHandler)
+    container.register(BatchUpdateDealsCommandHandler)
+    container.register(ImportDealsCommandHandler)
 
     # Sales - Tasks
     container.register(CreateTaskCommandHandler)
@@ -202,23 +353,177 @@ def _init_container() -> Container:
     # Sales - Contacts
     container.register(GetContactByIdQueryHandler)
     container.register(GetContactsQueryHandler)
+    container.register(ExportContactsQueryHandler)
 
     # Sales - Deals
     container.register(GetDealByIdQueryHandler)
     container.register(GetDealsQueryHandler)
+    container.register(ExportDealsQueryHandler)
     container.register(GetDealSummaryQueryHandler)
     container.register(GetDealFunnelQueryHandler)
 
     # Sales - Tasks
     container.register(GetTaskByIdQueryHandler)
     container.register(GetTasksQueryHandler)
+    container.register(ExportTasksQueryHandler)
 
     # Sales - Activities
     container.register(GetActivitiesByDealIdQueryHandler)
 
+    # Регистрируем event handlers
+    # Sales - Deals
+    container.register(DealStatusChangedEventHandler)
+    container.register(DealStageChangedEventHandler)
+
+    # Инициализируем диспетчер событий
+    def init_event_dispatcher() -> EventDispatcher:
+        dispatcher = EventDispatcher(
+            unit_of_work=container.resolve(BaseUnitOfWork),
+            max_concurrency=config.event_dispatch_concurrency,
+        )
+
+        # Sales - Deals
+        dispatcher.subscribe(
+            DealStatusChangedEvent,
+            [container.resolve(DealStatusChangedEventHandler)],
+        )
+        dispatcher.subscribe(
+            DealStageChangedEvent,
+            [container.resolve(DealStageChangedEventHandler)],
+        )
+
+        return dispatcher
+
+    container.register(EventDispatcher, factory=init_event_dispatcher, scope=Scope.singleton)
+
+    def init_outbox_relay() -> OutboxRelay:
+        return OutboxRelay(
+            outbox=container.resolve(BaseEventOutbox),
+            dispatcher=container.resolve(EventDispatcher),
+            batch_size=config.outbox_batch_size,
+            poll_interval=config.outbox_poll_interval,
+            lease=config.outbox_lease,
+            max_attempts=config.outbox_max_attempts,
+            retry_delay=config.outbox_retry_delay,
+        )
+
+    container.register(OutboxRelay, factory=init_outbox_relay, scope=Scope.singleton)
+
+    # Регистрируем middleware медиатора
+    container.register(MediatorMetrics, scope=Scope.singleton)
+    container.register(TimingMiddleware)
+
+    def init_query_cache() -> BaseQueryCache:
+        return InMemoryQueryCache(max_size=config.query_cache_max_size)
+
+    container.register(BaseQueryCache, factory=init_query_cache, scope=Scope.singleton)
+    container.register(QueryCacheMetrics, scope=Scope.singleton)
+
+    def init_query_cache_middleware() -> QueryCacheMiddleware:
+        middleware = QueryCacheMiddleware(
+            cache=container.resolve(BaseQueryCache),
+            unit_of_work=container.resolve(BaseUnitOfWork),
+            metrics=container.resolve(QueryCacheMetrics),
+        )
+
+        # Запросы: карточки помечены своей сущностью, списки и сводки - организацией
+        entity_ttl, list_ttl = config.query_cache_entity_ttl, config.query_cache_list_ttl
+        if entity_ttl:
+            middleware.cache_query(GetDealByIdQuery, entity_ttl, lambda q: [entity_tag("deal", q.deal_id)])
+            middleware.cache_query(GetContactByIdQuery, entity_ttl, lambda q: [entity_tag("contact", q.contact_id)])
+            middleware.cache_query(GetTaskByIdQuery, entity_ttl, lambda q: [entity_tag("task", q.task_id)])
+        if list_ttl:
+            middleware.cache_query(
+                GetDealsQuery,
+                list_ttl,
+                lambda q: [organization_tag(q.filters.organization_id, "deals")],
+            )
+            for query in (GetDealSummaryQuery, GetDealFunnelQuery):
+                middleware.cache_query(
+                    query,
+                    list_ttl,
+                    lambda q: [organization_tag(q.filters.organization_id, "deals")],
+                    key=deal_analytics_key,
+                )
+            middleware.cache_query(
+                GetContactsQuery,
+                list_ttl,
+                lambda q: [organization_tag(q.filters.organization_id, "contacts")],
+            )
+            middleware.cache_query(
+                GetTasksQuery,
+                list_ttl,
+                lambda q: [organization_tag(q.filters.organization_id, "tasks")],
+            )
+
+        # Команды: изменение сущности сбрасывает ее карточку и списки организации
+        for command in (CreateDealCommand, ImportDealsCommand):
+            middleware.invalidate_on(command, lambda c: [organization_tag(c.organization_id, "deals")])
+        for command in (UpdateDealCommand, UpdateDealStatusCommand, UpdateDealStageCommand):
+            middleware.invalidate_on(
+                command,
+                lambda c: [entity_tag("deal", c.deal_id), organization_tag(c.organization_id, "deals")],
+            )
+        middleware.invalidate_on(
+            BatchUpdateDealsCommand,
+            lambda c: [
+                *(entity_tag("deal", deal_id) for deal_id in c.deal_ids),
+                organization_tag(c.organization_id, "deals"),
+            ],
+        )
+        for command in (CreateContactCommand, ImportContactsCommand):
+            middleware.invalidate_on(command, lambda c: [organization_tag(c.organization_id, "contacts")])
+        middleware.invalidate_on(
+            DeleteContactCommand,
+            lambda c: [entity_tag("contact", c.contact_id), organization_tag(c.organization_id, "contacts")],
+        )
+        middleware.invalidate_on(CreateTaskCommand, lambda c: [organization_tag(c.organization_id, "tasks")])
+        middleware.invalidate_on(
+            UpdateTaskCommand,
+            lambda c: [entity_tag("task", c.task_id), organization_tag(c.organization_id, "tasks")],
+        )
+        return middleware
+
+    container.register(QueryCacheMiddleware, factory=init_query_cache_middleware, scope=Scope.singleton)
+
+    def init_single_flight_middleware() -> SingleFlightMiddleware:
+        middleware = SingleFlightMiddleware(
+            metrics=container.resolve(MediatorMetrics),
+            unit_of_work=container.resolve(BaseUnitOfWork),
+        )
+        # Выгрузки не склеиваются: их результат - поток строк
+        for query in (
+            GetDealByIdQuery,
+            GetContactByIdQuery,
+            GetTaskByIdQuery,
+            GetDealsQuery,
+            GetContactsQuery,
+            GetTasksQuery,
+        ):
+            middleware.coalesce(query)
+        for query in (GetDealSummaryQuery, GetDealFunnelQuery):
+            middleware.coalesce(query, key=deal_analytics_key)
+        return middleware
+
+    container.register(SingleFlightMiddleware, factory=init_single_flight_middleware, scope=Scope.singleton)
+
     # Инициализируем медиатор
     def init_mediator() -> Mediator:
-        mediator = Mediator()
+        mediator = Mediator(
+            unit_of_work=container.resolve(BaseUnitOfWork),
+            event_relay=container.resolve(OutboxRelay),
+            default_query_budget=config.query_budget_default or None,
+        )
+        mediator.add_middleware(container.resolve(TimingMiddleware))
+        mediator.add_middleware(container.resolve(QueryCacheMiddleware))
+        # Внутри кэша: промахи одного ключа в один момент дают одно чтение
+        mediator.add_middleware(container.resolve(SingleFlightMiddleware))
+
+        # Бюджеты запросов, которые плохой фильтр может сделать тяжелыми
+        for query in (GetDealsQuery, GetContactsQuery, GetTasksQuery):
+            mediator.set_query_budget(query, config.query_budget_search or None)
+        for query in (GetDealSummaryQuery, GetDealFunnelQuery):
+            mediator.set_query_budget(query, config.query_budget_analytics or None)
 
         # Регистрируем commands
         # Organizations
@@ -246,6 +551,10 @@ def _init_container() -> Container:
             DeleteContactCommand,
             [container.resolve(DeleteContactCommandHandler)],
         )
+        mediator.register_command(
+            ImportContactsCommand,
+            [container.resolve(ImportContactsCommandHandler)],
+        )
 
         # Sales - Deals
         mediator.register_command(
@@ -264,6 +573,14 @@ def _init_container() -> Container:
             UpdateDealCommand,
             [container.resolve(UpdateDealCommandHandler)],
         )
+        mediator.register_command(
+            BatchUpdateDealsCommand,
+            [container.resolve(BatchUpdateDealsCommandHandler)],
+        )
+        mediator.register_command(
+            ImportDealsCommand,
+            [container.resolve(ImportDealsCommandHandler)],
+        )
 
         # Sales - Tasks
         mediator.register_command(
@@ -319,6 +636,10 @@ def _init_container() -> Container:
             GetContactsQuery,
             container.resolve(GetContactsQueryHandler),
         )
+        mediator.register_query(
+            ExportContactsQuery,
+            container.resolve(ExportContactsQueryHandler),
+        )
 
         # Sales - Deals
         mediator.register_query(
@@ -329,6 +650,10 @@ def _init_container() -> Container:
             GetDealsQuery,
             container.resolve(GetDealsQueryHandler),
         )
+        mediator.register_query(
+            ExportDealsQuery,
+            container.resolve(ExportDealsQueryHandler),
+        )
         mediator.register_query(
             GetDealSummaryQuery,
             container.resolve(GetDealSummaryQueryHandler),
@@ -347,6 +672,10 @@ def _init_container() -> Container:
             GetTasksQuery,
             container.resolve(GetTasksQueryHandler),
         )
+        mediator.register_query(
+            ExportTasksQuery,
+            container.resolve(ExportTasksQueryHandler),
+        )
 
         # Sales - Activities
         mediator.register_query(
@@ -0,0 +1,8 @@
+from application.events.dispatcher import EventDispatcher
+from application.events.relay import OutboxRelay
+
+
+__all__ = (
+    "EventDispatcher",
+    "OutboxRelay",
+)
@@ -0,0 +1,91 @@
+import asyncio
+import contextvars
+import logging
+from collections import defaultdict
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from uuid import UUID
+
+from application.base.event import (
+    BaseEventHandler,
+    EventType,
+)
+from application.base.unit_of_work import BaseUnitOfWork
+from domain.base.events import BaseEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class EventDispatcher:
+    """Раздает доменные события подписчикам.
+
+    События группируются по типу, и каждый подписчик получает свою группу
+    одним вызовом handle_many в отдельном unit of work. Одновременно
+    выполняется не больше max_concurrency вызовов.
+
+    """
+
+    unit_of_work: BaseUnitOfWork = field(kw_only=True)
+    max_concurrency: int = field(default=8, kw_only=True)
+
+    events_map: dict[type[BaseEvent], list[BaseEventHandler]] = field(
+        default_factory=lambda: defaultdict(list),
+        kw_only=True,
+    )
+
+    def subscribe(
+        self,
+        event: type[EventType],
+        event_handlers: Iterable[BaseEventHandler[EventType]],
+    ):
+        self.events_map[event].extend(event_handlers)
+
+    async def dispatch(self, events: Sequence[BaseEvent]) -> set[UUID]:
+        """Доставляет события и возвращает event_id тех, у которых упал
+        хотя бы один подписчик."""
+        groups: dict[type[BaseEvent], list[BaseEvent]] = defaultdict(list)
+        for event in events:
+            groups[type(event)].append(event)
+
+        deliveries = [
+            (handler, group) for event_type, group in groups.items() for handler in self.events_map.get(event_type, [])
+        ]
+        if not deliveries:
+            return set()
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def deliver(handler: BaseEventHandler, group: list[BaseEvent]) -> None:
+            async with semaphore:
+                async with self.unit_of_work.begin(pool=handler.pool):
+                    await handler.handle_many(group)
+
+        # Пустой контекст: иначе подписчик присоединился бы к unit of work
+        # вызывающего кода, а одну сессию нельзя использовать конкурентно
+        results = await asyncio.gather(
+            *(
+                asyncio.create_task(deliver(handler, group), context=contextvars.Context())
+                for handler, group in deliveries
+            ),
+            return_exceptions=True,
+        )
+
+        failed: set[UUID] = set()
+        for (handler, group), result in zip(deliveries, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(
+                    "%s failed to handle %d events",
+                    type(handler).__name__,
+                    len(group),
+                    exc_info=result,
+                )
+                failed.update(event.event_id for event in group)
+        return failed
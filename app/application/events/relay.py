@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+from application.base.outbox import BaseEventOutbox
+from application.events.dispatcher import EventDispatcher
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class OutboxRelay:
+    """Переносит события из outbox к подписчикам.
+
+    Запущенный релей разбирает outbox в фоне: по сигналу notify() после
+    каждой команды и раз в poll_interval на случай событий, записанных
+    другими процессами. Событие отмечается опубликованным, только когда
+    его обработали все подписчики, иначе повторяется через retry_delay
+    (at-least-once). Пока релей не запущен, notify() разбирает outbox сам.
+
+    """
+
+    outbox: BaseEventOutbox
+    dispatcher: EventDispatcher
+    batch_size: int = 100
+    poll_interval: float = 1.0
+    lease: float = 30.0
+    max_attempts: int = 10
+    retry_delay: float = 5.0
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _worker: asyncio.Task | None = field(default=None, init=False)
+    _stopping: bool = field(default=False, init=False)
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    async def notify(self) -> None:
+        if self._worker is None:
+            await self.process_pending()
+            return
+        self._wakeup.set()
+
+    async def process_pending(self) -> int:
+        """Доставляет все готовые события и возвращает их число."""
+        processed = 0
+        while True:
+            events = await self.outbox.claim(
+                limit=self.batch_size,
+                lease=self.lease,
+                max_attempts=self.max_attempts,
+            )
+            if not events:
+                return processed
+
+            failed = await self.dispatcher.dispatch(events)
+            published = [event.event_id for event in events if event.event_id not in failed]
+            if published:
+                await self.outbox.mark_published(published)
+            if failed:
+                await self.outbox.mark_failed(list(failed), retry_delay=self.retry_delay)
+
+            processed += len(events)
+            if len(events) < self.batch_size:
+                return processed
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._stopping = False
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновый разбор. Неразобранные события остаются в
+        outbox до следующего запуска."""
+        if self._worker is None:
+            return
+
+        worker, self._worker = self._worker, None
+        self._stopping = True
+        self._wakeup.set()
+        await worker
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self.process_pending()
+            except Exception:
+                logger.exception("Failed to process outbox events")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except TimeoutError:
+                pass
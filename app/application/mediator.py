@@ -1,5 +1,12 @@
+import asyncio
+import contextvars
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Iterable,
+    Sequence,
+)
 from dataclasses import (
     dataclass,
     field,
@@ -17,14 +24,33 @@ from application.base.query import (
     QueryResultType,
     QueryType,
 )
+from application.base.unit_of_work import BaseUnitOfWork
 from application.common.exceptions import (
     CommandHandlersNotRegisteredException,
     QueryHandlerNotRegisteredException,
+    QueryTimeoutException,
+)
+from application.events.relay import OutboxRelay
+from application.middlewares.base import (
+    BaseMediatorMiddleware,
+    MediatorRequest,
 )
+from domain.base.events import (
+    BaseEvent,
+    collect_events,
+)
+
+
+# Запас (сек) таймера обработчика поверх statement_timeout
+QUERY_CANCEL_GRACE = 0.5
 
 
 @dataclass(eq=False)
 class Mediator:
+    unit_of_work: BaseUnitOfWork = field(kw_only=True)
+    # Доставляет события, сохраненные командой в outbox
+    event_relay: OutboxRelay | None = field(default=None, kw_only=True)
+
     commands_map: dict[CommandType, BaseCommandHandler] = field(
         default_factory=lambda: defaultdict(list),
         kw_only=True,
@@ -35,6 +61,22 @@ class Mediator:
         kw_only=True,
     )
 
+    middlewares: list[BaseMediatorMiddleware] = field(
+        default_factory=list,
+        kw_only=True,
+    )
+
+    # Бюджет времени запроса (сек) по типу; None - без ограничения
+    default_query_budget: float | None = field(default=None, kw_only=True)
+    query_budgets: dict[QueryType, float | None] = field(default_factory=dict, init=False)
+
+    def add_middleware(self, middleware: BaseMediatorMiddleware):
+        """Добавляет звено цепочки: первое добавленное - самое внешнее."""
+        self.middlewares.append(middleware)
+
+    def set_query_budget(self, query: QueryType, seconds: float | None):
+        self.query_budgets[query] = seconds
+
     def register_command(
         self,
         command: CommandType,
@@ -57,7 +99,7 @@ class Mediator:
         if not handlers:
             raise CommandHandlersNotRegisteredException(command_type)
 
-        return [await handler.handle(command) for handler in handlers]
+        return await self._call_chain(command, lambda: self._handle_command(command, handlers))
 
     async def handle_query(self, query: BaseQuery) -> QueryResultType:
         query_type = query.__class__
@@ -66,4 +108,113 @@ class Mediator:
         if not handler:
             raise QueryHandlerNotRegisteredException(query_type)
 
-        return await handler.handle(query=query)
+        return await self._call_chain(query, lambda: self._handle_query(query, handler))
+
+    async def _call_chain(self, request: MediatorRequest, handle: Callable[[], Awaitable]):
+        call_next = handle
+        for middleware in reversed(self.middlewares):
+            call_next = _bind(middleware, request, call_next)
+        return await call_next()
+
+    async def _handle_command(
+        self,
+        command: BaseCommand,
+        handlers: Sequence[BaseCommandHandler],
+    ) -> list[CommandResultType]:
+        with collect_events() as events:
+            if any(handler.independent or not handler.transactional for handler in handlers):
+                results = await self._handle_concurrently(command, handlers, events)
+            else:
+                async with self.unit_of_work.begin():
+                    results = [await handler.handle(command) for handler in handlers]
+
+        if events and self.event_relay is not None:
+            await self.event_relay.notify()
+        return results
+
+    async def _handle_concurrently(
+        self,
+        command: BaseCommand,
+        handlers: Sequence[BaseCommandHandler],
+        events: list[BaseEvent],
+    ) -> list[CommandResultType]:
+        """Зависимые обработчики выполняются по очереди в общем unit of work,
+        а каждый независимый - параллельно с ними в своем. Нетранзакционный
+        обработчик тоже выполняется отдельно, но unit of work открывает сам.
+        Ошибка любого отменяет остальные. Результаты возвращаются в порядке
+        регистрации."""
+        dependent = [index for index, handler in enumerate(handlers) if _shares_unit_of_work(handler)]
+
+        async def run_dependent() -> list[CommandResultType]:
+            if not dependent:
+                return []
+            async with self.unit_of_work.begin():
+                return [await handlers[index].handle(command) for index in dependent]
+
+        async def run_independent(handler: BaseCommandHandler) -> tuple[CommandResultType, list[BaseEvent]]:
+            with collect_events() as handler_events:
+                if not handler.transactional:
+                    result = await handler.handle(command)
+                else:
+                    async with self.unit_of_work.begin(pool=handler.pool):
+                        result = await handler.handle(command)
+            return result, handler_events
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                dependent_task = group.create_task(run_dependent())
+                # Одну сессию нельзя использовать конкурентно, поэтому независимый
+                # обработчик получает копию контекста без общего unit of work
+                independent_tasks = {
+                    index: group.create_task(run_independent(handler), context=self._detached_context())
+                    for index, handler in enumerate(handlers)
+                    if not _shares_unit_of_work(handler)
+                }
+        except ExceptionGroup as group_error:
+            # Вызывающий код (и обработчики ошибок API) ждут исключение обработчика, а не группу
+            raise group_error.exceptions[0] from None
+
+        results: list[CommandResultType] = [None] * len(handlers)
+        for index, result in zip(dependent, dependent_task.result(), strict=True):
+            results[index] = result
+        for index, task in independent_tasks.items():
+            results[index], handler_events = task.result()
+            events.extend(handler_events)
+        return results
+
+    def _detached_context(self) -> contextvars.Context:
+        context = contextvars.copy_context()
+        context.run(self.unit_of_work.detach)
+        return context
+
+    async def _handle_query(self, query: BaseQuery, handler: BaseQueryHandler) -> QueryResultType:
+        # Свой statement_timeout получают только запросы с явным бюджетом
+        # (поиск, сводки); остальным лимит на SQL-запрос задает пул
+        explicit = type(query) in self.query_budgets
+        budget = self.query_budgets[type(query)] if explicit else self.default_query_budget
+        if not budget:
+            async with self.unit_of_work.begin(read_only=True, pool=handler.pool):
+                return await handler.handle(query=query)
+
+        # statement_timeout обрывает отдельный запрос на стороне PostgreSQL и
+        # оставляет соединение рабочим. Таймер на весь обработчик срабатывает
+        # чуть позже: он ловит несколько запросов подряд и зависшую сеть, а
+        # отмена корутины заставляет asyncpg отправить серверу cancel
+        try:
+            async with asyncio.timeout(budget + QUERY_CANCEL_GRACE):
+                async with self.unit_of_work.begin(
+                    read_only=True,
+                    pool=handler.pool,
+                    statement_timeout=budget if explicit else None,
+                ):
+                    return await handler.handle(query=query)
+        except (TimeoutError, QueryTimeoutException) as error:
+            raise QueryTimeoutException(query_type=type(query).__name__, budget=budget) from error
+
+
+def _shares_unit_of_work(handler: BaseCommandHandler) -> bool:
+    return handler.transactional and not handler.independent
+
+
+def _bind(middleware: BaseMediatorMiddleware, request: MediatorRequest, call_next: Callable[[], Awaitable]):
+    return lambda: middleware(request, call_next)
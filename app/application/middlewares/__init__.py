@@ -0,0 +1,24 @@
+from application.middlewares.base import BaseMediatorMiddleware
+from application.middlewares.cache import (
+    entity_tag,
+    organization_tag,
+    QueryCacheMetrics,
+    QueryCacheMiddleware,
+)
+from application.middlewares.single_flight import SingleFlightMiddleware
+from application.middlewares.timing import (
+    MediatorMetrics,
+    TimingMiddleware,
+)
+
+
+__all__ = (
+    "BaseMediatorMiddleware",
+    "MediatorMetrics",
+    "QueryCacheMetrics",
+    "QueryCacheMiddleware",
+    "SingleFlightMiddleware",
+    "TimingMiddleware",
+    "entity_tag",
+    "organization_tag",
+)
@@ -0,0 +1,28 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from typing import Any
+
+from application.base.command import BaseCommand
+from application.base.query import BaseQuery
+
+
+MediatorRequest = BaseCommand | BaseQuery
+CallNext = Callable[[], Awaitable[Any]]
+
+
+class BaseMediatorMiddleware(ABC):
+    """Звено цепочки вокруг handle_command и handle_query.
+
+    Получает команду или запрос и call_next - оставшуюся цепочку вместе с
+    unit of work и обработчиками. Возвращает результат call_next (или свой).
+
+    """
+
+    @abstractmethod
+    async def __call__(self, request: MediatorRequest, call_next: CallNext) -> Any: ...
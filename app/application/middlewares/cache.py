@@ -0,0 +1,133 @@
+from collections import Counter
+from collections.abc import (
+    Callable,
+    Hashable,
+    Iterable,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from functools import partial
+from typing import Any
+from uuid import UUID
+
+from application.base.cache import (
+    BaseQueryCache,
+    CachedQueryResult,
+)
+from application.base.command import BaseCommand
+from application.base.query import BaseQuery
+from application.base.unit_of_work import BaseUnitOfWork
+from application.middlewares.base import (
+    BaseMediatorMiddleware,
+    CallNext,
+    MediatorRequest,
+)
+
+
+def organization_tag(organization_id: UUID, resource: str) -> str:
+    """Тег всех сущностей вида resource в организации (списки, сводки)."""
+    return f"organization:{organization_id}:{resource}"
+
+
+def entity_tag(resource: str, oid: UUID) -> str:
+    return f"{resource}:{oid}"
+
+
+@dataclass(frozen=True)
+class QueryCachePolicy:
+    ttl: float
+    tags: Callable[[Any], Iterable[str]]
+    # Ключ должен различать все поля запроса, влияющие на результат,
+    # включая пользователя и его роль
+    key: Callable[[Any], Hashable] = repr
+
+
+@dataclass
+class QueryCacheMetrics:
+    hits: Counter[str] = field(default_factory=Counter)
+    misses: Counter[str] = field(default_factory=Counter)
+    invalidations: Counter[str] = field(default_factory=Counter)
+
+    def hit_ratio(self, query: str) -> float:
+        total = self.hits[query] + self.misses[query]
+        return self.hits[query] / total if total else 0.0
+
+
+@dataclass
+class QueryCacheMiddleware(BaseMediatorMiddleware):
+    """Кэш результатов запросов, включаемый для типа запроса через
+    cache_query, и инвалидация по тегам после фиксации команд из
+    invalidate_on.
+
+    Кэшируются только успешные результаты, отличные от None. Без общего
+    хранилища каждый процесс видит только свои инвалидации, а записи
+    других процессов устаревают не дольше чем на TTL.
+
+    Пока запрос должен читать с мастера (read-your-writes), кэш не
+    читается и не пополняется. Результат, который могла отдать отстающая
+    реплика, хранится не дольше допустимого отставания реплик: иначе
+    прочитанное до записи жило бы весь TTL, а не время догона реплики.
+
+    """
+
+    cache: BaseQueryCache
+    unit_of_work: BaseUnitOfWork
+    metrics: QueryCacheMetrics
+    _policies: dict[type[BaseQuery], QueryCachePolicy] = field(default_factory=dict, init=False)
+    _invalidations: dict[type[BaseCommand], Callable[[Any], Iterable[str]]] = field(default_factory=dict, init=False)
+
+    def cache_query(
+        self,
+        query: type[BaseQuery],
+        ttl: float,
+        tags: Callable[[Any], Iterable[str]],
+        key: Callable[[Any], Hashable] = repr,
+    ) -> None:
+        self._policies[query] = QueryCachePolicy(ttl=ttl, tags=tags, key=key)
+
+    def invalidate_on(self, command: type[BaseCommand], tags: Callable[[Any], Iterable[str]]) -> None:
+        self._invalidations[command] = tags
+
+    async def __call__(self, request: MediatorRequest, call_next: CallNext) -> Any:
+        if isinstance(request, BaseCommand):
+            return await self._handle_command(request, call_next)
+
+        policy = self._policies.get(type(request))
+        if policy is None or self.unit_of_work.requires_primary():
+            return await call_next()
+        return await self._handle_query(request, policy, call_next)
+
+    async def _handle_query(self, query: BaseQuery, policy: QueryCachePolicy, call_next: CallNext) -> Any:
+        query_type = type(query).__name__
+        key = f"{query_type}:{policy.key(query)}"
+        tags = tuple(policy.tags(query))
+
+        # Версии берутся до чтения: инвалидация во время него делает запись устаревшей
+        tag_versions = await self.cache.tag_versions(tags)
+        cached = await self.cache.get(key)
+        if cached is not None and cached.tags == tags and cached.tag_versions == tag_versions:
+            self.metrics.hits[query_type] += 1
+            return cached.value
+
+        self.metrics.misses[query_type] += 1
+        result = await call_next()
+        if result is not None:
+            max_lag = self.unit_of_work.max_read_lag()
+            await self.cache.set(
+                key,
+                CachedQueryResult(value=result, tags=tags, tag_versions=tag_versions),
+                ttl=min(policy.ttl, max_lag) if max_lag else policy.ttl,
+            )
+        return result
+
+    async def _handle_command(self, command: BaseCommand, call_next: CallNext) -> Any:
+        result = await call_next()
+
+        tags_of = self._invalidations.get(type(command))
+        if tags_of is not None:
+            self.metrics.invalidations[type(command).__name__] += 1
+            # Команда внутри чужого unit of work фиксируется вместе с ним
+            await self.unit_of_work.after_commit(partial(self.cache.invalidate_tags, list(tags_of(command))))
+        return result
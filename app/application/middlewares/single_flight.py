@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import (
+    Callable,
+    Hashable,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Any
+
+from application.base.command import BaseCommand
+from application.base.query import BaseQuery
+from application.base.unit_of_work import BaseUnitOfWork
+from application.middlewares.base import (
+    BaseMediatorMiddleware,
+    CallNext,
+    MediatorRequest,
+)
+from application.middlewares.timing import MediatorMetrics
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+@dataclass
+class SingleFlightMiddleware(BaseMediatorMiddleware):
+    """Склеивает одновременные одинаковые запросы в одно выполнение.
+
+    Для типов, включенных через coalesce, запрос с тем же ключом, что и
+    уже выполняющийся, не идет в обработчик, а ждет его результата (или
+    исключения). Выполнение идет в отдельной задаче: отмена одного из
+    ожидающих не прерывает остальных, задача отменяется, только когда
+    ушли все. Потоковые результаты (выгрузки) склеивать нельзя - итератор
+    достался бы нескольким читателям.
+
+    В ключ входит номер поколения записей, который растет с каждой
+    зафиксированной командой: запрос, пришедший после записи, не получит
+    результат чтения, начатого до нее. Запросы, которые должны читать с
+    мастера (read-your-writes), не склеиваются: общее выполнение читает
+    оттуда, куда направил его первый запрос.
+
+    """
+
+    metrics: MediatorMetrics
+    unit_of_work: BaseUnitOfWork
+    _keys: dict[type[BaseQuery], Callable[[Any], Hashable]] = field(default_factory=dict, init=False)
+    _in_flight: dict[Hashable, _Flight] = field(default_factory=dict, init=False)
+    _generation: int = field(default=0, init=False)
+
+    def coalesce(self, query: type[BaseQuery], key: Callable[[Any], Hashable] = repr) -> None:
+        # Фильтры запросов - изменяемые pydantic-модели без __hash__,
+        # поэтому ключ по умолчанию - repr, равный для равных запросов
+        self._keys[query] = key
+
+    async def __call__(self, request: MediatorRequest, call_next: CallNext) -> Any:
+        if isinstance(request, BaseCommand):
+            result = await call_next()
+            await self.unit_of_work.after_commit(self._next_generation)
+            return result
+
+        key_of = self._keys.get(type(request))
+        if key_of is None or self.unit_of_work.requires_primary():
+            return await call_next()
+
+        key = (type(request), key_of(request), self._generation)
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.create_task(call_next()))
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.metrics.coalesced[type(request).__name__] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+    async def _next_generation(self) -> None:
+        self._generation += 1
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
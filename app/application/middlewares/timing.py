@@ -0,0 +1,50 @@
+import time
+from collections import Counter
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Any
+
+from application.base.command import BaseCommand
+from application.common.exceptions import QueryTimeoutException
+from application.common.metrics import LatencyHistograms
+from application.middlewares.base import (
+    BaseMediatorMiddleware,
+    CallNext,
+    MediatorRequest,
+)
+
+
+@dataclass
+class MediatorMetrics:
+    commands: LatencyHistograms = field(default_factory=LatencyHistograms)
+    queries: LatencyHistograms = field(default_factory=LatencyHistograms)
+    # Запросы, прерванные по бюджету времени, по типу
+    timeouts: Counter[str] = field(default_factory=Counter)
+    # Запросы, дождавшиеся результата такого же выполняющегося запроса
+    coalesced: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass
+class TimingMiddleware(BaseMediatorMiddleware):
+    """Пишет длительность каждой команды и запроса в гистограмму его типа.
+
+    Время включает unit of work целиком, вместе с фиксацией транзакции.
+
+    """
+
+    metrics: MediatorMetrics
+
+    async def __call__(self, request: MediatorRequest, call_next: CallNext) -> Any:
+        histograms = self.metrics.commands if isinstance(request, BaseCommand) else self.metrics.queries
+        started = time.perf_counter()
+        try:
+            result = await call_next()
+        except BaseException as error:
+            histograms.observe(type(request).__name__, time.perf_counter() - started, error=True)
+            if isinstance(error, QueryTimeoutException):
+                self.metrics.timeouts[type(request).__name__] += 1
+            raise
+        histograms.observe(type(request).__name__, time.perf_counter() - started)
+        return result
@@ -11,6 +11,8 @@ from application.sales.commands.contacts import (
     DeleteContactCommandHandler,
 )
 from application.sales.commands.deals import (
+    BatchUpdateDealsCommand,
+    BatchUpdateDealsCommandHandler,
     CreateDealCommand,
     CreateDealCommandHandler,
     UpdateDealCommand,
@@ -20,6 +22,12 @@ from application.sales.commands.deals import (
     UpdateDealStatusCommand,
     UpdateDealStatusCommandHandler,
 )
+from application.sales.commands.imports import (
+    ImportContactsCommand,
+    ImportContactsCommandHandler,
+    ImportDealsCommand,
+    ImportDealsCommandHandler,
+)
 from application.sales.commands.tasks import (
     CreateTaskCommand,
     CreateTaskCommandHandler,
@@ -39,12 +47,18 @@ __all__ = [
     "DeleteContactCommandHandler",
     "CreateDealCommand",
     "CreateDealCommandHandler",
+    "BatchUpdateDealsCommand",
+    "BatchUpdateDealsCommandHandler",
     "UpdateDealStatusCommand",
     "UpdateDealStatusCommandHandler",
     "UpdateDealStageCommand",
     "UpdateDealStageCommandHandler",
     "UpdateDealCommand",
     "UpdateDealCommandHandler",
+    "ImportContactsCommand",
+    "ImportContactsCommandHandler",
+    "ImportDealsCommand",
+    "ImportDealsCommandHandler",
     "CreateTaskCommand",
     "CreateTaskCommandHandler",
     "UpdateTaskCommand",
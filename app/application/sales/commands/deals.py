@@ -5,25 +5,42 @@ from application.base.command import (
     BaseCommand,
     BaseCommandHandler,
 )
+from domain.base.exceptions import VersionMismatchException
 from domain.organizations.value_objects.members import OrganizationMemberRole
 from domain.sales.entities import DealEntity
 from domain.sales.exceptions.sales import (
     AccessDeniedException,
     ContactOrganizationMismatchException,
-    DealStageRollbackNotAllowedException,
     ResourceNotFoundInOrganizationException,
 )
 from domain.sales.services import (
-    ActivityService,
     ContactService,
     DealService,
 )
 from domain.sales.value_objects.deals import (
     DealStage,
+    DealStageValueObject,
     DealStatus,
 )
 
 
+# Кто может вернуть сделку на более раннюю стадию: отдельной сменой стадии -
+# и менеджер, через обновление сделки (одной или набором) - только admin и owner
+_STAGE_CHANGE_ROLLBACK_ROLES = frozenset(
+    {
+        OrganizationMemberRole.ADMIN,
+        OrganizationMemberRole.OWNER,
+        OrganizationMemberRole.MANAGER,
+    },
+)
+_DEAL_UPDATE_ROLLBACK_ROLES = frozenset(
+    {
+        OrganizationMemberRole.ADMIN,
+        OrganizationMemberRole.OWNER,
+    },
+)
+
+
 @dataclass(frozen=True)
 class CreateDealCommand(BaseCommand):
     organization_id: UUID
@@ -60,6 +77,18 @@ class UpdateDealCommand(BaseCommand):
     user_role: str
     new_status: str | None = None
     new_stage: str | None = None
+    # Версия, которую видел клиент (If-Match); None - без проверки
+    expected_version: int | None = None
+
+
+@dataclass(frozen=True)
+class BatchUpdateDealsCommand(BaseCommand):
+    deal_ids: list[UUID]
+    organization_id: UUID
+    user_id: UUID
+    user_role: str
+    new_status: str | None = None
+    new_stage: str | None = None
 
 
 @dataclass(frozen=True)
@@ -98,7 +127,6 @@ class UpdateDealStatusCommandHandler(
     ],
 ):
     deal_service: DealService
-    activity_service: ActivityService
 
     async def handle(
         self,
@@ -124,21 +152,12 @@ class UpdateDealStatusCommandHandler(
                 user_id=command.user_id,
             )
 
+        # Активность о смене статуса создает подписчик DealStatusChangedEvent
         deal, old_status = await self.deal_service.update_deal_status(
             deal_id=command.deal_id,
             new_status=command.new_status,
         )
 
-        if old_status is not None:
-            old_status_str = old_status.value
-            new_status_str = deal.status.as_generic_type().value
-            if old_status_str != new_status_str:
-                await self.activity_service.create_status_changed_activity(
-                    deal_id=deal.oid,
-                    old_status=old_status_str,
-                    new_status=new_status_str,
-                )
-
         return deal, old_status
 
 
@@ -150,20 +169,6 @@ class UpdateDealStageCommandHandler(
     ],
 ):
     deal_service: DealService
-    activity_service: ActivityService
-
-    def _is_stage_rollback(
-        self,
-        current_stage: DealStage,
-        new_stage: DealStage,
-    ) -> bool:
-        stage_order = {
-            DealStage.QUALIFICATION: 1,
-            DealStage.PROPOSAL: 2,
-            DealStage.NEGOTIATION: 3,
-            DealStage.CLOSED: 4,
-        }
-        return stage_order.get(current_stage, 0) > stage_order.get(new_stage, 0)
 
     async def handle(
         self,
@@ -189,38 +194,17 @@ class UpdateDealStageCommandHandler(
                 user_id=command.user_id,
             )
 
-        old_stage = deal.stage.as_generic_type()
-        new_stage_enum = DealStage(command.new_stage)
-
-        if old_stage != new_stage_enum:
-            is_rollback = self._is_stage_rollback(old_stage, new_stage_enum)
-
-            if is_rollback and role not in {
-                OrganizationMemberRole.ADMIN,
-                OrganizationMemberRole.OWNER,
-                OrganizationMemberRole.MANAGER,
-            }:
-                raise DealStageRollbackNotAllowedException(
-                    deal_id=command.deal_id,
-                    current_stage=old_stage.value,
-                    new_stage=command.new_stage,
-                )
+        self.deal_service.ensure_stage_change_allowed(
+            deal,
+            DealStage(command.new_stage),
+            can_rollback=role in _STAGE_CHANGE_ROLLBACK_ROLES,
+        )
 
         deal, old_stage = await self.deal_service.update_deal_stage(
             deal_id=command.deal_id,
             new_stage=command.new_stage,
         )
 
-        if old_stage is not None:
-            old_stage_str = old_stage.value
-            new_stage_str = deal.stage.as_generic_type().value
-            if old_stage_str != new_stage_str:
-                await self.activity_service.create_stage_changed_activity(
-                    deal_id=deal.oid,
-                    old_stage=old_stage_str,
-                    new_stage=new_stage_str,
-                )
-
         return deal, old_stage
 
 
@@ -229,20 +213,6 @@ class UpdateDealCommandHandler(
     BaseCommandHandler[UpdateDealCommand, DealEntity],
 ):
     deal_service: DealService
-    activity_service: ActivityService
-
-    def _is_stage_rollback(
-        self,
-        current_stage: DealStage,
-        new_stage: DealStage,
-    ) -> bool:
-        stage_order = {
-            DealStage.QUALIFICATION: 1,
-            DealStage.PROPOSAL: 2,
-            DealStage.NEGOTIATION: 3,
-            DealStage.CLOSED: 4,
-        }
-        return stage_order.get(current_stage, 0) > stage_order.get(new_stage, 0)
 
     async def handle(
         self,
@@ -268,54 +238,80 @@ class UpdateDealCommandHandler(
                 user_id=command.user_id,
             )
 
+        if command.expected_version is not None and deal.version != command.expected_version:
+            raise VersionMismatchException(
+                resource_type="Deal",
+                resource_id=command.deal_id,
+                expected_version=command.expected_version,
+                actual_version=deal.version,
+            )
+
         # Обновляем статус, если указан
         if command.new_status is not None:
-            deal, old_status = await self.deal_service.update_deal_status(
+            deal, _ = await self.deal_service.update_deal_status(
                 deal_id=command.deal_id,
                 new_status=command.new_status,
             )
 
-            if old_status is not None:
-                old_status_str = old_status.value
-                new_status_str = deal.status.as_generic_type().value
-                if old_status_str != new_status_str:
-                    await self.activity_service.create_status_changed_activity(
-                        deal_id=deal.oid,
-                        old_status=old_status_str,
-                        new_status=new_status_str,
-                    )
-
         # Обновляем стадию, если указана
         if command.new_stage is not None:
-            old_stage = deal.stage.as_generic_type()
-            new_stage_enum = DealStage(command.new_stage)
-
-            if old_stage != new_stage_enum:
-                is_rollback = self._is_stage_rollback(old_stage, new_stage_enum)
-
-                if is_rollback and role not in {
-                    OrganizationMemberRole.ADMIN,
-                    OrganizationMemberRole.OWNER,
-                }:
-                    raise DealStageRollbackNotAllowedException(
-                        deal_id=command.deal_id,
-                        current_stage=old_stage.value,
-                        new_stage=command.new_stage,
-                    )
-
-            deal, old_stage = await self.deal_service.update_deal_stage(
+            self.deal_service.ensure_stage_change_allowed(
+                deal,
+                DealStage(command.new_stage),
+                can_rollback=role in _DEAL_UPDATE_ROLLBACK_ROLES,
+            )
+            deal, _ = await self.deal_service.update_deal_stage(
                 deal_id=command.deal_id,
                 new_stage=command.new_stage,
             )
 
-            if old_stage is not None:
-                old_stage_str = old_stage.value
-                new_stage_str = deal.stage.as_generic_type().value
-                if old_stage_str != new_stage_str:
-                    await self.activity_service.create_stage_changed_activity(
-                        deal_id=deal.oid,
-                        old_stage=old_stage_str,
-                        new_stage=new_stage_str,
-                    )
-
         return deal
+
+
+@dataclass(frozen=True)
+class BatchUpdateDealsCommandHandler(
+    BaseCommandHandler[BatchUpdateDealsCommand, list[DealEntity]],
+):
+    deal_service: DealService
+
+    async def handle(
+        self,
+        command: BatchUpdateDealsCommand,
+    ) -> list[DealEntity]:
+        # Все сделки набора одним запросом, без повторов
+        deal_ids = list(dict.fromkeys(command.deal_ids))
+        deals = await self.deal_service.get_deals_by_ids(deal_ids)
+
+        # Права и откат стадии проверяются для всего набора до любой записи
+        role = OrganizationMemberRole(command.user_role)
+        new_stage = DealStageValueObject(command.new_stage).as_generic_type() if command.new_stage is not None else None
+        for deal in deals:
+            if deal.organization_id != command.organization_id:
+                raise ResourceNotFoundInOrganizationException(
+                    resource_type="Deal",
+                    resource_id=deal.oid,
+                    organization_id=command.organization_id,
+                )
+
+            if role == OrganizationMemberRole.MEMBER and deal.owner_user_id != command.user_id:
+                raise AccessDeniedException(
+                    resource_type="Deal",
+                    resource_id=deal.oid,
+                    user_id=command.user_id,
+                )
+
+            if new_stage is not None:
+                self.deal_service.ensure_stage_change_allowed(
+                    deal,
+                    new_stage,
+                    can_rollback=role in _DEAL_UPDATE_ROLLBACK_ROLES,
+                )
+
+        # Активности создают подписчики событий смены статуса и стадии
+        await self.deal_service.update_deals(
+            deals=deals,
+            new_status=command.new_status,
+            new_stage=command.new_stage,
+        )
+
+        return deals
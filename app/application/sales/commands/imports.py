@@ -0,0 +1,87 @@
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from typing import ClassVar
+from uuid import UUID
+
+from application.base.command import (
+    BaseCommand,
+    BaseCommandHandler,
+)
+from application.base.unit_of_work import (
+    BACKGROUND_POOL,
+    BaseUnitOfWork,
+)
+from domain.base.imports import (
+    batched,
+    ImportReport,
+    ImportRow,
+)
+from domain.sales.services import SalesImportService
+
+
+@dataclass(frozen=True)
+class ImportContactsCommand(BaseCommand):
+    organization_id: UUID
+    owner_user_id: UUID
+    rows: AsyncIterable[ImportRow]
+    batch_size: int = 1000
+
+
+@dataclass(frozen=True)
+class ImportDealsCommand(BaseCommand):
+    organization_id: UUID
+    owner_user_id: UUID
+    rows: AsyncIterable[ImportRow]
+    batch_size: int = 1000
+
+
+@dataclass(frozen=True)
+class ImportContactsCommandHandler(
+    BaseCommandHandler[ImportContactsCommand, ImportReport],
+):
+    # Каждая пачка фиксируется в своем unit of work: соединение не простаивает
+    # в транзакции, пока загружается файл, а ошибка базы не откатывает пачки,
+    # уже учтенные в отчете
+    transactional: ClassVar[bool] = False
+    pool: ClassVar[str] = BACKGROUND_POOL
+
+    import_service: SalesImportService
+    unit_of_work: BaseUnitOfWork
+
+    async def handle(self, command: ImportContactsCommand) -> ImportReport:
+        report = ImportReport()
+        async for batch in batched(command.rows, command.batch_size):
+            async with self.unit_of_work.begin(pool=self.pool):
+                await self.import_service.import_contacts(
+                    organization_id=command.organization_id,
+                    owner_user_id=command.owner_user_id,
+                    batch=batch,
+                    report=report,
+                )
+        return report
+
+
+@dataclass(frozen=True)
+class ImportDealsCommandHandler(
+    BaseCommandHandler[ImportDealsCommand, ImportReport],
+):
+    # Каждая пачка фиксируется в своем unit of work: соединение не простаивает
+    # в транзакции, пока загружается файл, а ошибка базы не откатывает пачки,
+    # уже учтенные в отчете
+    transactional: ClassVar[bool] = False
+    pool: ClassVar[str] = BACKGROUND_POOL
+
+    import_service: SalesImportService
+    unit_of_work: BaseUnitOfWork
+
+    async def handle(self, command: ImportDealsCommand) -> ImportReport:
+        report = ImportReport()
+        async for batch in batched(command.rows, command.batch_size):
+            async with self.unit_of_work.begin(pool=self.pool):
+                await self.import_service.import_deals(
+                    organization_id=command.organization_id,
+                    owner_user_id=command.owner_user_id,
+                    batch=batch,
+                    report=report,
+                )
+        return report
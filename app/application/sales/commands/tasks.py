@@ -6,6 +6,7 @@ from application.base.command import (
     BaseCommand,
     BaseCommandHandler,
 )
+from domain.base.exceptions import VersionMismatchException
 from domain.organizations.value_objects.members import OrganizationMemberRole
 from domain.sales.entities import TaskEntity
 from domain.sales.exceptions.sales import (
@@ -40,6 +41,7 @@ class UpdateTaskCommand(BaseCommand):
     description: str | None = None
     due_date: date | None = None
     is_done: bool | None = None
+    expected_version: int | None = None
 
 
 @dataclass(frozen=True)
@@ -121,6 +123,14 @@ class UpdateTaskCommandHandler(
                 user_id=command.user_id,
             )
 
+        if command.expected_version is not None and task.version != command.expected_version:
+            raise VersionMismatchException(
+                resource_type="Task",
+                resource_id=command.task_id,
+                expected_version=command.expected_version,
+                actual_version=task.version,
+            )
+
         result = await self.task_service.update_task(
             task_id=command.task_id,
             title=command.title,
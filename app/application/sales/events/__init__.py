@@ -0,0 +1,10 @@
+from application.sales.events.deals import (
+    DealStageChangedEventHandler,
+    DealStatusChangedEventHandler,
+)
+
+
+__all__ = [
+    "DealStageChangedEventHandler",
+    "DealStatusChangedEventHandler",
+]
@@ -0,0 +1,72 @@
+from collections.abc import Sequence
+from dataclasses import (
+    dataclass,
+    replace,
+)
+
+from application.base.event import BaseEventHandler
+from domain.sales.entities import ActivityEntity
+from domain.sales.events import (
+    DealStageChangedEvent,
+    DealStatusChangedEvent,
+)
+from domain.sales.services import ActivityService
+
+
+# Подписчики пишут активности в своем unit of work, а не через журнал: журнал
+# откладывает запись до фиксации и при ошибке отбрасывает ее, а relay к тому
+# времени уже отметил бы событие доставленным. Ошибка записи оставляет событие
+# в outbox, и relay доставит его повторно
+
+
+def _as_event_activity(
+    activity: ActivityEntity, event: DealStatusChangedEvent | DealStageChangedEvent
+) -> ActivityEntity:
+    # oid активности - event_id: повторная доставка события не создаст дубль
+    return replace(activity, oid=event.event_id, created_at=event.occurred_at, updated_at=event.occurred_at)
+
+
+@dataclass(frozen=True)
+class DealStatusChangedEventHandler(BaseEventHandler[DealStatusChangedEvent]):
+    activity_service: ActivityService
+
+    async def handle(self, event: DealStatusChangedEvent) -> None:
+        await self.handle_many([event])
+
+    async def handle_many(self, events: Sequence[DealStatusChangedEvent]) -> None:
+        await self.activity_service.save_activities(
+            [
+                _as_event_activity(
+                    self.activity_service.build_status_changed_activity(
+                        deal_id=event.deal_id,
+                        old_status=event.old_status,
+                        new_status=event.new_status,
+                    ),
+                    event,
+                )
+                for event in events
+            ],
+        )
+
+
+@dataclass(frozen=True)
+class DealStageChangedEventHandler(BaseEventHandler[DealStageChangedEvent]):
+    activity_service: ActivityService
+
+    async def handle(self, event: DealStageChangedEvent) -> None:
+        await self.handle_many([event])
+
+    async def handle_many(self, events: Sequence[DealStageChangedEvent]) -> None:
+        await self.activity_service.save_activities(
+            [
+                _as_event_activity(
+                    self.activity_service.build_stage_changed_activity(
+                        deal_id=event.deal_id,
+                        old_stage=event.old_stage,
+                        new_stage=event.new_stage,
+                    ),
+                    event,
+                )
+                for event in events
+            ],
+        )
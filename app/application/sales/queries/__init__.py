@@ -3,24 +3,31 @@ from application.sales.queries.activities import (
     GetActivitiesByDealIdQueryHandler,
 )
 from application.sales.queries.analytics import (
+    deal_analytics_key,
     GetDealFunnelQuery,
     GetDealFunnelQueryHandler,
     GetDealSummaryQuery,
     GetDealSummaryQueryHandler,
 )
 from application.sales.queries.contacts import (
+    ExportContactsQuery,
+    ExportContactsQueryHandler,
     GetContactByIdQuery,
     GetContactByIdQueryHandler,
     GetContactsQuery,
     GetContactsQueryHandler,
 )
 from application.sales.queries.deals import (
+    ExportDealsQuery,
+    ExportDealsQueryHandler,
     GetDealByIdQuery,
     GetDealByIdQueryHandler,
     GetDealsQuery,
     GetDealsQueryHandler,
 )
 from application.sales.queries.tasks import (
+    ExportTasksQuery,
+    ExportTasksQueryHandler,
     GetTaskByIdQuery,
     GetTaskByIdQueryHandler,
     GetTasksQuery,
@@ -29,6 +36,12 @@ from application.sales.queries.tasks import (
 
 
 __all__ = [
+    "ExportContactsQuery",
+    "ExportContactsQueryHandler",
+    "ExportDealsQuery",
+    "ExportDealsQueryHandler",
+    "ExportTasksQuery",
+    "ExportTasksQueryHandler",
     "GetActivitiesByDealIdQuery",
     "GetActivitiesByDealIdQueryHandler",
     "GetContactByIdQuery",
@@ -47,4 +60,5 @@ __all__ = [
     "GetTaskByIdQueryHandler",
     "GetTasksQuery",
     "GetTasksQueryHandler",
+    "deal_analytics_key",
 ]
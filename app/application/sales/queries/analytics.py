@@ -1,12 +1,17 @@
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import ClassVar
 from uuid import UUID
 
 from application.base.query import (
     BaseQuery,
     BaseQueryHandler,
 )
+from application.base.unit_of_work import ANALYTICS_POOL
 from domain.organizations.value_objects.members import OrganizationMemberRole
+from domain.sales.aggregates import DealStageAggregate
 from domain.sales.filters import (
     DealFilters,
     DealFunnelFilters,
@@ -30,12 +35,22 @@ class DealSummaryResult:
     new_deals_count: int | None = None
 
 
+@dataclass(frozen=True)
+class DealFunnelStageResult:
+    stage: DealStage
+    count: int
+    amount: float
+    # Доля сделок, дошедших от предыдущей стадии до текущей (None для первой стадии)
+    conversion_rate: float | None = None
+
+
 @dataclass(frozen=True)
 class DealFunnelResult:
     qualification_count: int
     proposal_count: int
     negotiation_count: int
     closed_count: int
+    stages: list[DealFunnelStageResult] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -52,28 +67,37 @@ class GetDealFunnelQuery(BaseQuery):
     user_role: str
 
 
+def deal_analytics_key(query: GetDealSummaryQuery | GetDealFunnelQuery) -> str:
+    """Ключ результата сводки или воронки.
+
+    Member видит только свои сделки, остальные роли - всю организацию,
+    поэтому пользователь входит в ключ только для member: одинаковые
+    запросы руководителей одной организации получают общий результат.
+
+    """
+    role = OrganizationMemberRole(query.user_role)
+    owner_id = query.user_id if role == OrganizationMemberRole.MEMBER else None
+    return f"{query.filters!r}:{owner_id}"
+
+
 @dataclass(frozen=True)
 class GetDealSummaryQueryHandler(
     BaseQueryHandler[GetDealSummaryQuery, DealSummaryResult],
 ):
+    pool: ClassVar[str] = ANALYTICS_POOL
+
     deal_service: DealService
 
-    def _build_status_filters(
-        self,
-        organization_id: UUID,
-        status: DealStatus,
-        user_id: UUID | None,
-        created_after: datetime | None = None,
-    ) -> DealFilters:
-        filters = DealFilters(
-            organization_id=organization_id,
-            status=[status],
-        )
-        if user_id:
-            filters.owner_id = user_id
-        if created_after:
-            filters.created_at_from = created_after
-        return filters
+    def _build_status_enums(self, status_list: list[str] | None) -> list[DealStatus] | None:
+        if not status_list:
+            return None
+        status_enums = []
+        for status_str in status_list:
+            try:
+                status_enums.append(DealStatus(status_str))
+            except ValueError:
+                pass
+        return status_enums if status_enums else None
 
     async def handle(
         self,
@@ -82,86 +106,38 @@ class GetDealSummaryQueryHandler(
         role = OrganizationMemberRole(query.user_role)
         user_id = query.user_id if role == OrganizationMemberRole.MEMBER else None
 
-        base_filters = DealFilters(
+        filters = DealFilters(
             organization_id=query.filters.organization_id,
         )
         if user_id:
-            base_filters.owner_id = user_id
+            filters.owner_id = user_id
         if query.filters.created_after:
-            base_filters.created_at_from = query.filters.created_after
-        if query.filters.status:
-            status_enums = []
-            for status_str in query.filters.status:
-                try:
-                    status_enums.append(DealStatus(status_str))
-                except ValueError:
-                    pass
-            if status_enums:
-                base_filters.status = status_enums
-
-        total_count = await self.deal_service.get_deal_count(base_filters)
-
-        new_count = await self.deal_service.get_deal_count(
-            self._build_status_filters(
-                query.filters.organization_id,
-                DealStatus.NEW,
-                user_id,
-                query.filters.created_after,
-            ),
-        )
+            filters.created_at_from = query.filters.created_after
 
-        in_progress_count = await self.deal_service.get_deal_count(
-            self._build_status_filters(
-                query.filters.organization_id,
-                DealStatus.IN_PROGRESS,
-                user_id,
-                query.filters.created_after,
-            ),
-        )
+        # Все счетчики и суммы по статусам считаются одним запросом (GROUP BY status)
+        aggregates = await self.deal_service.get_status_aggregates(filters)
 
-        won_count = await self.deal_service.get_deal_count(
-            self._build_status_filters(
-                query.filters.organization_id,
-                DealStatus.WON,
-                user_id,
-                query.filters.created_after,
-            ),
-        )
+        def count_for(status: DealStatus) -> int:
+            aggregate = aggregates.get(status)
+            return aggregate.count if aggregate else 0
 
-        lost_count = await self.deal_service.get_deal_count(
-            self._build_status_filters(
-                query.filters.organization_id,
-                DealStatus.LOST,
-                user_id,
-                query.filters.created_after,
-            ),
-        )
+        # Фильтр по статусам ограничивает только общее количество
+        status_enums = self._build_status_enums(query.filters.status) or list(DealStatus)
+        total_count = sum(count_for(status) for status in status_enums)
 
-        total_won_amount = await self.deal_service.get_total_amount(
-            organization_id=query.filters.organization_id,
-            status=DealStatus.WON,
-            user_id=user_id,
-        )
+        won_aggregate = aggregates.get(DealStatus.WON)
+        total_won_amount = won_aggregate.amount if won_aggregate else 0.0
 
-        new_deals_count = None
-        if query.filters.created_after:
-            new_deals_count = await self.deal_service.get_deal_count(
-                self._build_status_filters(
-                    query.filters.organization_id,
-                    DealStatus.NEW,
-                    user_id,
-                    query.filters.created_after,
-                ),
-            )
+        new_count = count_for(DealStatus.NEW)
 
         return DealSummaryResult(
             total_count=total_count,
             new_count=new_count,
-            in_progress_count=in_progress_count,
-            won_count=won_count,
-            lost_count=lost_count,
+            in_progress_count=count_for(DealStatus.IN_PROGRESS),
+            won_count=count_for(DealStatus.WON),
+            lost_count=count_for(DealStatus.LOST),
             total_won_amount=total_won_amount,
-            new_deals_count=new_deals_count,
+            new_deals_count=new_count if query.filters.created_after else None,
         )
 
 
@@ -169,6 +145,8 @@ class GetDealSummaryQueryHandler(
 class GetDealFunnelQueryHandler(
     BaseQueryHandler[GetDealFunnelQuery, DealFunnelResult],
 ):
+    pool: ClassVar[str] = ANALYTICS_POOL
+
     deal_service: DealService
 
     def _build_status_enums(self, status_list: list[str] | None) -> list[DealStatus] | None:
@@ -182,19 +160,15 @@ class GetDealFunnelQueryHandler(
                 pass
         return status_enums if status_enums else None
 
-    def _build_stage_filters(
+    def _build_filters(
         self,
         organization_id: UUID,
-        stage: DealStage,
-        user_id: UUID | None,
+        user_id: UUID,
         user_role: str,
         status_list: list[str] | None,
     ) -> DealFilters:
-        from domain.sales.filters import DealFilters
-
         filters = DealFilters(
             organization_id=organization_id,
-            stage=stage,
         )
         if OrganizationMemberRole(user_role) == OrganizationMemberRole.MEMBER:
             filters.owner_id = user_id
@@ -203,49 +177,52 @@ class GetDealFunnelQueryHandler(
             filters.status = status_enums
         return filters
 
+    def _build_stages(
+        self,
+        aggregates: dict[DealStage, DealStageAggregate],
+    ) -> list[DealFunnelStageResult]:
+        stages = list(DealStage)
+        counts = [aggregates[stage].count if stage in aggregates else 0 for stage in stages]
+
+        # Сделка на стадии N уже прошла все предыдущие стадии
+        reached = [sum(counts[index:]) for index in range(len(stages))]
+
+        result = []
+        for index, stage in enumerate(stages):
+            conversion_rate = None
+            if index > 0:
+                previous_reached = reached[index - 1]
+                conversion_rate = reached[index] / previous_reached if previous_reached else 0.0
+            result.append(
+                DealFunnelStageResult(
+                    stage=stage,
+                    count=counts[index],
+                    amount=aggregates[stage].amount if stage in aggregates else 0.0,
+                    conversion_rate=conversion_rate,
+                ),
+            )
+        return result
+
     async def handle(
         self,
         query: GetDealFunnelQuery,
     ) -> DealFunnelResult:
-        qualification_filters = self._build_stage_filters(
+        filters = self._build_filters(
             query.filters.organization_id,
-            DealStage.QUALIFICATION,
             query.user_id,
             query.user_role,
             query.filters.status,
         )
-        qualification_count = await self.deal_service.get_deal_count(qualification_filters)
 
-        proposal_filters = self._build_stage_filters(
-            query.filters.organization_id,
-            DealStage.PROPOSAL,
-            query.user_id,
-            query.user_role,
-            query.filters.status,
-        )
-        proposal_count = await self.deal_service.get_deal_count(proposal_filters)
-
-        negotiation_filters = self._build_stage_filters(
-            query.filters.organization_id,
-            DealStage.NEGOTIATION,
-            query.user_id,
-            query.user_role,
-            query.filters.status,
-        )
-        negotiation_count = await self.deal_service.get_deal_count(negotiation_filters)
-
-        closed_filters = self._build_stage_filters(
-            query.filters.organization_id,
-            DealStage.CLOSED,
-            query.user_id,
-            query.user_role,
-            query.filters.status,
-        )
-        closed_count = await self.deal_service.get_deal_count(closed_filters)
+        # Количество и сумма по всем стадиям считаются одним запросом (GROUP BY stage)
+        aggregates = await self.deal_service.get_stage_aggregates(filters)
+        stages = self._build_stages(aggregates)
+        counts = {stage_result.stage: stage_result.count for stage_result in stages}
 
         return DealFunnelResult(
-            qualification_count=qualification_count,
-            proposal_count=proposal_count,
-            negotiation_count=negotiation_count,
-            closed_count=closed_count,
+            qualification_count=counts[DealStage.QUALIFICATION],
+            proposal_count=counts[DealStage.PROPOSAL],
+            negotiation_count=counts[DealStage.NEGOTIATION],
+            closed_count=counts[DealStage.CLOSED],
+            stages=stages,
         )
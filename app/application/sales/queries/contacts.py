@@ -1,11 +1,16 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from dataclasses import dataclass
+from typing import ClassVar
 from uuid import UUID
 
 from application.base.query import (
     BaseQuery,
     BaseQueryHandler,
 )
+from application.base.unit_of_work import ANALYTICS_POOL
 from domain.organizations.value_objects.members import OrganizationMemberRole
 from domain.sales.entities import ContactEntity
 from domain.sales.exceptions.sales import (
@@ -32,6 +37,36 @@ class GetContactsQuery(BaseQuery):
     owner_id: UUID | None = None
 
 
+@dataclass(frozen=True)
+class ExportContactsQuery(BaseQuery):
+    filters: ContactFilters
+    user_id: UUID
+    user_role: str
+    owner_id: UUID | None = None
+
+
+def _build_contact_filters(query: "GetContactsQuery | ExportContactsQuery") -> ContactFilters:
+    """Фильтры списка контактов с учетом прав: member видит только свои контакты."""
+    role = OrganizationMemberRole(query.user_role)
+
+    # Проверка прав на фильтрацию по owner_id
+    if query.owner_id is not None and role == OrganizationMemberRole.MEMBER:
+        raise AccessDeniedException(
+            resource_type="Contact",
+            resource_id=query.user_id,
+            user_id=query.user_id,
+        )
+
+    # Для member автоматически фильтруем по его контактам, если owner_id не указан
+    filters = query.filters
+    if role == OrganizationMemberRole.MEMBER and filters.owner_id is None:
+        filters = ContactFilters.model_validate(
+            {**filters.model_dump(), "owner_id": query.user_id},
+        )
+
+    return filters
+
+
 @dataclass(frozen=True)
 class GetContactByIdQueryHandler(
     BaseQueryHandler[GetContactByIdQuery, ContactEntity],
@@ -79,23 +114,20 @@ class GetContactsQueryHandler(
         self,
         query: GetContactsQuery,
     ) -> tuple[Iterable[ContactEntity], int]:
-        role = OrganizationMemberRole(query.user_role)
+        filters = _build_contact_filters(query)
+        return await self.contact_service.get_contact_list_with_count(filters)
 
-        # Проверка прав на фильтрацию по owner_id
-        if query.owner_id is not None and role == OrganizationMemberRole.MEMBER:
-            raise AccessDeniedException(
-                resource_type="Contact",
-                resource_id=query.user_id,
-                user_id=query.user_id,
-            )
 
-        # Для member автоматически фильтруем по его контактам, если owner_id не указан
-        filters = query.filters
-        if role == OrganizationMemberRole.MEMBER and filters.owner_id is None:
-            filters = ContactFilters.model_validate(
-                {**filters.model_dump(), "owner_id": query.user_id},
-            )
+@dataclass(frozen=True)
+class ExportContactsQueryHandler(
+    BaseQueryHandler[ExportContactsQuery, AsyncIterator[ContactEntity]],
+):
+    pool: ClassVar[str] = ANALYTICS_POOL
+
+    contact_service: ContactService
 
-        contacts = await self.contact_service.get_contact_list(filters)
-        count = await self.contact_service.get_contact_count(filters)
-        return contacts, count
+    async def handle(
+        self,
+        query: ExportContactsQuery,
+    ) -> AsyncIterator[ContactEntity]:
+        return self.contact_service.stream_contacts(_build_contact_filters(query))
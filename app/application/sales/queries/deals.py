@@ -1,11 +1,16 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from dataclasses import dataclass
+from typing import ClassVar
 from uuid import UUID
 
 from application.base.query import (
     BaseQuery,
     BaseQueryHandler,
 )
+from application.base.unit_of_work import ANALYTICS_POOL
 from domain.organizations.value_objects.members import OrganizationMemberRole
 from domain.sales.entities import DealEntity
 from domain.sales.exceptions.sales import (
@@ -40,6 +45,65 @@ class GetDealsQuery(BaseQuery):
     stage: str | None = None
 
 
+@dataclass(frozen=True)
+class ExportDealsQuery(BaseQuery):
+    filters: DealFilters
+    user_id: UUID
+    user_role: str
+    owner_id: UUID | None = None
+    status_list: list[str] | None = None
+    stage: str | None = None
+
+
+def _build_deal_filters(query: "GetDealsQuery | ExportDealsQuery") -> DealFilters:
+    """Фильтры списка сделок с учетом прав: member видит только свои сделки."""
+    role = OrganizationMemberRole(query.user_role)
+
+    # Проверка прав на фильтрацию по owner_id
+    if query.owner_id is not None and role == OrganizationMemberRole.MEMBER:
+        raise AccessDeniedException(
+            resource_type="Deal",
+            resource_id=query.user_id,
+            user_id=query.user_id,
+        )
+
+    # Преобразуем статусы из строк в enum
+    status_enums = None
+    if query.status_list:
+        try:
+            status_enums = [DealStatus(s) for s in query.status_list]
+        except ValueError:
+            invalid_statuses = [s for s in query.status_list if s not in [st.value for st in DealStatus]]
+            raise InvalidDealStatusException(status=invalid_statuses[0] if invalid_statuses else "")
+
+    # Преобразуем stage из строки в enum
+    stage_enum = None
+    if query.stage:
+        try:
+            stage_enum = DealStage(query.stage)
+        except ValueError:
+            raise InvalidDealStageException(stage=query.stage)
+
+    # Обновляем filters с преобразованными значениями
+    filters_dict = query.filters.model_dump()
+    if status_enums is not None:
+        filters_dict["status"] = status_enums
+    if stage_enum is not None:
+        filters_dict["stage"] = stage_enum
+    if query.owner_id is not None:
+        filters_dict["owner_id"] = query.owner_id
+
+    filters = DealFilters.model_validate(filters_dict)
+
+    # Для member автоматически фильтруем по его сделкам, если owner_id не указан
+    if role == OrganizationMemberRole.MEMBER and filters.owner_id is None:
+        filters = DealFilters.model_validate(
+            {**filters.model_dump(), "owner_id": query.user_id},
+        )
+
+    return filters
+
+
 @dataclass(frozen=True)
 class GetDealByIdQueryHandler(
     BaseQueryHandler[GetDealByIdQuery, DealEntity],
@@ -87,50 +151,21 @@ class GetDealsQueryHandler(
         self,
         query: GetDealsQuery,
     ) -> tuple[Iterable[DealEntity], int]:
-        role = OrganizationMemberRole(query.user_role)
+        filters = _build_deal_filters(query)
+        return await self.deal_service.get_deal_list_with_count(filters)
 
-        # Проверка прав на фильтрацию по owner_id
-        if query.owner_id is not None and role == OrganizationMemberRole.MEMBER:
-            raise AccessDeniedException(
-                resource_type="Deal",
-                resource_id=query.user_id,
-                user_id=query.user_id,
-            )
 
-        # Преобразуем статусы из строк в enum
-        status_enums = None
-        if query.status_list:
-            try:
-                status_enums = [DealStatus(s) for s in query.status_list]
-            except ValueError:
-                invalid_statuses = [s for s in query.status_list if s not in [st.value for st in DealStatus]]
-                raise InvalidDealStatusException(status=invalid_statuses[0] if invalid_statuses else "")
-
-        # Преобразуем stage из строки в enum
-        stage_enum = None
-        if query.stage:
-            try:
-                stage_enum = DealStage(query.stage)
-            except ValueError:
-                raise InvalidDealStageException(stage=query.stage)
-
-        # Обновляем filters с преобразованными значениями
-        filters_dict = query.filters.model_dump()
-        if status_enums is not None:
-            filters_dict["status"] = status_enums
-        if stage_enum is not None:
-            filters_dict["stage"] = stage_enum
-        if query.owner_id is not None:
-            filters_dict["owner_id"] = query.owner_id
-
-        filters = DealFilters.model_validate(filters_dict)
-
-        # Для member автоматически фильтруем по его сделкам, если owner_id не указан
-        if role == OrganizationMemberRole.MEMBER and filters.owner_id is None:
-            filters = DealFilters.model_validate(
-                {**filters.model_dump(), "owner_id": query.user_id},
-            )
+@dataclass(frozen=True)
+class ExportDealsQueryHandler(
+    BaseQueryHandler[ExportDealsQuery, AsyncIterator[DealEntity]],
+):
+    pool: ClassVar[str] = ANALYTICS_POOL
 
-        deals = await self.deal_service.get_deal_list(filters)
-        count = await self.deal_service.get_deal_count(filters)
-        return deals, count
+    deal_service: DealService
+
+    async def handle(
+        self,
+        query: ExportDealsQuery,
+    ) -> AsyncIterator[DealEntity]:
+        # Права проверяются сразу, а строки читаются уже при отдаче ответа
+        return self.deal_service.stream_deals(_build_deal_filters(query))
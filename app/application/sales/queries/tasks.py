@@ -1,11 +1,16 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from dataclasses import dataclass
+from typing import ClassVar
 from uuid import UUID
 
 from application.base.query import (
     BaseQuery,
     BaseQueryHandler,
 )
+from application.base.unit_of_work import ANALYTICS_POOL
 from domain.organizations.value_objects.members import OrganizationMemberRole
 from domain.sales.entities import TaskEntity
 from domain.sales.exceptions.sales import (
@@ -34,6 +39,13 @@ class GetTasksQuery(BaseQuery):
     user_role: str
 
 
+@dataclass(frozen=True)
+class ExportTasksQuery(BaseQuery):
+    filters: TaskFilters
+    user_id: UUID
+    user_role: str
+
+
 @dataclass(frozen=True)
 class GetTaskByIdQueryHandler(
     BaseQueryHandler[GetTaskByIdQuery, TaskEntity],
@@ -96,8 +108,7 @@ class GetTasksQueryHandler(
             # В реальности лучше добавить фильтр по owner_id в TaskFilters через deal
             pass
 
-        tasks = await self.task_service.get_task_list(filters)
-        count = await self.task_service.get_task_count(filters)
+        tasks, count = await self.task_service.get_task_list_with_count(filters)
 
         # Фильтруем задачи по правам доступа для member
         if role == OrganizationMemberRole.MEMBER:
@@ -110,3 +121,25 @@ class GetTasksQueryHandler(
             count = len(filtered_tasks)
 
         return tasks, count
+
+
+@dataclass(frozen=True)
+class ExportTasksQueryHandler(
+    BaseQueryHandler[ExportTasksQuery, AsyncIterator[TaskEntity]],
+):
+    pool: ClassVar[str] = ANALYTICS_POOL
+
+    task_service: TaskService
+
+    async def handle(
+        self,
+        query: ExportTasksQuery,
+    ) -> AsyncIterator[TaskEntity]:
+        # Member видит задачи только своих сделок - фильтр по владельцу сделки в самом запросе
+        filters = query.filters
+        if OrganizationMemberRole(query.user_role) == OrganizationMemberRole.MEMBER:
+            filters = TaskFilters.model_validate(
+                {**filters.model_dump(), "deal_owner_id": query.user_id},
+            )
+
+        return self.task_service.stream_tasks(filters)
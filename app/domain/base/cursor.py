@@ -0,0 +1,88 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from domain.base.entity import BaseEntity
+from domain.base.exceptions import InvalidPageCursorException
+
+
+CursorValue = datetime | float | str
+
+
+def get_sort_value(entity: BaseEntity, sort_key: str) -> CursorValue:
+    value = getattr(entity, sort_key)
+    if hasattr(value, "as_generic_type"):
+        return value.as_generic_type()
+    return value
+
+
+def _matches_sort_key(sort_key: str, value: Any) -> bool:
+    """Значение курсора того же типа, что и колонка сортировки: иначе
+    запрос упал бы в базе на приведении типа."""
+    if sort_key.endswith("_at"):
+        return isinstance(value, datetime)
+    if sort_key == "amount":
+        return isinstance(value, int | float) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Позиция в списке для keyset-пагинации.
+
+    Хранит значение ключа сортировки и oid последней записи страницы:
+    следующая страница начинается строго после пары (value, oid), поэтому
+    вставки новых записей не сдвигают уже просмотренные.
+
+    """
+
+    sort_key: str
+    descending: bool
+    value: CursorValue
+    oid: UUID
+
+    @classmethod
+    def from_entity(cls, entity: BaseEntity, sort_key: str, descending: bool) -> "PageCursor":
+        return cls(
+            sort_key=sort_key,
+            descending=descending,
+            value=get_sort_value(entity, sort_key),
+            oid=entity.oid,
+        )
+
+    def encode(self) -> str:
+        if isinstance(self.value, datetime):
+            value: dict[str, Any] = {"dt": self.value.isoformat()}
+        else:
+            value = {"v": self.value}
+        payload = {"k": self.sort_key, "d": self.descending, "id": str(self.oid), **value}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str, sort_key: str, descending: bool) -> "PageCursor":
+        """Разбирает курсор и проверяет, что он выдан для той же сортировки."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            value = datetime.fromisoformat(payload["dt"]) if "dt" in payload else payload["v"]
+            cursor = cls(
+                sort_key=payload["k"],
+                descending=payload["d"],
+                value=value,
+                oid=UUID(payload["id"]),
+            )
+        except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+            raise InvalidPageCursorException(cursor=token) from exc
+
+        if (
+            cursor.sort_key != sort_key
+            or cursor.descending != descending
+            or not _matches_sort_key(sort_key, cursor.value)
+        ):
+            raise InvalidPageCursorException(cursor=token)
+        return cursor
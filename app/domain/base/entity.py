@@ -9,12 +9,27 @@ from uuid import (
     uuid4,
 )
 
+from domain.base.events import (
+    BaseEvent,
+    record_event,
+)
+
 
 @dataclass
 class BaseEntity(ABC):
     oid: UUID = field(default_factory=uuid4, kw_only=True)
     created_at: datetime = field(default_factory=datetime.now, kw_only=True)
     updated_at: datetime = field(default_factory=datetime.now, kw_only=True)
+    _events: list[BaseEvent] = field(default_factory=list, init=False, repr=False, compare=False, kw_only=True)
+
+    @property
+    def events(self) -> list[BaseEvent]:
+        return list(self._events)
+
+    def register_event(self, event: BaseEvent) -> None:
+        """Запоминает событие сущности и передает его открытому unit of work."""
+        self._events.append(event)
+        record_event(event)
 
     def __hash__(self) -> int:
         return hash(self.oid)
@@ -0,0 +1,68 @@
+from abc import ABC
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import datetime
+from typing import ClassVar
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class BaseEvent(ABC):
+    """Доменное событие: факт, который уже произошел.
+
+    Поля событий - примитивы, UUID и datetime, чтобы событие можно было
+    сохранить в outbox и восстановить по имени типа.
+
+    """
+
+    event_id: UUID = field(default_factory=uuid4)
+    occurred_at: datetime = field(default_factory=datetime.now)
+
+    # Типы событий по имени - для восстановления из outbox
+    registry: ClassVar[dict[str, type["BaseEvent"]]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.registry[cls.__name__] = cls
+
+    @classmethod
+    def get_event_type(cls) -> str:
+        return cls.__name__
+
+
+# События, зарегистрированные сущностями в текущем контексте (запросе)
+_collected_events: ContextVar[list[BaseEvent] | None] = ContextVar("collected_events", default=None)
+
+
+@contextmanager
+def collect_events() -> Iterator[list[BaseEvent]]:
+    """Собирает события, которые сущности регистрируют внутри блока.
+
+    Вложенный сборщик при успешном выходе передает свои события внешнему,
+    при ошибке они отбрасываются вместе с изменениями.
+
+    """
+    events: list[BaseEvent] = []
+    token = _collected_events.set(events)
+    try:
+        yield events
+    finally:
+        _collected_events.reset(token)
+
+    outer = _collected_events.get()
+    if outer is not None:
+        outer.extend(events)
+
+
+def record_event(event: BaseEvent) -> None:
+    collected = _collected_events.get()
+    if collected is not None:
+        collected.append(event)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from uuid import UUID
 
 
 @dataclass(eq=False)
@@ -13,3 +14,37 @@ class DomainException(ApplicationException):
     @property
     def message(self) -> str:
         return "Domain exception occurred"
+
+
+@dataclass(eq=False)
+class InvalidPageCursorException(DomainException):
+    cursor: str
+
+    @property
+    def message(self) -> str:
+        return f"Invalid pagination cursor: {self.cursor}"
+
+
+@dataclass(eq=False)
+class ConcurrentUpdateException(DomainException):
+    resource_type: str
+    resource_id: UUID
+
+    @property
+    def message(self) -> str:
+        return f"{self.resource_type} {self.resource_id} was modified or deleted by another request"
+
+
+@dataclass(eq=False)
+class VersionMismatchException(DomainException):
+    resource_type: str
+    resource_id: UUID
+    expected_version: int
+    actual_version: int
+
+    @property
+    def message(self) -> str:
+        return (
+            f"{self.resource_type} {self.resource_id} is at version {self.actual_version}, "
+            f"expected {self.expected_version}"
+        )
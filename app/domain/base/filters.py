@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -17,15 +18,46 @@ class BaseFilters(BaseModel):
     page: int = 1
     page_size: int = 20
 
+    # Keyset-пагинация: непрозрачный курсор вместо номера страницы
+    cursor: str | None = None
+
+    # Оценка total по статистике планировщика вместо точного count
+    estimate_total: bool = False
+
+    @property
+    def sort_key(self) -> str:
+        return "created_at"
+
+    @property
+    def sort_descending(self) -> bool:
+        return True
+
+    @property
+    def is_ranked(self) -> bool:
+        # Сортировка по релевантности поиска вместо ключа сортировки
+        return False
+
 
 class BaseOrganizationFilters(BaseFilters):
     # Multi-tenant фильтр (обязателен для всех запросов)
     organization_id: UUID | None = None
 
 
+class SearchMode(str, Enum):
+    # Поиск подстроки (ILIKE '%...%')
+    CONTAINS = "contains"
+    # Нечеткий поиск по триграммам с сортировкой по релевантности
+    SIMILARITY = "similarity"
+
+
 class BaseSearchFilters(BaseFilters):
     # Общий поиск по текстовым полям
     search: str | None = None
+    search_mode: SearchMode = SearchMode.CONTAINS
+
+    @property
+    def is_ranked(self) -> bool:
+        return bool(self.search) and self.search_mode == SearchMode.SIMILARITY
 
 
 class BaseOrganizationSearchFilters(BaseOrganizationFilters, BaseSearchFilters):
@@ -0,0 +1,57 @@
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Mapping,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+
+@dataclass(frozen=True)
+class ImportRow:
+    """Строка входного файла импорта.
+
+    number - порядковый номер записи в файле (без заголовка), error -
+    ошибка разбора, если запись не удалось прочитать.
+
+    """
+
+    number: int
+    data: Mapping[str, str | None]
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class ImportRowError:
+    row: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """Итог импорта. Ошибки хранятся не более max_errors штук, чтобы отчет
+    по большому файлу не рос вместе с ним; failed считает все."""
+
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    max_errors: int = 1000
+
+    def add_error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(ImportRowError(row=row, message=message))
+
+
+async def batched(rows: AsyncIterable[ImportRow], size: int) -> AsyncIterator[list[ImportRow]]:
+    batch: list[ImportRow] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,10 @@
+from domain.sales.aggregates.analytics import (
+    DealStageAggregate,
+    DealStatusAggregate,
+)
+
+
+__all__ = [
+    "DealStageAggregate",
+    "DealStatusAggregate",
+]
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from domain.sales.value_objects.deals import (
+    DealStage,
+    DealStatus,
+)
+
+
+@dataclass(frozen=True)
+class DealStatusAggregate:
+    status: DealStatus
+    count: int = 0
+    amount: float = 0.0
+
+
+@dataclass(frozen=True)
+class DealStageAggregate:
+    stage: DealStage
+    count: int = 0
+    amount: float = 0.0
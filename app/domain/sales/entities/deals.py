@@ -1,7 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    field,
+)
 from uuid import UUID
 
 from domain.base.entity import BaseEntity
+from domain.sales.events.deals import (
+    DealStageChangedEvent,
+    DealStatusChangedEvent,
+)
 from domain.sales.value_objects.deals import (
     CurrencyValueObject,
     DealAmountValueObject,
@@ -21,3 +28,30 @@ class DealEntity(BaseEntity):
     currency: CurrencyValueObject
     status: DealStatusValueObject
     stage: DealStageValueObject
+    version: int = field(default=1, kw_only=True)
+
+    def change_status(self, status: DealStatusValueObject) -> None:
+        old_status = self.status.as_generic_type()
+        self.status = status
+        if status.as_generic_type() != old_status:
+            self.register_event(
+                DealStatusChangedEvent(
+                    deal_id=self.oid,
+                    organization_id=self.organization_id,
+                    old_status=old_status.value,
+                    new_status=status.as_generic_type().value,
+                ),
+            )
+
+    def change_stage(self, stage: DealStageValueObject) -> None:
+        old_stage = self.stage.as_generic_type()
+        self.stage = stage
+        if stage.as_generic_type() != old_stage:
+            self.register_event(
+                DealStageChangedEvent(
+                    deal_id=self.oid,
+                    organization_id=self.organization_id,
+                    old_stage=old_stage.value,
+                    new_stage=stage.as_generic_type().value,
+                ),
+            )
@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import (
+    dataclass,
+    field,
+)
 from uuid import UUID
 
 from domain.base.entity import BaseEntity
@@ -16,3 +19,4 @@ class TaskEntity(BaseEntity):
     description: TaskDescriptionValueObject
     due_date: TaskDueDateValueObject
     is_done: bool = False
+    version: int = field(default=1, kw_only=True)
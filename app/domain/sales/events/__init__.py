@@ -0,0 +1,10 @@
+from .deals import (
+    DealStageChangedEvent,
+    DealStatusChangedEvent,
+)
+
+
+__all__ = (
+    "DealStageChangedEvent",
+    "DealStatusChangedEvent",
+)
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from domain.base.events import BaseEvent
+
+
+@dataclass(frozen=True, kw_only=True)
+class DealStatusChangedEvent(BaseEvent):
+    deal_id: UUID
+    organization_id: UUID
+    old_status: str
+    new_status: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class DealStageChangedEvent(BaseEvent):
+    deal_id: UUID
+    organization_id: UUID
+    old_stage: str
+    new_stage: str
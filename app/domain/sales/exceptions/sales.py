@@ -204,6 +204,26 @@ class ResourceNotFoundInOrganizationException(SalesException):
         return f"{self.resource_type} {self.resource_id} not found in organization {self.organization_id}"
 
 
+@dataclass(eq=False)
+class InvalidImportFieldException(SalesException):
+    field: str
+    value: str | None
+
+    @property
+    def message(self) -> str:
+        return f"Invalid value for {self.field}: {self.value!r}"
+
+
+@dataclass(eq=False)
+class ImportRecordAlreadyExistsException(SalesException):
+    resource_type: str
+    resource_id: UUID
+
+    @property
+    def message(self) -> str:
+        return f"{self.resource_type} {self.resource_id} already exists"
+
+
 # Task exceptions
 @dataclass(eq=False)
 class EmptyTaskTitleException(SalesException):
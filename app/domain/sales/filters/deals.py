@@ -8,6 +8,9 @@ from domain.sales.value_objects.deals import (
 )
 
 
+DEAL_SORT_KEYS = ("created_at", "amount", "updated_at")
+
+
 class DealFilters(BaseOrganizationSearchFilters):
     # Фильтр по связанным сущностям
     contact_id: UUID | None = None
@@ -31,3 +34,11 @@ class DealFilters(BaseOrganizationSearchFilters):
     # Сортировка
     order_by: str | None = None  # created_at, amount, updated_at
     order: str = "desc"  # asc, desc
+
+    @property
+    def sort_key(self) -> str:
+        return self.order_by if self.order_by in DEAL_SORT_KEYS else "created_at"
+
+    @property
+    def sort_descending(self) -> bool:
+        return self.order == "desc"
@@ -8,6 +8,9 @@ class TaskFilters(BaseOrganizationSearchFilters):
     # Фильтр по сделке
     deal_id: UUID | None = None
 
+    # Фильтр по владельцу сделки (видимость задач для member)
+    deal_owner_id: UUID | None = None
+
     # Фильтр по статусу выполнения
     only_open: bool | None = None  # только is_done=false
 
@@ -0,0 +1,20 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import Sequence
+
+from domain.sales.entities import ActivityEntity
+
+
+class BaseActivityJournal(ABC):
+    """Журнал системных активностей сделки.
+
+    Реализация может записать активности не сразу, а после фиксации
+    текущего unit of work.
+
+    """
+
+    @abstractmethod
+    async def record(self, activities: Sequence[ActivityEntity]) -> None:
+        """Поставить активности на запись."""
@@ -2,6 +2,7 @@ from abc import (
     ABC,
     abstractmethod,
 )
+from collections.abc import Sequence
 from uuid import UUID
 
 from domain.sales.entities import ActivityEntity
@@ -11,6 +12,9 @@ class BaseActivityRepository(ABC):
     @abstractmethod
     async def add(self, activity: ActivityEntity) -> None: ...
 
+    @abstractmethod
+    async def add_many(self, activities: Sequence[ActivityEntity]) -> None: ...
+
     @abstractmethod
     async def get_by_id(self, activity_id: UUID) -> ActivityEntity | None: ...
 
@@ -2,7 +2,11 @@ from abc import (
     ABC,
     abstractmethod,
 )
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Sequence,
+)
 from uuid import UUID
 
 from domain.sales.entities import ContactEntity
@@ -13,9 +17,15 @@ class BaseContactRepository(ABC):
     @abstractmethod
     async def add(self, contact: ContactEntity) -> None: ...
 
+    @abstractmethod
+    async def add_many(self, contacts: Sequence[ContactEntity]) -> set[UUID]: ...
+
     @abstractmethod
     async def get_by_id(self, contact_id: UUID) -> ContactEntity | None: ...
 
+    @abstractmethod
+    async def get_existing_ids(self, organization_id: UUID, contact_ids: Iterable[UUID]) -> set[UUID]: ...
+
     @abstractmethod
     async def delete(self, contact_id: UUID) -> None: ...
 
@@ -30,3 +40,12 @@ class BaseContactRepository(ABC):
         self,
         filters: ContactFilters,
     ) -> int: ...
+
+    @abstractmethod
+    async def get_list_with_count(
+        self,
+        filters: ContactFilters,
+    ) -> tuple[list[ContactEntity], int]: ...
+
+    @abstractmethod
+    def stream(self, filters: ContactFilters) -> AsyncIterator[ContactEntity]: ...
@@ -2,24 +2,49 @@ from abc import (
     ABC,
     abstractmethod,
 )
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Sequence,
+)
 from uuid import UUID
 
+from domain.sales.aggregates import (
+    DealStageAggregate,
+    DealStatusAggregate,
+)
 from domain.sales.entities import DealEntity
 from domain.sales.filters import DealFilters
-from domain.sales.value_objects.deals import DealStatus
+from domain.sales.value_objects.deals import (
+    DealStage,
+    DealStatus,
+)
 
 
 class BaseDealRepository(ABC):
     @abstractmethod
     async def add(self, deal: DealEntity) -> None: ...
 
+    @abstractmethod
+    async def add_many(self, deals: Sequence[DealEntity]) -> set[UUID]: ...
+
     @abstractmethod
     async def get_by_id(self, deal_id: UUID) -> DealEntity | None: ...
 
+    @abstractmethod
+    async def get_by_ids(self, deal_ids: Sequence[UUID]) -> list[DealEntity]: ...
+
     @abstractmethod
     async def update(self, deal: DealEntity) -> None: ...
 
+    @abstractmethod
+    async def update_many(
+        self,
+        deals: Sequence[DealEntity],
+        status: DealStatus | None = None,
+        stage: DealStage | None = None,
+    ) -> None: ...
+
     @abstractmethod
     async def get_by_contact_id(self, contact_id: UUID) -> list[DealEntity]: ...
 
@@ -35,6 +60,15 @@ class BaseDealRepository(ABC):
         filters: DealFilters,
     ) -> int: ...
 
+    @abstractmethod
+    async def get_list_with_count(
+        self,
+        filters: DealFilters,
+    ) -> tuple[list[DealEntity], int]: ...
+
+    @abstractmethod
+    def stream(self, filters: DealFilters) -> AsyncIterator[DealEntity]: ...
+
     @abstractmethod
     async def get_total_amount(
         self,
@@ -42,3 +76,15 @@ class BaseDealRepository(ABC):
         status: DealStatus,
         user_id: UUID | None = None,
     ) -> float: ...
+
+    @abstractmethod
+    async def get_status_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStatus, DealStatusAggregate]: ...
+
+    @abstractmethod
+    async def get_stage_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStage, DealStageAggregate]: ...
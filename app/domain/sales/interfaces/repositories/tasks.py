@@ -2,7 +2,10 @@ from abc import (
     ABC,
     abstractmethod,
 )
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from uuid import UUID
 
 from domain.sales.entities import TaskEntity
@@ -30,3 +33,12 @@ class BaseTaskRepository(ABC):
         self,
         filters: TaskFilters,
     ) -> int: ...
+
+    @abstractmethod
+    async def get_list_with_count(
+        self,
+        filters: TaskFilters,
+    ) -> tuple[list[TaskEntity], int]: ...
+
+    @abstractmethod
+    def stream(self, filters: TaskFilters) -> AsyncIterator[TaskEntity]: ...
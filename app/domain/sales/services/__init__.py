@@ -1,6 +1,7 @@
 from .activities import ActivityService
 from .contacts import ContactService
 from .deals import DealService
+from .imports import SalesImportService
 from .tasks import TaskService
 
 
@@ -8,5 +9,6 @@ __all__ = (
     "ActivityService",
     "ContactService",
     "DealService",
+    "SalesImportService",
     "TaskService",
 )
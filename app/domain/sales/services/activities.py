@@ -1,8 +1,10 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
 
 from domain.sales.entities import ActivityEntity
+from domain.sales.interfaces.activity_journal import BaseActivityJournal
 from domain.sales.interfaces.repositories import BaseActivityRepository
 from domain.sales.value_objects.activities import (
     ActivityPayloadValueObject,
@@ -14,30 +16,29 @@ from domain.sales.value_objects.activities import (
 @dataclass
 class ActivityService:
     activity_repository: BaseActivityRepository
+    activity_journal: BaseActivityJournal
 
-    async def create_activity(
+    def build_activity(
         self,
         deal_id: UUID,
         activity_type: str,
         payload: dict[str, Any],
         author_user_id: UUID | None = None,
     ) -> ActivityEntity:
-        activity = ActivityEntity(
+        return ActivityEntity(
             deal_id=deal_id,
             author_user_id=author_user_id,
             type=ActivityTypeValueObject(activity_type),
             payload=ActivityPayloadValueObject(payload),
         )
-        await self.activity_repository.add(activity)
-        return activity
 
-    async def create_status_changed_activity(
+    def build_status_changed_activity(
         self,
         deal_id: UUID,
         old_status: str,
         new_status: str,
     ) -> ActivityEntity:
-        return await self.create_activity(
+        return self.build_activity(
             deal_id=deal_id,
             activity_type=ActivityType.STATUS_CHANGED.value,
             payload={
@@ -47,13 +48,13 @@ class ActivityService:
             author_user_id=None,
         )
 
-    async def create_stage_changed_activity(
+    def build_stage_changed_activity(
         self,
         deal_id: UUID,
         old_stage: str,
         new_stage: str,
     ) -> ActivityEntity:
-        return await self.create_activity(
+        return self.build_activity(
             deal_id=deal_id,
             activity_type=ActivityType.STAGE_CHANGED.value,
             payload={
@@ -63,6 +64,68 @@ class ActivityService:
             author_user_id=None,
         )
 
+    async def create_activity(
+        self,
+        deal_id: UUID,
+        activity_type: str,
+        payload: dict[str, Any],
+        author_user_id: UUID | None = None,
+    ) -> ActivityEntity:
+        activity = self.build_activity(
+            deal_id=deal_id,
+            activity_type=activity_type,
+            payload=payload,
+            author_user_id=author_user_id,
+        )
+        await self.activity_repository.add(activity)
+        return activity
+
+    async def create_activities(
+        self,
+        activities: Sequence[ActivityEntity],
+    ) -> None:
+        """Передает набор системных активностей в журнал: они пишутся
+        многострочной вставкой после фиксации команды."""
+        if activities:
+            await self.activity_journal.record(activities)
+
+    async def save_activities(
+        self,
+        activities: Sequence[ActivityEntity],
+    ) -> None:
+        """Пишет набор активностей сразу, в текущем unit of work, минуя
+        журнал: ошибка записи откатывает его и достается вызывающему коду."""
+        if activities:
+            await self.activity_repository.add_many(activities)
+
+    async def create_status_changed_activity(
+        self,
+        deal_id: UUID,
+        old_status: str,
+        new_status: str,
+    ) -> ActivityEntity:
+        activity = self.build_status_changed_activity(
+            deal_id=deal_id,
+            old_status=old_status,
+            new_status=new_status,
+        )
+        await self.activity_journal.record([activity])
+        return activity
+
+    async def create_stage_changed_activity(
+        self,
+        deal_id: UUID,
+        old_stage: str,
+        new_stage: str,
+    ) -> ActivityEntity:
+        activity = self.build_stage_changed_activity(
+            deal_id=deal_id,
+            old_stage=old_stage,
+            new_stage=new_stage,
+        )
+        await self.activity_journal.record([activity])
+        return activity
+
     async def create_task_created_activity(
         self,
         deal_id: UUID,
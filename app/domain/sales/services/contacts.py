@@ -1,4 +1,7 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -75,3 +78,15 @@ class ContactService:
         filters: ContactFilters,
     ) -> int:
         return await self.contact_repository.get_count(filters)
+
+    async def get_contact_list_with_count(
+        self,
+        filters: ContactFilters,
+    ) -> tuple[list[ContactEntity], int]:
+        return await self.contact_repository.get_list_with_count(filters)
+
+    def stream_contacts(
+        self,
+        filters: ContactFilters,
+    ) -> AsyncIterator[ContactEntity]:
+        return self.contact_repository.stream(filters)
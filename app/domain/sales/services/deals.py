@@ -1,11 +1,20 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Sequence,
+)
 from dataclasses import dataclass
 from uuid import UUID
 
+from domain.sales.aggregates import (
+    DealStageAggregate,
+    DealStatusAggregate,
+)
 from domain.sales.entities import DealEntity
 from domain.sales.exceptions.sales import (
     CannotCloseDealWithZeroAmountException,
     DealNotFoundException,
+    DealStageRollbackNotAllowedException,
 )
 from domain.sales.filters import DealFilters
 from domain.sales.interfaces.repositories import BaseDealRepository
@@ -55,6 +64,17 @@ class DealService:
             raise DealNotFoundException(deal_id=deal_id)
         return deal
 
+    async def get_deals_by_ids(
+        self,
+        deal_ids: Sequence[UUID],
+    ) -> list[DealEntity]:
+        """Загружает набор сделок одним запросом в порядке deal_ids."""
+        deals = {deal.oid: deal for deal in await self.deal_repository.get_by_ids(deal_ids)}
+        for deal_id in deal_ids:
+            if deal_id not in deals:
+                raise DealNotFoundException(deal_id=deal_id)
+        return [deals[deal_id] for deal_id in deal_ids]
+
     async def update_deal_status(
         self,
         deal_id: UUID,
@@ -69,10 +89,25 @@ class DealService:
             if deal.amount.as_generic_type() <= 0:
                 raise CannotCloseDealWithZeroAmountException(deal_id=deal_id)
 
-        deal.status = new_status_vo
+        deal.change_status(new_status_vo)
         await self.deal_repository.update(deal)
         return deal, old_status
 
+    def ensure_stage_change_allowed(
+        self,
+        deal: DealEntity,
+        new_stage: DealStage,
+        can_rollback: bool,
+    ) -> None:
+        """Запрещает переводить сделку на более раннюю стадию без права отката."""
+        old_stage = deal.stage.as_generic_type()
+        if not can_rollback and old_stage.is_rollback_to(new_stage):
+            raise DealStageRollbackNotAllowedException(
+                deal_id=deal.oid,
+                current_stage=old_stage.value,
+                new_stage=new_stage.value,
+            )
+
     async def update_deal_stage(
         self,
         deal_id: UUID,
@@ -82,10 +117,55 @@ class DealService:
         old_stage = deal.stage.as_generic_type()
         new_stage_vo = DealStageValueObject(new_stage)
 
-        deal.stage = new_stage_vo
+        deal.change_stage(new_stage_vo)
         await self.deal_repository.update(deal)
         return deal, old_stage
 
+    async def update_deals(
+        self,
+        deals: Sequence[DealEntity],
+        new_status: str | None = None,
+        new_stage: str | None = None,
+    ) -> list[tuple[DealEntity, DealStatus, DealStage]]:
+        """Переводит набор сделок в один статус и/или стадию.
+
+        Правила проверяются для всего набора до записи, поэтому при ошибке
+        ни одна сделка не меняется. Сделки, которые уже в целевом состоянии,
+        не обновляются. Возвращает измененные сделки с их прежними статусом
+        и стадией.
+
+        """
+        new_status_vo = DealStatusValueObject(new_status) if new_status is not None else None
+        new_stage_vo = DealStageValueObject(new_stage) if new_stage is not None else None
+
+        changed: list[tuple[DealEntity, DealStatus, DealStage]] = []
+        for deal in deals:
+            old_status = deal.status.as_generic_type()
+            old_stage = deal.stage.as_generic_type()
+            status_changed = new_status_vo is not None and new_status_vo.as_generic_type() != old_status
+            stage_changed = new_stage_vo is not None and new_stage_vo.as_generic_type() != old_stage
+            if not status_changed and not stage_changed:
+                continue
+            if status_changed and new_status_vo.as_generic_type() == DealStatus.WON:
+                if deal.amount.as_generic_type() <= 0:
+                    raise CannotCloseDealWithZeroAmountException(deal_id=deal.oid)
+            changed.append((deal, old_status, old_stage))
+
+        if not changed:
+            return changed
+
+        for deal, *_ in changed:
+            if new_status_vo is not None:
+                deal.change_status(new_status_vo)
+            if new_stage_vo is not None:
+                deal.change_stage(new_stage_vo)
+        await self.deal_repository.update_many(
+            deals=[deal for deal, *_ in changed],
+            status=new_status_vo.as_generic_type() if new_status_vo is not None else None,
+            stage=new_stage_vo.as_generic_type() if new_stage_vo is not None else None,
+        )
+        return changed
+
     async def get_deal_list(
         self,
         filters: DealFilters,
@@ -98,6 +178,18 @@ class DealService:
     ) -> int:
         return await self.deal_repository.get_count(filters)
 
+    async def get_deal_list_with_count(
+        self,
+        filters: DealFilters,
+    ) -> tuple[list[DealEntity], int]:
+        return await self.deal_repository.get_list_with_count(filters)
+
+    def stream_deals(
+        self,
+        filters: DealFilters,
+    ) -> AsyncIterator[DealEntity]:
+        return self.deal_repository.stream(filters)
+
     async def get_total_amount(
         self,
         organization_id: UUID,
@@ -109,3 +201,15 @@ class DealService:
             status=status,
             user_id=user_id,
         )
+
+    async def get_status_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStatus, DealStatusAggregate]:
+        return await self.deal_repository.get_status_aggregates(filters)
+
+    async def get_stage_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStage, DealStageAggregate]:
+        return await self.deal_repository.get_stage_aggregates(filters)
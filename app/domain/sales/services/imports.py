@@ -0,0 +1,200 @@
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from dataclasses import dataclass
+from typing import TypeVar
+from uuid import UUID
+
+from domain.base.entity import BaseEntity
+from domain.base.exceptions import DomainException
+from domain.base.imports import (
+    ImportReport,
+    ImportRow,
+)
+from domain.sales.entities import (
+    ContactEntity,
+    DealEntity,
+)
+from domain.sales.exceptions.sales import (
+    CannotCloseDealWithZeroAmountException,
+    ImportRecordAlreadyExistsException,
+    InvalidImportFieldException,
+    ResourceNotFoundInOrganizationException,
+)
+from domain.sales.interfaces.repositories import (
+    BaseContactRepository,
+    BaseDealRepository,
+)
+from domain.sales.value_objects.contacts import (
+    ContactEmailValueObject,
+    ContactNameValueObject,
+    ContactPhoneValueObject,
+)
+from domain.sales.value_objects.deals import (
+    CurrencyValueObject,
+    DealAmountValueObject,
+    DealStage,
+    DealStageValueObject,
+    DealStatus,
+    DealStatusValueObject,
+    DealTitleValueObject,
+)
+
+
+EntityType = TypeVar("EntityType", bound=BaseEntity)
+
+
+def _value(row: ImportRow, name: str) -> str | None:
+    value = row.data.get(name)
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
+
+
+def _uuid(row: ImportRow, name: str) -> UUID | None:
+    value = _value(row, name)
+    if value is None:
+        return None
+    try:
+        return UUID(value)
+    except ValueError:
+        raise InvalidImportFieldException(field=name, value=value)
+
+
+def _amount(row: ImportRow) -> float:
+    value = _value(row, "amount")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise InvalidImportFieldException(field="amount", value=value)
+
+
+@dataclass
+class SalesImportService:
+    """Пакетный импорт контактов и сделок.
+
+    Методы обрабатывают одну пачку строк: каждая проверяется теми же value
+    objects, что и при создании через API, ошибочные попадают в отчет, а
+    остальные записываются одним INSERT. Итоги пачек копятся в общем отчете.
+
+    """
+
+    contact_repository: BaseContactRepository
+    deal_repository: BaseDealRepository
+
+    async def import_contacts(
+        self,
+        organization_id: UUID,
+        owner_user_id: UUID,
+        batch: list[ImportRow],
+        report: ImportReport,
+    ) -> None:
+        contacts: dict[int, ContactEntity] = {}
+        for row in batch:
+            report.processed += 1
+            if row.error:
+                report.add_error(row.number, row.error)
+                continue
+            try:
+                contact = ContactEntity(
+                    organization_id=organization_id,
+                    owner_user_id=owner_user_id,
+                    name=ContactNameValueObject(_value(row, "name")),
+                    email=ContactEmailValueObject(_value(row, "email")),
+                    phone=ContactPhoneValueObject(_value(row, "phone")),
+                )
+                oid = _uuid(row, "id")
+                if oid:
+                    contact.oid = oid
+            except DomainException as exc:
+                report.add_error(row.number, exc.message)
+                continue
+            contacts[row.number] = contact
+
+        await self._write(contacts, self.contact_repository.add_many, "Contact", report)
+
+    async def import_deals(
+        self,
+        organization_id: UUID,
+        owner_user_id: UUID,
+        batch: list[ImportRow],
+        report: ImportReport,
+    ) -> None:
+        deals: dict[int, DealEntity] = {}
+        for row in batch:
+            report.processed += 1
+            if row.error:
+                report.add_error(row.number, row.error)
+                continue
+            try:
+                deals[row.number] = self._build_deal(organization_id, owner_user_id, row)
+            except DomainException as exc:
+                report.add_error(row.number, exc.message)
+
+        # Контакты пачки проверяются одним запросом
+        existing = await self.contact_repository.get_existing_ids(
+            organization_id,
+            {deal.contact_id for deal in deals.values()},
+        )
+        for number, deal in list(deals.items()):
+            if deal.contact_id not in existing:
+                error = ResourceNotFoundInOrganizationException(
+                    resource_type="Contact",
+                    resource_id=deal.contact_id,
+                    organization_id=organization_id,
+                )
+                report.add_error(number, error.message)
+                del deals[number]
+
+        await self._write(deals, self.deal_repository.add_many, "Deal", report)
+
+    def _build_deal(self, organization_id: UUID, owner_user_id: UUID, row: ImportRow) -> DealEntity:
+        contact_id = _uuid(row, "contact_id")
+        if contact_id is None:
+            raise InvalidImportFieldException(field="contact_id", value=None)
+
+        deal = DealEntity(
+            organization_id=organization_id,
+            contact_id=contact_id,
+            owner_user_id=owner_user_id,
+            title=DealTitleValueObject(_value(row, "title")),
+            amount=DealAmountValueObject(_amount(row)),
+            currency=CurrencyValueObject(_value(row, "currency")),
+            status=DealStatusValueObject(_value(row, "status") or DealStatus.NEW.value),
+            stage=DealStageValueObject(_value(row, "stage") or DealStage.QUALIFICATION.value),
+        )
+        oid = _uuid(row, "id")
+        if oid:
+            deal.oid = oid
+
+        if deal.status.as_generic_type() == DealStatus.WON and deal.amount.as_generic_type() <= 0:
+            raise CannotCloseDealWithZeroAmountException(deal_id=deal.oid)
+        return deal
+
+    async def _write(
+        self,
+        entities: dict[int, EntityType],
+        add_many: Callable[[list[EntityType]], Awaitable[set[UUID]]],
+        resource_type: str,
+        report: ImportReport,
+    ) -> None:
+        unique: dict[UUID, int] = {}
+        for number, entity in entities.items():
+            if entity.oid in unique:
+                error = ImportRecordAlreadyExistsException(resource_type=resource_type, resource_id=entity.oid)
+                report.add_error(number, error.message)
+            else:
+                unique[entity.oid] = number
+        if not unique:
+            return
+
+        # Записи с уже существующим id пропускаются (ON CONFLICT DO NOTHING),
+        # поэтому повторный импорт того же файла безопасен
+        inserted = await add_many([entities[number] for number in unique.values()])
+        report.imported += len(inserted)
+        for oid, number in unique.items():
+            if oid not in inserted:
+                error = ImportRecordAlreadyExistsException(resource_type=resource_type, resource_id=oid)
+                report.add_error(number, error.message)
@@ -1,4 +1,7 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from dataclasses import dataclass
 from datetime import date
 from uuid import UUID
@@ -100,3 +103,15 @@ class TaskService:
         filters: TaskFilters,
     ) -> int:
         return await self.task_repository.get_count(filters)
+
+    async def get_task_list_with_count(
+        self,
+        filters: TaskFilters,
+    ) -> tuple[list[TaskEntity], int]:
+        return await self.task_repository.get_list_with_count(filters)
+
+    def stream_tasks(
+        self,
+        filters: TaskFilters,
+    ) -> AsyncIterator[TaskEntity]:
+        return self.task_repository.stream(filters)
@@ -22,11 +22,16 @@ class DealStatus(str, Enum):
 
 
 class DealStage(str, Enum):
+    # Стадии объявлены в порядке прохождения воронки
     QUALIFICATION = "qualification"
     PROPOSAL = "proposal"
     NEGOTIATION = "negotiation"
     CLOSED = "closed"
 
+    def is_rollback_to(self, new_stage: "DealStage") -> bool:
+        stages = list(DealStage)
+        return stages.index(self) > stages.index(new_stage)
+
 
 @dataclass(frozen=True)
 class DealTitleValueObject(BaseValueObject):
@@ -0,0 +1,16 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+
+
+class BasePasswordHasher(ABC):
+    """Интерфейс хеширования паролей."""
+
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        """Получить хеш пароля."""
+
+    @abstractmethod
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Проверить пароль по хешу."""
@@ -2,8 +2,6 @@ import re
 from dataclasses import dataclass
 from uuid import UUID
 
-import bcrypt
-
 from domain.users.entities import UserEntity
 from domain.users.exceptions import (
     EmptyPasswordException,
@@ -13,6 +11,7 @@ from domain.users.exceptions import (
     UserAlreadyExistsException,
     UserNotFoundException,
 )
+from domain.users.interfaces.password_hasher import BasePasswordHasher
 from domain.users.interfaces.repositories.users import BaseUserRepository
 from domain.users.value_objects import (
     EmailValueObject,
@@ -26,6 +25,7 @@ MIN_PASSWORD_LENGTH = 8
 @dataclass
 class UserService:
     user_repository: BaseUserRepository
+    password_hasher: BasePasswordHasher
 
     def _validate_password(self, password: str) -> None:
         if not password:
@@ -58,10 +58,7 @@ class UserService:
 
         self._validate_password(password)
 
-        hashed_password = bcrypt.hashpw(
-            password.encode("utf-8"),
-            bcrypt.gensalt(rounds=8),
-        ).decode("utf-8")
+        hashed_password = await self.password_hasher.hash(password)
 
         user = UserEntity(
             email=EmailValueObject(email),
@@ -92,10 +89,7 @@ class UserService:
         user = await self.user_repository.get_by_email(email)
 
         if user:
-            password_valid = bcrypt.checkpw(
-                password.encode("utf-8"),
-                user.hashed_password.encode("utf-8"),
-            )
+            password_valid = await self.password_hasher.verify(password, user.hashed_password)
 
         if not user or not password_valid:
             raise InvalidCredentialsException()
@@ -0,0 +1,12 @@
+from infrastructure.cache.memory import (
+    CacheMetrics,
+    TTLCache,
+)
+from infrastructure.cache.query import InMemoryQueryCache
+
+
+__all__ = (
+    "CacheMetrics",
+    "InMemoryQueryCache",
+    "TTLCache",
+)
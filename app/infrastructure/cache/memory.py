@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Hashable,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Generic,
+    TypeVar,
+)
+
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class TTLCache(Generic[KeyType, ValueType]):
+    """In-process кэш с временем жизни записей (TTL) и ограничением размера:
+    при переполнении вытесняется давно не использованная запись (LRU)."""
+
+    ttl: float
+    max_size: int
+    clock: Callable[[], float] = field(default=time.monotonic, kw_only=True)
+    metrics: CacheMetrics = field(default_factory=CacheMetrics, kw_only=True)
+    _entries: OrderedDict[KeyType, tuple[float, ValueType]] = field(
+        default_factory=OrderedDict,
+        init=False,
+    )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyType) -> ValueType | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self.metrics.hits += 1
+                return value
+            del self._entries[key]
+
+        self.metrics.misses += 1
+        return None
+
+    def set(self, key: KeyType, value: ValueType, ttl: float | None = None) -> None:
+        self._entries[key] = (self.clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def invalidate(self, key: KeyType) -> None:
+        if self._entries.pop(key, None) is not None:
+            self.metrics.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
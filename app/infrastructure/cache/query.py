@@ -0,0 +1,58 @@
+import itertools
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+from infrastructure.cache.memory import TTLCache
+
+from application.base.cache import (
+    BaseQueryCache,
+    CachedQueryResult,
+)
+
+
+@dataclass
+class InMemoryQueryCache(BaseQueryCache):
+    """Кэш результатов запросов в памяти процесса: LRU с TTL на запись.
+
+    Версии тегов берутся из общего возрастающего счетчика. Чтобы словарь
+    версий не рос без предела, при переполнении давно не менявшиеся теги
+    забываются, а их версией становится наибольшая из забытых: так версия
+    тега никогда не уменьшается, и забытый тег в худшем случае дает промах.
+
+    """
+
+    max_size: int = 10_000
+    max_tags: int = 100_000
+    entries: TTLCache[str, CachedQueryResult] = field(init=False)
+    _tag_versions: dict[str, int] = field(default_factory=dict, init=False)
+    _forgotten_version: int = field(default=0, init=False)
+    _counter: itertools.count = field(default_factory=lambda: itertools.count(1), init=False)
+
+    def __post_init__(self) -> None:
+        self.entries = TTLCache(ttl=0.0, max_size=self.max_size)
+
+    async def get(self, key: str) -> CachedQueryResult | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, result: CachedQueryResult, ttl: float) -> None:
+        self.entries.set(key, result, ttl=ttl)
+
+    async def tag_versions(self, tags: Sequence[str]) -> tuple[int, ...]:
+        return tuple(self._tag_versions.get(tag, self._forgotten_version) for tag in tags)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            # Переставляем тег в конец: словарь упорядочен по последней инвалидации
+            self._tag_versions.pop(tag, None)
+            self._tag_versions[tag] = next(self._counter)
+
+        if len(self._tag_versions) > self.max_tags:
+            forgotten = list(itertools.islice(self._tag_versions, len(self._tag_versions) - self.max_tags // 2))
+            for tag in forgotten:
+                self._forgotten_version = max(self._forgotten_version, self._tag_versions.pop(tag))
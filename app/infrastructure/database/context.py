@@ -0,0 +1,59 @@
+import inspect
+from collections.abc import Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import (
+    Any,
+    TypeVar,
+)
+
+
+T = TypeVar("T")
+
+
+def _wrap_coroutine(func: Callable[..., Any], var: ContextVar[T], value: T) -> Callable[..., Any]:
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = var.set(value)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            var.reset(token)
+
+    return wrapper
+
+
+def _wrap_async_generator(func: Callable[..., Any], var: ContextVar[T], value: T) -> Callable[..., Any]:
+    # Генератор выполняется в контексте потребителя, поэтому значение
+    # ставится на каждый шаг отдельно, а не на все время итерации
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        generator = func(*args, **kwargs)
+        try:
+            while True:
+                token = var.set(value)
+                try:
+                    item = await anext(generator)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    var.reset(token)
+                yield item
+        finally:
+            token = var.set(value)
+            try:
+                await generator.aclose()
+            finally:
+                var.reset(token)
+
+    return wrapper
+
+
+def with_context_value(func: Callable[..., Any], var: ContextVar[T], value: T) -> Callable[..., Any]:
+    """Оборачивает асинхронную функцию или асинхронный генератор так, что
+    на время их выполнения ``var`` равна ``value``. Остальное не меняется."""
+    if inspect.isasyncgenfunction(func):
+        return _wrap_async_generator(func, var, value)
+    if inspect.iscoroutinefunction(func):
+        return _wrap_coroutine(func, var, value)
+    return func
@@ -0,0 +1,10 @@
+from infrastructure.database.converters.outbox.event import (
+    event_to_outbox_model,
+    outbox_model_to_event,
+)
+
+
+__all__ = [
+    "event_to_outbox_model",
+    "outbox_model_to_event",
+]
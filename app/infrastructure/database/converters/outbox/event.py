@@ -0,0 +1,38 @@
+from datetime import datetime
+from functools import cache
+
+from infrastructure.database.models.outbox.event import OutboxEventModel
+from pydantic import TypeAdapter
+
+from domain.base.events import BaseEvent
+
+
+# event_id и occurred_at хранятся в своих колонках
+_ENVELOPE_FIELDS = {"event_id", "occurred_at"}
+
+
+@cache
+def _event_adapter(event_type: type[BaseEvent]) -> TypeAdapter:
+    return TypeAdapter(event_type)
+
+
+def event_to_outbox_model(event: BaseEvent) -> OutboxEventModel:
+    now = datetime.now()
+    return OutboxEventModel(
+        oid=event.event_id,
+        event_type=event.get_event_type(),
+        payload=_event_adapter(type(event)).dump_python(event, mode="json", exclude=_ENVELOPE_FIELDS),
+        occurred_at=event.occurred_at,
+        available_at=now,
+        attempts=0,
+        published_at=None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def outbox_model_to_event(model: OutboxEventModel) -> BaseEvent:
+    event_type = BaseEvent.registry[model.event_type]
+    return _event_adapter(event_type).validate_python(
+        {**model.payload, "event_id": model.oid, "occurred_at": model.occurred_at},
+    )
@@ -23,6 +23,7 @@ def deal_entity_to_model(entity: DealEntity) -> DealModel:
         stage=entity.stage.as_generic_type().value,
         created_at=entity.created_at,
         updated_at=entity.updated_at,
+        version=entity.version,
     )
 
 
@@ -39,4 +40,5 @@ def deal_model_to_entity(model: DealModel) -> DealEntity:
         stage=DealStageValueObject(value=model.stage),
         created_at=model.created_at,
         updated_at=model.updated_at,
+        version=model.version,
     )
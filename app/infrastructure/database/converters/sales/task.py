@@ -18,6 +18,7 @@ def task_entity_to_model(entity: TaskEntity) -> TaskModel:
         is_done=entity.is_done,
         created_at=entity.created_at,
         updated_at=entity.updated_at,
+        version=entity.version,
     )
 
 
@@ -31,4 +32,5 @@ def task_model_to_entity(model: TaskModel) -> TaskEntity:
         is_done=model.is_done,
         created_at=model.created_at,
         updated_at=model.updated_at,
+        version=model.version,
     )
@@ -0,0 +1,85 @@
+from collections.abc import (
+    Callable,
+    Iterator,
+)
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    TypeVar,
+)
+
+from infrastructure.database.context import with_context_value
+
+from application.base.unit_of_work import INTERACTIVE_POOL
+
+
+# Пул, из которого берут соединения сессии, открытые в текущем контексте
+_current_pool: ContextVar[str] = ContextVar("current_pool", default=INTERACTIVE_POOL)
+
+TFunc = TypeVar("TFunc", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Настройки движка одного пула.
+
+    timeout - сколько ждать свободного соединения (сек), recycle - через
+    сколько секунд переоткрывать соединение, statement_timeout - лимит
+    на один запрос на стороне PostgreSQL (сек, None - без лимита),
+    statement_cache_size - кэш подготовленных запросов asyncpg на
+    соединение (0 - выключен, нужно за pgbouncer в transaction mode).
+
+    """
+
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: float | None = None
+    statement_timeout: float | None = None
+    statement_cache_size: int = 100
+
+    def engine_options(self) -> dict[str, Any]:
+        server_settings = {}
+        if self.statement_timeout:
+            server_settings["statement_timeout"] = str(int(self.statement_timeout * 1000))
+        return {
+            "pool_size": self.size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": -1 if self.recycle is None else self.recycle,
+            "connect_args": {
+                "statement_cache_size": self.statement_cache_size,
+                "server_settings": server_settings,
+            },
+        }
+
+
+def current_pool() -> str:
+    return _current_pool.get()
+
+
+@contextmanager
+def use_pool(name: str) -> Iterator[None]:
+    """Новые сессии внутри блока берут соединения из пула ``name``.
+
+    Уже открытая сессия unit of work остается в своем пуле.
+
+    """
+    token = _current_pool.set(name)
+    try:
+        yield
+    finally:
+        _current_pool.reset(token)
+
+
+def uses_pool(name: str) -> Callable[[TFunc], TFunc]:
+    """Декоратор метода репозитория, который всегда работает в пуле
+    ``name`` - например, потоковой выгрузки, читающей строки уже после
+    выхода из unit of work запроса."""
+
+    def decorator(func: TFunc) -> TFunc:
+        return with_context_value(func, _current_pool, name)
+
+    return decorator
@@ -1,57 +1,364 @@
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import (
+    asynccontextmanager,
+    contextmanager,
+)
+from contextvars import ContextVar
+from dataclasses import (
+    dataclass,
+    field,
+)
 from typing import Any
 
-from sqlalchemy.exc import SQLAlchemyError
+from infrastructure.database.gateways.pools import (
+    current_pool,
+    PoolSettings,
+)
+from infrastructure.database.gateways.replicas import (
+    ReadYourWritesTracker,
+    Replica,
+    ReplicaSet,
+)
+from infrastructure.database.instrumentation import (
+    EngineMetrics,
+    instrument_engine,
+    InstrumentedAsyncQueuePool,
+    pool_status,
+    PoolStatus,
+)
+from sqlalchemy import (
+    Connection,
+    event,
+    text,
+)
+from sqlalchemy.exc import (
+    DBAPIError,
+    SQLAlchemyError,
+    TimeoutError as PoolTimeoutError,
+)
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
+from sqlalchemy.orm import (
+    Session,
+    SessionTransaction,
+)
+
+from application.base.unit_of_work import INTERACTIVE_POOL
+from application.common.exceptions import (
+    DatabasePoolExhaustedException,
+    QueryTimeoutException,
+)
+
+
+# Запрос отменен сервером: сработал statement_timeout или cancel от клиента
+_QUERY_CANCELED = "57014"
+
+_SET_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :value, :is_local)")
+
+
+@contextmanager
+def _translate_errors() -> Iterator[None]:
+    """Переводит исчерпание пула и отмену запроса в исключения приложения,
+    которые API отдает как 503 и 504."""
+    try:
+        yield
+    except PoolTimeoutError as error:
+        raise DatabasePoolExhaustedException() from error
+    except DBAPIError as error:
+        if getattr(error.orig, "sqlstate", None) == _QUERY_CANCELED:
+            raise QueryTimeoutException() from error
+        raise
+
+
+async def _rollback(session: AsyncSession) -> None:
+    # После отмены по таймауту asyncpg-соединение может быть в неопределенном
+    # состоянии: такое соединение выбрасывается, а не возвращается в пул
+    try:
+        await session.rollback()
+    except Exception:
+        await session.invalidate()
+
+
+async def _reset_statement_timeout(session: AsyncSession) -> None:
+    try:
+        await session.execute(text("RESET statement_timeout"))
+    except Exception:
+        await session.invalidate()
+
+
+def _session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker[AsyncSession](bind=engine, expire_on_commit=False)
+
+
+@dataclass(frozen=True)
+class _ScopedSession:
+    session: AsyncSession
+    read_only: bool
+    after_commit: list[Callable[[], Awaitable[None]]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _EnginePool:
+    session: async_sessionmaker[AsyncSession]
+    read_only_session: async_sessionmaker[AsyncSession]
+    replicas: ReplicaSet
 
 
 class Database:
-    def __init__(self, url: str, ro_url: str) -> None:
-        self._async_engine = create_async_engine(
-            url=url,
-            pool_pre_ping=False,
-            # echo=False,
-            isolation_level="READ COMMITTED",
-        )
-        self._async_session = async_sessionmaker[AsyncSession](
-            bind=self._async_engine,
-            expire_on_commit=False,
+    """Мастер (запись и чтение с него) и необязательные реплики для чтения,
+    с отдельными движками на каждый именованный пул.
+
+    Пул выбирается по контексту (use_pool, uses_pool, begin(pool=...)) в
+    момент открытия сессии. Неизвестное имя пула означает пул по
+    умолчанию - первый в pools. Чтения вне команд уходят на реплику, если
+    после записи в этом запросе или недавней записи того же пользователя не
+    требуется мастер.
+
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ro_url: str,
+        replica_urls: Sequence[str] = (),
+        replica_selection: str = "round_robin",
+        replica_max_lag: float = 5.0,
+        replica_lag_check_interval: float = 2.0,
+        read_your_writes_window: float = 5.0,
+        pools: Mapping[str, PoolSettings] | None = None,
+    ) -> None:
+        self.engine_metrics: dict[tuple[str, str], EngineMetrics] = {}
+        self._engines: dict[tuple[str, str], AsyncEngine] = {}
+        self._pools: dict[str, _EnginePool] = {}
+
+        for pool_name, settings in (pools or {INTERACTIVE_POOL: PoolSettings()}).items():
+            engine = self._create_engine(pool_name, "primary", url, settings, isolation_level="READ COMMITTED")
+            read_only_engine = self._create_engine(
+                pool_name, "read_only", ro_url, settings, isolation_level="AUTOCOMMIT"
+            )
+
+            replicas = []
+            for index, replica_url in enumerate(replica_urls):
+                name = f"replica_{index}"
+                replica_engine = self._create_engine(
+                    pool_name, name, replica_url, settings, isolation_level="AUTOCOMMIT"
+                )
+                replicas.append(
+                    Replica(name=name, engine=replica_engine, session_factory=_session_factory(replica_engine))
+                )
+
+            self._pools[pool_name] = _EnginePool(
+                session=_session_factory(engine),
+                read_only_session=_session_factory(read_only_engine),
+                replicas=ReplicaSet(
+                    replicas=replicas,
+                    selection=replica_selection,
+                    max_lag=replica_max_lag,
+                    lag_check_interval=replica_lag_check_interval,
+                ),
+            )
+        self._default_pool = next(iter(self._pools.values()))
+        self.read_your_writes = ReadYourWritesTracker(window=read_your_writes_window)
+
+        # Сессия открытого unit of work в текущем контексте (запросе)
+        self._scoped_session: ContextVar[_ScopedSession | None] = ContextVar(
+            f"scoped_session_{id(self)}",
+            default=None,
         )
 
-        self._read_only_async_engine = create_async_engine(
-            url=ro_url,
+    def _create_engine(
+        self,
+        pool_name: str,
+        name: str,
+        url: str,
+        settings: PoolSettings,
+        isolation_level: str,
+    ) -> AsyncEngine:
+        engine = create_async_engine(
+            url=url,
             pool_pre_ping=False,
             # echo=False,
-            isolation_level="AUTOCOMMIT",
-        )
-        self._read_only_async_session = async_sessionmaker[AsyncSession](
-            bind=self._read_only_async_engine,
-            expire_on_commit=False,
+            isolation_level=isolation_level,
+            poolclass=InstrumentedAsyncQueuePool,
+            **settings.engine_options(),
         )
+        key = (pool_name, name)
+        self._engines[key] = engine
+        self.engine_metrics[key] = EngineMetrics()
+        instrument_engine(engine, self.engine_metrics[key])
+        return engine
+
+    @property
+    def replica_sets(self) -> dict[str, ReplicaSet]:
+        return {name: pool.replicas for name, pool in self._pools.items()}
+
+    def start(self) -> None:
+        """Запускает фоновую проверку отставания реплик."""
+        for pool in self._pools.values():
+            pool.replicas.start()
+
+    async def stop(self) -> None:
+        for pool in self._pools.values():
+            await pool.replicas.stop()
+
+    def pool_statuses(self) -> dict[tuple[str, str], PoolStatus]:
+        statuses = {key: pool_status(engine.pool) for key, engine in self._engines.items()}
+        return {key: status for key, status in statuses.items() if status is not None}
+
+    def bind_consistency_key(self, key: str) -> None:
+        """Закрепляет чтения текущего запроса за ключом (обычно id
+        пользователя): после его записи они какое-то время идут на мастер."""
+        self.read_your_writes.bind(key)
+
+    def max_read_lag(self) -> float:
+        """Допустимое отставание реплик (сек), 0 - реплик нет."""
+        return max((replicas.max_lag for replicas in self.replica_sets.values() if replicas.replicas), default=0.0)
+
+    def detach(self) -> None:
+        """Текущий контекст перестает видеть сессию открытого session_scope:
+        следующий session_scope в нем откроет новую."""
+        self._scoped_session.set(None)
+
+    def _pool(self) -> _EnginePool:
+        return self._pools.get(current_pool(), self._default_pool)
+
+    def _read_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        pool = self._pool()
+        if not self.read_your_writes.requires_primary():
+            replica = pool.replicas.choose()
+            if replica is not None:
+                return replica.session_factory
+        return pool.read_only_session
 
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, Any]:
-        session: AsyncSession = self._async_session()
+    async def session_scope(
+        self,
+        read_only: bool = False,
+        statement_timeout: float | None = None,
+    ) -> AsyncGenerator[None, Any]:
+        """Открывает одну сессию на весь блок: get_session и
+        get_read_only_session внутри него возвращают ее же. Изменения
+        фиксируются один раз на выходе, при ошибке откатываются.
+
+        Вложенный вызов присоединяется к уже открытой сессии. Колбэки
+        after_commit выполняются после фиксации, когда сессия уже закрыта.
+
+        statement_timeout (сек) ограничивает каждый запрос блока вместо
+        лимита пула. Он ставится при первом обращении сессии к соединению:
+        блок, обслуженный без базы (из кэша), соединение не занимает. В
+        транзакции лимит ставится через SET LOCAL и снимается фиксацией, а на
+        read-only (AUTOCOMMIT) соединении сбрасывается перед возвратом в пул.
+
+        """
+        if self._scoped_session.get() is not None:
+            yield
+            return
+
+        session_factory = self._read_session_factory() if read_only else self._pool().session
+        session: AsyncSession = session_factory()
+        scoped = _ScopedSession(session=session, read_only=read_only)
+        timeout_set = False
+        if statement_timeout is not None:
+            parameters = {"value": str(int(statement_timeout * 1000)), "is_local": not read_only}
+
+            def set_statement_timeout(
+                _session: Session, _transaction: SessionTransaction, connection: Connection
+            ) -> None:
+                nonlocal timeout_set
+                connection.execute(_SET_STATEMENT_TIMEOUT, parameters)
+                timeout_set = True
+
+            event.listen(session.sync_session, "after_begin", set_statement_timeout)
+
+        token = self._scoped_session.set(scoped)
         try:
-            yield session
-        except SQLAlchemyError:
-            await session.rollback()
+            with _translate_errors():
+                yield
+                if not read_only:
+                    await session.commit()
+                    self.read_your_writes.record_write()
+        except BaseException:
+            await _rollback(session)
             raise
         finally:
-            await session.commit()
+            self._scoped_session.reset(token)
+            if timeout_set and read_only:
+                await _reset_statement_timeout(session)
             await session.close()
 
+        for callback in scoped.after_commit:
+            await callback()
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        scoped = self._scoped_session.get()
+        if scoped is None or scoped.read_only:
+            await callback()
+            return
+        scoped.after_commit.append(callback)
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        scoped = self._scoped_session.get()
+        if scoped is not None and not scoped.read_only:
+            yield scoped.session
+            return
+
+        session: AsyncSession = self._pool().session()
+        with _translate_errors():
+            try:
+                yield session
+            except SQLAlchemyError:
+                await session.rollback()
+                raise
+            finally:
+                await session.commit()
+                await session.close()
+                self.read_your_writes.record_write()
+
     @asynccontextmanager
     async def get_read_only_session(self) -> AsyncGenerator[AsyncSession, Any]:
-        session: AsyncSession = self._read_only_async_session()
-        try:
-            yield session
-        except SQLAlchemyError:
-            raise
-        finally:
-            await session.close()
+        scoped = self._scoped_session.get()
+        if scoped is not None:
+            # Внутри команды чтение идет в ее сессии и видит ее незафиксированные изменения
+            yield scoped.session
+            return
+
+        session: AsyncSession = self._read_session_factory()()
+        with _translate_errors():
+            try:
+                yield session
+            except SQLAlchemyError:
+                raise
+            finally:
+                await session.close()
+
+    @asynccontextmanager
+    async def get_stream_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        """Сессия для выгрузки через серверный курсор.
+
+        asyncpg открывает курсор только внутри транзакции, а read-only движок
+        работает в AUTOCOMMIT. Поэтому соединение переводится в транзакцию
+        REPEATABLE READ READ ONLY: заодно вся выгрузка читает один снимок
+        данных, сколько бы она ни длилась.
+
+        """
+        session: AsyncSession = self._read_session_factory()()
+        with _translate_errors():
+            try:
+                await session.connection(
+                    execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True},
+                )
+                yield session
+            finally:
+                await session.close()
@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    async_sessionmaker,
+    AsyncEngine,
+    AsyncSession,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики (сек). Пока реплика догоняет WAL, считаем от времени
+# последней проигранной транзакции; если догнала - отставания нет, даже
+# если на мастере давно не было записей
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """,
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    # Последнее измеренное отставание (сек), inf - реплика недоступна
+    lag: float = 0.0
+
+    @property
+    def checked_out(self) -> int:
+        return self.engine.pool.checkedout()
+
+
+@dataclass
+class ReplicaSet:
+    """Реплики для чтения: выбор по кругу (round_robin) или наименее
+    нагруженной по занятым соединениям пула (least_loaded).
+
+    Реплика, отстающая больше max_lag, в выбор не попадает; если
+    подходящих нет, choose() возвращает None и чтение идет на мастер.
+    Отставание обновляет фоновая задача (start/stop); без нее реплики
+    считаются актуальными.
+
+    """
+
+    replicas: Sequence[Replica]
+    selection: str = "round_robin"
+    max_lag: float = 5.0
+    lag_check_interval: float = 2.0
+    _counter: itertools.count = field(default_factory=itertools.count, init=False)
+    _monitor: asyncio.Task | None = field(default=None, init=False)
+
+    def choose(self) -> Replica | None:
+        candidates = [replica for replica in self.replicas if replica.lag <= self.max_lag]
+        if not candidates:
+            return None
+
+        offset = next(self._counter)
+        ordered = [candidates[(offset + index) % len(candidates)] for index in range(len(candidates))]
+        if self.selection == "least_loaded":
+            # min берет первую из равных, поэтому при равной нагрузке выбор идет по кругу
+            return min(ordered, key=lambda replica: replica.checked_out)
+        return ordered[0]
+
+    async def refresh_lag(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as connection:
+                    replica.lag = float((await connection.execute(_LAG_QUERY)).scalar_one())
+            except Exception:
+                logger.warning("Replica %s is unavailable", replica.name, exc_info=True)
+                replica.lag = math.inf
+
+    def start(self) -> None:
+        if self.replicas and self._monitor is None:
+            self._monitor = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._monitor is None:
+            return
+        monitor, self._monitor = self._monitor, None
+        monitor.cancel()
+        try:
+            await monitor
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh_lag()
+            await asyncio.sleep(self.lag_check_interval)
+
+
+@dataclass
+class _ReadConsistency:
+    key: str | None = None
+    wrote: bool = False
+
+
+@dataclass
+class ReadYourWritesTracker:
+    """Решает, когда чтение нельзя отдавать реплике.
+
+    После записи чтения того же запроса идут на мастер, а чтения того же
+    ключа (пользователя) - еще window секунд, пока реплики догоняют
+    изменения. Закрепления хранятся в памяти процесса: запрос, попавший
+    в другой процесс, увидит реплику, если она отстает.
+
+    """
+
+    window: float = 5.0
+    max_keys: int = 10_000
+    _pinned: dict[str, float] = field(default_factory=dict, init=False)
+    _consistency: ContextVar[_ReadConsistency | None] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._consistency = ContextVar(f"read_consistency_{id(self)}", default=None)
+
+    def bind(self, key: str) -> None:
+        """Привязывает текущий запрос к ключу согласованности."""
+        self._consistency.set(_ReadConsistency(key=key))
+
+    def record_write(self) -> None:
+        consistency = self._consistency.get()
+        if consistency is None:
+            consistency = _ReadConsistency()
+            self._consistency.set(consistency)
+        consistency.wrote = True
+
+        if consistency.key is None or self.window <= 0:
+            return
+        now = time.monotonic()
+        if len(self._pinned) >= self.max_keys:
+            self._pinned = {key: until for key, until in self._pinned.items() if until > now}
+        self._pinned[consistency.key] = now + self.window
+
+    def requires_primary(self) -> bool:
+        consistency = self._consistency.get()
+        if consistency is None:
+            return False
+        if consistency.wrote:
+            return True
+        if consistency.key is None:
+            return False
+        return self._pinned.get(consistency.key, 0.0) > time.monotonic()
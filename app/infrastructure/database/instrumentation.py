@@ -0,0 +1,130 @@
+import time
+from contextvars import ContextVar
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Any,
+    TypeVar,
+)
+
+from infrastructure.database.context import with_context_value
+from sqlalchemy import (
+    Engine,
+    event,
+)
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    Pool,
+    QueuePool,
+)
+
+from application.common.metrics import (
+    LatencyHistogram,
+    LatencyHistograms,
+)
+
+
+# Метод репозитория, из которого выполняется текущий SQL-запрос
+_statement_source: ContextVar[str] = ContextVar("statement_source", default="other")
+
+# Ключ в Connection.info: моменты начала выполняемых запросов
+_STARTED_KEY = "instrumentation_started"
+
+TRepository = TypeVar("TRepository", bound=type)
+
+
+def instrumented(cls: TRepository) -> TRepository:
+    """Декоратор класса репозитория: SQL-запросы из его публичных
+    асинхронных методов попадают в метрики с меткой ``Класс.метод``."""
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith("_") and callable(attr):
+            setattr(cls, name, with_context_value(attr, _statement_source, f"{cls.__name__}.{name}"))
+    return cls
+
+
+@dataclass
+class EngineMetrics:
+    """Метрики одного движка: запросы по методам репозиториев и ожидание
+    соединения из пула."""
+
+    statements: LatencyHistograms = field(default_factory=LatencyHistograms)
+    checkout_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+@dataclass(frozen=True)
+class PoolStatus:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Пул, замеряющий время выдачи соединения.
+
+    В замер входит и ожидание свободного соединения, и открытие нового,
+    если пул еще не заполнен. Рост этого времени при обычной длительности
+    запросов означает, что пулу не хватает соединений.
+
+    """
+
+    metrics: EngineMetrics | None = None
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except BaseException:
+            if self.metrics is not None:
+                self.metrics.checkout_wait.observe(time.perf_counter() - started, error=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.checkout_wait.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        # dispose() движка пересоздает пул - метрики переходят в новый
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_engine(engine: AsyncEngine | Engine, metrics: EngineMetrics) -> None:
+    """Подписывает метрики на события выполнения запросов движка."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    if isinstance(sync_engine.pool, InstrumentedAsyncQueuePool):
+        sync_engine.pool.metrics = metrics
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info[_STARTED_KEY].pop()
+        metrics.statements.observe(_statement_source.get(), time.perf_counter() - started)
+
+    def handle_error(context: ExceptionContext) -> None:
+        # Ошибка подключения случается до before_cursor_execute
+        started = context.connection.info.get(_STARTED_KEY) if context.connection is not None else None
+        if started:
+            metrics.statements.observe(_statement_source.get(), time.perf_counter() - started.pop(), error=True)
+
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(sync_engine, "handle_error", handle_error)
+
+
+def pool_status(pool: Pool) -> PoolStatus | None:
+    """Заполненность пула; для пулов без очереди (NullPool и т.п.) - None."""
+    if not isinstance(pool, QueuePool):
+        return None
+    return PoolStatus(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+    )
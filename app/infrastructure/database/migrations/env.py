@@ -17,6 +17,7 @@ from infrastructure.database.models.organizations import (  # noqa: F401
     OrganizationMemberModel,
     OrganizationModel,
 )
+from infrastructure.database.models.outbox import OutboxEventModel  # noqa: F401
 from infrastructure.database.models.sales import (  # noqa: F401
     ActivityModel,
     ContactModel,
@@ -0,0 +1,93 @@
+"""add access path indexes
+
+Revision ID: e9f7a93731e8
+Revises: 641a17c1353d
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e9f7a93731e8"
+down_revision: Union[str, Sequence[str], None] = "641a17c1353d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_deals_organization_id_created_at",
+        "deals",
+        ["organization_id", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "ix_deals_organization_id_owner_id_created_at",
+        "deals",
+        ["organization_id", "owner_id", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "ix_deals_organization_id_status",
+        "deals",
+        ["organization_id", "status"],
+    )
+    op.create_index(
+        "ix_deals_organization_id_stage",
+        "deals",
+        ["organization_id", "stage"],
+    )
+    op.create_index("ix_deals_contact_id", "deals", ["contact_id"])
+
+    op.create_index(
+        "ix_contacts_organization_id_created_at",
+        "contacts",
+        ["organization_id", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "ix_contacts_organization_id_owner_id_created_at",
+        "contacts",
+        ["organization_id", "owner_id", sa.text("created_at DESC")],
+    )
+
+    op.create_index(
+        "ix_tasks_deal_id_created_at",
+        "tasks",
+        ["deal_id", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "ix_tasks_deal_id_due_date_open",
+        "tasks",
+        ["deal_id", "due_date"],
+        postgresql_where=sa.text("is_done = false"),
+    )
+
+    op.create_index(
+        "ix_activities_deal_id_created_at",
+        "activities",
+        ["deal_id", sa.text("created_at DESC")],
+    )
+
+    op.create_index(
+        "ix_organization_members_user_id",
+        "organization_members",
+        ["user_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_organization_members_user_id", table_name="organization_members")
+    op.drop_index("ix_activities_deal_id_created_at", table_name="activities")
+    op.drop_index("ix_tasks_deal_id_due_date_open", table_name="tasks")
+    op.drop_index("ix_tasks_deal_id_created_at", table_name="tasks")
+    op.drop_index("ix_contacts_organization_id_owner_id_created_at", table_name="contacts")
+    op.drop_index("ix_contacts_organization_id_created_at", table_name="contacts")
+    op.drop_index("ix_deals_contact_id", table_name="deals")
+    op.drop_index("ix_deals_organization_id_stage", table_name="deals")
+    op.drop_index("ix_deals_organization_id_status", table_name="deals")
+    op.drop_index("ix_deals_organization_id_owner_id_created_at", table_name="deals")
+    op.drop_index("ix_deals_organization_id_created_at", table_name="deals")
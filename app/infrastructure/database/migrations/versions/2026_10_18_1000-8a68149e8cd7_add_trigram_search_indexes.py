@@ -0,0 +1,49 @@
+"""add trigram search indexes
+
+Revision ID: 8a68149e8cd7
+Revises: e9f7a93731e8
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a68149e8cd7"
+down_revision: Union[str, Sequence[str], None] = "e9f7a93731e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = (
+    ("ix_contacts_name_trgm", "contacts", "name"),
+    ("ix_contacts_email_trgm", "contacts", "email"),
+    ("ix_contacts_phone_trgm", "contacts", "phone"),
+    ("ix_deals_title_trgm", "deals", "title"),
+    ("ix_tasks_title_trgm", "tasks", "title"),
+    ("ix_tasks_description_trgm", "tasks", "description"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            postgresql_using="gin",
+            postgresql_ops={column_name: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
+
+    # Расширение не удаляем: им могут пользоваться другие объекты базы
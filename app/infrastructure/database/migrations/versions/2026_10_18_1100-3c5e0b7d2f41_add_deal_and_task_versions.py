@@ -0,0 +1,39 @@
+"""add deal and task versions
+
+Revision ID: 3c5e0b7d2f41
+Revises: 8a68149e8cd7
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3c5e0b7d2f41"
+down_revision: Union[str, Sequence[str], None] = "8a68149e8cd7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("deals", "tasks"):
+        op.add_column(
+            table,
+            sa.Column(
+                "version",
+                sa.Integer(),
+                server_default=sa.text("1"),
+                nullable=False,
+                comment="Версия строки для оптимистичной блокировки",
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "version")
+    op.drop_column("deals", "version")
@@ -0,0 +1,71 @@
+"""add outbox events
+
+Revision ID: 5b1d7e2a9c60
+Revises: 3c5e0b7d2f41
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1d7e2a9c60"
+down_revision: Union[str, Sequence[str], None] = "3c5e0b7d2f41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "outbox_events",
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False, comment="Когда произошло событие"),
+        sa.Column(
+            "available_at",
+            sa.DateTime(),
+            nullable=False,
+            comment="Не раньше какого момента событие можно забрать на доставку",
+        ),
+        sa.Column(
+            "attempts",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+            comment="Число попыток доставки",
+        ),
+        sa.Column("published_at", sa.DateTime(), nullable=True, comment="Когда событие доставлено всем подписчикам"),
+        sa.Column("oid", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="Дата создания",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="Дата обновления",
+        ),
+        sa.PrimaryKeyConstraint("oid"),
+    )
+    op.create_index(
+        "ix_outbox_events_pending_available_at",
+        "outbox_events",
+        ["available_at"],
+        postgresql_where=sa.text("published_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_outbox_events_pending_available_at", table_name="outbox_events")
+    op.drop_table("outbox_events")
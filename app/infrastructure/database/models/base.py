@@ -50,3 +50,14 @@ class TimedBaseModel(BaseModel):
         onupdate=sql.func.now(),
         comment="Дата обновления",
     )
+
+
+class VersionedBaseModel(TimedBaseModel):
+    __abstract__ = True
+
+    version: Mapped[int] = mapped_column(
+        nullable=False,
+        default=1,
+        server_default=sql.text("1"),
+        comment="Версия строки для оптимистичной блокировки",
+    )
@@ -3,6 +3,7 @@ from uuid import UUID
 from infrastructure.database.models.base import TimedBaseModel
 from sqlalchemy import (
     ForeignKey,
+    Index,
     String,
     UniqueConstraint,
 )
@@ -16,7 +17,10 @@ from sqlalchemy.orm import (
 
 class OrganizationMemberModel(TimedBaseModel):
     __tablename__ = "organization_members"
-    __table_args__ = (UniqueConstraint("organization_id", "user_id", name="uq_organization_member"),)
+    __table_args__ = (
+        UniqueConstraint("organization_id", "user_id", name="uq_organization_member"),
+        Index("ix_organization_members_user_id", "user_id"),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
         UUIDType(as_uuid=True),
@@ -36,10 +40,10 @@ class OrganizationMemberModel(TimedBaseModel):
     organization: Mapped["OrganizationModel"] = relationship(  # noqa: F821
         "OrganizationModel",
         back_populates="members",
-        lazy="selectin",
+        lazy="raise",
     )
     user: Mapped["UserModel"] = relationship(  # noqa: F821
         "UserModel",
         back_populates="organization_members",
-        lazy="selectin",
+        lazy="raise",
     )
@@ -15,17 +15,17 @@ class OrganizationModel(TimedBaseModel):
     members: Mapped[list["OrganizationMemberModel"]] = relationship(  # noqa: F821
         "OrganizationMemberModel",
         back_populates="organization",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
     contacts: Mapped[list["ContactModel"]] = relationship(  # noqa: F821
         "ContactModel",
         back_populates="organization",
-        lazy="selectin",
+        lazy="raise",
     )
     deals: Mapped[list["DealModel"]] = relationship(  # noqa: F821
         "DealModel",
         back_populates="organization",
-        lazy="selectin",
+        lazy="raise",
     )
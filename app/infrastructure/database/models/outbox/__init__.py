@@ -0,0 +1,4 @@
+from infrastructure.database.models.outbox.event import OutboxEventModel
+
+
+__all__ = ("OutboxEventModel",)
@@ -0,0 +1,51 @@
+import datetime
+from typing import Any
+
+from infrastructure.database.models.base import TimedBaseModel
+from sqlalchemy import (
+    Index,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+
+
+class OutboxEventModel(TimedBaseModel):
+    """Доменное событие, ожидающее доставки подписчикам. oid - event_id."""
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending_available_at",
+            "available_at",
+            postgresql_where=text("published_at IS NULL"),
+        ),
+    )
+
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        JSONB,
+        nullable=False,
+    )
+    occurred_at: Mapped[datetime.datetime] = mapped_column(
+        nullable=False,
+        comment="Когда произошло событие",
+    )
+    available_at: Mapped[datetime.datetime] = mapped_column(
+        nullable=False,
+        comment="Не раньше какого момента событие можно забрать на доставку",
+    )
+    attempts: Mapped[int] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+        comment="Число попыток доставки",
+    )
+    published_at: Mapped[datetime.datetime | None] = mapped_column(
+        nullable=True,
+        comment="Когда событие доставлено всем подписчикам",
+    )
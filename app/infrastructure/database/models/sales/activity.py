@@ -4,7 +4,9 @@ from uuid import UUID
 from infrastructure.database.models.base import TimedBaseModel
 from sqlalchemy import (
     ForeignKey,
+    Index,
     String,
+    text,
 )
 from sqlalchemy.dialects.postgresql import (
     JSONB,
@@ -19,6 +21,7 @@ from sqlalchemy.orm import (
 
 class ActivityModel(TimedBaseModel):
     __tablename__ = "activities"
+    __table_args__ = (Index("ix_activities_deal_id_created_at", "deal_id", text("created_at DESC")),)
 
     deal_id: Mapped[UUID] = mapped_column(
         UUIDType(as_uuid=True),
@@ -39,11 +42,11 @@ class ActivityModel(TimedBaseModel):
     deal: Mapped["DealModel"] = relationship(  # noqa: F821
         "DealModel",
         back_populates="activities",
-        lazy="selectin",
+        lazy="raise",
     )
     author: Mapped["UserModel | None"] = relationship(  # noqa: F821
         "UserModel",
         foreign_keys=[author_id],
         back_populates="activities",
-        lazy="selectin",
+        lazy="raise",
     )
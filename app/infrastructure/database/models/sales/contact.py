@@ -3,7 +3,9 @@ from uuid import UUID
 from infrastructure.database.models.base import TimedBaseModel
 from sqlalchemy import (
     ForeignKey,
+    Index,
     String,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as UUIDType
 from sqlalchemy.orm import (
@@ -15,6 +17,19 @@ from sqlalchemy.orm import (
 
 class ContactModel(TimedBaseModel):
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_organization_id_created_at", "organization_id", text("created_at DESC")),
+        Index(
+            "ix_contacts_organization_id_owner_id_created_at",
+            "organization_id",
+            "owner_id",
+            text("created_at DESC"),
+        ),
+        # Триграммные индексы для поиска ILIKE '%...%' и по сходству (pg_trgm)
+        Index("ix_contacts_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_contacts_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_contacts_phone_trgm", "phone", postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
         UUIDType(as_uuid=True),
@@ -33,16 +48,16 @@ class ContactModel(TimedBaseModel):
     organization: Mapped["OrganizationModel"] = relationship(  # noqa: F821
         "OrganizationModel",
         back_populates="contacts",
-        lazy="selectin",
+        lazy="raise",
     )
     owner: Mapped["UserModel"] = relationship(  # noqa: F821
         "UserModel",
         foreign_keys=[owner_id],
         back_populates="owned_contacts",
-        lazy="selectin",
+        lazy="raise",
     )
     deals: Mapped[list["DealModel"]] = relationship(  # noqa: F821
         "DealModel",
         back_populates="contact",
-        lazy="selectin",
+        lazy="raise",
     )
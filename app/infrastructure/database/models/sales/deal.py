@@ -1,11 +1,13 @@
 from decimal import Decimal
 from uuid import UUID
 
-from infrastructure.database.models.base import TimedBaseModel
+from infrastructure.database.models.base import VersionedBaseModel
 from sqlalchemy import (
     DECIMAL,
     ForeignKey,
+    Index,
     String,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as UUIDType
 from sqlalchemy.orm import (
@@ -15,8 +17,22 @@ from sqlalchemy.orm import (
 )
 
 
-class DealModel(TimedBaseModel):
+class DealModel(VersionedBaseModel):
     __tablename__ = "deals"
+    __table_args__ = (
+        Index("ix_deals_organization_id_created_at", "organization_id", text("created_at DESC")),
+        Index(
+            "ix_deals_organization_id_owner_id_created_at",
+            "organization_id",
+            "owner_id",
+            text("created_at DESC"),
+        ),
+        Index("ix_deals_organization_id_status", "organization_id", "status"),
+        Index("ix_deals_organization_id_stage", "organization_id", "stage"),
+        Index("ix_deals_contact_id", "contact_id"),
+        # Триграммный индекс для поиска ILIKE '%...%' и по сходству (pg_trgm)
+        Index("ix_deals_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
         UUIDType(as_uuid=True),
@@ -45,30 +61,30 @@ class DealModel(TimedBaseModel):
     organization: Mapped["OrganizationModel"] = relationship(  # noqa: F821
         "OrganizationModel",
         back_populates="deals",
-        lazy="selectin",
+        lazy="raise",
     )
     contact: Mapped["ContactModel"] = relationship(  # noqa: F821
         "ContactModel",
         back_populates="deals",
-        lazy="selectin",
+        lazy="raise",
     )
     owner: Mapped["UserModel"] = relationship(  # noqa: F821
         "UserModel",
         foreign_keys=[owner_id],
         back_populates="owned_deals",
-        lazy="selectin",
+        lazy="raise",
     )
     tasks: Mapped[list["TaskModel"]] = relationship(  # noqa: F821
         "TaskModel",
         back_populates="deal",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
     activities: Mapped[list["ActivityModel"]] = relationship(  # noqa: F821
         "ActivityModel",
         back_populates="deal",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
@@ -1,13 +1,15 @@
 from datetime import date
 from uuid import UUID
 
-from infrastructure.database.models.base import TimedBaseModel
+from infrastructure.database.models.base import VersionedBaseModel
 from sqlalchemy import (
     Boolean,
     Date,
     ForeignKey,
+    Index,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as UUIDType
 from sqlalchemy.orm import (
@@ -17,8 +19,26 @@ from sqlalchemy.orm import (
 )
 
 
-class TaskModel(TimedBaseModel):
+class TaskModel(VersionedBaseModel):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_deal_id_created_at", "deal_id", text("created_at DESC")),
+        # Частичный индекс: открытые задачи (only_open / is_done=false) - основной сценарий списка задач
+        Index(
+            "ix_tasks_deal_id_due_date_open",
+            "deal_id",
+            "due_date",
+            postgresql_where=text("is_done = false"),
+        ),
+        # Триграммные индексы для поиска ILIKE '%...%' и по сходству (pg_trgm)
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "ix_tasks_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     deal_id: Mapped[UUID] = mapped_column(
         UUIDType(as_uuid=True),
@@ -33,5 +53,5 @@ class TaskModel(TimedBaseModel):
     deal: Mapped["DealModel"] = relationship(  # noqa: F821
         "DealModel",
         back_populates="tasks",
-        lazy="selectin",
+        lazy="raise",
     )
@@ -21,23 +21,23 @@ class UserModel(TimedBaseModel):
     organization_members: Mapped[list["OrganizationMemberModel"]] = relationship(  # noqa: F821
         "OrganizationMemberModel",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
     )
     owned_contacts: Mapped[list["ContactModel"]] = relationship(  # noqa: F821
         "ContactModel",
         foreign_keys="[ContactModel.owner_id]",
         back_populates="owner",
-        lazy="selectin",
+        lazy="raise",
     )
     owned_deals: Mapped[list["DealModel"]] = relationship(  # noqa: F821
         "DealModel",
         foreign_keys="[DealModel.owner_id]",
         back_populates="owner",
-        lazy="selectin",
+        lazy="raise",
     )
     activities: Mapped[list["ActivityModel"]] = relationship(  # noqa: F821
         "ActivityModel",
         foreign_keys="[ActivityModel.author_id]",
         back_populates="author",
-        lazy="selectin",
+        lazy="raise",
     )
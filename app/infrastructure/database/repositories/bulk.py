@@ -0,0 +1,32 @@
+from collections.abc import Sequence
+from typing import Any
+from uuid import UUID
+
+from infrastructure.database.models.base import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def model_to_values(instance: BaseModel) -> dict[str, Any]:
+    """Значения колонок ORM-объекта для Core INSERT."""
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+async def insert_many(session: AsyncSession, instances: Sequence[BaseModel]) -> set[UUID]:
+    """Многострочный INSERT ... ON CONFLICT (oid) DO NOTHING RETURNING oid.
+
+    Выполняется на соединении сессии в обход unit of work ORM: объекты не
+    попадают в identity map, поэтому память не растет с размером импорта.
+    SQLAlchemy сам разбивает параметры на пачки (insertmanyvalues).
+    Возвращает oid реально вставленных строк.
+
+    """
+    if not instances:
+        return set()
+
+    model = type(instances[0])
+    stmt = insert(model).on_conflict_do_nothing(index_elements=[model.oid]).returning(model.oid)
+    connection = await session.connection()
+    res = await connection.execute(stmt, [model_to_values(instance) for instance in instances])
+    return set(res.scalars().all())
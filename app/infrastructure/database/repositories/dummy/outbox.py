@@ -0,0 +1,62 @@
+from collections.abc import Sequence
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+from uuid import UUID
+
+from application.base.outbox import BaseEventOutbox
+from domain.base.events import BaseEvent
+
+
+@dataclass
+class _OutboxRecord:
+    event: BaseEvent
+    available_at: datetime
+    attempts: int = 0
+    published_at: datetime | None = None
+
+
+@dataclass
+class DummyInMemoryEventOutbox(BaseEventOutbox):
+    _records: dict[UUID, _OutboxRecord] = field(
+        default_factory=dict,
+        init=False,
+    )
+
+    @property
+    def pending(self) -> list[BaseEvent]:
+        return [record.event for record in self._records.values() if record.published_at is None]
+
+    async def add(self, events: Sequence[BaseEvent]) -> None:
+        now = datetime.now()
+        for event in events:
+            self._records.setdefault(event.event_id, _OutboxRecord(event=event, available_at=now))
+
+    async def claim(self, limit: int, lease: float, max_attempts: int) -> list[BaseEvent]:
+        now = datetime.now()
+        ready = [
+            record
+            for record in self._records.values()
+            if record.published_at is None and record.available_at <= now and record.attempts < max_attempts
+        ]
+        ready.sort(key=lambda record: record.available_at)
+        claimed = ready[:limit]
+        for record in claimed:
+            record.attempts += 1
+            record.available_at = now + timedelta(seconds=lease)
+        return sorted((record.event for record in claimed), key=lambda event: event.occurred_at)
+
+    async def mark_published(self, event_ids: Sequence[UUID]) -> None:
+        now = datetime.now()
+        for event_id in event_ids:
+            self._records[event_id].published_at = now
+
+    async def mark_failed(self, event_ids: Sequence[UUID], retry_delay: float) -> None:
+        available_at = datetime.now() + timedelta(seconds=retry_delay)
+        for event_id in event_ids:
+            self._records[event_id].available_at = available_at
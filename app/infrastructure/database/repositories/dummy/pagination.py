@@ -0,0 +1,51 @@
+from typing import TypeVar
+from uuid import UUID
+
+from domain.base.cursor import (
+    get_sort_value,
+    PageCursor,
+)
+from domain.base.entity import BaseEntity
+from domain.base.exceptions import InvalidPageCursorException
+from domain.base.filters import BaseFilters
+
+
+EntityT = TypeVar("EntityT", bound=BaseEntity)
+
+
+def sort_items(items: list[EntityT], filters: BaseFilters) -> list[EntityT]:
+    return sorted(
+        items, key=lambda item: (get_sort_value(item, filters.sort_key), item.oid), reverse=filters.sort_descending
+    )
+
+
+def paginate(
+    items: list[EntityT],
+    filters: BaseFilters,
+    ranks: dict[UUID, float] | None = None,
+) -> list[EntityT]:
+    """In-memory аналог SQL-пагинации: та же сортировка (с релевантностью
+    поиска впереди, если она передана) и тот же курсор."""
+
+    def position(item: EntityT) -> tuple:
+        return get_sort_value(item, filters.sort_key), item.oid
+
+    result = sort_items(items, filters)
+    if ranks is not None:
+        # Сортировка стабильная: при равной релевантности сохраняется порядок по ключу
+        result.sort(key=lambda item: ranks[item.oid], reverse=True)
+
+    if not filters.cursor:
+        offset = (filters.page - 1) * filters.page_size
+        return result[offset : offset + filters.page_size]
+
+    if filters.is_ranked:
+        raise InvalidPageCursorException(cursor=filters.cursor)
+
+    cursor = PageCursor.decode(filters.cursor, filters.sort_key, filters.sort_descending)
+    boundary = (cursor.value, cursor.oid)
+    if filters.sort_descending:
+        result = [item for item in result if position(item) < boundary]
+    else:
+        result = [item for item in result if position(item) > boundary]
+    return result[: filters.page_size]
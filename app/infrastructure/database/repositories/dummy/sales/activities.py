@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import (
     dataclass,
     field,
@@ -18,6 +19,14 @@ class DummyInMemoryActivityRepository(BaseActivityRepository):
     async def add(self, activity: ActivityEntity) -> None:
         self._saved_activities.append(activity)
 
+    async def add_many(self, activities: Sequence[ActivityEntity]) -> None:
+        # Как ON CONFLICT (oid) DO NOTHING: повторная запись не создает дублей
+        existing = {activity.oid for activity in self._saved_activities}
+        for activity in activities:
+            if activity.oid not in existing:
+                self._saved_activities.append(activity)
+                existing.add(activity.oid)
+
     async def get_by_id(self, activity_id: UUID) -> ActivityEntity | None:
         try:
             return next(activity for activity in self._saved_activities if activity.oid == activity_id)
@@ -1,10 +1,20 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Sequence,
+)
 from dataclasses import (
     dataclass,
     field,
 )
 from uuid import UUID
 
+from infrastructure.database.repositories.dummy.pagination import (
+    paginate,
+    sort_items,
+)
+from infrastructure.database.repositories.dummy.search import InMemoryTrigramIndex
+
 from domain.sales.entities.contacts import ContactEntity
 from domain.sales.filters.contacts import ContactFilters
 from domain.sales.interfaces.repositories.contacts import BaseContactRepository
@@ -16,6 +26,18 @@ class DummyInMemoryContactRepository(BaseContactRepository):
         default_factory=list,
         kw_only=True,
     )
+    _search_index: InMemoryTrigramIndex = field(
+        default_factory=InMemoryTrigramIndex,
+        init=False,
+    )
+
+    def _index(self, contact: ContactEntity) -> None:
+        self._search_index.add(
+            contact.oid,
+            contact.name.as_generic_type(),
+            contact.email.as_generic_type(),
+            contact.phone.as_generic_type(),
+        )
 
     def _filter_items(self, items: list[ContactEntity], filters: ContactFilters) -> list[ContactEntity]:
         result = list(items)
@@ -42,14 +64,8 @@ class DummyInMemoryContactRepository(BaseContactRepository):
                 c for c in result if c.phone.as_generic_type() and phone_lower in c.phone.as_generic_type().lower()
             ]
         if filters.search:
-            search_lower = filters.search.lower()
-            result = [
-                c
-                for c in result
-                if search_lower in c.name.as_generic_type().lower()
-                or (c.email.as_generic_type() and search_lower in c.email.as_generic_type().lower())
-                or (c.phone.as_generic_type() and search_lower in c.phone.as_generic_type().lower())
-            ]
+            matches = self._search_index.search(filters.search, filters.search_mode)
+            result = [c for c in result if c.oid in matches]
         if filters.created_at_from:
             result = [c for c in result if c.created_at >= filters.created_at_from]
         if filters.created_at_to:
@@ -59,6 +75,18 @@ class DummyInMemoryContactRepository(BaseContactRepository):
 
     async def add(self, contact: ContactEntity) -> None:
         self._saved_contacts.append(contact)
+        self._index(contact)
+
+    async def add_many(self, contacts: Sequence[ContactEntity]) -> set[UUID]:
+        existing = {contact.oid for contact in self._saved_contacts}
+        inserted = set()
+        for contact in contacts:
+            if contact.oid in existing:
+                continue
+            await self.add(contact)
+            existing.add(contact.oid)
+            inserted.add(contact.oid)
+        return inserted
 
     async def get_by_id(self, contact_id: UUID) -> ContactEntity | None:
         try:
@@ -66,8 +94,17 @@ class DummyInMemoryContactRepository(BaseContactRepository):
         except StopIteration:
             return None
 
+    async def get_existing_ids(self, organization_id: UUID, contact_ids: Iterable[UUID]) -> set[UUID]:
+        contact_ids = set(contact_ids)
+        return {
+            contact.oid
+            for contact in self._saved_contacts
+            if contact.organization_id == organization_id and contact.oid in contact_ids
+        }
+
     async def delete(self, contact_id: UUID) -> None:
         self._saved_contacts = [contact for contact in self._saved_contacts if contact.oid != contact_id]
+        self._search_index.remove(contact_id)
 
     async def get_list(
         self,
@@ -75,10 +112,8 @@ class DummyInMemoryContactRepository(BaseContactRepository):
     ) -> Iterable[ContactEntity]:
         result = self._filter_items(self._saved_contacts, filters)
 
-        offset = (filters.page - 1) * filters.page_size
-        limit = filters.page_size
-
-        return result[offset : offset + limit]
+        ranks = self._search_index.search(filters.search, filters.search_mode) if filters.is_ranked else None
+        return paginate(result, filters, ranks)
 
     async def get_count(
         self,
@@ -86,3 +121,15 @@ class DummyInMemoryContactRepository(BaseContactRepository):
     ) -> int:
         result = self._filter_items(self._saved_contacts, filters)
         return len(result)
+
+    async def stream(self, filters: ContactFilters) -> AsyncIterator[ContactEntity]:
+        for item in sort_items(self._filter_items(self._saved_contacts, filters), filters):
+            yield item
+
+    async def get_list_with_count(
+        self,
+        filters: ContactFilters,
+    ) -> tuple[list[ContactEntity], int]:
+        result = self._filter_items(self._saved_contacts, filters)
+        ranks = self._search_index.search(filters.search, filters.search_mode) if filters.is_ranked else None
+        return paginate(result, filters, ranks), len(result)
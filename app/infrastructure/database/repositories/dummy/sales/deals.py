@@ -1,22 +1,51 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Sequence,
+)
 from dataclasses import (
     dataclass,
     field,
+    replace,
 )
+from datetime import datetime
 from uuid import UUID
 
+from infrastructure.database.repositories.dummy.pagination import (
+    paginate,
+    sort_items,
+)
+from infrastructure.database.repositories.dummy.search import InMemoryTrigramIndex
+
+from domain.base.exceptions import ConcurrentUpdateException
+from domain.sales.aggregates.analytics import (
+    DealStageAggregate,
+    DealStatusAggregate,
+)
 from domain.sales.entities.deals import DealEntity
 from domain.sales.filters.deals import DealFilters
 from domain.sales.interfaces.repositories.deals import BaseDealRepository
-from domain.sales.value_objects.deals import DealStatus
+from domain.sales.value_objects.deals import (
+    DealStage,
+    DealStageValueObject,
+    DealStatus,
+    DealStatusValueObject,
+)
 
 
 @dataclass
 class DummyInMemoryDealRepository(BaseDealRepository):
+    """Хранит и отдает копии сделок, как строки базы: изменение
+    прочитанной сущности не видно репозиторию до update."""
+
     _saved_deals: list[DealEntity] = field(
         default_factory=list,
         kw_only=True,
     )
+    _search_index: InMemoryTrigramIndex = field(
+        default_factory=InMemoryTrigramIndex,
+        init=False,
+    )
 
     def _filter_items(self, items: list[DealEntity], filters: DealFilters) -> list[DealEntity]:
         result = list(items)
@@ -47,8 +76,8 @@ class DummyInMemoryDealRepository(BaseDealRepository):
         if filters.updated_at_to:
             result = [d for d in result if d.updated_at <= filters.updated_at_to]
         if filters.search:
-            search_lower = filters.search.lower()
-            result = [d for d in result if search_lower in d.title.as_generic_type().lower()]
+            matches = self._search_index.search(filters.search, filters.search_mode)
+            result = [d for d in result if d.oid in matches]
         if filters.created_at_from:
             result = [d for d in result if d.created_at >= filters.created_at_from]
         if filters.created_at_to:
@@ -57,22 +86,66 @@ class DummyInMemoryDealRepository(BaseDealRepository):
         return result
 
     async def add(self, deal: DealEntity) -> None:
-        self._saved_deals.append(deal)
+        self._saved_deals.append(replace(deal))
+        self._search_index.add(deal.oid, deal.title.as_generic_type())
+
+    async def add_many(self, deals: Sequence[DealEntity]) -> set[UUID]:
+        existing = {deal.oid for deal in self._saved_deals}
+        inserted = set()
+        for deal in deals:
+            if deal.oid in existing:
+                continue
+            await self.add(deal)
+            existing.add(deal.oid)
+            inserted.add(deal.oid)
+        return inserted
 
     async def get_by_id(self, deal_id: UUID) -> DealEntity | None:
         try:
-            return next(deal for deal in self._saved_deals if deal.oid == deal_id)
+            return next(replace(deal) for deal in self._saved_deals if deal.oid == deal_id)
         except StopIteration:
             return None
 
-    async def update(self, deal: DealEntity) -> None:
+    async def get_by_ids(self, deal_ids: Sequence[UUID]) -> list[DealEntity]:
+        ids = set(deal_ids)
+        return [replace(deal) for deal in self._saved_deals if deal.oid in ids]
+
+    def _replace_unchanged(self, deal: DealEntity, updated_at: datetime) -> None:
+        """Аналог условного UPDATE: запись заменяется, только если ее версия
+        совпадает с прочитанной в deal."""
         for i, saved_deal in enumerate(self._saved_deals):
-            if saved_deal.oid == deal.oid:
-                self._saved_deals[i] = deal
+            if saved_deal.oid == deal.oid and saved_deal.version == deal.version:
+                deal.version += 1
+                deal.updated_at = updated_at
+                self._saved_deals[i] = replace(deal)
+                self._search_index.add(deal.oid, deal.title.as_generic_type())
                 return
+        raise ConcurrentUpdateException(resource_type="Deal", resource_id=deal.oid)
+
+    async def update(self, deal: DealEntity) -> None:
+        self._replace_unchanged(deal, datetime.now())
+
+    async def update_many(
+        self,
+        deals: Sequence[DealEntity],
+        status: DealStatus | None = None,
+        stage: DealStage | None = None,
+    ) -> None:
+        versions = {deal.oid: deal.version for deal in self._saved_deals}
+        for deal in deals:
+            if versions.get(deal.oid) != deal.version:
+                raise ConcurrentUpdateException(resource_type="Deal", resource_id=deal.oid)
+
+        updated_at = datetime.now()
+        for deal in deals:
+            if status is not None:
+                deal.status = DealStatusValueObject(status.value)
+            if stage is not None:
+                deal.stage = DealStageValueObject(stage.value)
+            self._replace_unchanged(deal, updated_at)
 
     async def get_by_contact_id(self, contact_id: UUID) -> list[DealEntity]:
-        return [deal for deal in self._saved_deals if deal.contact_id == contact_id]
+        return [replace(deal) for deal in self._saved_deals if deal.contact_id == contact_id]
 
     async def get_list(
         self,
@@ -80,10 +153,8 @@ class DummyInMemoryDealRepository(BaseDealRepository):
     ) -> Iterable[DealEntity]:
         result = self._filter_items(self._saved_deals, filters)
 
-        offset = (filters.page - 1) * filters.page_size
-        limit = filters.page_size
-
-        return result[offset : offset + limit]
+        ranks = self._search_index.search(filters.search, filters.search_mode) if filters.is_ranked else None
+        return [replace(deal) for deal in paginate(result, filters, ranks)]
 
     async def get_count(
         self,
@@ -92,6 +163,18 @@ class DummyInMemoryDealRepository(BaseDealRepository):
         result = self._filter_items(self._saved_deals, filters)
         return len(result)
 
+    async def stream(self, filters: DealFilters) -> AsyncIterator[DealEntity]:
+        for item in sort_items(self._filter_items(self._saved_deals, filters), filters):
+            yield replace(item)
+
+    async def get_list_with_count(
+        self,
+        filters: DealFilters,
+    ) -> tuple[list[DealEntity], int]:
+        result = self._filter_items(self._saved_deals, filters)
+        ranks = self._search_index.search(filters.search, filters.search_mode) if filters.is_ranked else None
+        return [replace(deal) for deal in paginate(result, filters, ranks)], len(result)
+
     async def get_total_amount(
         self,
         organization_id: UUID,
@@ -106,3 +189,33 @@ class DummyInMemoryDealRepository(BaseDealRepository):
             filters.owner_id = user_id
         result = self._filter_items(self._saved_deals, filters)
         return sum(deal.amount.as_generic_type() for deal in result)
+
+    async def get_status_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStatus, DealStatusAggregate]:
+        result: dict[DealStatus, DealStatusAggregate] = {}
+        for deal in self._filter_items(self._saved_deals, filters):
+            status = deal.status.as_generic_type()
+            aggregate = result.get(status, DealStatusAggregate(status=status))
+            result[status] = DealStatusAggregate(
+                status=status,
+                count=aggregate.count + 1,
+                amount=aggregate.amount + deal.amount.as_generic_type(),
+            )
+        return result
+
+    async def get_stage_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStage, DealStageAggregate]:
+        result: dict[DealStage, DealStageAggregate] = {}
+        for deal in self._filter_items(self._saved_deals, filters):
+            stage = deal.stage.as_generic_type()
+            aggregate = result.get(stage, DealStageAggregate(stage=stage))
+            result[stage] = DealStageAggregate(
+                stage=stage,
+                count=aggregate.count + 1,
+                amount=aggregate.amount + deal.amount.as_generic_type(),
+            )
+        return result
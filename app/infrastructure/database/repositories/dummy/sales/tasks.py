@@ -1,10 +1,22 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from dataclasses import (
     dataclass,
     field,
+    replace,
 )
+from datetime import datetime
 from uuid import UUID
 
+from infrastructure.database.repositories.dummy.pagination import (
+    paginate,
+    sort_items,
+)
+from infrastructure.database.repositories.dummy.search import InMemoryTrigramIndex
+
+from domain.base.exceptions import ConcurrentUpdateException
 from domain.sales.entities.tasks import TaskEntity
 from domain.sales.filters.tasks import TaskFilters
 from domain.sales.interfaces.repositories.tasks import BaseTaskRepository
@@ -12,10 +24,23 @@ from domain.sales.interfaces.repositories.tasks import BaseTaskRepository
 
 @dataclass
 class DummyInMemoryTaskRepository(BaseTaskRepository):
+    """Как и репозиторий сделок, хранит и отдает копии задач."""
+
     _saved_tasks: list[TaskEntity] = field(
         default_factory=list,
         kw_only=True,
     )
+    _search_index: InMemoryTrigramIndex = field(
+        default_factory=InMemoryTrigramIndex,
+        init=False,
+    )
+
+    def _index(self, task: TaskEntity) -> None:
+        self._search_index.add(
+            task.oid,
+            task.title.as_generic_type(),
+            task.description.as_generic_type(),
+        )
 
     def _filter_items(self, items: list[TaskEntity], filters: TaskFilters) -> list[TaskEntity]:
         result = list(items)
@@ -40,13 +65,8 @@ class DummyInMemoryTaskRepository(BaseTaskRepository):
                 t for t in result if t.due_date.as_generic_type() and t.due_date.as_generic_type() >= filters.due_after
             ]
         if filters.search:
-            search_lower = filters.search.lower()
-            result = [
-                t
-                for t in result
-                if search_lower in t.title.as_generic_type().lower()
-                or (t.description.as_generic_type() and search_lower in t.description.as_generic_type().lower())
-            ]
+            matches = self._search_index.search(filters.search, filters.search_mode)
+            result = [t for t in result if t.oid in matches]
         if filters.created_at_from:
             result = [t for t in result if t.created_at >= filters.created_at_from]
         if filters.created_at_to:
@@ -55,19 +75,24 @@ class DummyInMemoryTaskRepository(BaseTaskRepository):
         return result
 
     async def add(self, task: TaskEntity) -> None:
-        self._saved_tasks.append(task)
+        self._saved_tasks.append(replace(task))
+        self._index(task)
 
     async def get_by_id(self, task_id: UUID) -> TaskEntity | None:
         try:
-            return next(task for task in self._saved_tasks if task.oid == task_id)
+            return next(replace(task) for task in self._saved_tasks if task.oid == task_id)
         except StopIteration:
             return None
 
     async def update(self, task: TaskEntity) -> None:
         for i, saved_task in enumerate(self._saved_tasks):
-            if saved_task.oid == task.oid:
-                self._saved_tasks[i] = task
+            if saved_task.oid == task.oid and saved_task.version == task.version:
+                task.version += 1
+                task.updated_at = datetime.now()
+                self._saved_tasks[i] = replace(task)
+                self._index(task)
                 return
+        raise ConcurrentUpdateException(resource_type="Task", resource_id=task.oid)
 
     async def get_list(
         self,
@@ -75,10 +100,8 @@ class DummyInMemoryTaskRepository(BaseTaskRepository):
     ) -> Iterable[TaskEntity]:
         result = self._filter_items(self._saved_tasks, filters)
 
-        offset = (filters.page - 1) * filters.page_size
-        limit = filters.page_size
-
-        return result[offset : offset + limit]
+        ranks = self._search_index.search(filters.search, filters.search_mode) if filters.is_ranked else None
+        return [replace(task) for task in paginate(result, filters, ranks)]
 
     async def get_count(
         self,
@@ -86,3 +109,15 @@ class DummyInMemoryTaskRepository(BaseTaskRepository):
     ) -> int:
         result = self._filter_items(self._saved_tasks, filters)
         return len(result)
+
+    async def stream(self, filters: TaskFilters) -> AsyncIterator[TaskEntity]:
+        for item in sort_items(self._filter_items(self._saved_tasks, filters), filters):
+            yield replace(item)
+
+    async def get_list_with_count(
+        self,
+        filters: TaskFilters,
+    ) -> tuple[list[TaskEntity], int]:
+        result = self._filter_items(self._saved_tasks, filters)
+        ranks = self._search_index.search(filters.search, filters.search_mode) if filters.is_ranked else None
+        return [replace(task) for task in paginate(result, filters, ranks)], len(result)
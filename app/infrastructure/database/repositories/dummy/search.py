@@ -0,0 +1,107 @@
+import re
+from collections import defaultdict
+from dataclasses import (
+    dataclass,
+    field,
+)
+from uuid import UUID
+
+from domain.base.filters import SearchMode
+
+
+# Порог pg_trgm.word_similarity_threshold по умолчанию
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _word_trigrams(text: str) -> list[str]:
+    """Упорядоченные триграммы строки так же, как их строит pg_trgm: каждое
+    слово в нижнем регистре дополняется двумя пробелами слева и одним
+    справа."""
+    trigrams = []
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        trigrams.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def _substring_trigrams(text: str) -> set[str]:
+    lowered = text.lower()
+    return {lowered[i : i + 3] for i in range(len(lowered) - 2)}
+
+
+def word_similarity(search: str, text: str) -> float:
+    """Аналог pg_trgm word_similarity: наибольшее сходство множества
+    триграмм строки поиска с непрерывным отрезком триграмм текста."""
+    search_trigrams = set(_word_trigrams(search))
+    text_trigrams = _word_trigrams(text)
+    if not search_trigrams or not text_trigrams:
+        return 0.0
+
+    best = 0.0
+    for start in range(len(text_trigrams)):
+        if text_trigrams[start] not in search_trigrams:
+            continue
+        extent: set[str] = set()
+        for trigram in text_trigrams[start:]:
+            extent.add(trigram)
+            common = len(search_trigrams & extent)
+            best = max(best, common / (len(search_trigrams) + len(extent) - common))
+    return best
+
+
+@dataclass
+class InMemoryTrigramIndex:
+    """Инвертированный индекс триграмм для dummy-репозиториев.
+
+    Повторяет поведение TrigramSearchBackend: кандидаты отбираются по
+    индексу, а затем проверяются тем же условием, что и в PostgreSQL.
+
+    """
+
+    _texts: dict[UUID, list[str]] = field(default_factory=dict)
+    _substring_index: dict[str, set[UUID]] = field(default_factory=lambda: defaultdict(set))
+    _word_index: dict[str, set[UUID]] = field(default_factory=lambda: defaultdict(set))
+
+    def add(self, key: UUID, *texts: str | None) -> None:
+        self.remove(key)
+        values = [text for text in texts if text]
+        self._texts[key] = values
+        for text in values:
+            for trigram in _substring_trigrams(text):
+                self._substring_index[trigram].add(key)
+            for trigram in _word_trigrams(text):
+                self._word_index[trigram].add(key)
+
+    def remove(self, key: UUID) -> None:
+        if self._texts.pop(key, None) is None:
+            return
+        for keys in self._substring_index.values():
+            keys.discard(key)
+        for keys in self._word_index.values():
+            keys.discard(key)
+
+    def _candidates(self, search: str, mode: SearchMode) -> set[UUID]:
+        if mode == SearchMode.SIMILARITY:
+            return set().union(*(self._word_index.get(trigram, set()) for trigram in _word_trigrams(search)))
+
+        trigrams = _substring_trigrams(search)
+        if not trigrams:
+            # Строки короче трех символов индексом не покрываются
+            return set(self._texts)
+        return set.intersection(*(self._substring_index.get(trigram, set()) for trigram in trigrams))
+
+    def search(self, search: str, mode: SearchMode) -> dict[UUID, float]:
+        """Возвращает подходящие ключи и их релевантность."""
+        result: dict[UUID, float] = {}
+        search_lower = search.lower()
+        for key in self._candidates(search, mode):
+            texts = self._texts[key]
+            if mode == SearchMode.SIMILARITY:
+                rank = max((word_similarity(search, text) for text in texts), default=0.0)
+                if rank >= WORD_SIMILARITY_THRESHOLD:
+                    result[key] = rank
+            elif any(search_lower in text.lower() for text in texts):
+                result[key] = 1.0
+        return result
@@ -0,0 +1,48 @@
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+)
+from contextlib import asynccontextmanager
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Any
+
+from infrastructure.database.repositories.dummy.outbox import DummyInMemoryEventOutbox
+
+from application.base.outbox import BaseEventOutbox
+from application.base.unit_of_work import BaseUnitOfWork
+from domain.base.events import collect_events
+
+
+@dataclass
+class DummyUnitOfWork(BaseUnitOfWork):
+    event_outbox: BaseEventOutbox = field(default_factory=DummyInMemoryEventOutbox)
+
+    @asynccontextmanager
+    async def begin(
+        self,
+        read_only: bool = False,
+        pool: str | None = None,
+        statement_timeout: float | None = None,
+    ) -> AsyncGenerator[None, Any]:
+        with collect_events() as events:
+            yield
+        if events and not read_only:
+            await self.event_outbox.add(events)
+
+    def requires_primary(self) -> bool:
+        return False
+
+    def max_read_lag(self) -> float:
+        return 0.0
+
+    def detach(self) -> None:
+        # Общей сессии нет - отвязывать нечего
+        pass
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        # Транзакций нет: изменения in-memory репозиториев видны сразу
+        await callback()
@@ -0,0 +1,39 @@
+from collections.abc import AsyncIterator
+
+from infrastructure.database.models.base import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    QueryableAttribute,
+    raiseload,
+    selectinload,
+)
+from sqlalchemy.sql import Select
+
+
+# Сколько строк серверный курсор отдает за одну выборку при потоковом чтении
+STREAM_BATCH_SIZE = 1000
+
+
+def select_entity(model: type[BaseModel], *relationships: QueryableAttribute) -> Select:
+    """SELECT строк модели с явно заданным графом загрузки.
+
+    Связи в моделях объявлены с lazy="raise": обращение к незагруженной связи
+    - ошибка, а не скрытый запрос. Каждый метод репозитория сам перечисляет
+    нужные ему связи, они подгружаются на один уровень; остальные отключены.
+
+    """
+    options = [selectinload(relationship).raiseload("*") for relationship in relationships]
+    return select(model).options(raiseload("*"), *options)
+
+
+async def stream_models(session: AsyncSession, stmt: Select) -> AsyncIterator[BaseModel]:
+    """Строки запроса через серверный курсор, пачками по STREAM_BATCH_SIZE.
+
+    Identity map сессии держит объекты по слабым ссылкам, поэтому уже
+    отданные строки освобождаются и память не растет с размером выборки.
+
+    """
+    result = await session.stream_scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for model in result:
+        yield model
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from infrastructure.cache import TTLCache
+
+from domain.organizations.entities import (
+    OrganizationEntity,
+    OrganizationMemberEntity,
+)
+from domain.organizations.interfaces.repositories.members import BaseOrganizationMemberRepository
+
+
+class OrganizationMemberCache(TTLCache[tuple[UUID, UUID], OrganizationMemberEntity]):
+    """Кэш членства по (organization_id, user_id)."""
+
+
+@dataclass
+class CachedOrganizationMemberRepository(BaseOrganizationMemberRepository):
+    """Кэширует проверку членства, которая выполняется на каждом запросе к
+    API организации.
+
+    Кэшируются только найденные участники: отсутствие членства не
+    запоминается, поэтому добавленный участник сразу получает доступ.
+    Любая запись через репозиторий сбрасывает запись кэша.
+
+    """
+
+    repository: BaseOrganizationMemberRepository
+    cache: OrganizationMemberCache
+
+    async def add(self, member: OrganizationMemberEntity) -> None:
+        await self.repository.add(member)
+        self.cache.invalidate((member.organization_id, member.user_id))
+
+    async def get_by_id(self, member_id: UUID) -> OrganizationMemberEntity | None:
+        return await self.repository.get_by_id(member_id)
+
+    async def get_by_organization_and_user(
+        self,
+        organization_id: UUID,
+        user_id: UUID,
+    ) -> OrganizationMemberEntity | None:
+        key = (organization_id, user_id)
+        member = self.cache.get(key)
+        if member is not None:
+            return member
+
+        member = await self.repository.get_by_organization_and_user(
+            organization_id=organization_id,
+            user_id=user_id,
+        )
+        if member is not None:
+            self.cache.set(key, member)
+        return member
+
+    async def get_by_user(
+        self,
+        user_id: UUID,
+    ) -> tuple[list[OrganizationMemberEntity], dict[UUID, OrganizationEntity]]:
+        return await self.repository.get_by_user(user_id)
@@ -7,15 +7,16 @@ from infrastructure.database.converters.organizations.member import (
 )
 from infrastructure.database.converters.organizations.organization import organization_model_to_entity
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
 from infrastructure.database.models.organizations.member import OrganizationMemberModel
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from infrastructure.database.repositories.loading import select_entity
 
 from domain.organizations.entities.members import OrganizationMemberEntity
 from domain.organizations.entities.organizations import OrganizationEntity
 from domain.organizations.interfaces.repositories.members import BaseOrganizationMemberRepository
 
 
+@instrumented
 @dataclass
 class SQLAlchemyOrganizationMemberRepository(BaseOrganizationMemberRepository):
     database: Database
@@ -24,21 +25,14 @@ class SQLAlchemyOrganizationMemberRepository(BaseOrganizationMemberRepository):
         async with self.database.get_session() as session:
             member_model = organization_member_entity_to_model(member)
             session.add(member_model)
-            await session.commit()
+            await session.flush()
 
     async def get_by_id(
         self,
         member_id: UUID,
     ) -> OrganizationMemberEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(OrganizationMemberModel)
-                .where(OrganizationMemberModel.oid == member_id)
-                .options(
-                    selectinload(OrganizationMemberModel.organization),
-                    selectinload(OrganizationMemberModel.user),
-                )
-            )
+            stmt = select_entity(OrganizationMemberModel).where(OrganizationMemberModel.oid == member_id)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return organization_member_model_to_entity(result) if result else None
@@ -49,16 +43,9 @@ class SQLAlchemyOrganizationMemberRepository(BaseOrganizationMemberRepository):
         user_id: UUID,
     ) -> OrganizationMemberEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(OrganizationMemberModel)
-                .where(
-                    OrganizationMemberModel.organization_id == organization_id,
-                    OrganizationMemberModel.user_id == user_id,
-                )
-                .options(
-                    selectinload(OrganizationMemberModel.organization),
-                    selectinload(OrganizationMemberModel.user),
-                )
+            stmt = select_entity(OrganizationMemberModel).where(
+                OrganizationMemberModel.organization_id == organization_id,
+                OrganizationMemberModel.user_id == user_id,
             )
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
@@ -69,14 +56,10 @@ class SQLAlchemyOrganizationMemberRepository(BaseOrganizationMemberRepository):
         user_id: UUID,
     ) -> tuple[list[OrganizationMemberEntity], dict[UUID, OrganizationEntity]]:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(OrganizationMemberModel)
-                .where(OrganizationMemberModel.user_id == user_id)
-                .options(
-                    selectinload(OrganizationMemberModel.organization),
-                    selectinload(OrganizationMemberModel.user),
-                )
-            )
+            stmt = select_entity(
+                OrganizationMemberModel,
+                OrganizationMemberModel.organization,
+            ).where(OrganizationMemberModel.user_id == user_id)
             res = await session.execute(stmt)
             results = res.scalars().all()
 
@@ -6,14 +6,15 @@ from infrastructure.database.converters.organizations.organization import (
     organization_model_to_entity,
 )
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
 from infrastructure.database.models.organizations.organization import OrganizationModel
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from infrastructure.database.repositories.loading import select_entity
 
 from domain.organizations.entities.organizations import OrganizationEntity
 from domain.organizations.interfaces.repositories.organizations import BaseOrganizationRepository
 
 
+@instrumented
 @dataclass
 class SQLAlchemyOrganizationRepository(BaseOrganizationRepository):
     database: Database
@@ -22,17 +23,11 @@ class SQLAlchemyOrganizationRepository(BaseOrganizationRepository):
         async with self.database.get_session() as session:
             org_model = organization_entity_to_model(organization)
             session.add(org_model)
-            await session.commit()
+            await session.flush()
 
     async def get_by_id(self, organization_id: UUID) -> OrganizationEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(OrganizationModel)
-                .where(OrganizationModel.oid == organization_id)
-                .options(
-                    selectinload(OrganizationModel.members),
-                )
-            )
+            stmt = select_entity(OrganizationModel).where(OrganizationModel.oid == organization_id)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return organization_model_to_entity(result) if result else None
@@ -0,0 +1,92 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import (
+    datetime,
+    timedelta,
+)
+from uuid import UUID
+
+from infrastructure.database.converters.outbox import (
+    event_to_outbox_model,
+    outbox_model_to_event,
+)
+from infrastructure.database.gateways.pools import uses_pool
+from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
+from infrastructure.database.models.outbox import OutboxEventModel
+from infrastructure.database.repositories.bulk import insert_many
+from sqlalchemy import (
+    select,
+    update,
+)
+
+from application.base.outbox import BaseEventOutbox
+from application.base.unit_of_work import BACKGROUND_POOL
+from domain.base.events import BaseEvent
+
+
+@instrumented
+@dataclass
+class SQLAlchemyEventOutbox(BaseEventOutbox):
+    database: Database
+
+    async def add(self, events: Sequence[BaseEvent]) -> None:
+        async with self.database.get_session() as session:
+            await insert_many(session, [event_to_outbox_model(event) for event in events])
+
+    @uses_pool(BACKGROUND_POOL)
+    async def claim(self, limit: int, lease: float, max_attempts: int) -> list[BaseEvent]:
+        """UPDATE ... WHERE oid IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING:
+        несколько релеев разбирают outbox, не мешая друг другу и не забирая
+        одно событие дважды."""
+        now = datetime.now()
+        ready = (
+            select(OutboxEventModel.oid)
+            .where(
+                OutboxEventModel.published_at.is_(None),
+                OutboxEventModel.available_at <= now,
+                OutboxEventModel.attempts < max_attempts,
+            )
+            .order_by(OutboxEventModel.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OutboxEventModel)
+            .where(OutboxEventModel.oid.in_(ready.scalar_subquery()))
+            .values(
+                attempts=OutboxEventModel.attempts + 1,
+                available_at=now + timedelta(seconds=lease),
+                updated_at=now,
+            )
+            .returning(OutboxEventModel)
+            .execution_options(synchronize_session=False)
+        )
+        async with self.database.get_session() as session:
+            res = await session.execute(stmt)
+            models = sorted(res.scalars().all(), key=lambda model: model.occurred_at)
+            return [outbox_model_to_event(model) for model in models]
+
+    @uses_pool(BACKGROUND_POOL)
+    async def mark_published(self, event_ids: Sequence[UUID]) -> None:
+        now = datetime.now()
+        stmt = (
+            update(OutboxEventModel)
+            .where(OutboxEventModel.oid.in_(event_ids))
+            .values(published_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        async with self.database.get_session() as session:
+            await session.execute(stmt)
+
+    @uses_pool(BACKGROUND_POOL)
+    async def mark_failed(self, event_ids: Sequence[UUID], retry_delay: float) -> None:
+        now = datetime.now()
+        stmt = (
+            update(OutboxEventModel)
+            .where(OutboxEventModel.oid.in_(event_ids))
+            .values(available_at=now + timedelta(seconds=retry_delay), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        async with self.database.get_session() as session:
+            await session.execute(stmt)
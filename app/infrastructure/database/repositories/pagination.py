@@ -0,0 +1,84 @@
+import json
+
+from infrastructure.database.models.base import BaseModel
+from infrastructure.database.repositories.loading import select_entity
+from sqlalchemy import (
+    asc,
+    ColumnElement,
+    desc,
+    func,
+    literal,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from domain.base.cursor import PageCursor
+from domain.base.exceptions import InvalidPageCursorException
+from domain.base.filters import BaseFilters
+
+
+def order_by_sort_key(stmt: Select, model: type[BaseModel], filters: BaseFilters) -> Select:
+    """Сортировка по ключу фильтров, oid - для однозначности."""
+    direction = desc if filters.sort_descending else asc
+    return stmt.order_by(direction(getattr(model, filters.sort_key)), direction(model.oid))
+
+
+def paginate(stmt: Select, model: type[BaseModel], filters: BaseFilters) -> Select:
+    """Добавляет сортировку по ключу фильтров и ограничивает выборку
+    страницей: после курсора, если он передан, иначе через OFFSET."""
+    sort_column = getattr(model, filters.sort_key)
+    stmt = order_by_sort_key(stmt, model, filters)
+
+    if not filters.cursor:
+        offset = (filters.page - 1) * filters.page_size
+        return stmt.offset(offset).limit(filters.page_size)
+
+    if filters.is_ranked:
+        # Релевантность не хранится в курсоре - продолжить выдачу нельзя
+        raise InvalidPageCursorException(cursor=filters.cursor)
+
+    cursor = PageCursor.decode(filters.cursor, filters.sort_key, filters.sort_descending)
+    position = tuple_(sort_column, model.oid)
+    boundary = tuple_(literal(cursor.value, sort_column.type), literal(cursor.oid, model.oid.type))
+    stmt = stmt.where(position < boundary if filters.sort_descending else position > boundary)
+    return stmt.limit(filters.page_size)
+
+
+def paginate_with_total(
+    stmt: Select,
+    model: type[BaseModel],
+    filters: BaseFilters,
+    rank: ColumnElement[float] | None = None,
+) -> Select:
+    """Страница вместе с общим числом строк за один запрос.
+
+    Отфильтрованный запрос оборачивается в подзапрос с count(*) OVER (), а
+    сортировка, курсор и LIMIT применяются снаружи - так total считается по
+    всей выборке, а не по ее части после курсора. Строки результата -
+    (модель, total).
+
+    """
+    columns = [func.count().over().label("total")]
+    if rank is not None:
+        columns.append(rank.label("rank"))
+    filtered = stmt.add_columns(*columns).subquery()
+    entity = aliased(model, filtered)
+
+    page = select_entity(entity).add_columns(filtered.c.total)
+    if rank is not None:
+        page = page.order_by(filtered.c.rank.desc())
+    return paginate(page, entity, filters)
+
+
+async def estimate_count(session: AsyncSession, stmt: Select) -> int:
+    """Оценка числа строк запроса по статистике планировщика (pg_class,
+    pg_statistic) без его выполнения."""
+    connection = await session.connection()
+    compiled = stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    res = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = res.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -6,14 +7,16 @@ from infrastructure.database.converters.sales.activity import (
     activity_model_to_entity,
 )
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
 from infrastructure.database.models.sales.activity import ActivityModel
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from infrastructure.database.repositories.bulk import insert_many
+from infrastructure.database.repositories.loading import select_entity
 
 from domain.sales.entities.activities import ActivityEntity
 from domain.sales.interfaces.repositories.activities import BaseActivityRepository
 
 
+@instrumented
 @dataclass
 class SQLAlchemyActivityRepository(BaseActivityRepository):
     database: Database
@@ -22,18 +25,15 @@ class SQLAlchemyActivityRepository(BaseActivityRepository):
         async with self.database.get_session() as session:
             activity_model = activity_entity_to_model(activity)
             session.add(activity_model)
-            await session.commit()
+            await session.flush()
+
+    async def add_many(self, activities: Sequence[ActivityEntity]) -> None:
+        async with self.database.get_session() as session:
+            await insert_many(session, [activity_entity_to_model(activity) for activity in activities])
 
     async def get_by_id(self, activity_id: UUID) -> ActivityEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(ActivityModel)
-                .where(ActivityModel.oid == activity_id)
-                .options(
-                    selectinload(ActivityModel.deal),
-                    selectinload(ActivityModel.author),
-                )
-            )
+            stmt = select_entity(ActivityModel).where(ActivityModel.oid == activity_id)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return activity_model_to_entity(result) if result else None
@@ -41,12 +41,8 @@ class SQLAlchemyActivityRepository(BaseActivityRepository):
     async def get_by_deal_id(self, deal_id: UUID) -> list[ActivityEntity]:
         async with self.database.get_read_only_session() as session:
             stmt = (
-                select(ActivityModel)
+                select_entity(ActivityModel)
                 .where(ActivityModel.deal_id == deal_id)
-                .options(
-                    selectinload(ActivityModel.deal),
-                    selectinload(ActivityModel.author),
-                )
                 .order_by(ActivityModel.created_at.desc())
             )
             res = await session.execute(stmt)
@@ -1,4 +1,8 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Sequence,
+)
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -6,23 +10,46 @@ from infrastructure.database.converters.sales.contact import (
     contact_entity_to_model,
     contact_model_to_entity,
 )
+from infrastructure.database.gateways.pools import uses_pool
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
 from infrastructure.database.models.sales.contact import ContactModel
+from infrastructure.database.repositories.bulk import insert_many
+from infrastructure.database.repositories.loading import (
+    select_entity,
+    stream_models,
+)
+from infrastructure.database.repositories.pagination import (
+    estimate_count,
+    order_by_sort_key,
+    paginate,
+    paginate_with_total,
+)
+from infrastructure.database.repositories.writes import delete_by_id
+from infrastructure.database.search import BaseSearchBackend
 from sqlalchemy import (
+    ColumnElement,
     func,
     select,
 )
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import Select
 
+from application.base.unit_of_work import ANALYTICS_POOL
 from domain.sales.entities.contacts import ContactEntity
 from domain.sales.filters.contacts import ContactFilters
 from domain.sales.interfaces.repositories.contacts import BaseContactRepository
 
 
+@instrumented
 @dataclass
 class SQLAlchemyContactRepository(BaseContactRepository):
     database: Database
+    search_backend: BaseSearchBackend
+
+    def _search_columns(self) -> list[InstrumentedAttribute]:
+        return [ContactModel.name, ContactModel.email, ContactModel.phone]
 
     def _build_query(self, stmt: Select, filters: ContactFilters) -> Select:
         if filters.organization_id:
@@ -41,9 +68,11 @@ class SQLAlchemyContactRepository(BaseContactRepository):
             stmt = stmt.where(ContactModel.phone.ilike(f"%{filters.phone}%"))
         if filters.search:
             stmt = stmt.where(
-                (ContactModel.name.ilike(f"%{filters.search}%"))
-                | (ContactModel.email.ilike(f"%{filters.search}%"))
-                | (ContactModel.phone.ilike(f"%{filters.search}%")),
+                self.search_backend.build_condition(
+                    self._search_columns(),
+                    filters.search,
+                    filters.search_mode,
+                ),
             )
         if filters.created_at_from:
             stmt = stmt.where(ContactModel.created_at >= filters.created_at_from)
@@ -55,58 +84,99 @@ class SQLAlchemyContactRepository(BaseContactRepository):
         async with self.database.get_session() as session:
             contact_model = contact_entity_to_model(contact)
             session.add(contact_model)
-            await session.commit()
+            await session.flush()
+
+    async def add_many(self, contacts: Sequence[ContactEntity]) -> set[UUID]:
+        async with self.database.get_session() as session:
+            return await insert_many(session, [contact_entity_to_model(contact) for contact in contacts])
 
     async def get_by_id(self, contact_id: UUID) -> ContactEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(ContactModel)
-                .where(ContactModel.oid == contact_id)
-                .options(
-                    selectinload(ContactModel.organization),
-                    selectinload(ContactModel.owner),
-                    selectinload(ContactModel.deals),
-                )
-            )
+            stmt = select_entity(ContactModel).where(ContactModel.oid == contact_id)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return contact_model_to_entity(result) if result else None
 
+    async def get_existing_ids(self, organization_id: UUID, contact_ids: Iterable[UUID]) -> set[UUID]:
+        contact_ids = list(contact_ids)
+        if not contact_ids:
+            return set()
+        async with self.database.get_read_only_session() as session:
+            stmt = select(ContactModel.oid).where(
+                ContactModel.organization_id == organization_id,
+                ContactModel.oid.in_(contact_ids),
+            )
+            res = await session.execute(stmt)
+            return set(res.scalars().all())
+
     async def delete(self, contact_id: UUID) -> None:
         async with self.database.get_session() as session:
-            stmt = select(ContactModel).where(ContactModel.oid == contact_id)
-            res = await session.execute(stmt)
-            contact = res.scalar_one_or_none()
-            if contact:
-                await session.delete(contact)
-                await session.commit()
+            # Сделки контакта защищает внешний ключ ON DELETE RESTRICT, поэтому
+            # загружать их в unit of work перед удалением не нужно
+            await delete_by_id(session, ContactModel, contact_id)
+
+    def _build_rank(self, filters: ContactFilters) -> ColumnElement[float] | None:
+        if not filters.is_ranked:
+            return None
+        return self.search_backend.build_rank(self._search_columns(), filters.search)
+
+    async def _fetch_list(self, session: AsyncSession, filters: ContactFilters) -> list[ContactEntity]:
+        stmt = self._build_query(select_entity(ContactModel), filters)
+        rank = self._build_rank(filters)
+        if rank is not None:
+            stmt = stmt.order_by(rank.desc())
+        stmt = paginate(stmt, ContactModel, filters)
+
+        res = await session.execute(stmt)
+        return [contact_model_to_entity(row) for row in res.scalars().all()]
+
+    async def _fetch_count(self, session: AsyncSession, filters: ContactFilters) -> int:
+        stmt = self._build_query(select(func.count(ContactModel.oid)), filters)
+        res = await session.execute(stmt)
+        return res.scalar_one() or 0
 
     async def get_list(
         self,
         filters: ContactFilters,
     ) -> Iterable[ContactEntity]:
         async with self.database.get_read_only_session() as session:
-            stmt = select(ContactModel).options(
-                selectinload(ContactModel.organization),
-                selectinload(ContactModel.owner),
-                selectinload(ContactModel.deals),
-            )
-            stmt = self._build_query(stmt, filters)
-
-            offset = (filters.page - 1) * filters.page_size
-            stmt = stmt.offset(offset).limit(filters.page_size)
-
-            res = await session.execute(stmt)
-            results = res.scalars().all()
-            return [contact_model_to_entity(row) for row in results]
+            return await self._fetch_list(session, filters)
 
     async def get_count(
         self,
         filters: ContactFilters,
     ) -> int:
         async with self.database.get_read_only_session() as session:
-            stmt = select(func.count(ContactModel.oid))
-            stmt = self._build_query(stmt, filters)
+            return await self._fetch_count(session, filters)
 
+    @uses_pool(ANALYTICS_POOL)
+    async def stream(self, filters: ContactFilters) -> AsyncIterator[ContactEntity]:
+        async with self.database.get_stream_session() as session:
+            stmt = order_by_sort_key(self._build_query(select_entity(ContactModel), filters), ContactModel, filters)
+            async for model in stream_models(session, stmt):
+                yield contact_model_to_entity(model)
+
+    async def get_list_with_count(
+        self,
+        filters: ContactFilters,
+    ) -> tuple[list[ContactEntity], int]:
+        async with self.database.get_read_only_session() as session:
+            if filters.estimate_total:
+                contacts = await self._fetch_list(session, filters)
+                total = await estimate_count(session, self._build_query(select(ContactModel.oid), filters))
+                return contacts, max(total, len(contacts))
+
+            stmt = paginate_with_total(
+                self._build_query(select(ContactModel), filters),
+                ContactModel,
+                filters,
+                self._build_rank(filters),
+            )
             res = await session.execute(stmt)
-            return res.scalar_one() or 0
+            rows = res.all()
+            if rows:
+                return [contact_model_to_entity(model) for model, _ in rows], rows[0].total
+            if filters.page == 1 and not filters.cursor:
+                return [], 0
+            # Страница за пределами выборки: строк с total нет, считаем отдельно
+            return [], await self._fetch_count(session, filters)
@@ -1,4 +1,8 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+    Sequence,
+)
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -6,24 +10,67 @@ from infrastructure.database.converters.sales.deal import (
     deal_entity_to_model,
     deal_model_to_entity,
 )
+from infrastructure.database.gateways.pools import uses_pool
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
 from infrastructure.database.models.sales.deal import DealModel
+from infrastructure.database.repositories.bulk import insert_many
+from infrastructure.database.repositories.loading import (
+    select_entity,
+    stream_models,
+)
+from infrastructure.database.repositories.pagination import (
+    estimate_count,
+    order_by_sort_key,
+    paginate,
+    paginate_with_total,
+)
+from infrastructure.database.repositories.writes import (
+    update_if_unchanged,
+    update_many_if_unchanged,
+)
+from infrastructure.database.search import BaseSearchBackend
 from sqlalchemy import (
+    any_,
+    bindparam,
+    ColumnElement,
     func,
     select,
 )
-from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    UUID as UUIDType,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import BindParameter
 
+from application.base.unit_of_work import ANALYTICS_POOL
+from domain.base.exceptions import ConcurrentUpdateException
+from domain.sales.aggregates.analytics import (
+    DealStageAggregate,
+    DealStatusAggregate,
+)
 from domain.sales.entities.deals import DealEntity
 from domain.sales.filters.deals import DealFilters
 from domain.sales.interfaces.repositories.deals import BaseDealRepository
-from domain.sales.value_objects.deals import DealStatus
+from domain.sales.value_objects.deals import (
+    DealStage,
+    DealStatus,
+)
+
 
+def _uuid_array(ids: Sequence[UUID]) -> BindParameter:
+    """Список oid одним параметром-массивом: oid = ANY(:ids) не меняет
+    текст запроса в зависимости от размера набора, в отличие от IN (...)."""
+    return bindparam("deal_ids", list(ids), type_=ARRAY(UUIDType(as_uuid=True)))
 
+
+@instrumented
 @dataclass
 class SQLAlchemyDealRepository(BaseDealRepository):
     database: Database
+    search_backend: BaseSearchBackend
 
     def _build_query(self, stmt: Select, filters: DealFilters) -> Select:
         if filters.organization_id:
@@ -52,7 +99,13 @@ class SQLAlchemyDealRepository(BaseDealRepository):
         if filters.updated_at_to:
             stmt = stmt.where(DealModel.updated_at <= filters.updated_at_to)
         if filters.search:
-            stmt = stmt.where(DealModel.title.ilike(f"%{filters.search}%"))
+            stmt = stmt.where(
+                self.search_backend.build_condition(
+                    [DealModel.title],
+                    filters.search,
+                    filters.search_mode,
+                ),
+            )
         if filters.created_at_from:
             stmt = stmt.where(DealModel.created_at >= filters.created_at_from)
         if filters.created_at_to:
@@ -63,98 +116,144 @@ class SQLAlchemyDealRepository(BaseDealRepository):
         async with self.database.get_session() as session:
             deal_model = deal_entity_to_model(deal)
             session.add(deal_model)
-            await session.commit()
+            await session.flush()
+
+    async def add_many(self, deals: Sequence[DealEntity]) -> set[UUID]:
+        async with self.database.get_session() as session:
+            return await insert_many(session, [deal_entity_to_model(deal) for deal in deals])
 
     async def get_by_id(self, deal_id: UUID) -> DealEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(DealModel)
-                .where(DealModel.oid == deal_id)
-                .options(
-                    selectinload(DealModel.organization),
-                    selectinload(DealModel.contact),
-                    selectinload(DealModel.owner),
-                    selectinload(DealModel.tasks),
-                    selectinload(DealModel.activities),
-                )
-            )
+            stmt = select_entity(DealModel).where(DealModel.oid == deal_id)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return deal_model_to_entity(result) if result else None
 
+    async def get_by_ids(self, deal_ids: Sequence[UUID]) -> list[DealEntity]:
+        async with self.database.get_read_only_session() as session:
+            stmt = select_entity(DealModel).where(DealModel.oid == any_(_uuid_array(deal_ids)))
+            res = await session.execute(stmt)
+            return [deal_model_to_entity(row) for row in res.scalars().all()]
+
     async def update(self, deal: DealEntity) -> None:
         async with self.database.get_session() as session:
-            stmt = select(DealModel).where(DealModel.oid == deal.oid)
-            res = await session.execute(stmt)
-            deal_model = res.scalar_one_or_none()
-            if deal_model:
-                updated_model = deal_entity_to_model(deal)
-                deal_model.title = updated_model.title
-                deal_model.amount = updated_model.amount
-                deal_model.currency = updated_model.currency
-                deal_model.status = updated_model.status
-                deal_model.stage = updated_model.stage
-                deal_model.updated_at = updated_model.updated_at
-                await session.commit()
+            updated_at = await update_if_unchanged(
+                session,
+                DealModel,
+                oid=deal.oid,
+                version=deal.version,
+                values={
+                    "title": deal.title.as_generic_type(),
+                    "amount": deal.amount.as_generic_type(),
+                    "currency": deal.currency.as_generic_type(),
+                    "status": deal.status.as_generic_type().value,
+                    "stage": deal.stage.as_generic_type().value,
+                },
+            )
+        if updated_at is None:
+            raise ConcurrentUpdateException(resource_type="Deal", resource_id=deal.oid)
+        deal.version += 1
+        deal.updated_at = updated_at
+
+    async def update_many(
+        self,
+        deals: Sequence[DealEntity],
+        status: DealStatus | None = None,
+        stage: DealStage | None = None,
+    ) -> None:
+        values = {}
+        if status is not None:
+            values["status"] = status.value
+        if stage is not None:
+            values["stage"] = stage.value
+        if not deals or not values:
+            return
+
+        async with self.database.get_session() as session:
+            updated, updated_at = await update_many_if_unchanged(
+                session,
+                DealModel,
+                versions={deal.oid: deal.version for deal in deals},
+                values=values,
+            )
+        for deal in deals:
+            if deal.oid not in updated:
+                raise ConcurrentUpdateException(resource_type="Deal", resource_id=deal.oid)
+            deal.version += 1
+            deal.updated_at = updated_at
 
     async def get_by_contact_id(self, contact_id: UUID) -> list[DealEntity]:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(DealModel)
-                .where(DealModel.contact_id == contact_id)
-                .options(
-                    selectinload(DealModel.organization),
-                    selectinload(DealModel.contact),
-                    selectinload(DealModel.owner),
-                    selectinload(DealModel.tasks),
-                    selectinload(DealModel.activities),
-                )
-            )
+            stmt = select_entity(DealModel).where(DealModel.contact_id == contact_id)
             res = await session.execute(stmt)
             results = res.scalars().all()
             return [deal_model_to_entity(row) for row in results]
 
+    def _build_rank(self, filters: DealFilters) -> ColumnElement[float] | None:
+        if not filters.is_ranked:
+            return None
+        return self.search_backend.build_rank([DealModel.title], filters.search)
+
+    async def _fetch_list(self, session: AsyncSession, filters: DealFilters) -> list[DealEntity]:
+        stmt = self._build_query(select_entity(DealModel), filters)
+        rank = self._build_rank(filters)
+        if rank is not None:
+            stmt = stmt.order_by(rank.desc())
+        stmt = paginate(stmt, DealModel, filters)
+
+        res = await session.execute(stmt)
+        return [deal_model_to_entity(row) for row in res.scalars().all()]
+
+    async def _fetch_count(self, session: AsyncSession, filters: DealFilters) -> int:
+        stmt = self._build_query(select(func.count(DealModel.oid)), filters)
+        res = await session.execute(stmt)
+        return res.scalar_one() or 0
+
     async def get_list(
         self,
         filters: DealFilters,
     ) -> Iterable[DealEntity]:
         async with self.database.get_read_only_session() as session:
-            stmt = select(DealModel).options(
-                selectinload(DealModel.organization),
-                selectinload(DealModel.contact),
-                selectinload(DealModel.owner),
-                selectinload(DealModel.tasks),
-                selectinload(DealModel.activities),
-            )
-            stmt = self._build_query(stmt, filters)
-
-            if filters.order_by:
-                order_column = getattr(DealModel, filters.order_by, None)
-                if order_column:
-                    if filters.order == "desc":
-                        stmt = stmt.order_by(order_column.desc())
-                    else:
-                        stmt = stmt.order_by(order_column.asc())
-            else:
-                stmt = stmt.order_by(DealModel.created_at.desc())
-
-            offset = (filters.page - 1) * filters.page_size
-            stmt = stmt.offset(offset).limit(filters.page_size)
-
-            res = await session.execute(stmt)
-            results = res.scalars().all()
-            return [deal_model_to_entity(row) for row in results]
+            return await self._fetch_list(session, filters)
 
     async def get_count(
         self,
         filters: DealFilters,
     ) -> int:
         async with self.database.get_read_only_session() as session:
-            stmt = select(func.count(DealModel.oid))
-            stmt = self._build_query(stmt, filters)
+            return await self._fetch_count(session, filters)
 
+    @uses_pool(ANALYTICS_POOL)
+    async def stream(self, filters: DealFilters) -> AsyncIterator[DealEntity]:
+        async with self.database.get_stream_session() as session:
+            stmt = order_by_sort_key(self._build_query(select_entity(DealModel), filters), DealModel, filters)
+            async for model in stream_models(session, stmt):
+                yield deal_model_to_entity(model)
+
+    async def get_list_with_count(
+        self,
+        filters: DealFilters,
+    ) -> tuple[list[DealEntity], int]:
+        async with self.database.get_read_only_session() as session:
+            if filters.estimate_total:
+                deals = await self._fetch_list(session, filters)
+                total = await estimate_count(session, self._build_query(select(DealModel.oid), filters))
+                return deals, max(total, len(deals))
+
+            stmt = paginate_with_total(
+                self._build_query(select(DealModel), filters),
+                DealModel,
+                filters,
+                self._build_rank(filters),
+            )
             res = await session.execute(stmt)
-            return res.scalar_one() or 0
+            rows = res.all()
+            if rows:
+                return [deal_model_to_entity(model) for model, _ in rows], rows[0].total
+            if filters.page == 1 and not filters.cursor:
+                return [], 0
+            # Страница за пределами выборки: строк с total нет, считаем отдельно
+            return [], await self._fetch_count(session, filters)
 
     async def get_total_amount(
         self,
@@ -172,3 +271,47 @@ class SQLAlchemyDealRepository(BaseDealRepository):
             res = await session.execute(stmt)
             result = res.scalar_one()
             return float(result) if result else 0.0
+
+    async def get_status_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStatus, DealStatusAggregate]:
+        async with self.database.get_read_only_session() as session:
+            stmt = select(
+                DealModel.status,
+                func.count(DealModel.oid),
+                func.coalesce(func.sum(DealModel.amount), 0),
+            ).group_by(DealModel.status)
+            stmt = self._build_query(stmt, filters)
+
+            res = await session.execute(stmt)
+            return {
+                DealStatus(status): DealStatusAggregate(
+                    status=DealStatus(status),
+                    count=count,
+                    amount=float(amount),
+                )
+                for status, count, amount in res.all()
+            }
+
+    async def get_stage_aggregates(
+        self,
+        filters: DealFilters,
+    ) -> dict[DealStage, DealStageAggregate]:
+        async with self.database.get_read_only_session() as session:
+            stmt = select(
+                DealModel.stage,
+                func.count(DealModel.oid),
+                func.coalesce(func.sum(DealModel.amount), 0),
+            ).group_by(DealModel.stage)
+            stmt = self._build_query(stmt, filters)
+
+            res = await session.execute(stmt)
+            return {
+                DealStage(stage): DealStageAggregate(
+                    stage=DealStage(stage),
+                    count=count,
+                    amount=float(amount),
+                )
+                for stage, count, amount in res.all()
+            }
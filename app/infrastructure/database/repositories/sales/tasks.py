@@ -1,4 +1,7 @@
-from collections.abc import Iterable
+from collections.abc import (
+    AsyncIterator,
+    Iterable,
+)
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -6,24 +9,48 @@ from infrastructure.database.converters.sales.task import (
     task_entity_to_model,
     task_model_to_entity,
 )
+from infrastructure.database.gateways.pools import uses_pool
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
 from infrastructure.database.models.sales.deal import DealModel
 from infrastructure.database.models.sales.task import TaskModel
+from infrastructure.database.repositories.loading import (
+    select_entity,
+    stream_models,
+)
+from infrastructure.database.repositories.pagination import (
+    estimate_count,
+    order_by_sort_key,
+    paginate,
+    paginate_with_total,
+)
+from infrastructure.database.repositories.writes import update_if_unchanged
+from infrastructure.database.search import BaseSearchBackend
 from sqlalchemy import (
+    ColumnElement,
+    false,
     func,
     select,
 )
-from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import Select
 
+from application.base.unit_of_work import ANALYTICS_POOL
+from domain.base.exceptions import ConcurrentUpdateException
 from domain.sales.entities.tasks import TaskEntity
 from domain.sales.filters.tasks import TaskFilters
 from domain.sales.interfaces.repositories.tasks import BaseTaskRepository
 
 
+@instrumented
 @dataclass
 class SQLAlchemyTaskRepository(BaseTaskRepository):
     database: Database
+    search_backend: BaseSearchBackend
+
+    def _search_columns(self) -> list[InstrumentedAttribute]:
+        return [TaskModel.title, TaskModel.description]
 
     def _build_query(self, stmt: Select, filters: TaskFilters) -> Select:
         if filters.deal_id:
@@ -34,18 +61,27 @@ class SQLAlchemyTaskRepository(BaseTaskRepository):
             stmt = stmt.where(TaskModel.oid.in_(filters.ids))
         if filters.only_open is not None:
             if filters.only_open:
-                stmt = stmt.where(TaskModel.is_done.is_(False))
+                # Условие совпадает с предикатом частичного индекса ix_tasks_deal_id_due_date_open
+                stmt = stmt.where(TaskModel.is_done == false())
         if filters.is_done is not None:
             stmt = stmt.where(TaskModel.is_done == filters.is_done)
         if filters.due_before:
             stmt = stmt.where(TaskModel.due_date <= filters.due_before)
         if filters.due_after:
             stmt = stmt.where(TaskModel.due_date >= filters.due_after)
+        if filters.organization_id or filters.deal_owner_id:
+            stmt = stmt.join(DealModel)
         if filters.organization_id:
-            stmt = stmt.join(DealModel).where(DealModel.organization_id == filters.organization_id)
+            stmt = stmt.where(DealModel.organization_id == filters.organization_id)
+        if filters.deal_owner_id:
+            stmt = stmt.where(DealModel.owner_id == filters.deal_owner_id)
         if filters.search:
             stmt = stmt.where(
-                (TaskModel.title.ilike(f"%{filters.search}%")) | (TaskModel.description.ilike(f"%{filters.search}%")),
+                self.search_backend.build_condition(
+                    self._search_columns(),
+                    filters.search,
+                    filters.search_mode,
+                ),
             )
         if filters.created_at_from:
             stmt = stmt.where(TaskModel.created_at >= filters.created_at_from)
@@ -57,59 +93,96 @@ class SQLAlchemyTaskRepository(BaseTaskRepository):
         async with self.database.get_session() as session:
             task_model = task_entity_to_model(task)
             session.add(task_model)
-            await session.commit()
+            await session.flush()
 
     async def get_by_id(self, task_id: UUID) -> TaskEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = (
-                select(TaskModel)
-                .where(TaskModel.oid == task_id)
-                .options(
-                    selectinload(TaskModel.deal),
-                )
-            )
+            stmt = select_entity(TaskModel).where(TaskModel.oid == task_id)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return task_model_to_entity(result) if result else None
 
     async def update(self, task: TaskEntity) -> None:
         async with self.database.get_session() as session:
-            stmt = select(TaskModel).where(TaskModel.oid == task.oid)
-            res = await session.execute(stmt)
-            task_model = res.scalar_one_or_none()
-            if task_model:
-                updated_model = task_entity_to_model(task)
-                task_model.title = updated_model.title
-                task_model.description = updated_model.description
-                task_model.due_date = updated_model.due_date
-                task_model.is_done = updated_model.is_done
-                task_model.updated_at = updated_model.updated_at
-                await session.commit()
+            updated_at = await update_if_unchanged(
+                session,
+                TaskModel,
+                oid=task.oid,
+                version=task.version,
+                values={
+                    "title": task.title.as_generic_type(),
+                    "description": task.description.as_generic_type(),
+                    "due_date": task.due_date.as_generic_type(),
+                    "is_done": task.is_done,
+                },
+            )
+        if updated_at is None:
+            raise ConcurrentUpdateException(resource_type="Task", resource_id=task.oid)
+        task.version += 1
+        task.updated_at = updated_at
+
+    def _build_rank(self, filters: TaskFilters) -> ColumnElement[float] | None:
+        if not filters.is_ranked:
+            return None
+        return self.search_backend.build_rank(self._search_columns(), filters.search)
+
+    async def _fetch_list(self, session: AsyncSession, filters: TaskFilters) -> list[TaskEntity]:
+        stmt = self._build_query(select_entity(TaskModel), filters)
+        rank = self._build_rank(filters)
+        if rank is not None:
+            stmt = stmt.order_by(rank.desc())
+        stmt = paginate(stmt, TaskModel, filters)
+
+        res = await session.execute(stmt)
+        return [task_model_to_entity(row) for row in res.scalars().all()]
+
+    async def _fetch_count(self, session: AsyncSession, filters: TaskFilters) -> int:
+        stmt = self._build_query(select(func.count(TaskModel.oid)), filters)
+        res = await session.execute(stmt)
+        return res.scalar_one() or 0
 
     async def get_list(
         self,
         filters: TaskFilters,
     ) -> Iterable[TaskEntity]:
         async with self.database.get_read_only_session() as session:
-            stmt = select(TaskModel).options(
-                selectinload(TaskModel.deal),
-            )
-            stmt = self._build_query(stmt, filters)
-
-            offset = (filters.page - 1) * filters.page_size
-            stmt = stmt.offset(offset).limit(filters.page_size)
-
-            res = await session.execute(stmt)
-            results = res.scalars().all()
-            return [task_model_to_entity(row) for row in results]
+            return await self._fetch_list(session, filters)
 
     async def get_count(
         self,
         filters: TaskFilters,
     ) -> int:
         async with self.database.get_read_only_session() as session:
-            stmt = select(func.count(TaskModel.oid))
-            stmt = self._build_query(stmt, filters)
+            return await self._fetch_count(session, filters)
+
+    @uses_pool(ANALYTICS_POOL)
+    async def stream(self, filters: TaskFilters) -> AsyncIterator[TaskEntity]:
+        async with self.database.get_stream_session() as session:
+            stmt = order_by_sort_key(self._build_query(select_entity(TaskModel), filters), TaskModel, filters)
+            async for model in stream_models(session, stmt):
+                yield task_model_to_entity(model)
+
+    async def get_list_with_count(
+        self,
+        filters: TaskFilters,
+    ) -> tuple[list[TaskEntity], int]:
+        async with self.database.get_read_only_session() as session:
+            if filters.estimate_total:
+                tasks = await self._fetch_list(session, filters)
+                total = await estimate_count(session, self._build_query(select(TaskModel.oid), filters))
+                return tasks, max(total, len(tasks))
 
+            stmt = paginate_with_total(
+                self._build_query(select(TaskModel), filters),
+                TaskModel,
+                filters,
+                self._build_rank(filters),
+            )
             res = await session.execute(stmt)
-            return res.scalar_one() or 0
+            rows = res.all()
+            if rows:
+                return [task_model_to_entity(model) for model, _ in rows], rows[0].total
+            if filters.page == 1 and not filters.cursor:
+                return [], 0
+            # Страница за пределами выборки: строк с total нет, считаем отдельно
+            return [], await self._fetch_count(session, filters)
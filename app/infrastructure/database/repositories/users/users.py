@@ -6,16 +6,16 @@ from infrastructure.database.converters.users.user import (
     user_model_to_entity,
 )
 from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.instrumentation import instrumented
 from infrastructure.database.models.users.user import UserModel
-from sqlalchemy import (
-    func,
-    select,
-)
+from infrastructure.database.repositories.loading import select_entity
+from sqlalchemy import func
 
 from domain.users.entities import UserEntity
 from domain.users.interfaces.repositories.users import BaseUserRepository
 
 
+@instrumented
 @dataclass
 class SQLAlchemyUserRepository(BaseUserRepository):
     database: Database
@@ -24,18 +24,18 @@ class SQLAlchemyUserRepository(BaseUserRepository):
         async with self.database.get_session() as session:
             user_model = user_entity_to_model(user)
             session.add(user_model)
-            await session.commit()
+            await session.flush()
 
     async def get_by_id(self, user_id: UUID) -> UserEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = select(UserModel).where(UserModel.oid == user_id)
+            stmt = select_entity(UserModel).where(UserModel.oid == user_id)
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return user_model_to_entity(result) if result else None
 
     async def get_by_email(self, email: str) -> UserEntity | None:
         async with self.database.get_read_only_session() as session:
-            stmt = select(UserModel).where(func.lower(UserModel.email) == email.lower())
+            stmt = select_entity(UserModel).where(func.lower(UserModel.email) == email.lower())
             res = await session.execute(stmt)
             result = res.scalar_one_or_none()
             return user_model_to_entity(result) if result else None
@@ -0,0 +1,76 @@
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from infrastructure.database.models.base import (
+    TimedBaseModel,
+    VersionedBaseModel,
+)
+from sqlalchemy import (
+    delete,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def update_if_unchanged(
+    session: AsyncSession,
+    model: type[VersionedBaseModel],
+    oid: UUID,
+    version: int,
+    values: dict[str, Any],
+) -> datetime | None:
+    """UPDATE ... SET version = :version + 1 WHERE oid = :oid AND version = :version
+    RETURNING updated_at.
+
+    Строка меняется одним выражением, без предварительного SELECT, и только
+    если с момента чтения ее никто не изменил. Возвращает новый updated_at
+    или None, если строки нет или ее версия уже другая.
+
+    Новые version и updated_at задаются значениями, а не SQL-выражениями:
+    тогда ORM сама переносит их в уже загруженные в сессию объекты.
+
+    """
+    new_updated_at = datetime.now()
+    stmt = (
+        update(model)
+        .where(model.oid == oid, model.version == version)
+        .values(**values, version=version + 1, updated_at=new_updated_at)
+        .returning(model.updated_at)
+    )
+    res = await session.execute(stmt)
+    return res.scalar_one_or_none()
+
+
+async def update_many_if_unchanged(
+    session: AsyncSession,
+    model: type[VersionedBaseModel],
+    versions: Mapping[UUID, int],
+    values: dict[str, Any],
+) -> tuple[set[UUID], datetime]:
+    """Одно UPDATE ... WHERE (oid, version) IN (...) RETURNING oid для набора строк.
+
+    versions - прочитанная версия каждой строки, у обновленных она
+    увеличивается на единицу. Возвращает oid реально обновленных строк и их
+    новый updated_at: строки, которых нет среди обновленных, удалены или
+    изменены другим запросом.
+
+    """
+    new_updated_at = datetime.now()
+    stmt = (
+        update(model)
+        .where(tuple_(model.oid, model.version).in_(list(versions.items())))
+        .values(**values, version=model.version + 1, updated_at=new_updated_at)
+        .returning(model.oid)
+        .execution_options(synchronize_session="fetch")
+    )
+    res = await session.execute(stmt)
+    return set(res.scalars().all()), new_updated_at
+
+
+async def delete_by_id(session: AsyncSession, model: type[TimedBaseModel], oid: UUID) -> bool:
+    """DELETE ... WHERE oid = :oid RETURNING oid. Возвращает, была ли строка удалена."""
+    res = await session.execute(delete(model).where(model.oid == oid).returning(model.oid))
+    return res.scalar_one_or_none() is not None
@@ -0,0 +1,12 @@
+from infrastructure.database.search.backends import (
+    BaseSearchBackend,
+    ILikeSearchBackend,
+    TrigramSearchBackend,
+)
+
+
+__all__ = (
+    "BaseSearchBackend",
+    "ILikeSearchBackend",
+    "TrigramSearchBackend",
+)
@@ -0,0 +1,82 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import Sequence
+
+from sqlalchemy import (
+    ColumnElement,
+    func,
+    or_,
+)
+
+from domain.base.filters import SearchMode
+
+
+class BaseSearchBackend(ABC):
+    @abstractmethod
+    def build_condition(
+        self,
+        columns: Sequence[ColumnElement[str]],
+        search: str,
+        mode: SearchMode,
+    ) -> ColumnElement[bool]: ...
+
+    @abstractmethod
+    def build_rank(
+        self,
+        columns: Sequence[ColumnElement[str]],
+        search: str,
+    ) -> ColumnElement[float] | None: ...
+
+
+class ILikeSearchBackend(BaseSearchBackend):
+    """Поиск подстроки через ILIKE, работает без расширений PostgreSQL.
+
+    Режим SIMILARITY сводится к поиску подстроки без ранжирования.
+
+    """
+
+    def build_condition(
+        self,
+        columns: Sequence[ColumnElement[str]],
+        search: str,
+        mode: SearchMode,
+    ) -> ColumnElement[bool]:
+        return or_(*(column.ilike(f"%{search}%") for column in columns))
+
+    def build_rank(
+        self,
+        columns: Sequence[ColumnElement[str]],
+        search: str,
+    ) -> ColumnElement[float] | None:
+        return None
+
+
+class TrigramSearchBackend(BaseSearchBackend):
+    """Поиск на базе pg_trgm.
+
+    ILIKE '%...%' по колонкам с GIN-индексом gin_trgm_ops использует индекс,
+    а режим SIMILARITY сравнивает строку поиска с отдельными словами колонки
+    (оператор %>) и ранжирует результаты по word_similarity.
+
+    """
+
+    def build_condition(
+        self,
+        columns: Sequence[ColumnElement[str]],
+        search: str,
+        mode: SearchMode,
+    ) -> ColumnElement[bool]:
+        if mode == SearchMode.SIMILARITY:
+            return or_(*(column.op("%>")(search) for column in columns))
+        return or_(*(column.ilike(f"%{search}%") for column in columns))
+
+    def build_rank(
+        self,
+        columns: Sequence[ColumnElement[str]],
+        search: str,
+    ) -> ColumnElement[float] | None:
+        return func.greatest(
+            *(func.coalesce(func.word_similarity(search, column), 0) for column in columns),
+        )
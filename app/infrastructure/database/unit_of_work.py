@@ -0,0 +1,51 @@
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+)
+from contextlib import (
+    asynccontextmanager,
+    nullcontext,
+)
+from dataclasses import dataclass
+from typing import Any
+
+from infrastructure.database.gateways.pools import use_pool
+from infrastructure.database.gateways.postgres import Database
+
+from application.base.outbox import BaseEventOutbox
+from application.base.unit_of_work import BaseUnitOfWork
+from domain.base.events import collect_events
+
+
+@dataclass
+class SQLAlchemyUnitOfWork(BaseUnitOfWork):
+    database: Database
+    event_outbox: BaseEventOutbox
+
+    @asynccontextmanager
+    async def begin(
+        self,
+        read_only: bool = False,
+        pool: str | None = None,
+        statement_timeout: float | None = None,
+    ) -> AsyncGenerator[None, Any]:
+        with use_pool(pool) if pool is not None else nullcontext():
+            async with self.database.session_scope(read_only=read_only, statement_timeout=statement_timeout):
+                with collect_events() as events:
+                    yield
+                # События пишутся в outbox в той же транзакции, что и изменения
+                if events and not read_only:
+                    await self.event_outbox.add(events)
+
+    def requires_primary(self) -> bool:
+        return self.database.read_your_writes.requires_primary()
+
+    def max_read_lag(self) -> float:
+        return self.database.max_read_lag()
+
+    def detach(self) -> None:
+        self.database.detach()
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        await self.database.after_commit(callback)
@@ -0,0 +1,14 @@
+from infrastructure.imports.readers import (
+    ImportFormat,
+    read_csv,
+    read_ndjson,
+    read_rows,
+)
+
+
+__all__ = (
+    "ImportFormat",
+    "read_csv",
+    "read_ndjson",
+    "read_rows",
+)
@@ -0,0 +1,140 @@
+import codecs
+import csv
+import json
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+)
+from enum import Enum
+
+from domain.base.imports import ImportRow
+
+
+# Предел длины одной записи: незакрытая кавычка не должна накапливать весь файл в памяти
+MAX_RECORD_SIZE = 1024 * 1024
+
+
+class RecordTooLargeError(ValueError):
+    """Строка длиннее MAX_RECORD_SIZE: дальше поток не читается."""
+
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Строки из потока байтов, с сохранением перевода строки.
+
+    Декодер инкрементальный: многобайтовый символ на границе чанков не
+    ломается, BOM в начале файла отбрасывается. Незаконченная строка
+    длиннее MAX_RECORD_SIZE - RecordTooLargeError, чтобы файл без
+    переводов строки не читался в память целиком.
+
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+        if len(buffer) > MAX_RECORD_SIZE:
+            raise RecordTooLargeError()
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def _stop_at_too_large_record(rows: AsyncIterator[ImportRow]) -> AsyncIterator[ImportRow]:
+    """После слишком длинной строки граница следующей записи неизвестна,
+    поэтому чтение останавливается с ошибкой этой записи."""
+    number = 0
+    try:
+        async for row in rows:
+            number = row.number
+            yield row
+    except RecordTooLargeError:
+        yield ImportRow(number=number + 1, data={}, error=f"Record exceeds {MAX_RECORD_SIZE} characters")
+
+
+def read_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    return _stop_at_too_large_record(_read_csv_records(chunks))
+
+
+async def _read_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    """Записи CSV с заголовком. Поле в кавычках может содержать перевод
+    строки: запись заканчивается, когда число кавычек в ней четное."""
+    header: list[str] | None = None
+    record: list[str] = []
+    record_size = 0
+    quotes = 0
+    number = 0
+
+    async for line in iter_lines(chunks):
+        record.append(line)
+        record_size += len(line)
+        quotes += line.count('"')
+        if quotes % 2 and record_size < MAX_RECORD_SIZE:
+            continue
+
+        text = "".join(record)
+        unterminated = quotes % 2 == 1
+        record.clear()
+        record_size = 0
+        quotes = 0
+        if not text.strip():
+            continue
+
+        if header is None:
+            header = [name.strip().lower() for name in next(csv.reader([text]))]
+            continue
+
+        number += 1
+        if unterminated:
+            yield ImportRow(number=number, data={}, error="Unterminated quoted field")
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as exc:
+            yield ImportRow(number=number, data={}, error=f"Malformed CSV record: {exc}")
+            continue
+        if len(values) != len(header):
+            yield ImportRow(number=number, data={}, error=f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield ImportRow(number=number, data=dict(zip(header, values)))
+
+    if record:
+        yield ImportRow(number=number + 1, data={}, error="Unterminated quoted field")
+
+
+def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    return _stop_at_too_large_record(_read_ndjson_records(chunks))
+
+
+async def _read_ndjson_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    """Записи NDJSON: один JSON-объект на строку."""
+    number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+
+        number += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield ImportRow(number=number, data={}, error="Invalid JSON")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRow(number=number, data={}, error="Expected a JSON object")
+            continue
+        yield ImportRow(
+            number=number,
+            data={str(key).lower(): None if value is None else str(value) for key, value in data.items()},
+        )
+
+
+def read_rows(chunks: AsyncIterable[bytes], import_format: ImportFormat) -> AsyncIterator[ImportRow]:
+    if import_format == ImportFormat.NDJSON:
+        return read_ndjson(chunks)
+    return read_csv(chunks)
@@ -0,0 +1,10 @@
+from infrastructure.journal.activities import (
+    ActivityJournalMetrics,
+    QueuedActivityJournal,
+)
+
+
+__all__ = (
+    "ActivityJournalMetrics",
+    "QueuedActivityJournal",
+)
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import (
+    dataclass,
+    field,
+)
+from functools import partial
+
+from infrastructure.database.gateways.pools import use_pool
+
+from application.base.unit_of_work import (
+    BACKGROUND_POOL,
+    BaseUnitOfWork,
+)
+from domain.sales.entities import ActivityEntity
+from domain.sales.interfaces.activity_journal import BaseActivityJournal
+from domain.sales.interfaces.repositories.activities import BaseActivityRepository
+
+
+logger = logging.getLogger(__name__)
+
+# Сигнал писателю: дописать накопленное и завершиться
+_STOP = object()
+
+
+@dataclass
+class ActivityJournalMetrics:
+    recorded: int = 0
+    written: int = 0
+    batches: int = 0
+    retries: int = 0
+    inline_writes: int = 0
+    dropped: int = 0
+    enqueue_seconds: float = 0.0
+    write_seconds: float = 0.0
+    inline_write_seconds: float = 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Оценка снизу для времени, которое запросы не ждали: фоновая запись
+        минус время постановки в очередь. Вставки по одной строке обошлись
+        бы дороже пачек, так что реальная экономия больше."""
+        return max(self.write_seconds - self.enqueue_seconds, 0.0)
+
+
+@dataclass
+class QueuedActivityJournal(BaseActivityJournal):
+    """Журнал активностей с ограниченной in-process очередью и фоновым
+    писателем, который сбрасывает ее многострочными вставками.
+
+    Активности попадают в очередь только после фиксации команды, поэтому
+    откат не оставляет в журнале лишних записей. Если очередь заполнена
+    дольше enqueue_timeout, запрос пишет свои активности сам - так
+    проявляется backpressure, и ничего не теряется из-за переполнения.
+
+    Доставка - at-least-once в пределах жизни процесса: повторы после
+    ошибки безопасны (ON CONFLICT (oid) DO NOTHING), stop() дописывает
+    очередь, но аварийное завершение процесса теряет ее содержимое.
+    Пока писатель не запущен (тесты, скрипты), запись идет синхронно.
+
+    """
+
+    activity_repository: BaseActivityRepository
+    unit_of_work: BaseUnitOfWork
+    max_queue_size: int = 10_000
+    batch_size: int = 500
+    flush_interval: float = 0.5
+    enqueue_timeout: float = 0.1
+    max_retries: int = 3
+    retry_delay: float = 0.1
+    metrics: ActivityJournalMetrics = field(default_factory=ActivityJournalMetrics, kw_only=True)
+    _queue: asyncio.Queue = field(init=False)
+    _writer: asyncio.Task | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def is_running(self) -> bool:
+        return self._writer is not None
+
+    async def record(self, activities: Sequence[ActivityEntity]) -> None:
+        await self.unit_of_work.after_commit(partial(self._enqueue, list(activities)))
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает писателя, дождавшись записи всей очереди."""
+        if self._writer is None:
+            return
+
+        writer, self._writer = self._writer, None
+        await self._queue.put(_STOP)
+        await writer
+
+        # То, что успели поставить после сигнала остановки
+        rest = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                rest.append(item)
+        if rest:
+            await self._write_inline(rest)
+
+    async def _enqueue(self, activities: list[ActivityEntity]) -> None:
+        if self._writer is None:
+            await self._write_inline(activities)
+            return
+
+        started = time.perf_counter()
+        for index, activity in enumerate(activities):
+            try:
+                self._queue.put_nowait(activity)
+            except asyncio.QueueFull:
+                try:
+                    await asyncio.wait_for(self._queue.put(activity), timeout=self.enqueue_timeout)
+                except TimeoutError:
+                    self.metrics.enqueue_seconds += time.perf_counter() - started
+                    self.metrics.recorded += index
+                    await self._write_inline(activities[index:])
+                    return
+
+        self.metrics.enqueue_seconds += time.perf_counter() - started
+        self.metrics.recorded += len(activities)
+
+    async def _write_inline(self, activities: list[ActivityEntity]) -> None:
+        started = time.perf_counter()
+        if await self._write(activities):
+            self.metrics.inline_writes += len(activities)
+        self.metrics.inline_write_seconds += time.perf_counter() - started
+
+    async def _write(self, activities: list[ActivityEntity]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Запись журнала не должна занимать соединения запросов API
+                with use_pool(BACKGROUND_POOL):
+                    await self.activity_repository.add_many(activities)
+                return True
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception("Failed to write %d activities, dropping them", len(activities))
+                    self.metrics.dropped += len(activities)
+                    return False
+                self.metrics.retries += 1
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+        return False
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            # Копим пачку, пока она не наберется или не истечет flush_interval
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            started = time.perf_counter()
+            if await self._write(batch):
+                self.metrics.written += len(batch)
+                self.metrics.batches += 1
+            self.metrics.write_seconds += time.perf_counter() - started
@@ -0,0 +1,4 @@
+from infrastructure.security.password_hasher import BcryptPasswordHasher
+
+
+__all__ = ("BcryptPasswordHasher",)
@@ -0,0 +1,46 @@
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import (
+    dataclass,
+    field,
+)
+
+import bcrypt
+
+from domain.users.interfaces.password_hasher import BasePasswordHasher
+
+
+def _hash_password(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+@dataclass
+class BcryptPasswordHasher(BasePasswordHasher):
+    """bcrypt в отдельном пуле потоков или процессов.
+
+    Один вызов bcrypt занимает десятки миллисекунд CPU и, выполненный прямо в
+    корутине, блокирует event loop для всех остальных запросов. Здесь он
+    уходит в executor, а семафор ограничивает число одновременных операций:
+    лишние вызовы ждут в event loop, не занимая пул.
+
+    """
+
+    executor: Executor
+    max_concurrency: int
+    rounds: int = 8
+    _semaphore: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _run(self, func, *args):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(_hash_password, password.encode("utf-8"), self.rounds)
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8"))
@@ -8,6 +8,7 @@ from fastapi import (
     status,
 )
 
+from infrastructure.database.gateways.postgres import Database
 from presentation.api.auth import auth_service
 
 from application.container import init_container
@@ -32,8 +33,14 @@ async def get_access_token_payload(
 
 async def get_current_user_id(
     token_payload: dict = Depends(get_access_token_payload),
+    container=Depends(init_container),
 ) -> UUID:
-    """Dependency для получения текущего user_id из токена."""
+    """Dependency для получения текущего user_id из токена.
+
+    Заодно закрепляет чтения запроса за пользователем: после его записи
+    они не уходят на отстающую реплику.
+
+    """
     user_id_str = token_payload.sub
     if not user_id_str:
         raise HTTPException(
@@ -41,13 +48,17 @@ async def get_current_user_id(
             detail="User ID not found in token payload",
         )
     try:
-        return UUID(user_id_str)
+        user_id = UUID(user_id_str)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID format in token",
         )
 
+    database: Database = container.resolve(Database)
+    database.bind_consistency_key(str(user_id))
+    return user_id
+
 
 async def get_organization_id(
     x_organization_id: str = Header(
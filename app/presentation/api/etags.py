@@ -0,0 +1,49 @@
+from fastapi import (
+    Header,
+    HTTPException,
+    status,
+)
+
+
+def make_etag(version: int) -> str:
+    """ETag ресурса - его версия, сильный валидатор."""
+    return f'"{version}"'
+
+
+def _split_etags(value: str) -> list[str]:
+    return [tag.strip() for tag in value.split(",") if tag.strip()]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверка If-None-Match: слабое сравнение, "*" совпадает с любым ETag."""
+    if if_none_match is None:
+        return False
+    tags = [tag.removeprefix("W/") for tag in _split_etags(if_none_match)]
+    return "*" in tags or etag in tags
+
+
+async def get_expected_version(
+    if_match: str | None = Header(
+        None,
+        alias="If-Match",
+        description="ETag, полученный при чтении ресурса",
+    ),
+) -> int | None:
+    """Dependency для получения ожидаемой версии из If-Match.
+
+    Без заголовка или с "*" версия не проверяется. Поддерживается один
+    сильный ETag: If-Match требует сильного сравнения, поэтому слабый ETag
+    или их список не может совпасть ни с одной версией.
+
+    """
+    if if_match is None:
+        return None
+    tags = _split_etags(if_match)
+    if tags == ["*"]:
+        return None
+    if len(tags) == 1 and tags[0].startswith('"') and tags[0].endswith('"') and tags[0][1:-1].isdigit():
+        return int(tags[0][1:-1])
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="If-Match must contain a single strong ETag",
+    )
@@ -10,9 +10,15 @@ from authx.exceptions import MissingTokenError
 from presentation.api.schemas import ApiResponse
 
 from application.base.exception import LogicException
+from application.common.exceptions import (
+    QueryTimeoutException,
+    ServiceUnavailableException,
+)
 from domain.base.exceptions import (
     ApplicationException,
+    ConcurrentUpdateException,
     DomainException,
+    VersionMismatchException,
 )
 from domain.organizations.exceptions import OrganizationException
 from domain.sales.exceptions import SalesException
@@ -28,10 +34,22 @@ async def application_exception_handler(
     request: Request,
     exc: ApplicationException,
 ) -> JSONResponse:
+    headers = None
     if isinstance(exc, LogicException):
         status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    elif isinstance(exc, ServiceUnavailableException):
+        # Перегрузка временная: клиент может повторить запрос
+        if isinstance(exc, QueryTimeoutException):
+            status_code = status.HTTP_504_GATEWAY_TIMEOUT
+        else:
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        headers = {"Retry-After": "1"}
     elif isinstance(exc, DomainException):
-        if isinstance(exc, UserException):
+        if isinstance(exc, ConcurrentUpdateException):
+            status_code = status.HTTP_409_CONFLICT
+        elif isinstance(exc, VersionMismatchException):
+            status_code = status.HTTP_412_PRECONDITION_FAILED
+        elif isinstance(exc, UserException):
             if isinstance(exc, (InvalidCredentialsException, UserNotFoundException)):
                 status_code = status.HTTP_401_UNAUTHORIZED
             elif isinstance(exc, UserAlreadyExistsException):
@@ -61,6 +79,7 @@ async def application_exception_handler(
     return JSONResponse(
         status_code=status_code,
         content=response.model_dump(),
+        headers=headers,
     )
 
 
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+)
+from enum import Enum
+from typing import (
+    Any,
+    TypeVar,
+)
+
+from fastapi.responses import StreamingResponse
+
+from pydantic import BaseModel
+
+
+TItem = TypeVar("TItem")
+
+# Размер чанка ответа: строки копятся в буфере, чтобы не отправлять каждую отдельным фреймом
+FLUSH_SIZE = 64 * 1024
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+async def _encode(
+    items: AsyncIterator[TItem],
+    schema: type[BaseModel],
+    to_schema: Callable[[TItem], BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer: csv.DictWriter | None = None
+    if export_format == ExportFormat.CSV:
+        writer = csv.DictWriter(buffer, fieldnames=list(schema.model_fields))
+        writer.writeheader()
+
+    async for item in items:
+        row: dict[str, Any] = to_schema(item).model_dump(mode="json")
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write("\n")
+
+        if buffer.tell() >= FLUSH_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    items: AsyncIterator[TItem],
+    schema: type[BaseModel],
+    to_schema: Callable[[TItem], BaseModel],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Потоковый ответ с выгрузкой: строки сериализуются по мере чтения из
+    курсора, в памяти держится только текущий чанк."""
+    return StreamingResponse(
+        _encode(items, schema, to_schema, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
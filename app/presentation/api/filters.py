@@ -1,13 +1,30 @@
+from collections.abc import Sequence
+
 from pydantic import (
     BaseModel,
     Field,
 )
 
+from domain.base.cursor import PageCursor
+from domain.base.entity import BaseEntity
+from domain.base.filters import BaseFilters
+
 
 class PaginationOut(BaseModel):
     limit: int
     offset: int
     total: int
+    # Курсор следующей страницы (None - страниц больше нет)
+    next_cursor: str | None = None
+
+
+def build_next_cursor(items: Sequence[BaseEntity], filters: BaseFilters) -> str | None:
+    """Курсор выдается, если страница заполнена целиком и выдача не
+    отсортирована по релевантности поиска."""
+    if filters.is_ranked or not items or len(items) < filters.page_size:
+        return None
+    cursor = PageCursor.from_entity(items[-1], filters.sort_key, filters.sort_descending)
+    return cursor.encode()
 
 
 class PaginationIn(BaseModel):
@@ -1,13 +1,18 @@
 from fastapi import (
     APIRouter,
+    Depends,
     status,
 )
 
+from infrastructure.journal import QueuedActivityJournal
 from presentation.api.schemas import (
+    ActivityJournalStatsSchema,
     ApiResponse,
     PingResponseSchema,
 )
 
+from application.container import init_container
+
 
 healthcheck_router = APIRouter(
     prefix="/healthcheck",
@@ -20,3 +25,19 @@ async def get_status() -> ApiResponse[PingResponseSchema]:
     return ApiResponse[PingResponseSchema](
         data=PingResponseSchema(result=True),
     )
+
+
+@healthcheck_router.get(
+    "/activity-journal",
+    status_code=status.HTTP_200_OK,
+    summary="Состояние журнала активностей",
+    description="Очередь фоновой записи активностей и сэкономленное запросами время",
+)
+async def get_activity_journal_stats(
+    container=Depends(init_container),
+) -> ApiResponse[ActivityJournalStatsSchema]:
+    activity_journal: QueuedActivityJournal = container.resolve(QueuedActivityJournal)
+
+    return ApiResponse[ActivityJournalStatsSchema](
+        data=ActivityJournalStatsSchema.from_journal(activity_journal),
+    )
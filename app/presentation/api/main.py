@@ -1,10 +1,41 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from infrastructure.database.gateways.postgres import Database
+from infrastructure.journal import QueuedActivityJournal
 from presentation.admin import setup_admin
 from presentation.api.exceptions import setup_exception_handlers
 from presentation.api.healthcheck import healthcheck_router
+from presentation.api.metrics import metrics_router
+from presentation.api.middlewares import RouteTimingMiddleware
 from presentation.api.v1 import v1_router
 
+from application.common.metrics import LatencyHistograms
+from application.container import init_container
+from application.events import OutboxRelay
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Контейнер берется с учетом dependency_overrides, чтобы тесты запускали свой журнал
+    container = app.dependency_overrides.get(init_container, init_container)()
+    activity_journal = container.resolve(QueuedActivityJournal)
+    event_relay = container.resolve(OutboxRelay)
+    database = container.resolve(Database)
+
+    database.start()
+    activity_journal.start()
+    event_relay.start()
+    try:
+        yield
+    finally:
+        # Подписчики пишут активности в журнал - релей останавливается первым
+        await event_relay.stop()
+        await activity_journal.stop()
+        await database.stop()
+
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -12,11 +43,16 @@ def create_app() -> FastAPI:
         description="CRM",
         docs_url="/api/docs",
         debug=True,
+        lifespan=lifespan,
     )
 
     setup_exception_handlers(app)
 
+    app.state.http_metrics = LatencyHistograms()
+    app.add_middleware(RouteTimingMiddleware, metrics=app.state.http_metrics)
+
     app.include_router(healthcheck_router)
+    app.include_router(metrics_router)
     app.include_router(v1_router, prefix="/api/v1")
 
     setup_admin(app)
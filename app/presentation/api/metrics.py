@@ -0,0 +1,201 @@
+from collections.abc import (
+    Iterator,
+    Sequence,
+)
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Request,
+    status,
+)
+from fastapi.responses import PlainTextResponse
+
+from infrastructure.cache import CacheMetrics
+from infrastructure.database.gateways.postgres import Database
+from infrastructure.database.repositories.organizations.cached_members import OrganizationMemberCache
+
+from application.common.metrics import (
+    LatencyHistograms,
+    MetricKey,
+)
+from application.container import init_container
+from application.middlewares import (
+    MediatorMetrics,
+    QueryCacheMetrics,
+)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], key: MetricKey, **extra: str) -> str:
+    values = (key,) if isinstance(key, str) else key
+    pairs = [*zip(names, values, strict=True), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _histogram_family(
+    name: str,
+    description: str,
+    label_names: Sequence[str],
+    histograms: LatencyHistograms,
+) -> Iterator[str]:
+    """Гистограмма и счетчик ошибок к ней в текстовом формате Prometheus."""
+    yield f"# HELP {name} {description}"
+    yield f"# TYPE {name} histogram"
+    for key, histogram in histograms.histograms.items():
+        bounds = [*histogram.buckets, float("inf")]
+        for bound, count in zip(bounds, histogram.cumulative_counts(), strict=True):
+            yield f"{name}_bucket{_labels(label_names, key, le=_format_bound(bound))} {count}"
+        yield f"{name}_sum{_labels(label_names, key)} {histogram.total}"
+        yield f"{name}_count{_labels(label_names, key)} {histogram.count}"
+
+    errors_name = name.removesuffix("_seconds") + "_errors_total"
+    yield f"# HELP {errors_name} Failed observations of {name}"
+    yield f"# TYPE {errors_name} counter"
+    for key, histogram in histograms.histograms.items():
+        yield f"{errors_name}{_labels(label_names, key)} {histogram.errors}"
+
+
+def _query_cache_families(metrics: QueryCacheMetrics) -> Iterator[str]:
+    counters = {
+        "mediator_query_cache_hits_total": ("Query results served from the cache", "query", metrics.hits),
+        "mediator_query_cache_misses_total": ("Cacheable queries passed to the handler", "query", metrics.misses),
+        "mediator_query_cache_invalidations_total": (
+            "Committed commands that invalidated cached results",
+            "command",
+            metrics.invalidations,
+        ),
+    }
+    for name, (description, label, counter) in counters.items():
+        yield f"# HELP {name} {description}"
+        yield f"# TYPE {name} counter"
+        for key, count in counter.items():
+            yield f"{name}{_labels((label,), key)} {count}"
+
+    yield "# HELP mediator_query_cache_hit_ratio Share of cacheable queries served from the cache"
+    yield "# TYPE mediator_query_cache_hit_ratio gauge"
+    for query in sorted(metrics.hits.keys() | metrics.misses.keys()):
+        yield f"mediator_query_cache_hit_ratio{_labels(('query',), query)} {metrics.hit_ratio(query)}"
+
+
+def _membership_cache_families(metrics: CacheMetrics) -> Iterator[str]:
+    counters = {
+        "membership_cache_hits_total": ("Membership checks served from the cache", metrics.hits),
+        "membership_cache_misses_total": ("Membership checks passed to the database", metrics.misses),
+        "membership_cache_evictions_total": ("Memberships evicted by the size limit", metrics.evictions),
+        "membership_cache_invalidations_total": ("Memberships dropped after a write", metrics.invalidations),
+    }
+    for name, (description, value) in counters.items():
+        yield f"# HELP {name} {description}"
+        yield f"# TYPE {name} counter"
+        yield f"{name} {value}"
+
+    yield "# HELP membership_cache_hit_ratio Share of membership checks served from the cache"
+    yield "# TYPE membership_cache_hit_ratio gauge"
+    yield f"membership_cache_hit_ratio {metrics.hit_ratio}"
+
+
+def _database_families(database: Database) -> Iterator[str]:
+    statements = LatencyHistograms()
+    checkout_wait = LatencyHistograms()
+    for (pool, engine), metrics in database.engine_metrics.items():
+        for source, histogram in metrics.statements.histograms.items():
+            statements.histograms[(pool, engine, source)] = histogram
+        checkout_wait.histograms[(pool, engine)] = metrics.checkout_wait
+
+    yield from _histogram_family(
+        "db_statement_duration_seconds",
+        "SQL statement duration by pool, engine and repository method",
+        ("pool", "engine", "source"),
+        statements,
+    )
+    yield from _histogram_family(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled connection",
+        ("pool", "engine"),
+        checkout_wait,
+    )
+
+    statuses = database.pool_statuses()
+    gauges = {
+        "db_pool_size": ("Configured pool size", "size"),
+        "db_pool_checked_in": ("Idle connections in the pool", "checked_in"),
+        "db_pool_checked_out": ("Connections in use", "checked_out"),
+        "db_pool_overflow": ("Connections opened beyond the pool size", "overflow"),
+    }
+    for name, (description, attribute) in gauges.items():
+        yield f"# HELP {name} {description}"
+        yield f"# TYPE {name} gauge"
+        for key, pool_status in statuses.items():
+            yield f"{name}{_labels(('pool', 'engine'), key)} {getattr(pool_status, attribute)}"
+
+
+@metrics_router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+    summary="Метрики в формате Prometheus",
+    description=(
+        "Время HTTP-запросов и обработчиков медиатора, попадания в кэш запросов и членства, "
+        "SQL-запросы и состояние пулов соединений"
+    ),
+)
+async def get_metrics(
+    request: Request,
+    container=Depends(init_container),
+) -> PlainTextResponse:
+    mediator_metrics: MediatorMetrics = container.resolve(MediatorMetrics)
+    cache_metrics: QueryCacheMetrics = container.resolve(QueryCacheMetrics)
+    member_cache: OrganizationMemberCache = container.resolve(OrganizationMemberCache)
+    database: Database = container.resolve(Database)
+
+    lines = [
+        *_histogram_family(
+            "http_request_duration_seconds",
+            "HTTP request duration by route",
+            ("method", "route"),
+            request.app.state.http_metrics,
+        ),
+        *_histogram_family(
+            "mediator_command_duration_seconds",
+            "Command handling duration including the unit of work commit",
+            ("command",),
+            mediator_metrics.commands,
+        ),
+        *_histogram_family(
+            "mediator_query_duration_seconds",
+            "Query handling duration",
+            ("query",),
+            mediator_metrics.queries,
+        ),
+        "# HELP mediator_query_timeouts_total Queries aborted by their time budget",
+        "# TYPE mediator_query_timeouts_total counter",
+        *(
+            f"mediator_query_timeouts_total{_labels(('query',), query)} {count}"
+            for query, count in mediator_metrics.timeouts.items()
+        ),
+        "# HELP mediator_query_coalesced_total Queries that joined an identical in-flight query",
+        "# TYPE mediator_query_coalesced_total counter",
+        *(
+            f"mediator_query_coalesced_total{_labels(('query',), query)} {count}"
+            for query, count in mediator_metrics.coalesced.items()
+        ),
+        *_query_cache_families(cache_metrics),
+        *_membership_cache_families(member_cache.metrics),
+        *_database_families(database),
+    ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
@@ -0,0 +1,53 @@
+import time
+from dataclasses import dataclass
+
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from application.common.metrics import LatencyHistograms
+
+
+@dataclass
+class RouteTimingMiddleware:
+    """ASGI-middleware: длительность HTTP-запросов по методу и шаблону пути.
+
+    Метка - шаблон маршрута (``/api/v1/deals/{deal_id}``), а не сам путь,
+    чтобы число рядов не росло с числом сущностей. Время считается до
+    отправки последней части тела, поэтому потоковые выгрузки учитываются
+    целиком. Ответы 5xx и необработанные исключения считаются ошибками.
+
+    """
+
+    app: ASGIApp
+    metrics: LatencyHistograms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Роутер дописывает найденный маршрут в тот же scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            self.metrics.observe(
+                (scope["method"], path),
+                time.perf_counter() - started,
+                error=status_code >= 500,
+            )
@@ -4,12 +4,15 @@ from typing import (
     TypeVar,
 )
 
+from infrastructure.journal import QueuedActivityJournal
 from presentation.api.filters import PaginationOut
 from pydantic import (
     BaseModel,
     Field,
 )
 
+from domain.base.imports import ImportReport
+
 
 TData = TypeVar("TData")
 TListItem = TypeVar("TListItem")
@@ -30,6 +33,60 @@ class ApiResponse(BaseModel, Generic[TData]):
     errors: list[Any] = Field(default_factory=list)
 
 
+class ImportRowErrorSchema(BaseModel):
+    row: int
+    message: str
+
+
+class ImportReportSchema(BaseModel):
+    processed: int
+    imported: int
+    failed: int
+    errors: list[ImportRowErrorSchema]
+
+    @classmethod
+    def from_report(cls, report: ImportReport) -> "ImportReportSchema":
+        return cls(
+            processed=report.processed,
+            imported=report.imported,
+            failed=report.failed,
+            errors=[ImportRowErrorSchema(row=error.row, message=error.message) for error in report.errors],
+        )
+
+
+class ActivityJournalStatsSchema(BaseModel):
+    running: bool
+    queue_size: int
+    recorded: int
+    written: int
+    batches: int
+    retries: int
+    inline_writes: int
+    dropped: int
+    enqueue_seconds: float
+    write_seconds: float
+    inline_write_seconds: float
+    saved_seconds: float
+
+    @classmethod
+    def from_journal(cls, journal: QueuedActivityJournal) -> "ActivityJournalStatsSchema":
+        metrics = journal.metrics
+        return cls(
+            running=journal.is_running,
+            queue_size=journal.queue_size,
+            recorded=metrics.recorded,
+            written=metrics.written,
+            batches=metrics.batches,
+            retries=metrics.retries,
+            inline_writes=metrics.inline_writes,
+            dropped=metrics.dropped,
+            enqueue_seconds=metrics.enqueue_seconds,
+            write_seconds=metrics.write_seconds,
+            inline_write_seconds=metrics.inline_write_seconds,
+            saved_seconds=metrics.saved_seconds,
+        )
+
+
 class ErrorDetailSchema(BaseModel):
     message: str
     type: str | None = None
@@ -2,6 +2,7 @@ from pydantic import BaseModel
 
 from application.sales.queries.analytics import (
     DealFunnelResult,
+    DealFunnelStageResult,
     DealSummaryResult,
 )
 
@@ -28,11 +29,28 @@ class DealSummaryResponseSchema(BaseModel):
         )
 
 
+class DealFunnelStageResponseSchema(BaseModel):
+    stage: str
+    count: int
+    amount: float
+    conversion_rate: float | None = None
+
+    @classmethod
+    def from_result(cls, result: DealFunnelStageResult) -> "DealFunnelStageResponseSchema":
+        return cls(
+            stage=result.stage.value,
+            count=result.count,
+            amount=result.amount,
+            conversion_rate=result.conversion_rate,
+        )
+
+
 class DealFunnelResponseSchema(BaseModel):
     qualification_count: int
     proposal_count: int
     negotiation_count: int
     closed_count: int
+    stages: list[DealFunnelStageResponseSchema] = []
 
     @classmethod
     def from_result(cls, result: DealFunnelResult) -> "DealFunnelResponseSchema":
@@ -41,4 +59,5 @@ class DealFunnelResponseSchema(BaseModel):
             proposal_count=result.proposal_count,
             negotiation_count=result.negotiation_count,
             closed_count=result.closed_count,
+            stages=[DealFunnelStageResponseSchema.from_result(stage) for stage in result.stages],
         )
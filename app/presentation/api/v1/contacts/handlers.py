@@ -4,18 +4,32 @@ from fastapi import (
     APIRouter,
     Depends,
     Query,
+    Request,
     status,
 )
+from fastapi.responses import StreamingResponse
 
+from infrastructure.imports import (
+    ImportFormat,
+    read_rows,
+)
 from presentation.api.dependencies import (
     get_current_user_id,
     get_organization_id,
     get_organization_member,
 )
-from presentation.api.filters import PaginationOut
+from presentation.api.exports import (
+    export_response,
+    ExportFormat,
+)
+from presentation.api.filters import (
+    build_next_cursor,
+    PaginationOut,
+)
 from presentation.api.schemas import (
     ApiResponse,
     ErrorResponseSchema,
+    ImportReportSchema,
 )
 from presentation.api.v1.contacts.schemas import (
     ContactListResponseSchema,
@@ -28,11 +42,14 @@ from application.mediator import Mediator
 from application.sales.commands import (
     CreateContactCommand,
     DeleteContactCommand,
+    ImportContactsCommand,
 )
 from application.sales.queries import (
+    ExportContactsQuery,
     GetContactByIdQuery,
     GetContactsQuery,
 )
+from domain.base.filters import SearchMode
 from domain.organizations.entities import OrganizationMemberEntity
 from domain.sales.filters import ContactFilters
 
@@ -54,7 +71,10 @@ router = APIRouter(prefix="/contacts", tags=["contacts"])
 async def get_contacts(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Opaque cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(default=False, description="Return planner-estimated total instead of exact count"),
     search: str | None = Query(default=None),
+    search_mode: SearchMode = Query(default=SearchMode.CONTAINS),
     owner_id: UUID | None = Query(default=None),
     organization_id: UUID = Depends(get_organization_id),
     user_id: UUID = Depends(get_current_user_id),
@@ -68,7 +88,10 @@ async def get_contacts(
         organization_id=organization_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        estimate_total=estimate_total,
         search=search,
+        search_mode=search_mode,
         owner_id=owner_id,
     )
 
@@ -80,6 +103,7 @@ async def get_contacts(
         owner_id=owner_id,
     )
     contacts, total = await mediator.handle_query(query)
+    contacts = list(contacts)
 
     items = [ContactResponseSchema.from_entity(contact) for contact in contacts]
 
@@ -87,6 +111,7 @@ async def get_contacts(
         limit=page_size,
         offset=(page - 1) * page_size,
         total=total,
+        next_cursor=build_next_cursor(contacts, filters),
     )
 
     return ApiResponse[ContactListResponseSchema](
@@ -97,6 +122,55 @@ async def get_contacts(
     )
 
 
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}}},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
+    },
+)
+async def export_contacts(
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    search: str | None = Query(default=None),
+    search_mode: SearchMode = Query(default=SearchMode.CONTAINS),
+    owner_id: UUID | None = Query(default=None),
+    organization_id: UUID = Depends(get_organization_id),
+    user_id: UUID = Depends(get_current_user_id),
+    member: OrganizationMemberEntity = Depends(get_organization_member),
+    container=Depends(init_container),
+) -> StreamingResponse:
+    """Выгрузить все контакты по фильтрам потоком (CSV или NDJSON)."""
+    mediator: Mediator = container.resolve(Mediator)
+
+    filters = ContactFilters(
+        organization_id=organization_id,
+        search=search,
+        search_mode=search_mode,
+        owner_id=owner_id,
+    )
+
+    role = member.role.as_generic_type()
+    query = ExportContactsQuery(
+        filters=filters,
+        user_id=user_id,
+        user_role=role.value,
+        owner_id=owner_id,
+    )
+    contacts = await mediator.handle_query(query)
+
+    return export_response(
+        contacts,
+        ContactResponseSchema,
+        ContactResponseSchema.from_entity,
+        export_format,
+        "contacts",
+    )
+
+
 @router.post(
     "",
     status_code=status.HTTP_201_CREATED,
@@ -134,6 +208,46 @@ async def create_contact(
     )
 
 
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[ImportReportSchema],
+    responses={
+        status.HTTP_200_OK: {"model": ApiResponse[ImportReportSchema]},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
+    },
+)
+async def import_contacts(
+    request: Request,
+    import_format: ImportFormat = Query(default=ImportFormat.CSV, alias="format"),
+    organization_id: UUID = Depends(get_organization_id),
+    user_id: UUID = Depends(get_current_user_id),
+    member: OrganizationMemberEntity = Depends(get_organization_member),
+    container=Depends(init_container),
+) -> ApiResponse[ImportReportSchema]:
+    """Массовый импорт из CSV или NDJSON в теле запроса.
+
+    Тело читается потоком, ошибки отдельных строк возвращаются в отчете и
+    не прерывают импорт.
+
+    """
+    mediator: Mediator = container.resolve(Mediator)
+
+    command = ImportContactsCommand(
+        organization_id=organization_id,
+        owner_user_id=user_id,
+        rows=read_rows(request.stream(), import_format),
+    )
+
+    report, *_ = await mediator.handle_command(command)
+
+    return ApiResponse[ImportReportSchema](
+        data=ImportReportSchema.from_report(report),
+    )
+
+
 @router.get(
     "/{contact_id}",
     status_code=status.HTTP_200_OK,
@@ -3,21 +3,44 @@ from uuid import UUID
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     Query,
+    Request,
+    Response,
     status,
 )
+from fastapi.responses import StreamingResponse
 
+from infrastructure.imports import (
+    ImportFormat,
+    read_rows,
+)
 from presentation.api.dependencies import (
     get_current_user_id,
     get_organization_id,
     get_organization_member,
 )
-from presentation.api.filters import PaginationOut
+from presentation.api.etags import (
+    etag_matches,
+    get_expected_version,
+    make_etag,
+)
+from presentation.api.exports import (
+    export_response,
+    ExportFormat,
+)
+from presentation.api.filters import (
+    build_next_cursor,
+    PaginationOut,
+)
 from presentation.api.schemas import (
     ApiResponse,
     ErrorResponseSchema,
+    ImportReportSchema,
 )
 from presentation.api.v1.deals.schemas import (
+    BatchUpdateDealsRequestSchema,
+    BatchUpdateDealsResponseSchema,
     CreateDealRequestSchema,
     DealListResponseSchema,
     DealResponseSchema,
@@ -27,13 +50,17 @@ from presentation.api.v1.deals.schemas import (
 from application.container import init_container
 from application.mediator import Mediator
 from application.sales.commands import (
+    BatchUpdateDealsCommand,
     CreateDealCommand,
+    ImportDealsCommand,
     UpdateDealCommand,
 )
 from application.sales.queries import (
+    ExportDealsQuery,
     GetDealByIdQuery,
     GetDealsQuery,
 )
+from domain.base.filters import SearchMode
 from domain.organizations.entities import OrganizationMemberEntity
 from domain.sales.filters import DealFilters
 
@@ -55,6 +82,8 @@ router = APIRouter(prefix="/deals", tags=["deals"])
 async def get_deals(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Opaque cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(default=False, description="Return planner-estimated total instead of exact count"),
     status_list: list[str] | None = Query(default=None, alias="status"),
     min_amount: float | None = Query(default=None),
     max_amount: float | None = Query(default=None),
@@ -62,6 +91,8 @@ async def get_deals(
     owner_id: UUID | None = Query(default=None),
     order_by: str | None = Query(default=None),
     order: str = Query(default="desc"),
+    search: str | None = Query(default=None),
+    search_mode: SearchMode = Query(default=SearchMode.CONTAINS),
     organization_id: UUID = Depends(get_organization_id),
     user_id: UUID = Depends(get_current_user_id),
     member: OrganizationMemberEntity = Depends(get_organization_member),
@@ -74,10 +105,14 @@ async def get_deals(
         organization_id=organization_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        estimate_total=estimate_total,
         min_amount=min_amount,
         max_amount=max_amount,
         order_by=order_by,
         order=order,
+        search=search,
+        search_mode=search_mode,
     )
 
     role = member.role.as_generic_type()
@@ -90,6 +125,7 @@ async def get_deals(
         stage=stage,
     )
     deals, total = await mediator.handle_query(query)
+    deals = list(deals)
 
     items = [DealResponseSchema.from_entity(deal) for deal in deals]
 
@@ -97,6 +133,7 @@ async def get_deals(
         limit=page_size,
         offset=(page - 1) * page_size,
         total=total,
+        next_cursor=build_next_cursor(deals, filters),
     )
 
     return ApiResponse[DealListResponseSchema](
@@ -107,6 +144,60 @@ async def get_deals(
     )
 
 
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}}},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
+    },
+)
+async def export_deals(
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    status_list: list[str] | None = Query(default=None, alias="status"),
+    min_amount: float | None = Query(default=None),
+    max_amount: float | None = Query(default=None),
+    stage: str | None = Query(default=None),
+    owner_id: UUID | None = Query(default=None),
+    order_by: str | None = Query(default=None),
+    order: str = Query(default="desc"),
+    search: str | None = Query(default=None),
+    search_mode: SearchMode = Query(default=SearchMode.CONTAINS),
+    organization_id: UUID = Depends(get_organization_id),
+    user_id: UUID = Depends(get_current_user_id),
+    member: OrganizationMemberEntity = Depends(get_organization_member),
+    container=Depends(init_container),
+) -> StreamingResponse:
+    """Выгрузить все сделки по фильтрам потоком (CSV или NDJSON)."""
+    mediator: Mediator = container.resolve(Mediator)
+
+    filters = DealFilters(
+        organization_id=organization_id,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        order_by=order_by,
+        order=order,
+        search=search,
+        search_mode=search_mode,
+    )
+
+    role = member.role.as_generic_type()
+    query = ExportDealsQuery(
+        filters=filters,
+        user_id=user_id,
+        user_role=role.value,
+        owner_id=owner_id,
+        status_list=status_list,
+        stage=stage,
+    )
+    deals = await mediator.handle_query(query)
+
+    return export_response(deals, DealResponseSchema, DealResponseSchema.from_entity, export_format, "deals")
+
+
 @router.post(
     "",
     status_code=status.HTTP_201_CREATED,
@@ -145,12 +236,53 @@ async def create_deal(
     )
 
 
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[ImportReportSchema],
+    responses={
+        status.HTTP_200_OK: {"model": ApiResponse[ImportReportSchema]},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
+    },
+)
+async def import_deals(
+    request: Request,
+    import_format: ImportFormat = Query(default=ImportFormat.CSV, alias="format"),
+    organization_id: UUID = Depends(get_organization_id),
+    user_id: UUID = Depends(get_current_user_id),
+    member: OrganizationMemberEntity = Depends(get_organization_member),
+    container=Depends(init_container),
+) -> ApiResponse[ImportReportSchema]:
+    """Массовый импорт из CSV или NDJSON в теле запроса.
+
+    Тело читается потоком, ошибки отдельных строк возвращаются в отчете и
+    не прерывают импорт.
+
+    """
+    mediator: Mediator = container.resolve(Mediator)
+
+    command = ImportDealsCommand(
+        organization_id=organization_id,
+        owner_user_id=user_id,
+        rows=read_rows(request.stream(), import_format),
+    )
+
+    report, *_ = await mediator.handle_command(command)
+
+    return ApiResponse[ImportReportSchema](
+        data=ImportReportSchema.from_report(report),
+    )
+
+
 @router.get(
     "/{deal_id}",
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[DealResponseSchema],
     responses={
         status.HTTP_200_OK: {"model": ApiResponse[DealResponseSchema]},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Deal has not changed since the ETag in If-None-Match"},
         status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
         status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
         status.HTTP_404_NOT_FOUND: {"model": ErrorResponseSchema},
@@ -158,6 +290,8 @@ async def create_deal(
 )
 async def get_deal(
     deal_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
     organization_id: UUID = Depends(get_organization_id),
     user_id: UUID = Depends(get_current_user_id),
     member: OrganizationMemberEntity = Depends(get_organization_member),
@@ -175,11 +309,62 @@ async def get_deal(
     )
     deal = await mediator.handle_query(query)
 
+    etag = make_etag(deal.version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return ApiResponse[DealResponseSchema](
         data=DealResponseSchema.from_entity(deal),
     )
 
 
+@router.patch(
+    "",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[BatchUpdateDealsResponseSchema],
+    responses={
+        status.HTTP_200_OK: {"model": ApiResponse[BatchUpdateDealsResponseSchema]},
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorResponseSchema},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
+        status.HTTP_404_NOT_FOUND: {"model": ErrorResponseSchema},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
+    },
+)
+async def batch_update_deals(
+    request: BatchUpdateDealsRequestSchema,
+    organization_id: UUID = Depends(get_organization_id),
+    user_id: UUID = Depends(get_current_user_id),
+    member: OrganizationMemberEntity = Depends(get_organization_member),
+    container=Depends(init_container),
+) -> ApiResponse[BatchUpdateDealsResponseSchema]:
+    """Массово обновить статус и/или стадию набора сделок.
+
+    Набор обновляется целиком или не обновляется вовсе: если хотя бы одна
+    сделка недоступна или переход для нее запрещен, изменений не будет.
+
+    """
+    mediator: Mediator = container.resolve(Mediator)
+
+    role = member.role.as_generic_type()
+    command = BatchUpdateDealsCommand(
+        deal_ids=request.deal_ids,
+        organization_id=organization_id,
+        user_id=user_id,
+        user_role=role.value,
+        new_status=request.status,
+        new_stage=request.stage,
+    )
+    deals, *_ = await mediator.handle_command(command)
+
+    return ApiResponse[BatchUpdateDealsResponseSchema](
+        data=BatchUpdateDealsResponseSchema(
+            items=[DealResponseSchema.from_entity(deal) for deal in deals],
+        ),
+    )
+
+
 @router.patch(
     "/{deal_id}",
     status_code=status.HTTP_200_OK,
@@ -190,12 +375,16 @@ async def get_deal(
         status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
         status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
         status.HTTP_404_NOT_FOUND: {"model": ErrorResponseSchema},
+        status.HTTP_409_CONFLICT: {"model": ErrorResponseSchema},
+        status.HTTP_412_PRECONDITION_FAILED: {"model": ErrorResponseSchema},
         status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
     },
 )
 async def update_deal(
     deal_id: UUID,
     request: UpdateDealRequestSchema,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     organization_id: UUID = Depends(get_organization_id),
     user_id: UUID = Depends(get_current_user_id),
     member: OrganizationMemberEntity = Depends(get_organization_member),
@@ -212,9 +401,11 @@ async def update_deal(
         user_role=role.value,
         new_status=request.status,
         new_stage=request.stage,
+        expected_version=expected_version,
     )
     deal, *_ = await mediator.handle_command(command)
 
+    response.headers["ETag"] = make_etag(deal.version)
     return ApiResponse[DealResponseSchema](
         data=DealResponseSchema.from_entity(deal),
     )
@@ -1,11 +1,18 @@
 from uuid import UUID
 
 from presentation.api.filters import PaginationOut
-from pydantic import BaseModel
+from pydantic import (
+    BaseModel,
+    Field,
+)
 
 from domain.sales.entities import DealEntity
 
 
+# Верхняя граница набора в одном массовом обновлении
+BATCH_UPDATE_MAX_DEALS = 500
+
+
 class DealResponseSchema(BaseModel):
     id: UUID
     organization_id: UUID
@@ -48,6 +55,16 @@ class UpdateDealRequestSchema(BaseModel):
     stage: str | None = None
 
 
+class BatchUpdateDealsRequestSchema(BaseModel):
+    deal_ids: list[UUID] = Field(min_length=1, max_length=BATCH_UPDATE_MAX_DEALS)
+    status: str | None = None
+    stage: str | None = None
+
+
+class BatchUpdateDealsResponseSchema(BaseModel):
+    items: list[DealResponseSchema]
+
+
 class DealListResponseSchema(BaseModel):
     items: list[DealResponseSchema]
     pagination: PaginationOut
@@ -4,16 +4,31 @@ from uuid import UUID
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     Query,
+    Response,
     status,
 )
+from fastapi.responses import StreamingResponse
 
 from presentation.api.dependencies import (
     get_current_user_id,
     get_organization_id,
     get_organization_member,
 )
-from presentation.api.filters import PaginationOut
+from presentation.api.etags import (
+    etag_matches,
+    get_expected_version,
+    make_etag,
+)
+from presentation.api.exports import (
+    export_response,
+    ExportFormat,
+)
+from presentation.api.filters import (
+    build_next_cursor,
+    PaginationOut,
+)
 from presentation.api.schemas import (
     ApiResponse,
     ErrorResponseSchema,
@@ -32,9 +47,11 @@ from application.sales.commands import (
     UpdateTaskCommand,
 )
 from application.sales.queries import (
+    ExportTasksQuery,
     GetTaskByIdQuery,
     GetTasksQuery,
 )
+from domain.base.filters import SearchMode
 from domain.organizations.entities import OrganizationMemberEntity
 from domain.sales.filters import TaskFilters
 
@@ -56,11 +73,15 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 async def get_tasks(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="Opaque cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(default=False, description="Return planner-estimated total instead of exact count"),
     deal_id: UUID | None = Query(default=None),
     only_open: bool | None = Query(default=None),
     due_before: date | None = Query(default=None),
     due_after: date | None = Query(default=None),
     is_done: bool | None = Query(default=None),
+    search: str | None = Query(default=None),
+    search_mode: SearchMode = Query(default=SearchMode.CONTAINS),
     organization_id: UUID = Depends(get_organization_id),
     user_id: UUID = Depends(get_current_user_id),
     member: OrganizationMemberEntity = Depends(get_organization_member),
@@ -73,11 +94,15 @@ async def get_tasks(
         organization_id=organization_id,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        estimate_total=estimate_total,
         deal_id=deal_id,
         only_open=only_open,
         due_before=due_before,
         due_after=due_after,
         is_done=is_done,
+        search=search,
+        search_mode=search_mode,
     )
 
     role = member.role.as_generic_type()
@@ -87,6 +112,7 @@ async def get_tasks(
         user_role=role.value,
     )
     tasks, total = await mediator.handle_query(query)
+    tasks = list(tasks)
 
     items = [TaskResponseSchema.from_entity(task) for task in tasks]
 
@@ -94,6 +120,7 @@ async def get_tasks(
         limit=page_size,
         offset=(page - 1) * page_size,
         total=total,
+        next_cursor=build_next_cursor(tasks, filters),
     )
 
     return ApiResponse[TaskListResponseSchema](
@@ -104,6 +131,56 @@ async def get_tasks(
     )
 
 
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}}},
+        status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
+        status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
+    },
+)
+async def export_tasks(
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+    deal_id: UUID | None = Query(default=None),
+    only_open: bool | None = Query(default=None),
+    due_before: date | None = Query(default=None),
+    due_after: date | None = Query(default=None),
+    is_done: bool | None = Query(default=None),
+    search: str | None = Query(default=None),
+    search_mode: SearchMode = Query(default=SearchMode.CONTAINS),
+    organization_id: UUID = Depends(get_organization_id),
+    user_id: UUID = Depends(get_current_user_id),
+    member: OrganizationMemberEntity = Depends(get_organization_member),
+    container=Depends(init_container),
+) -> StreamingResponse:
+    """Выгрузить все задачи по фильтрам потоком (CSV или NDJSON)."""
+    mediator: Mediator = container.resolve(Mediator)
+
+    filters = TaskFilters(
+        organization_id=organization_id,
+        deal_id=deal_id,
+        only_open=only_open,
+        due_before=due_before,
+        due_after=due_after,
+        is_done=is_done,
+        search=search,
+        search_mode=search_mode,
+    )
+
+    role = member.role.as_generic_type()
+    query = ExportTasksQuery(
+        filters=filters,
+        user_id=user_id,
+        user_role=role.value,
+    )
+    tasks = await mediator.handle_query(query)
+
+    return export_response(tasks, TaskResponseSchema, TaskResponseSchema.from_entity, export_format, "tasks")
+
+
 @router.post(
     "",
     status_code=status.HTTP_201_CREATED,
@@ -151,6 +228,7 @@ async def create_task(
     response_model=ApiResponse[TaskResponseSchema],
     responses={
         status.HTTP_200_OK: {"model": ApiResponse[TaskResponseSchema]},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Task has not changed since the ETag in If-None-Match"},
         status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
         status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
         status.HTTP_404_NOT_FOUND: {"model": ErrorResponseSchema},
@@ -158,6 +236,8 @@ async def create_task(
 )
 async def get_task(
     task_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
     organization_id: UUID = Depends(get_organization_id),
     user_id: UUID = Depends(get_current_user_id),
     member: OrganizationMemberEntity = Depends(get_organization_member),
@@ -175,6 +255,11 @@ async def get_task(
     )
     task = await mediator.handle_query(query)
 
+    etag = make_etag(task.version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return ApiResponse[TaskResponseSchema](
         data=TaskResponseSchema.from_entity(task),
     )
@@ -190,12 +275,16 @@ async def get_task(
         status.HTTP_401_UNAUTHORIZED: {"model": ErrorResponseSchema},
         status.HTTP_403_FORBIDDEN: {"model": ErrorResponseSchema},
         status.HTTP_404_NOT_FOUND: {"model": ErrorResponseSchema},
+        status.HTTP_409_CONFLICT: {"model": ErrorResponseSchema},
+        status.HTTP_412_PRECONDITION_FAILED: {"model": ErrorResponseSchema},
         status.HTTP_422_UNPROCESSABLE_CONTENT: {"model": ErrorResponseSchema},
     },
 )
 async def update_task(
     task_id: UUID,
     request: UpdateTaskRequestSchema,
+    response: Response,
+    expected_version: int | None = Depends(get_expected_version),
     organization_id: UUID = Depends(get_organization_id),
     user_id: UUID = Depends(get_current_user_id),
     member: OrganizationMemberEntity = Depends(get_organization_member),
@@ -214,9 +303,11 @@ async def update_task(
         description=request.description,
         due_date=request.due_date,
         is_done=request.is_done,
+        expected_version=expected_version,
     )
     task, *_ = await mediator.handle_command(command)
 
+    response.headers["ETag"] = make_etag(task.version)
     return ApiResponse[TaskResponseSchema](
         data=TaskResponseSchema.from_entity(task),
     )
@@ -0,0 +1,95 @@
+"""Массовый импорт контактов и сделок из файла.
+
+python -m presentation.cli.imports contacts contacts.csv --organization-id ... --owner-id ...
+python -m presentation.cli.imports deals deals.ndjson --organization-id ... --owner-id ...
+
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from uuid import UUID
+
+from infrastructure.imports import (
+    ImportFormat,
+    read_rows,
+)
+from presentation.api.schemas import ImportReportSchema
+
+from application.container import init_container
+from application.mediator import Mediator
+from application.sales.commands import (
+    ImportContactsCommand,
+    ImportDealsCommand,
+)
+from domain.base.imports import ImportReport
+
+
+CHUNK_SIZE = 64 * 1024
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, CHUNK_SIZE):
+            yield chunk
+
+
+async def run_import(
+    resource: str,
+    path: Path,
+    import_format: ImportFormat,
+    organization_id: UUID,
+    owner_id: UUID,
+    batch_size: int,
+) -> ImportReport:
+    mediator: Mediator = init_container().resolve(Mediator)
+
+    command_class = ImportContactsCommand if resource == "contacts" else ImportDealsCommand
+    command = command_class(
+        organization_id=organization_id,
+        owner_user_id=owner_id,
+        rows=read_rows(read_file(path), import_format),
+        batch_size=batch_size,
+    )
+
+    report, *_ = await mediator.handle_command(command)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import contacts or deals from CSV/NDJSON")
+    parser.add_argument("resource", choices=["contacts", "deals"])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--organization-id", type=UUID, required=True)
+    parser.add_argument("--owner-id", type=UUID, required=True)
+    parser.add_argument("--format", choices=[item.value for item in ImportFormat], default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if args.format:
+        import_format = ImportFormat(args.format)
+    elif args.path.suffix.lower() in NDJSON_SUFFIXES:
+        import_format = ImportFormat.NDJSON
+    else:
+        import_format = ImportFormat.CSV
+
+    report = asyncio.run(
+        run_import(
+            resource=args.resource,
+            path=args.path,
+            import_format=import_format,
+            organization_id=args.organization_id,
+            owner_id=args.owner_id,
+            batch_size=args.batch_size,
+        ),
+    )
+    print(ImportReportSchema.from_report(report).model_dump_json(indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -34,11 +34,248 @@ class Config(BaseSettings):
         alias="POSTGRES_HOST",
     )
 
+    # Пулы соединений по типу нагрузки: interactive (запросы API), analytics
+    # (сводки и выгрузки), background (события и журнал). Размер пула, сверх
+    # него, ожидание соединения (сек) и statement_timeout (сек, 0 - без лимита)
+    db_interactive_pool_size: int = Field(
+        default=10,
+        alias="DB_INTERACTIVE_POOL_SIZE",
+    )
+
+    db_interactive_max_overflow: int = Field(
+        default=10,
+        alias="DB_INTERACTIVE_MAX_OVERFLOW",
+    )
+
+    db_interactive_pool_timeout: float = Field(
+        default=5.0,
+        alias="DB_INTERACTIVE_POOL_TIMEOUT",
+    )
+
+    db_interactive_statement_timeout: float = Field(
+        default=15.0,
+        alias="DB_INTERACTIVE_STATEMENT_TIMEOUT",
+    )
+
+    db_analytics_pool_size: int = Field(
+        default=3,
+        alias="DB_ANALYTICS_POOL_SIZE",
+    )
+
+    db_analytics_max_overflow: int = Field(
+        default=2,
+        alias="DB_ANALYTICS_MAX_OVERFLOW",
+    )
+
+    db_analytics_pool_timeout: float = Field(
+        default=30.0,
+        alias="DB_ANALYTICS_POOL_TIMEOUT",
+    )
+
+    db_analytics_statement_timeout: float = Field(
+        default=120.0,
+        alias="DB_ANALYTICS_STATEMENT_TIMEOUT",
+    )
+
+    db_background_pool_size: int = Field(
+        default=3,
+        alias="DB_BACKGROUND_POOL_SIZE",
+    )
+
+    db_background_max_overflow: int = Field(
+        default=2,
+        alias="DB_BACKGROUND_MAX_OVERFLOW",
+    )
+
+    db_background_pool_timeout: float = Field(
+        default=30.0,
+        alias="DB_BACKGROUND_POOL_TIMEOUT",
+    )
+
+    db_background_statement_timeout: float = Field(
+        default=60.0,
+        alias="DB_BACKGROUND_STATEMENT_TIMEOUT",
+    )
+
+    # Общие для пулов: через сколько секунд переоткрывать соединение и
+    # размер кэша подготовленных запросов asyncpg (0 - за pgbouncer)
+    db_pool_recycle: float = Field(
+        default=1800.0,
+        alias="DB_POOL_RECYCLE",
+    )
+
+    db_statement_cache_size: int = Field(
+        default=100,
+        alias="DB_STATEMENT_CACHE_SIZE",
+    )
+
+    # Бюджеты времени запросов медиатора (сек, 0 - без лимита): по умолчанию,
+    # для списков с поиском и для аналитических сводок
+    query_budget_default: float = Field(
+        default=10.0,
+        alias="QUERY_BUDGET_DEFAULT",
+    )
+
+    query_budget_search: float = Field(
+        default=5.0,
+        alias="QUERY_BUDGET_SEARCH",
+    )
+
+    query_budget_analytics: float = Field(
+        default=30.0,
+        alias="QUERY_BUDGET_ANALYTICS",
+    )
+
+    # Кэш результатов запросов: число записей, время жизни (сек) карточек
+    # сущностей и списков со сводками (0 - не кэшировать)
+    query_cache_max_size: int = Field(
+        default=10_000,
+        alias="QUERY_CACHE_MAX_SIZE",
+    )
+
+    query_cache_entity_ttl: float = Field(
+        default=30.0,
+        alias="QUERY_CACHE_ENTITY_TTL",
+    )
+
+    query_cache_list_ttl: float = Field(
+        default=10.0,
+        alias="QUERY_CACHE_LIST_TTL",
+    )
+
+    # Реплики для чтения: DSN в виде JSON-списка, способ выбора
+    # (round_robin или least_loaded), допустимое отставание (сек) и период
+    # его проверки (сек)
+    postgres_replica_uris: list[str] = Field(
+        default_factory=list,
+        alias="POSTGRES_REPLICA_URIS",
+    )
+
+    replica_selection: str = Field(
+        default="round_robin",
+        alias="REPLICA_SELECTION",
+    )
+
+    replica_max_lag: float = Field(
+        default=5.0,
+        alias="REPLICA_MAX_LAG",
+    )
+
+    replica_lag_check_interval: float = Field(
+        default=2.0,
+        alias="REPLICA_LAG_CHECK_INTERVAL",
+    )
+
+    # Сколько секунд после записи чтения пользователя идут на мастер
+    read_your_writes_window: float = Field(
+        default=5.0,
+        alias="READ_YOUR_WRITES_WINDOW",
+    )
+
     jwt_secret_key: str = Field(
         alias="JWT_SECRET_KEY",
         default="secret-key",
     )
 
+    # Бэкенд текстового поиска: trigram (pg_trgm) или ilike
+    search_backend: str = Field(
+        default="trigram",
+        alias="SEARCH_BACKEND",
+    )
+
+    # Кэш членства в организациях: время жизни записи (сек) и размер
+    membership_cache_ttl: float = Field(
+        default=30.0,
+        alias="MEMBERSHIP_CACHE_TTL",
+    )
+
+    membership_cache_max_size: int = Field(
+        default=10_000,
+        alias="MEMBERSHIP_CACHE_MAX_SIZE",
+    )
+
+    # Хеширование паролей: пул (thread или process), его размер,
+    # лимит одновременных операций и cost-фактор bcrypt
+    password_hasher_executor: str = Field(
+        default="thread",
+        alias="PASSWORD_HASHER_EXECUTOR",
+    )
+
+    password_hasher_workers: int = Field(
+        default=4,
+        alias="PASSWORD_HASHER_WORKERS",
+    )
+
+    password_hasher_max_concurrency: int = Field(
+        default=16,
+        alias="PASSWORD_HASHER_MAX_CONCURRENCY",
+    )
+
+    password_hash_rounds: int = Field(
+        default=8,
+        alias="PASSWORD_HASH_ROUNDS",
+    )
+
+    # Журнал активностей: размер очереди, размер пачки, интервал сброса (сек),
+    # ожидание места в очереди (сек) перед синхронной записью и число повторов
+    activity_journal_queue_size: int = Field(
+        default=10_000,
+        alias="ACTIVITY_JOURNAL_QUEUE_SIZE",
+    )
+
+    activity_journal_batch_size: int = Field(
+        default=500,
+        alias="ACTIVITY_JOURNAL_BATCH_SIZE",
+    )
+
+    activity_journal_flush_interval: float = Field(
+        default=0.5,
+        alias="ACTIVITY_JOURNAL_FLUSH_INTERVAL",
+    )
+
+    activity_journal_enqueue_timeout: float = Field(
+        default=0.1,
+        alias="ACTIVITY_JOURNAL_ENQUEUE_TIMEOUT",
+    )
+
+    activity_journal_max_retries: int = Field(
+        default=3,
+        alias="ACTIVITY_JOURNAL_MAX_RETRIES",
+    )
+
+    # Доменные события: сколько подписчиков выполняется одновременно, размер
+    # пачки и период опроса outbox (сек), аренда забранных событий (сек),
+    # число попыток доставки и пауза перед повтором (сек)
+    event_dispatch_concurrency: int = Field(
+        default=8,
+        alias="EVENT_DISPATCH_CONCURRENCY",
+    )
+
+    outbox_batch_size: int = Field(
+        default=100,
+        alias="OUTBOX_BATCH_SIZE",
+    )
+
+    outbox_poll_interval: float = Field(
+        default=1.0,
+        alias="OUTBOX_POLL_INTERVAL",
+    )
+
+    outbox_lease: float = Field(
+        default=30.0,
+        alias="OUTBOX_LEASE",
+    )
+
+    outbox_max_attempts: int = Field(
+        default=10,
+        alias="OUTBOX_MAX_ATTEMPTS",
+    )
+
+    outbox_retry_delay: float = Field(
+        default=5.0,
+        alias="OUTBOX_RETRY_DELAY",
+    )
+
     @computed_field
     @property
     def postgres_connection_uri(self) -> str:
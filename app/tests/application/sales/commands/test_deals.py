@@ -9,6 +9,7 @@ from application.organizations.commands import (
     CreateOrganizationCommand,
 )
 from application.sales.commands import (
+    BatchUpdateDealsCommand,
     CreateContactCommand,
     CreateDealCommand,
     UpdateDealStageCommand,
@@ -694,3 +695,168 @@ async def test_update_deal_status_command_member_can_update_own_deal(
     )
 
     assert updated_deal.status.as_generic_type().value == "won"
+
+
+async def _create_deals(
+    mediator: Mediator,
+    faker: Faker,
+    organization_id,
+    owner_user_id,
+    amounts: list[float],
+) -> list[DealEntity]:
+    contact_result, *_ = await mediator.handle_command(
+        CreateContactCommand(
+            organization_id=organization_id,
+            owner_user_id=owner_user_id,
+            name=faker.name(),
+        ),
+    )
+    deals = []
+    for amount in amounts:
+        deal_result, *_ = await mediator.handle_command(
+            CreateDealCommand(
+                organization_id=organization_id,
+                contact_id=contact_result.oid,
+                owner_user_id=owner_user_id,
+                title=faker.sentence(),
+                amount=amount,
+                currency="USD",
+            ),
+        )
+        deals.append(deal_result)
+    return deals
+
+
+@pytest.mark.asyncio
+async def test_batch_update_deals_command_success(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+    deals = await _create_deals(mediator, faker, organization_id, owner_user_id, [1000.0, 2000.0])
+
+    result, *_ = await mediator.handle_command(
+        BatchUpdateDealsCommand(
+            deal_ids=[deal.oid for deal in deals],
+            organization_id=organization_id,
+            user_id=owner_user_id,
+            user_role="owner",
+            new_status="won",
+            new_stage="closed",
+        ),
+    )
+
+    assert [deal.oid for deal in result] == [deal.oid for deal in deals]
+    for deal in deals:
+        updated = await mediator.handle_query(
+            GetDealByIdQuery(
+                deal_id=deal.oid,
+                organization_id=organization_id,
+                user_id=owner_user_id,
+                user_role="owner",
+            ),
+        )
+        assert updated.status.as_generic_type().value == "won"
+        assert updated.stage.as_generic_type().value == "closed"
+
+        activities = await mediator.handle_query(
+            GetActivitiesByDealIdQuery(
+                deal_id=deal.oid,
+                organization_id=organization_id,
+                user_id=owner_user_id,
+                user_role="owner",
+            ),
+        )
+        assert sorted(activity.payload.as_generic_type().get("new_status", "") for activity in activities) == [
+            "",
+            "won",
+        ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("role", "new_status", "new_stage", "exception"),
+    [
+        ("member", None, "qualification", DealStageRollbackNotAllowedException),
+        ("owner", "won", None, CannotCloseDealWithZeroAmountException),
+    ],
+)
+async def test_batch_update_deals_command_rejects_whole_set(
+    mediator: Mediator,
+    faker: Faker,
+    role: str,
+    new_status: str | None,
+    new_stage: str | None,
+    exception: type[Exception],
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+    valid, invalid = await _create_deals(mediator, faker, organization_id, owner_user_id, [1000.0, 0.0])
+    await mediator.handle_command(
+        UpdateDealStageCommand(
+            deal_id=invalid.oid,
+            new_stage="proposal",
+            organization_id=organization_id,
+            user_id=owner_user_id,
+            user_role="admin",
+        ),
+    )
+
+    with pytest.raises(exception):
+        await mediator.handle_command(
+            BatchUpdateDealsCommand(
+                deal_ids=[valid.oid, invalid.oid],
+                organization_id=organization_id,
+                user_id=owner_user_id,
+                user_role=role,
+                new_status=new_status,
+                new_stage=new_stage,
+            ),
+        )
+
+    # Ни одна сделка набора не изменилась
+    unchanged = await mediator.handle_query(
+        GetDealByIdQuery(
+            deal_id=valid.oid,
+            organization_id=organization_id,
+            user_id=owner_user_id,
+            user_role="owner",
+        ),
+    )
+    assert unchanged.status.as_generic_type().value == "new"
+    assert unchanged.stage.as_generic_type().value == "qualification"
+
+
+@pytest.mark.asyncio
+async def test_batch_update_deals_command_member_cannot_update_other_user_deal(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+    member_user_id = uuid4()
+    (own,) = await _create_deals(mediator, faker, organization_id, member_user_id, [1000.0])
+    (foreign,) = await _create_deals(mediator, faker, organization_id, owner_user_id, [1000.0])
+
+    with pytest.raises(AccessDeniedException) as exc_info:
+        await mediator.handle_command(
+            BatchUpdateDealsCommand(
+                deal_ids=[own.oid, foreign.oid],
+                organization_id=organization_id,
+                user_id=member_user_id,
+                user_role="member",
+                new_status="lost",
+            ),
+        )
+
+    assert exc_info.value.resource_id == foreign.oid
@@ -0,0 +1,121 @@
+from collections.abc import AsyncIterator
+from uuid import uuid4
+
+import pytest
+from faker import Faker
+
+from application.mediator import Mediator
+from application.organizations.commands import CreateOrganizationCommand
+from application.sales.commands import (
+    CreateContactCommand,
+    ImportContactsCommand,
+    ImportDealsCommand,
+)
+from application.sales.queries import GetContactsQuery
+from domain.base.imports import ImportRow
+from domain.sales.filters import ContactFilters
+
+
+async def _rows(*rows: dict[str, str | None]) -> AsyncIterator[ImportRow]:
+    for number, data in enumerate(rows, start=1):
+        yield ImportRow(number=number, data=data)
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_reports_invalid_rows_without_aborting(
+    mediator: Mediator,
+    faker: Faker,
+):
+    organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    owner_user_id = uuid4()
+
+    report, *_ = await mediator.handle_command(
+        ImportContactsCommand(
+            organization_id=organization.oid,
+            owner_user_id=owner_user_id,
+            rows=_rows(
+                {"name": faker.name(), "email": faker.email()},
+                {"name": "", "email": faker.email()},
+                {"name": faker.name(), "email": "not-an-email"},
+                {"name": faker.name(), "phone": faker.numerify("+7##########")},
+            ),
+            batch_size=2,
+        ),
+    )
+
+    assert report.processed == 4
+    assert report.imported == 2
+    assert report.failed == 2
+    assert [error.row for error in report.errors] == [2, 3]
+
+    contacts, total = await mediator.handle_query(
+        GetContactsQuery(
+            filters=ContactFilters(organization_id=organization.oid),
+            user_id=owner_user_id,
+            user_role="owner",
+        ),
+    )
+    assert total == 2
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_skips_existing_ids(
+    mediator: Mediator,
+    faker: Faker,
+):
+    organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    contact_id = str(uuid4())
+
+    def command() -> ImportContactsCommand:
+        return ImportContactsCommand(
+            organization_id=organization.oid,
+            owner_user_id=uuid4(),
+            rows=_rows(
+                {"id": contact_id, "name": faker.name()},
+                {"id": contact_id, "name": faker.name()},
+            ),
+        )
+
+    first, *_ = await mediator.handle_command(command())
+    second, *_ = await mediator.handle_command(command())
+
+    # Дубликат внутри файла и повторный импорт не создают новых контактов
+    assert (first.imported, first.failed) == (1, 1)
+    assert (second.imported, second.failed) == (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_import_deals_validates_contacts_and_values(
+    mediator: Mediator,
+    faker: Faker,
+):
+    organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    other_organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    owner_user_id = uuid4()
+    contact, *_ = await mediator.handle_command(
+        CreateContactCommand(organization_id=organization.oid, owner_user_id=owner_user_id, name=faker.name()),
+    )
+    foreign_contact, *_ = await mediator.handle_command(
+        CreateContactCommand(organization_id=other_organization.oid, owner_user_id=owner_user_id, name=faker.name()),
+    )
+    valid = {"contact_id": str(contact.oid), "title": "Deal", "amount": "100.50", "currency": "usd"}
+
+    report, *_ = await mediator.handle_command(
+        ImportDealsCommand(
+            organization_id=organization.oid,
+            owner_user_id=owner_user_id,
+            rows=_rows(
+                valid,
+                {**valid, "contact_id": str(foreign_contact.oid)},
+                {**valid, "contact_id": "not-a-uuid"},
+                {**valid, "amount": "a lot"},
+                {**valid, "currency": "XYZ"},
+                {**valid, "status": "won", "amount": "0"},
+                {**valid, "status": "in_progress", "stage": "proposal"},
+            ),
+        ),
+    )
+
+    assert report.processed == 7
+    assert report.imported == 2
+    assert sorted(error.row for error in report.errors) == [2, 3, 4, 5, 6]
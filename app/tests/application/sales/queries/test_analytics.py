@@ -0,0 +1,283 @@
+import asyncio
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+import pytest
+from faker import Faker
+from punq import Container
+
+from application.mediator import Mediator
+from application.middlewares import MediatorMetrics
+from application.organizations.commands import CreateOrganizationCommand
+from application.sales.commands import (
+    CreateContactCommand,
+    CreateDealCommand,
+    UpdateDealCommand,
+)
+from application.sales.queries import (
+    GetDealFunnelQuery,
+    GetDealSummaryQuery,
+)
+from domain.sales.filters import (
+    DealFunnelFilters,
+    DealSummaryFilters,
+)
+from domain.sales.value_objects.deals import DealStage
+
+
+async def _create_deal(
+    mediator: Mediator,
+    faker: Faker,
+    organization_id: UUID,
+    contact_id: UUID,
+    owner_user_id: UUID,
+    amount: float,
+    new_status: str | None = None,
+    new_stage: str | None = None,
+) -> None:
+    deal, *_ = await mediator.handle_command(
+        CreateDealCommand(
+            organization_id=organization_id,
+            contact_id=contact_id,
+            owner_user_id=owner_user_id,
+            title=faker.sentence(),
+            amount=amount,
+            currency="USD",
+        ),
+    )
+    if new_status or new_stage:
+        await mediator.handle_command(
+            UpdateDealCommand(
+                deal_id=deal.oid,
+                organization_id=organization_id,
+                user_id=owner_user_id,
+                user_role="owner",
+                new_status=new_status,
+                new_stage=new_stage,
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_deal_summary_counts_and_amounts(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+
+    contact_result, *_ = await mediator.handle_command(
+        CreateContactCommand(
+            organization_id=organization_id,
+            owner_user_id=owner_user_id,
+            name=faker.name(),
+        ),
+    )
+
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 100.0)
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 200.0, "in_progress")
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 300.0, "won")
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 400.0, "won")
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 500.0, "lost")
+
+    result = await mediator.handle_query(
+        GetDealSummaryQuery(
+            filters=DealSummaryFilters(organization_id=organization_id),
+            user_id=owner_user_id,
+            user_role="owner",
+        ),
+    )
+
+    assert result.total_count == 5
+    assert result.new_count == 1
+    assert result.in_progress_count == 1
+    assert result.won_count == 2
+    assert result.lost_count == 1
+    assert result.total_won_amount == 700.0
+    assert result.new_deals_count is None
+
+
+@pytest.mark.asyncio
+async def test_get_deal_summary_status_filter_limits_total_only(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+
+    contact_result, *_ = await mediator.handle_command(
+        CreateContactCommand(
+            organization_id=organization_id,
+            owner_user_id=owner_user_id,
+            name=faker.name(),
+        ),
+    )
+
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 100.0)
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 300.0, "won")
+
+    result = await mediator.handle_query(
+        GetDealSummaryQuery(
+            filters=DealSummaryFilters(organization_id=organization_id, status=["won", "unknown"]),
+            user_id=owner_user_id,
+            user_role="owner",
+        ),
+    )
+
+    assert result.total_count == 1
+    assert result.new_count == 1
+    assert result.won_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_deal_summary_member_sees_only_own_deals(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    member_user_id = uuid4()
+    other_user_id = uuid4()
+
+    contact_result, *_ = await mediator.handle_command(
+        CreateContactCommand(
+            organization_id=organization_id,
+            owner_user_id=member_user_id,
+            name=faker.name(),
+        ),
+    )
+
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, member_user_id, 100.0, "won")
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, other_user_id, 900.0, "won")
+
+    result = await mediator.handle_query(
+        GetDealSummaryQuery(
+            filters=DealSummaryFilters(organization_id=organization_id),
+            user_id=member_user_id,
+            user_role="member",
+        ),
+    )
+
+    assert result.total_count == 1
+    assert result.won_count == 1
+    assert result.total_won_amount == 100.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_deal_summaries_share_one_execution(
+    container: Container,
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    member_user_id = uuid4()
+
+    contact_result, *_ = await mediator.handle_command(
+        CreateContactCommand(
+            organization_id=organization_id,
+            owner_user_id=member_user_id,
+            name=faker.name(),
+        ),
+    )
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, member_user_id, 100.0)
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, uuid4(), 900.0)
+
+    def summary(user_id: UUID, user_role: str) -> GetDealSummaryQuery:
+        return GetDealSummaryQuery(
+            filters=DealSummaryFilters(organization_id=organization_id),
+            user_id=user_id,
+            user_role=user_role,
+        )
+
+    # Сводка owner и admin одинакова, у member - своя
+    owner_result, admin_result, member_result = await asyncio.gather(
+        mediator.handle_query(summary(uuid4(), "owner")),
+        mediator.handle_query(summary(uuid4(), "admin")),
+        mediator.handle_query(summary(member_user_id, "member")),
+    )
+
+    assert owner_result is admin_result
+    assert owner_result.total_count == 2
+    assert member_result.total_count == 1
+    assert container.resolve(MediatorMetrics).coalesced == {"GetDealSummaryQuery": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_deal_funnel_stage_metrics(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+
+    contact_result, *_ = await mediator.handle_command(
+        CreateContactCommand(
+            organization_id=organization_id,
+            owner_user_id=owner_user_id,
+            name=faker.name(),
+        ),
+    )
+
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 100.0)
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 100.0)
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 200.0, new_stage="proposal")
+    await _create_deal(mediator, faker, organization_id, contact_result.oid, owner_user_id, 300.0, new_stage="closed")
+
+    result = await mediator.handle_query(
+        GetDealFunnelQuery(
+            filters=DealFunnelFilters(organization_id=organization_id),
+            user_id=owner_user_id,
+            user_role="owner",
+        ),
+    )
+
+    assert result.qualification_count == 2
+    assert result.proposal_count == 1
+    assert result.negotiation_count == 0
+    assert result.closed_count == 1
+
+    stages = {stage.stage: stage for stage in result.stages}
+    assert [stage.stage for stage in result.stages] == list(DealStage)
+    assert stages[DealStage.QUALIFICATION].amount == 200.0
+    assert stages[DealStage.QUALIFICATION].conversion_rate is None
+    # 2 из 4 сделок прошли квалификацию, 1 из 2 дошла до переговоров и дальше
+    assert stages[DealStage.PROPOSAL].conversion_rate == 0.5
+    assert stages[DealStage.NEGOTIATION].conversion_rate == 0.5
+    assert stages[DealStage.CLOSED].conversion_rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_get_deal_funnel_empty_conversion(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+
+    result = await mediator.handle_query(
+        GetDealFunnelQuery(
+            filters=DealFunnelFilters(organization_id=org_result.oid),
+            user_id=uuid4(),
+            user_role="owner",
+        ),
+    )
+
+    assert all(stage.count == 0 for stage in result.stages)
+    assert all(stage.conversion_rate in (None, 0.0) for stage in result.stages)
@@ -10,6 +10,8 @@ from application.sales.queries import (
     GetContactByIdQuery,
     GetContactsQuery,
 )
+from domain.base.cursor import PageCursor
+from domain.base.filters import SearchMode
 from domain.sales.entities import ContactEntity
 from domain.sales.exceptions.sales import ContactNotFoundException
 from domain.sales.filters import ContactFilters
@@ -154,6 +156,49 @@ async def test_get_contacts_query_with_search_filter(
     assert any(c.oid == contact_result.oid for c in contacts_list)
 
 
+@pytest.mark.asyncio
+async def test_get_contacts_query_with_similarity_search(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+
+    contact_ids = {}
+    for name in ("Alexander Petrov", "Alexandra Smirnova", "Ivan Sidorov"):
+        contact_result, *_ = await mediator.handle_command(
+            CreateContactCommand(
+                organization_id=organization_id,
+                owner_user_id=owner_user_id,
+                name=name,
+            ),
+        )
+        contact_ids[name] = contact_result.oid
+
+    filters = ContactFilters(
+        organization_id=organization_id,
+        search="Alexandr",
+        search_mode=SearchMode.SIMILARITY,
+    )
+    contacts, count = await mediator.handle_query(
+        GetContactsQuery(
+            filters=filters,
+            user_id=owner_user_id,
+            user_role="owner",
+        ),
+    )
+
+    # Более похожие контакты идут первыми, непохожие отсекаются порогом
+    assert count == 2
+    assert [c.oid for c in contacts] == [
+        contact_ids["Alexandra Smirnova"],
+        contact_ids["Alexander Petrov"],
+    ]
+
+
 @pytest.mark.asyncio
 async def test_get_contacts_query_with_pagination(
     mediator: Mediator,
@@ -186,3 +231,47 @@ async def test_get_contacts_query_with_pagination(
     contacts_list = list(contacts)
     assert count >= 3
     assert len(contacts_list) <= 2
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_query_with_cursor(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    owner_user_id = uuid4()
+
+    created_ids = set()
+    for _ in range(5):
+        contact_result, *_ = await mediator.handle_command(
+            CreateContactCommand(
+                organization_id=organization_id,
+                owner_user_id=owner_user_id,
+                name=faker.name(),
+            ),
+        )
+        created_ids.add(contact_result.oid)
+
+    seen_ids = []
+    cursor = None
+    while True:
+        filters = ContactFilters(organization_id=organization_id, page_size=2, cursor=cursor)
+        contacts, count = await mediator.handle_query(
+            GetContactsQuery(
+                filters=filters,
+                user_id=owner_user_id,
+                user_role="owner",
+            ),
+        )
+        contacts = list(contacts)
+        assert count == 5
+        seen_ids.extend(c.oid for c in contacts)
+        if len(contacts) < filters.page_size:
+            break
+        cursor = PageCursor.from_entity(contacts[-1], filters.sort_key, filters.sort_descending).encode()
+
+    assert len(seen_ids) == 5
+    assert set(seen_ids) == created_ids
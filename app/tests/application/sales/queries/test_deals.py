@@ -10,6 +10,7 @@ from application.sales.commands import (
     CreateDealCommand,
 )
 from application.sales.queries import (
+    ExportDealsQuery,
     GetDealByIdQuery,
     GetDealsQuery,
 )
@@ -194,3 +195,49 @@ async def test_get_deals_query_with_pagination(
     deals_list = list(deals)
     assert count >= 3
     assert len(deals_list) <= 2
+
+
+@pytest.mark.asyncio
+async def test_export_deals_query_member_sees_only_own_deals(
+    mediator: Mediator,
+    faker: Faker,
+):
+    org_result, *_ = await mediator.handle_command(
+        CreateOrganizationCommand(name=faker.company()),
+    )
+    organization_id = org_result.oid
+    member_user_id = uuid4()
+    other_user_id = uuid4()
+
+    contact_result, *_ = await mediator.handle_command(
+        CreateContactCommand(
+            organization_id=organization_id,
+            owner_user_id=member_user_id,
+            name=faker.name(),
+        ),
+    )
+
+    deal_ids = {}
+    for owner_user_id in (member_user_id, other_user_id):
+        deal_result, *_ = await mediator.handle_command(
+            CreateDealCommand(
+                organization_id=organization_id,
+                contact_id=contact_result.oid,
+                owner_user_id=owner_user_id,
+                title=faker.sentence(),
+                amount=1000.0,
+                currency="USD",
+            ),
+        )
+        deal_ids[owner_user_id] = deal_result.oid
+
+    filters = DealFilters(organization_id=organization_id)
+    member_deals = await mediator.handle_query(
+        ExportDealsQuery(filters=filters, user_id=member_user_id, user_role="member"),
+    )
+    owner_deals = await mediator.handle_query(
+        ExportDealsQuery(filters=filters, user_id=other_user_id, user_role="owner"),
+    )
+
+    assert [deal.oid async for deal in member_deals] == [deal_ids[member_user_id]]
+    assert {deal.oid async for deal in owner_deals} == set(deal_ids.values())
@@ -0,0 +1,232 @@
+import asyncio
+from collections.abc import Sequence
+from dataclasses import (
+    dataclass,
+    field,
+)
+from uuid import uuid4
+
+import pytest
+from faker import Faker
+from infrastructure.database.repositories.dummy.outbox import DummyInMemoryEventOutbox
+from infrastructure.database.repositories.dummy.sales import DummyInMemoryActivityRepository
+from infrastructure.database.repositories.dummy.unit_of_work import DummyUnitOfWork
+from punq import Container
+
+from application.base.event import BaseEventHandler
+from application.base.outbox import BaseEventOutbox
+from application.events import (
+    EventDispatcher,
+    OutboxRelay,
+)
+from application.mediator import Mediator
+from application.organizations.commands import CreateOrganizationCommand
+from application.sales.commands import (
+    CreateContactCommand,
+    CreateDealCommand,
+    UpdateDealCommand,
+)
+from application.sales.events import DealStatusChangedEventHandler
+from domain.base.events import (
+    BaseEvent,
+    record_event,
+)
+from domain.sales.entities import ActivityEntity
+from domain.sales.events import (
+    DealStageChangedEvent,
+    DealStatusChangedEvent,
+)
+from domain.sales.interfaces.repositories import BaseActivityRepository
+from domain.sales.services import ActivityService
+
+
+@dataclass(frozen=True, kw_only=True)
+class PingEvent(BaseEvent):
+    number: int
+
+
+@dataclass
+class Probe:
+    handled: list[int] = field(default_factory=list)
+    running: int = 0
+    max_running: int = 0
+    failures: int = 0
+
+
+@dataclass(frozen=True)
+class PingEventHandler(BaseEventHandler[PingEvent]):
+    probe: Probe
+    delay: float = 0.0
+
+    async def handle(self, event: PingEvent) -> None:
+        self.probe.running += 1
+        self.probe.max_running = max(self.probe.max_running, self.probe.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.probe.failures:
+                self.probe.failures -= 1
+                raise RuntimeError("subscriber is down")
+            self.probe.handled.append(event.number)
+        finally:
+            self.probe.running -= 1
+
+
+@dataclass
+class FlakyActivityRepository(DummyInMemoryActivityRepository):
+    failures: int = 0
+
+    async def add_many(self, activities: Sequence[ActivityEntity]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is down")
+        await super().add_many(activities)
+
+
+@pytest.mark.asyncio
+async def test_command_events_are_stored_in_outbox_and_delivered(container: Container, faker: Faker):
+    mediator = container.resolve(Mediator)
+    organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    user_id = uuid4()
+    contact, *_ = await mediator.handle_command(
+        CreateContactCommand(organization_id=organization.oid, owner_user_id=user_id, name=faker.name()),
+    )
+    deal, *_ = await mediator.handle_command(
+        CreateDealCommand(
+            organization_id=organization.oid,
+            contact_id=contact.oid,
+            owner_user_id=user_id,
+            title=faker.sentence(),
+            amount=100.0,
+            currency="USD",
+        ),
+    )
+
+    await mediator.handle_command(
+        UpdateDealCommand(
+            deal_id=deal.oid,
+            organization_id=organization.oid,
+            user_id=user_id,
+            user_role="owner",
+            new_status="in_progress",
+            new_stage="proposal",
+        ),
+    )
+
+    outbox: DummyInMemoryEventOutbox = container.resolve(BaseEventOutbox)
+    assert outbox.pending == []
+    events = [record.event for record in outbox._records.values()]
+    assert [type(event) for event in events] == [DealStatusChangedEvent, DealStageChangedEvent]
+
+    # Активности созданы подписчиками, их oid - event_id события
+    activities = await container.resolve(BaseActivityRepository).get_by_deal_id(deal.oid)
+    assert {activity.oid for activity in activities} == {event.event_id for event in events}
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_stores_events_only_on_commit():
+    outbox = DummyInMemoryEventOutbox()
+    unit_of_work = DummyUnitOfWork(event_outbox=outbox)
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work.begin():
+            record_event(PingEvent(number=1))
+            raise RuntimeError
+
+    async with unit_of_work.begin():
+        record_event(PingEvent(number=2))
+
+    assert [event.number for event in outbox.pending] == [2]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_limits_concurrent_subscribers():
+    probe = Probe()
+    dispatcher = EventDispatcher(unit_of_work=DummyUnitOfWork(), max_concurrency=2)
+    dispatcher.subscribe(PingEvent, [PingEventHandler(probe=probe, delay=0.01) for _ in range(5)])
+
+    failed = await dispatcher.dispatch([PingEvent(number=1), PingEvent(number=2)])
+
+    assert failed == set()
+    assert sorted(probe.handled) == [1, 1, 1, 1, 1, 2, 2, 2, 2, 2]
+    assert probe.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_relay_retries_events_until_subscribers_succeed():
+    probe = Probe(failures=1)
+    outbox = DummyInMemoryEventOutbox()
+    unit_of_work = DummyUnitOfWork(event_outbox=outbox)
+    dispatcher = EventDispatcher(unit_of_work=unit_of_work)
+    dispatcher.subscribe(PingEvent, [PingEventHandler(probe=probe)])
+    relay = OutboxRelay(outbox=outbox, dispatcher=dispatcher, retry_delay=0)
+
+    async with unit_of_work.begin():
+        record_event(PingEvent(number=1))
+
+    assert await relay.process_pending() == 1
+    assert probe.handled == []
+    assert len(outbox.pending) == 1
+
+    assert await relay.process_pending() == 1
+    assert probe.handled == [1]
+    assert outbox.pending == []
+
+
+@pytest.mark.asyncio
+async def test_activity_write_failure_keeps_event_pending_until_redelivered():
+    repository = FlakyActivityRepository(failures=1)
+    outbox = DummyInMemoryEventOutbox()
+    unit_of_work = DummyUnitOfWork(event_outbox=outbox)
+    dispatcher = EventDispatcher(unit_of_work=unit_of_work)
+    dispatcher.subscribe(
+        DealStatusChangedEvent,
+        [
+            DealStatusChangedEventHandler(
+                activity_service=ActivityService(activity_repository=repository, activity_journal=None),
+            ),
+        ],
+    )
+    relay = OutboxRelay(outbox=outbox, dispatcher=dispatcher, retry_delay=0)
+    deal_id = uuid4()
+    event = DealStatusChangedEvent(
+        deal_id=deal_id,
+        organization_id=uuid4(),
+        old_status="new",
+        new_status="in_progress",
+    )
+
+    async with unit_of_work.begin():
+        record_event(event)
+
+    await relay.process_pending()
+    assert len(outbox.pending) == 1
+    assert await repository.get_by_deal_id(deal_id) == []
+
+    await relay.process_pending()
+    # Повторная доставка после успеха не создает дубль
+    await dispatcher.dispatch([event])
+    assert outbox.pending == []
+    assert [activity.oid for activity in await repository.get_by_deal_id(deal_id)] == [event.event_id]
+
+
+@pytest.mark.asyncio
+async def test_started_relay_delivers_in_background():
+    probe = Probe()
+    outbox = DummyInMemoryEventOutbox()
+    unit_of_work = DummyUnitOfWork(event_outbox=outbox)
+    dispatcher = EventDispatcher(unit_of_work=unit_of_work)
+    dispatcher.subscribe(PingEvent, [PingEventHandler(probe=probe, delay=0.01)])
+    relay = OutboxRelay(outbox=outbox, dispatcher=dispatcher, poll_interval=60)
+    relay.start()
+
+    async with unit_of_work.begin():
+        record_event(PingEvent(number=1))
+    await relay.notify()
+    # notify не ждет доставки
+    assert probe.handled == []
+
+    await asyncio.sleep(0.05)
+    await relay.stop()
+
+    assert probe.handled == [1]
+    assert not relay.is_running
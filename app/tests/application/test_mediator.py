@@ -0,0 +1,608 @@
+import asyncio
+import contextvars
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+)
+from contextlib import asynccontextmanager
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from faker import Faker
+from infrastructure.cache import InMemoryQueryCache
+from infrastructure.database.gateways.replicas import ReadYourWritesTracker
+from punq import (
+    Container,
+    Scope,
+)
+
+from application.base.cache import (
+    BaseQueryCache,
+    CachedQueryResult,
+)
+from application.base.command import (
+    BaseCommand,
+    BaseCommandHandler,
+)
+from application.base.query import (
+    BaseQuery,
+    BaseQueryHandler,
+)
+from application.base.unit_of_work import (
+    BACKGROUND_POOL,
+    BaseUnitOfWork,
+)
+from application.common.exceptions import QueryTimeoutException
+from application.mediator import Mediator
+from application.middlewares import (
+    BaseMediatorMiddleware,
+    entity_tag,
+    MediatorMetrics,
+    QueryCacheMetrics,
+    QueryCacheMiddleware,
+    SingleFlightMiddleware,
+)
+from application.organizations.commands import CreateOrganizationCommand
+from application.organizations.queries import GetOrganizationByIdQuery
+from application.sales.commands import ImportContactsCommand
+from application.sales.queries import GetContactsQuery
+from domain.base.imports import ImportRow
+from domain.organizations.exceptions import OrganizationNotFoundException
+from domain.sales.filters import ContactFilters
+
+
+@dataclass(frozen=True)
+class PingCommand(BaseCommand): ...
+
+
+@dataclass
+class Probe:
+    running: int = 0
+    max_running: int = 0
+
+
+@dataclass(frozen=True)
+class SlowPingHandler(BaseCommandHandler[PingCommand, str]):
+    name: str
+    probe: Probe
+    fail: bool = False
+
+    async def handle(self, command: PingCommand) -> str:
+        self.probe.running += 1
+        self.probe.max_running = max(self.probe.max_running, self.probe.running)
+        try:
+            await asyncio.sleep(0.02)
+            if self.fail:
+                raise RuntimeError(self.name)
+            return self.name
+        finally:
+            self.probe.running -= 1
+
+
+@dataclass(frozen=True)
+class IndependentSlowPingHandler(SlowPingHandler):
+    independent = True
+
+
+@dataclass(frozen=True)
+class SlowQuery(BaseQuery):
+    seconds: float
+
+
+@dataclass(frozen=True)
+class SlowQueryHandler(BaseQueryHandler[SlowQuery, str]):
+    async def handle(self, query: SlowQuery) -> str:
+        await asyncio.sleep(query.seconds)
+        return "done"
+
+
+@dataclass(frozen=True)
+class CountQuery(BaseQuery):
+    name: str
+
+
+@dataclass(frozen=True)
+class RenameCommand(BaseCommand):
+    name: str
+
+
+@dataclass
+class Counter:
+    reads: int = 0
+    # Событие, которого ждет чтение перед возвратом результата
+    release: asyncio.Event | None = None
+
+
+@dataclass(frozen=True)
+class CountQueryHandler(BaseQueryHandler[CountQuery, int]):
+    counter: Counter
+
+    async def handle(self, query: CountQuery) -> int:
+        self.counter.reads += 1
+        reads = self.counter.reads
+        if self.counter.release is not None:
+            await self.counter.release.wait()
+        return reads
+
+
+@dataclass(frozen=True)
+class RenameCommandHandler(BaseCommandHandler[RenameCommand, None]):
+    async def handle(self, command: RenameCommand) -> None: ...
+
+
+@dataclass
+class TracingMiddleware(BaseMediatorMiddleware):
+    name: str
+    trace: list[str] = field(default_factory=list)
+
+    async def __call__(self, request, call_next):
+        self.trace.append(f"{self.name}:before")
+        result = await call_next()
+        self.trace.append(f"{self.name}:after")
+        return result
+
+
+class RecordingUnitOfWork(BaseUnitOfWork):
+    def __init__(self, tracker: ReadYourWritesTracker | None = None, read_lag: float = 0.0) -> None:
+        self.calls: list[tuple[bool, str]] = []
+        self.statement_timeouts: list[float | None] = []
+        self.pools: list[str | None] = []
+        self.tracker = tracker
+        self.read_lag = read_lag
+        self._open: contextvars.ContextVar[bool] = contextvars.ContextVar("recording_uow_open", default=False)
+
+    @asynccontextmanager
+    async def begin(
+        self,
+        read_only: bool = False,
+        pool: str | None = None,
+        statement_timeout: float | None = None,
+    ) -> AsyncGenerator[None, Any]:
+        if self._open.get():
+            # Как session_scope: вложенный вызов присоединяется к открытому
+            yield
+            return
+        self.statement_timeouts.append(statement_timeout)
+        self.pools.append(pool)
+        token = self._open.set(True)
+        try:
+            yield
+        except Exception as exc:
+            self.calls.append((read_only, type(exc).__name__))
+            raise
+        finally:
+            self._open.reset(token)
+        self.calls.append((read_only, "committed"))
+        if self.tracker is not None and not read_only:
+            self.tracker.record_write()
+
+    def requires_primary(self) -> bool:
+        return self.tracker is not None and self.tracker.requires_primary()
+
+    def max_read_lag(self) -> float:
+        return self.read_lag
+
+    def detach(self) -> None:
+        self._open.set(False)
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        await callback()
+
+
+@pytest.fixture()
+def unit_of_work(container: Container) -> RecordingUnitOfWork:
+    unit_of_work = RecordingUnitOfWork()
+    container.register(BaseUnitOfWork, instance=unit_of_work, scope=Scope.singleton)
+    return unit_of_work
+
+
+@pytest.mark.asyncio
+async def test_mediator_opens_one_unit_of_work_per_request(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+    faker: Faker,
+):
+    mediator = container.resolve(Mediator)
+
+    organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    await mediator.handle_query(GetOrganizationByIdQuery(organization_id=organization.oid))
+
+    assert unit_of_work.calls == [(False, "committed"), (True, "committed")]
+
+
+@pytest.mark.asyncio
+async def test_mediator_unit_of_work_sees_handler_error(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+):
+    mediator = container.resolve(Mediator)
+
+    with pytest.raises(OrganizationNotFoundException):
+        await mediator.handle_query(GetOrganizationByIdQuery(organization_id=uuid4()))
+
+    assert unit_of_work.calls == [(True, "OrganizationNotFoundException")]
+
+
+@pytest.mark.asyncio
+async def test_mediator_runs_independent_handlers_concurrently(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+):
+    mediator = container.resolve(Mediator)
+    probe = Probe()
+    mediator.register_command(
+        PingCommand,
+        [
+            SlowPingHandler(name="first", probe=probe),
+            IndependentSlowPingHandler(name="audit", probe=probe),
+            SlowPingHandler(name="second", probe=probe),
+            IndependentSlowPingHandler(name="notify", probe=probe),
+        ],
+    )
+
+    results = await mediator.handle_command(PingCommand())
+
+    assert results == ["first", "audit", "second", "notify"]
+    assert probe.max_running == 3
+    # Общий unit of work для зависимых и по одному на каждый независимый
+    assert unit_of_work.calls == [(False, "committed")] * 3
+
+
+@pytest.mark.asyncio
+async def test_mediator_raises_independent_handler_error(container: Container):
+    mediator = container.resolve(Mediator)
+    probe = Probe()
+    mediator.register_command(
+        PingCommand,
+        [
+            SlowPingHandler(name="first", probe=probe),
+            IndependentSlowPingHandler(name="broken", probe=probe, fail=True),
+        ],
+    )
+
+    with pytest.raises(RuntimeError, match="broken"):
+        await mediator.handle_command(PingCommand())
+
+
+@pytest.mark.asyncio
+async def test_import_commits_each_batch_in_background_unit_of_work(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+    faker: Faker,
+):
+    mediator = container.resolve(Mediator)
+    organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    owner_user_id = uuid4()
+    unit_of_work.calls.clear()
+    unit_of_work.pools.clear()
+
+    async def interrupted_upload() -> AsyncGenerator[ImportRow, Any]:
+        for number in range(1, 4):
+            yield ImportRow(number=number, data={"name": faker.name()})
+        raise ConnectionResetError("upload interrupted")
+
+    with pytest.raises(ConnectionResetError):
+        await mediator.handle_command(
+            ImportContactsCommand(
+                organization_id=organization.oid,
+                owner_user_id=owner_user_id,
+                rows=interrupted_upload(),
+                batch_size=2,
+            ),
+        )
+
+    # Первая пачка зафиксирована до обрыва, вторая не успела собраться
+    assert unit_of_work.calls == [(False, "committed")]
+    assert unit_of_work.pools == [BACKGROUND_POOL]
+
+    _, total = await mediator.handle_query(
+        GetContactsQuery(
+            filters=ContactFilters(organization_id=organization.oid),
+            user_id=owner_user_id,
+            user_role="owner",
+        ),
+    )
+    assert total == 2
+
+
+@pytest.mark.asyncio
+async def test_mediator_middlewares_wrap_requests_and_record_timings(
+    container: Container,
+    faker: Faker,
+):
+    mediator = container.resolve(Mediator)
+    trace: list[str] = []
+    mediator.add_middleware(TracingMiddleware(name="outer", trace=trace))
+    mediator.add_middleware(TracingMiddleware(name="inner", trace=trace))
+
+    organization, *_ = await mediator.handle_command(CreateOrganizationCommand(name=faker.company()))
+    await mediator.handle_query(GetOrganizationByIdQuery(organization_id=organization.oid))
+    with pytest.raises(OrganizationNotFoundException):
+        await mediator.handle_query(GetOrganizationByIdQuery(organization_id=uuid4()))
+
+    assert trace[:4] == ["outer:before", "inner:before", "inner:after", "outer:after"]
+
+    metrics = container.resolve(MediatorMetrics)
+    command_histogram = metrics.commands.histograms["CreateOrganizationCommand"]
+    query_histogram = metrics.queries.histograms["GetOrganizationByIdQuery"]
+    assert command_histogram.count == 1
+    assert (query_histogram.count, query_histogram.errors) == (2, 1)
+    assert query_histogram.cumulative_counts()[-1] == 2
+
+
+@pytest.mark.asyncio
+async def test_mediator_enforces_query_budget(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr("application.mediator.QUERY_CANCEL_GRACE", 0.0)
+    mediator = container.resolve(Mediator)
+    mediator.register_query(SlowQuery, SlowQueryHandler())
+    mediator.set_query_budget(SlowQuery, 0.05)
+
+    assert await mediator.handle_query(SlowQuery(seconds=0.01)) == "done"
+    with pytest.raises(QueryTimeoutException) as exc_info:
+        await mediator.handle_query(SlowQuery(seconds=5))
+    assert exc_info.value.message == "Query SlowQuery exceeded its 0.05s budget"
+
+    # Бюджет уходит в сессию как statement_timeout
+    assert unit_of_work.statement_timeouts == [0.05, 0.05]
+    # Отмена по таймеру не фиксирует unit of work
+    assert unit_of_work.calls == [(True, "committed")]
+    assert container.resolve(MediatorMetrics).timeouts == {"SlowQuery": 1}
+
+
+@pytest.mark.asyncio
+async def test_default_query_budget_keeps_pool_statement_timeout(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr("application.mediator.QUERY_CANCEL_GRACE", 0.0)
+    mediator = container.resolve(Mediator)
+    mediator.default_query_budget = 0.05
+    mediator.register_query(SlowQuery, SlowQueryHandler())
+
+    assert await mediator.handle_query(SlowQuery(seconds=0.01)) == "done"
+    with pytest.raises(QueryTimeoutException):
+        await mediator.handle_query(SlowQuery(seconds=5))
+
+    # Общий бюджет ограничивает обработчик, но лимит на SQL-запрос остается за пулом
+    assert unit_of_work.statement_timeouts == [None, None]
+
+
+class RecordingQueryCache(InMemoryQueryCache):
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.ttls: list[float] = []
+
+    async def set(self, key: str, result: CachedQueryResult, ttl: float) -> None:
+        self.ttls.append(ttl)
+        await super().set(key, result, ttl)
+
+
+@pytest.fixture()
+def cached_mediator(unit_of_work: RecordingUnitOfWork, container: Container) -> tuple[Mediator, Counter]:
+    container.register(BaseQueryCache, instance=RecordingQueryCache(), scope=Scope.singleton)
+    mediator = container.resolve(Mediator)
+    counter = Counter()
+    mediator.register_query(CountQuery, CountQueryHandler(counter=counter))
+    mediator.register_command(RenameCommand, [RenameCommandHandler()])
+
+    middleware = container.resolve(QueryCacheMiddleware)
+    middleware.cache_query(CountQuery, 60, lambda q: [entity_tag("counter", q.name)])
+    middleware.invalidate_on(RenameCommand, lambda c: [entity_tag("counter", c.name)])
+    return mediator, counter
+
+
+@pytest.mark.asyncio
+async def test_query_cache_serves_hits_until_command_invalidates_tag(
+    cached_mediator: tuple[Mediator, Counter],
+    container: Container,
+):
+    mediator, counter = cached_mediator
+
+    assert await mediator.handle_query(CountQuery(name="a")) == 1
+    assert await mediator.handle_query(CountQuery(name="a")) == 1
+    # Другой ключ - отдельная запись
+    assert await mediator.handle_query(CountQuery(name="b")) == 2
+
+    await mediator.handle_command(RenameCommand(name="a"))
+    assert await mediator.handle_query(CountQuery(name="a")) == 3
+    assert await mediator.handle_query(CountQuery(name="b")) == 2
+
+    metrics = container.resolve(QueryCacheMetrics)
+    assert (metrics.hits["CountQuery"], metrics.misses["CountQuery"]) == (2, 3)
+    assert metrics.hit_ratio("CountQuery") == 0.4
+    assert metrics.invalidations == {"RenameCommand": 1}
+
+
+@pytest.mark.asyncio
+async def test_query_cache_drops_result_read_before_invalidation(
+    cached_mediator: tuple[Mediator, Counter],
+):
+    mediator, counter = cached_mediator
+    counter.release = asyncio.Event()
+
+    # Чтение началось до команды, а закончилось после нее
+    reading = asyncio.create_task(mediator.handle_query(CountQuery(name="a")))
+    await asyncio.sleep(0)
+    await mediator.handle_command(RenameCommand(name="a"))
+    counter.release.set()
+    assert await reading == 1
+
+    assert await mediator.handle_query(CountQuery(name="a")) == 2
+    assert await mediator.handle_query(CountQuery(name="a")) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_identical_in_flight_queries(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+):
+    mediator = container.resolve(Mediator)
+    counter = Counter(release=asyncio.Event())
+    mediator.register_query(CountQuery, CountQueryHandler(counter=counter))
+    container.resolve(SingleFlightMiddleware).coalesce(CountQuery)
+
+    first = asyncio.create_task(mediator.handle_query(CountQuery(name="a")))
+    second = asyncio.create_task(mediator.handle_query(CountQuery(name="a")))
+    other = asyncio.create_task(mediator.handle_query(CountQuery(name="b")))
+    await asyncio.sleep(0.01)
+
+    # Отмена одного из ожидающих не прерывает общее выполнение
+    first.cancel()
+    counter.release.set()
+    assert (await second, await other) == (1, 2)
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    assert counter.reads == 2
+    assert unit_of_work.calls == [(True, "committed")] * 2
+    assert container.resolve(MediatorMetrics).coalesced == {"CountQuery": 1}
+
+    # Завершенный запрос не склеивается со следующим
+    assert await mediator.handle_query(CountQuery(name="a")) == 3
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_execution_without_waiters(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+):
+    mediator = container.resolve(Mediator)
+    counter = Counter(release=asyncio.Event())
+    mediator.register_query(CountQuery, CountQueryHandler(counter=counter))
+    container.resolve(SingleFlightMiddleware).coalesce(CountQuery)
+
+    waiter = asyncio.create_task(mediator.handle_query(CountQuery(name="a")))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    counter.release.set()
+    await asyncio.sleep(0.01)
+
+    # Выполнение отменено вместе с последним ожидающим и ничего не зафиксировало
+    assert unit_of_work.calls == []
+
+
+@pytest.mark.asyncio
+async def test_independent_handler_write_pins_request_consistency_key(container: Container):
+    tracker = ReadYourWritesTracker(window=60)
+    unit_of_work = RecordingUnitOfWork(tracker=tracker)
+    container.register(BaseUnitOfWork, instance=unit_of_work, scope=Scope.singleton)
+    mediator = container.resolve(Mediator)
+    mediator.register_command(PingCommand, [IndependentSlowPingHandler(name="audit", probe=Probe())])
+
+    async def request() -> None:
+        tracker.bind("user-1")
+        async with unit_of_work.begin(read_only=True):
+            await mediator.handle_command(PingCommand())
+
+    # Запрос уже в unit of work: независимый обработчик открывает свой, но
+    # сохраняет ключ согласованности запроса
+    await asyncio.create_task(request(), context=contextvars.Context())
+    assert unit_of_work.calls == [(False, "committed"), (True, "committed")]
+
+    def next_request_requires_primary() -> bool:
+        tracker.bind("user-1")
+        return tracker.requires_primary()
+
+    assert contextvars.Context().run(next_request_requires_primary)
+
+
+@pytest.mark.asyncio
+async def test_query_cache_is_bypassed_while_reads_require_primary(
+    cached_mediator: tuple[Mediator, Counter],
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+):
+    mediator, counter = cached_mediator
+    unit_of_work.tracker = ReadYourWritesTracker(window=60)
+
+    async def request(command: RenameCommand | None = None) -> int:
+        unit_of_work.tracker.bind("user-1")
+        if command is not None:
+            await mediator.handle_command(command)
+        return await mediator.handle_query(CountQuery(name="a"))
+
+    def run(command: RenameCommand | None = None) -> asyncio.Task[int]:
+        return asyncio.create_task(request(command), context=contextvars.Context())
+
+    assert await run() == 1
+    # Пользователь записал: его чтения идут мимо кэша и не пополняют его
+    assert await run(RenameCommand(name="b")) == 2
+    assert await run() == 3
+    assert container.resolve(BaseQueryCache).ttls == [60]
+
+
+@pytest.mark.asyncio
+async def test_query_cache_keeps_replica_results_no_longer_than_replica_lag(
+    cached_mediator: tuple[Mediator, Counter],
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+):
+    mediator, _ = cached_mediator
+    unit_of_work.read_lag = 5.0
+
+    await mediator.handle_query(CountQuery(name="a"))
+
+    assert container.resolve(BaseQueryCache).ttls == [5.0]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_starts_new_execution_after_committed_command(
+    unit_of_work: RecordingUnitOfWork,
+    container: Container,
+):
+    mediator = container.resolve(Mediator)
+    counter = Counter(release=asyncio.Event())
+    mediator.register_query(CountQuery, CountQueryHandler(counter=counter))
+    mediator.register_command(RenameCommand, [RenameCommandHandler()])
+    container.resolve(SingleFlightMiddleware).coalesce(CountQuery)
+
+    before_write = asyncio.create_task(mediator.handle_query(CountQuery(name="a")))
+    await asyncio.sleep(0.01)
+    await mediator.handle_command(RenameCommand(name="a"))
+    after_write = asyncio.create_task(mediator.handle_query(CountQuery(name="a")))
+    await asyncio.sleep(0.01)
+    counter.release.set()
+
+    # Чтение после записи не присоединяется к начатому до нее
+    assert (await before_write, await after_write) == (1, 2)
+    assert container.resolve(MediatorMetrics).coalesced == {}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_skips_requests_that_require_primary(container: Container):
+    tracker = ReadYourWritesTracker(window=60)
+    unit_of_work = RecordingUnitOfWork(tracker=tracker)
+    container.register(BaseUnitOfWork, instance=unit_of_work, scope=Scope.singleton)
+    mediator = container.resolve(Mediator)
+    counter = Counter(release=asyncio.Event())
+    mediator.register_query(CountQuery, CountQueryHandler(counter=counter))
+    container.resolve(SingleFlightMiddleware).coalesce(CountQuery)
+
+    async def read(user: str) -> int:
+        tracker.bind(user)
+        return await mediator.handle_query(CountQuery(name="a"))
+
+    # Недавно записавший пользователь читает сам, остальные склеиваются
+    tracker.bind("writer")
+    tracker.record_write()
+    tasks = [asyncio.create_task(read(user), context=contextvars.Context()) for user in ("reader", "writer", "other")]
+    await asyncio.sleep(0.01)
+    counter.release.set()
+
+    reader, writer, other = [await task for task in tasks]
+    assert reader == other != writer
+    assert counter.reads == 2
+    assert container.resolve(MediatorMetrics).coalesced == {"CountQuery": 1}
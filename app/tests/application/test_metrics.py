@@ -0,0 +1,15 @@
+from application.common.metrics import LatencyHistogram
+
+
+def test_latency_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram(buckets=(0.1, 0.5, 1.0))
+
+    for seconds in (0.05, 0.1, 0.3, 0.7, 2.0):
+        histogram.observe(seconds)
+
+    # Граница корзины включается в нее
+    assert histogram.bucket_counts == [2, 1, 1, 1]
+    assert histogram.cumulative_counts() == [2, 3, 4, 5]
+    assert histogram.count == 5
+    assert histogram.quantile(0.5) == 0.5
+    assert histogram.quantile(0.99) == float("inf")
@@ -1,6 +1,7 @@
 from uuid import uuid4
 
 from domain.sales.entities import DealEntity
+from domain.sales.events import DealStatusChangedEvent
 from domain.sales.value_objects.deals import (
     CurrencyValueObject,
     DealAmountValueObject,
@@ -69,3 +70,34 @@ def test_deal_entity_equality():
 
     assert deal1 == deal2
     assert hash(deal1) == hash(deal2)
+
+
+def test_deal_entity_records_status_and_stage_changes():
+    deal = DealEntity(
+        organization_id=uuid4(),
+        contact_id=uuid4(),
+        owner_user_id=uuid4(),
+        title=DealTitleValueObject("Deal"),
+        amount=DealAmountValueObject(100.0),
+        currency=CurrencyValueObject("USD"),
+        status=DealStatusValueObject("new"),
+        stage=DealStageValueObject("qualification"),
+    )
+
+    deal.change_status(DealStatusValueObject("new"))
+    assert deal.events == []
+
+    deal.change_status(DealStatusValueObject("in_progress"))
+    deal.change_stage(DealStageValueObject("proposal"))
+
+    status_changed, stage_changed = deal.events
+    assert status_changed == DealStatusChangedEvent(
+        event_id=status_changed.event_id,
+        occurred_at=status_changed.occurred_at,
+        deal_id=deal.oid,
+        organization_id=deal.organization_id,
+        old_status="new",
+        new_status="in_progress",
+    )
+    assert (stage_changed.old_stage, stage_changed.new_stage) == ("qualification", "proposal")
+    assert deal.stage.as_generic_type().value == "proposal"
@@ -155,3 +155,16 @@ def test_deal_stage_valid(stage_value, expected_stage):
 def test_deal_stage_invalid(stage_value, exception):
     with pytest.raises(exception):
         DealStageValueObject(stage_value)
+
+
+@pytest.mark.parametrize(
+    "current_stage,new_stage,expected",
+    [
+        (DealStage.PROPOSAL, DealStage.QUALIFICATION, True),
+        (DealStage.CLOSED, DealStage.NEGOTIATION, True),
+        (DealStage.QUALIFICATION, DealStage.CLOSED, False),
+        (DealStage.NEGOTIATION, DealStage.NEGOTIATION, False),
+    ],
+)
+def test_deal_stage_rollback(current_stage, new_stage, expected):
+    assert current_stage.is_rollback_to(new_stage) is expected
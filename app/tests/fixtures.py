@@ -1,15 +1,19 @@
 from infrastructure.database.repositories.dummy.organizations.members import DummyInMemoryOrganizationMemberRepository
 from infrastructure.database.repositories.dummy.organizations.organizations import DummyInMemoryOrganizationRepository
+from infrastructure.database.repositories.dummy.outbox import DummyInMemoryEventOutbox
 from infrastructure.database.repositories.dummy.sales.activities import DummyInMemoryActivityRepository
 from infrastructure.database.repositories.dummy.sales.contacts import DummyInMemoryContactRepository
 from infrastructure.database.repositories.dummy.sales.deals import DummyInMemoryDealRepository
 from infrastructure.database.repositories.dummy.sales.tasks import DummyInMemoryTaskRepository
+from infrastructure.database.repositories.dummy.unit_of_work import DummyUnitOfWork
 from infrastructure.database.repositories.dummy.users.users import DummyInMemoryUserRepository
 from punq import (
     Container,
     Scope,
 )
 
+from application.base.outbox import BaseEventOutbox
+from application.base.unit_of_work import BaseUnitOfWork
 from application.container import _init_container
 from domain.organizations.interfaces.repositories.members import BaseOrganizationMemberRepository
 from domain.organizations.interfaces.repositories.organizations import BaseOrganizationRepository
@@ -23,6 +27,9 @@ from domain.users.interfaces.repositories.users import BaseUserRepository
 def init_dummy_container() -> Container:
     container = _init_container()
 
+    container.register(BaseEventOutbox, DummyInMemoryEventOutbox, scope=Scope.singleton)
+    container.register(BaseUnitOfWork, DummyUnitOfWork, scope=Scope.singleton)
+
     # Регистрируем репозитории (dummy для начала)
     container.register(
         BaseOrganizationRepository,
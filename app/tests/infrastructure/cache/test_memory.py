@@ -0,0 +1,52 @@
+from infrastructure.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache[str, int](ttl=10, max_size=10, clock=clock)
+
+    cache.set("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.metrics.hits == 1
+    assert cache.metrics.misses == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache[str, int](ttl=60, max_size=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # "a" использован последним - вытесняется "b"
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.metrics.evictions == 1
+
+
+def test_ttl_cache_invalidate_and_hit_ratio():
+    cache = TTLCache[str, int](ttl=60, max_size=10)
+
+    cache.set("a", 1)
+    cache.get("a")
+    cache.invalidate("a")
+    cache.invalidate("missing")
+
+    assert cache.get("a") is None
+    assert cache.metrics.invalidations == 1
+    assert cache.metrics.hit_ratio == 0.5
@@ -0,0 +1,34 @@
+import pytest
+from infrastructure.cache import InMemoryQueryCache
+
+from application.base.cache import CachedQueryResult
+
+
+@pytest.mark.asyncio
+async def test_query_cache_tag_versions_grow_and_survive_pruning():
+    cache = InMemoryQueryCache(max_size=10, max_tags=4)
+
+    assert await cache.tag_versions(["deal:1", "deal:2"]) == (0, 0)
+    await cache.invalidate_tags(["deal:1"])
+    (first,) = await cache.tag_versions(["deal:1"])
+    assert first > 0
+
+    await cache.invalidate_tags([f"task:{index}" for index in range(5)])
+    # deal:1 забыт при переполнении, но его версия не уменьшилась
+    (after_pruning,) = await cache.tag_versions(["deal:1"])
+    assert after_pruning >= first
+    # Тег без инвалидаций тоже считается изменившимся: запись с ним даст промах
+    assert await cache.tag_versions(["deal:2"]) != (0,)
+
+
+@pytest.mark.asyncio
+async def test_query_cache_stores_results_with_ttl():
+    cache = InMemoryQueryCache(max_size=1)
+    result = CachedQueryResult(value=[1, 2], tags=("deal:1",), tag_versions=(0,))
+
+    await cache.set("GetDealsQuery:a", result, ttl=60)
+    assert await cache.get("GetDealsQuery:a") == result
+
+    # LRU на одну запись вытесняет предыдущую
+    await cache.set("GetDealsQuery:b", result, ttl=60)
+    assert await cache.get("GetDealsQuery:a") is None
@@ -0,0 +1,83 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from infrastructure.database.models.base import BaseModel
+from infrastructure.database.models.organizations import (  # noqa: F401
+    OrganizationMemberModel,
+    OrganizationModel,
+)
+from infrastructure.database.models.outbox import OutboxEventModel  # noqa: F401
+from infrastructure.database.models.sales import (  # noqa: F401
+    ActivityModel,
+    ContactModel,
+    DealModel,
+    TaskModel,
+)
+from infrastructure.database.models.users import UserModel  # noqa: F401
+from sqlalchemy import (
+    event,
+    text,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    create_async_engine,
+)
+
+from settings.config import Config
+from tests.infrastructure.database.fixtures import (
+    ConnectionDatabase,
+    QueryCounter,
+)
+
+
+@pytest_asyncio.fixture
+async def postgres_connection() -> AsyncGenerator[AsyncConnection, None]:
+    """Соединение с реальным PostgreSQL внутри транзакции, которая
+    откатывается после теста.
+
+    Если база недоступна - тест пропускается.
+
+    """
+    engine = create_async_engine(Config().postgres_connection_uri)
+    try:
+        connection = await engine.connect()
+    except (OSError, DBAPIError) as exc:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL is not available: {exc}")
+
+    transaction = await connection.begin()
+    try:
+        await connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await connection.run_sync(BaseModel.metadata.create_all)
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def database(postgres_connection: AsyncConnection) -> ConnectionDatabase:
+    return ConnectionDatabase(connection=postgres_connection)
+
+
+@pytest_asyncio.fixture
+async def query_counter(postgres_connection: AsyncConnection) -> AsyncGenerator[QueryCounter, None]:
+    counter = QueryCounter()
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    def on_load(target, context):
+        counter.loaded[type(target).__name__] += 1
+
+    sync_connection = postgres_connection.sync_connection
+    event.listen(sync_connection, "before_cursor_execute", on_execute)
+    event.listen(BaseModel, "load", on_load, propagate=True)
+    try:
+        yield counter
+    finally:
+        event.remove(BaseModel, "load", on_load)
+        event.remove(sync_connection, "before_cursor_execute", on_execute)
@@ -0,0 +1,61 @@
+from collections import Counter
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import Any
+
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+)
+
+
+@dataclass
+class ConnectionDatabase:
+    """Замена Database для репозиториев: все сессии работают внутри
+    транзакции тестового соединения (commit фиксирует savepoint).
+
+    Как и Database.get_session, фиксирует изменения на выходе, иначе
+    закрытие сессии откатило бы savepoint вместе с записью репозитория.
+
+    """
+
+    connection: AsyncConnection
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        async with AsyncSession(
+            bind=self.connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        ) as session:
+            yield session
+            await session.commit()
+
+    get_read_only_session = get_session
+    get_stream_session = get_session
+
+
+@dataclass
+class QueryCounter:
+    """Считает SQL-выражения, выполненные на соединении, и загруженные ORM-объекты по моделям."""
+
+    statements: list[str] = field(default_factory=list)
+    loaded: Counter = field(default_factory=Counter)
+
+    def reset(self) -> None:
+        self.statements.clear()
+        self.loaded.clear()
+
+    @property
+    def select_statements(self) -> list[str]:
+        return [statement for statement in self.statements if statement.lstrip().upper().startswith("SELECT")]
+
+    def assert_load_graph(self, statements: int, loaded: dict[str, int]) -> None:
+        """Проверяет, что вызов выполнил ровно statements SELECT и загрузил
+        только перечисленные модели - лишняя связь в графе сразу видна."""
+        assert len(self.select_statements) == statements, "\n\n".join(self.select_statements)
+        assert dict(self.loaded) == loaded
@@ -0,0 +1,143 @@
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.models.organizations import OrganizationModel
+from infrastructure.database.models.users import UserModel
+from infrastructure.database.repositories.dummy.unit_of_work import DummyUnitOfWork
+from infrastructure.database.repositories.sales.activities import SQLAlchemyActivityRepository
+from infrastructure.database.repositories.sales.contacts import SQLAlchemyContactRepository
+from infrastructure.database.repositories.sales.deals import SQLAlchemyDealRepository
+from infrastructure.database.search import TrigramSearchBackend
+from infrastructure.journal import QueuedActivityJournal
+
+from domain.sales.entities import (
+    ContactEntity,
+    DealEntity,
+)
+from domain.sales.services import (
+    ActivityService,
+    DealService,
+)
+from domain.sales.value_objects.contacts import (
+    ContactEmailValueObject,
+    ContactNameValueObject,
+    ContactPhoneValueObject,
+)
+from domain.sales.value_objects.deals import (
+    CurrencyValueObject,
+    DealAmountValueObject,
+    DealStage,
+    DealStageValueObject,
+    DealStatus,
+    DealStatusValueObject,
+    DealTitleValueObject,
+)
+from tests.infrastructure.database.fixtures import (
+    ConnectionDatabase,
+    QueryCounter,
+)
+
+
+@pytest.mark.asyncio
+async def test_contacts_add_many_inserts_in_one_statement_and_skips_existing(
+    database: ConnectionDatabase,
+    query_counter: QueryCounter,
+):
+    async with database.get_session() as session:
+        user = UserModel(oid=uuid4(), email=f"{uuid4()}@example.com", hashed_password="x", name="Owner")
+        organization = OrganizationModel(oid=uuid4(), name="Import")
+        session.add_all([user, organization])
+        await session.commit()
+
+    repository = SQLAlchemyContactRepository(database=database, search_backend=TrigramSearchBackend())
+    contacts = [
+        ContactEntity(
+            organization_id=organization.oid,
+            owner_user_id=user.oid,
+            name=ContactNameValueObject(f"Contact {i}"),
+            email=ContactEmailValueObject(None),
+            phone=ContactPhoneValueObject(None),
+        )
+        for i in range(50)
+    ]
+
+    query_counter.reset()
+    inserted = await repository.add_many(contacts)
+
+    assert inserted == {contact.oid for contact in contacts}
+    inserts = [statement for statement in query_counter.statements if statement.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 1
+
+    inserted = await repository.add_many(contacts[:10])
+    assert inserted == set()
+    assert await repository.get_existing_ids(organization.oid, [contacts[0].oid, uuid4()]) == {contacts[0].oid}
+
+
+@pytest.mark.asyncio
+async def test_deals_batch_update_uses_one_select_one_update_and_one_insert(
+    database: ConnectionDatabase,
+    query_counter: QueryCounter,
+):
+    async with database.get_session() as session:
+        user = UserModel(oid=uuid4(), email=f"{uuid4()}@example.com", hashed_password="x", name="Owner")
+        organization = OrganizationModel(oid=uuid4(), name="Batch")
+        session.add_all([user, organization])
+        await session.commit()
+
+    search_backend = TrigramSearchBackend()
+    contact = ContactEntity(
+        organization_id=organization.oid,
+        owner_user_id=user.oid,
+        name=ContactNameValueObject("Contact"),
+        email=ContactEmailValueObject(None),
+        phone=ContactPhoneValueObject(None),
+    )
+    await SQLAlchemyContactRepository(database=database, search_backend=search_backend).add(contact)
+
+    deal_repository = SQLAlchemyDealRepository(database=database, search_backend=search_backend)
+    deals = [
+        DealEntity(
+            organization_id=organization.oid,
+            contact_id=contact.oid,
+            owner_user_id=user.oid,
+            title=DealTitleValueObject(f"Deal {i}"),
+            amount=DealAmountValueObject(100.0),
+            currency=CurrencyValueObject("USD"),
+            status=DealStatusValueObject(DealStatus.NEW.value),
+            stage=DealStageValueObject(DealStage.QUALIFICATION.value),
+        )
+        for i in range(30)
+    ]
+    await deal_repository.add_many(deals)
+
+    deal_service = DealService(deal_repository=deal_repository)
+    activity_repository = SQLAlchemyActivityRepository(database=database)
+    activity_service = ActivityService(
+        activity_repository=activity_repository,
+        # Писатель не запущен: журнал пишет пачку сразу
+        activity_journal=QueuedActivityJournal(activity_repository=activity_repository, unit_of_work=DummyUnitOfWork()),
+    )
+
+    query_counter.reset()
+    loaded = await deal_service.get_deals_by_ids([deal.oid for deal in deals])
+    changed = await deal_service.update_deals(loaded, new_status=DealStatus.LOST.value)
+    await activity_service.create_activities(
+        [
+            activity_service.build_status_changed_activity(
+                deal_id=deal.oid,
+                old_status=old_status.value,
+                new_status=deal.status.as_generic_type().value,
+            )
+            for deal, old_status, _ in changed
+        ],
+    )
+
+    verbs = [statement.lstrip().split(None, 1)[0].upper() for statement in query_counter.statements]
+    assert [verb for verb in verbs if verb not in {"SAVEPOINT", "RELEASE"}] == ["SELECT", "UPDATE", "INSERT"]
+
+    stored = await deal_repository.get_by_ids([deal.oid for deal in deals])
+    assert {deal.status.as_generic_type() for deal in stored} == {DealStatus.LOST}
+    # Каждая сделка набора получает время и версию своей записанной строки
+    stored_by_id = {deal.oid: deal for deal in stored}
+    for deal in loaded:
+        assert (deal.updated_at, deal.version) == (stored_by_id[deal.oid].updated_at, stored_by_id[deal.oid].version)
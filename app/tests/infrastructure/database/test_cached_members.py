@@ -0,0 +1,65 @@
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.repositories.dummy.organizations.members import DummyInMemoryOrganizationMemberRepository
+from infrastructure.database.repositories.organizations.cached_members import (
+    CachedOrganizationMemberRepository,
+    OrganizationMemberCache,
+)
+
+from domain.organizations.entities import OrganizationMemberEntity
+from domain.organizations.value_objects.members import OrganizationMemberRoleValueObject
+
+
+@pytest.fixture()
+def repository() -> CachedOrganizationMemberRepository:
+    return CachedOrganizationMemberRepository(
+        repository=DummyInMemoryOrganizationMemberRepository(),
+        cache=OrganizationMemberCache(ttl=60, max_size=100),
+    )
+
+
+def _member(organization_id=None, user_id=None) -> OrganizationMemberEntity:
+    return OrganizationMemberEntity(
+        organization_id=organization_id or uuid4(),
+        user_id=user_id or uuid4(),
+        role=OrganizationMemberRoleValueObject("member"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_membership_lookup_is_served_from_cache(repository: CachedOrganizationMemberRepository):
+    member = _member()
+    await repository.add(member)
+
+    first = await repository.get_by_organization_and_user(member.organization_id, member.user_id)
+    second = await repository.get_by_organization_and_user(member.organization_id, member.user_id)
+
+    assert first.oid == second.oid == member.oid
+    assert repository.cache.metrics.misses == 1
+    assert repository.cache.metrics.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_membership_is_not_cached(repository: CachedOrganizationMemberRepository):
+    organization_id, user_id = uuid4(), uuid4()
+
+    assert await repository.get_by_organization_and_user(organization_id, user_id) is None
+
+    await repository.add(_member(organization_id, user_id))
+
+    member = await repository.get_by_organization_and_user(organization_id, user_id)
+    assert member is not None
+    assert repository.cache.metrics.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_add_invalidates_cached_membership(repository: CachedOrganizationMemberRepository):
+    member = _member()
+    key = (member.organization_id, member.user_id)
+    repository.cache.set(key, member)
+
+    await repository.add(member)
+
+    assert repository.cache.get(key) is None
+    assert repository.cache.metrics.invalidations == 1
@@ -0,0 +1,122 @@
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.models.organizations import OrganizationModel
+from infrastructure.database.models.sales import (
+    ContactModel,
+    DealModel,
+    TaskModel,
+)
+from infrastructure.database.models.users import UserModel
+from infrastructure.database.repositories.sales.contacts import SQLAlchemyContactRepository
+from infrastructure.database.repositories.sales.deals import SQLAlchemyDealRepository
+from infrastructure.database.repositories.sales.tasks import SQLAlchemyTaskRepository
+from infrastructure.database.search import TrigramSearchBackend
+
+from domain.base.exceptions import ConcurrentUpdateException
+from domain.sales.value_objects.deals import DealTitleValueObject
+from tests.infrastructure.database.fixtures import (
+    ConnectionDatabase,
+    QueryCounter,
+)
+
+
+async def _seed(database: ConnectionDatabase) -> tuple[ContactModel, DealModel, TaskModel]:
+    async with database.get_session() as session:
+        user = UserModel(oid=uuid4(), email=f"{uuid4()}@example.com", hashed_password="x", name="Owner")
+        organization = OrganizationModel(oid=uuid4(), name="Writes")
+        session.add_all([user, organization])
+        await session.flush()
+        contact = ContactModel(oid=uuid4(), organization_id=organization.oid, owner_id=user.oid, name="Contact")
+        empty_contact = ContactModel(oid=uuid4(), organization_id=organization.oid, owner_id=user.oid, name="Empty")
+        session.add_all([contact, empty_contact])
+        await session.flush()
+        deal = DealModel(
+            oid=uuid4(),
+            organization_id=organization.oid,
+            contact_id=contact.oid,
+            owner_id=user.oid,
+            title="Deal",
+            amount=100,
+            currency="USD",
+            status="new",
+            stage="qualification",
+        )
+        session.add(deal)
+        await session.flush()
+        task = TaskModel(oid=uuid4(), deal_id=deal.oid, title="Task")
+        session.add(task)
+    return empty_contact, deal, task
+
+
+def _writes(query_counter: QueryCounter) -> list[str]:
+    verbs = [statement.lstrip().split(None, 1)[0].upper() for statement in query_counter.statements]
+    return [verb for verb in verbs if verb not in {"SAVEPOINT", "RELEASE"}]
+
+
+@pytest.mark.asyncio
+async def test_deal_update_is_one_statement_and_detects_stale_write(
+    database: ConnectionDatabase,
+    query_counter: QueryCounter,
+):
+    _, deal_model, _ = await _seed(database)
+    deals = SQLAlchemyDealRepository(database=database, search_backend=TrigramSearchBackend())
+    deal = await deals.get_by_id(deal_model.oid)
+    stale = replace(deal)
+
+    query_counter.reset()
+    deal.title = DealTitleValueObject("Renamed")
+    await deals.update(deal)
+
+    assert _writes(query_counter) == ["UPDATE"]
+    assert deal.version == stale.version + 1
+
+    stale.title = DealTitleValueObject("Lost update")
+    with pytest.raises(ConcurrentUpdateException):
+        await deals.update(stale)
+
+    stored = await deals.get_by_id(deal.oid)
+    assert stored.title.as_generic_type() == "Renamed"
+    assert stored.version == deal.version
+
+
+@pytest.mark.asyncio
+async def test_task_update_detects_stale_write(database: ConnectionDatabase):
+    _, _, task_model = await _seed(database)
+    tasks = SQLAlchemyTaskRepository(database=database, search_backend=TrigramSearchBackend())
+    task = await tasks.get_by_id(task_model.oid)
+    stale = replace(task)
+
+    task.is_done = True
+    await tasks.update(task)
+
+    with pytest.raises(ConcurrentUpdateException):
+        await tasks.update(stale)
+    assert (await tasks.get_by_id(task.oid)).is_done is True
+
+
+@pytest.mark.asyncio
+async def test_deal_update_many_rejects_stale_set(database: ConnectionDatabase):
+    _, deal_model, _ = await _seed(database)
+    deals = SQLAlchemyDealRepository(database=database, search_backend=TrigramSearchBackend())
+    (deal,) = await deals.get_by_ids([deal_model.oid])
+    stale = replace(deal)
+
+    await deals.update(deal)
+
+    with pytest.raises(ConcurrentUpdateException):
+        await deals.update_many([stale], status=stale.status.as_generic_type())
+
+
+@pytest.mark.asyncio
+async def test_contact_delete_is_one_statement(database: ConnectionDatabase, query_counter: QueryCounter):
+    empty_contact, _, _ = await _seed(database)
+    contacts = SQLAlchemyContactRepository(database=database, search_backend=TrigramSearchBackend())
+
+    query_counter.reset()
+    await contacts.delete(empty_contact.oid)
+
+    assert _writes(query_counter) == ["DELETE"]
+    query_counter.assert_load_graph(0, {})
+    assert await contacts.get_by_id(empty_contact.oid) is None
@@ -0,0 +1,85 @@
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.repositories.dummy.sales.deals import DummyInMemoryDealRepository
+from infrastructure.database.repositories.dummy.sales.tasks import DummyInMemoryTaskRepository
+
+from domain.base.exceptions import ConcurrentUpdateException
+from domain.sales.entities import (
+    DealEntity,
+    TaskEntity,
+)
+from domain.sales.value_objects.deals import (
+    CurrencyValueObject,
+    DealAmountValueObject,
+    DealStageValueObject,
+    DealStatus,
+    DealStatusValueObject,
+    DealTitleValueObject,
+)
+from domain.sales.value_objects.tasks import (
+    TaskDescriptionValueObject,
+    TaskDueDateValueObject,
+    TaskTitleValueObject,
+)
+
+
+def _deal() -> DealEntity:
+    return DealEntity(
+        organization_id=uuid4(),
+        contact_id=uuid4(),
+        owner_user_id=uuid4(),
+        title=DealTitleValueObject("Deal"),
+        amount=DealAmountValueObject(100.0),
+        currency=CurrencyValueObject("USD"),
+        status=DealStatusValueObject("new"),
+        stage=DealStageValueObject("qualification"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_dummy_deal_update_detects_stale_write():
+    deals = DummyInMemoryDealRepository()
+    stored = _deal()
+    await deals.add(stored)
+    deal = await deals.get_by_id(stored.oid)
+    stale = await deals.get_by_id(stored.oid)
+
+    # Прочитанная сущность - копия: до update хранилище не меняется
+    deal.title = DealTitleValueObject("Renamed")
+    assert (await deals.get_by_id(deal.oid)).title.as_generic_type() == "Deal"
+
+    await deals.update(deal)
+    assert deal.version == stale.version + 1
+
+    stale.title = DealTitleValueObject("Lost update")
+    with pytest.raises(ConcurrentUpdateException):
+        await deals.update(stale)
+    with pytest.raises(ConcurrentUpdateException):
+        await deals.update_many([stale], status=DealStatus.LOST)
+
+    current = await deals.get_by_id(deal.oid)
+    assert current.title.as_generic_type() == "Renamed"
+    assert current.status.as_generic_type() == DealStatus.NEW
+    assert current.version == deal.version
+
+
+@pytest.mark.asyncio
+async def test_dummy_task_update_detects_stale_write():
+    tasks = DummyInMemoryTaskRepository()
+    stored = TaskEntity(
+        deal_id=uuid4(),
+        title=TaskTitleValueObject("Task"),
+        description=TaskDescriptionValueObject(None),
+        due_date=TaskDueDateValueObject(None),
+    )
+    await tasks.add(stored)
+    task = await tasks.get_by_id(stored.oid)
+    stale = await tasks.get_by_id(stored.oid)
+
+    task.is_done = True
+    await tasks.update(task)
+
+    with pytest.raises(ConcurrentUpdateException):
+        await tasks.update(stale)
+    assert (await tasks.get_by_id(task.oid)).is_done is True
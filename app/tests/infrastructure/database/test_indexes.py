@@ -0,0 +1,180 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.models.organizations import OrganizationMemberModel
+from infrastructure.database.models.sales import (
+    ActivityModel,
+    ContactModel,
+    DealModel,
+    TaskModel,
+)
+from infrastructure.database.repositories.pagination import paginate
+from infrastructure.database.repositories.sales.contacts import SQLAlchemyContactRepository
+from infrastructure.database.repositories.sales.deals import SQLAlchemyDealRepository
+from infrastructure.database.repositories.sales.tasks import SQLAlchemyTaskRepository
+from infrastructure.database.search import TrigramSearchBackend
+from sqlalchemy import (
+    func,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import Select
+
+from domain.base.cursor import PageCursor
+from domain.base.filters import SearchMode
+from domain.sales.filters import (
+    ContactFilters,
+    DealFilters,
+    TaskFilters,
+)
+
+
+ORGANIZATION_ID = uuid4()
+OWNER_ID = uuid4()
+DEAL_ID = uuid4()
+
+
+def _access_paths() -> list[tuple[str, str, Select]]:
+    search_backend = TrigramSearchBackend()
+    deals = SQLAlchemyDealRepository(database=None, search_backend=search_backend)
+    contacts = SQLAlchemyContactRepository(database=None, search_backend=search_backend)
+    tasks = SQLAlchemyTaskRepository(database=None, search_backend=search_backend)
+
+    return [
+        (
+            "deals by organization",
+            "deals",
+            deals._build_query(select(DealModel), DealFilters(organization_id=ORGANIZATION_ID))
+            .order_by(DealModel.created_at.desc())
+            .limit(20),
+        ),
+        (
+            "deals by organization and owner",
+            "deals",
+            deals._build_query(select(DealModel), DealFilters(organization_id=ORGANIZATION_ID, owner_id=OWNER_ID))
+            .order_by(DealModel.created_at.desc())
+            .limit(20),
+        ),
+        (
+            "deal status aggregates",
+            "deals",
+            deals._build_query(
+                select(DealModel.status, func.count(DealModel.oid)).group_by(DealModel.status),
+                DealFilters(organization_id=ORGANIZATION_ID),
+            ),
+        ),
+        (
+            "deals keyset page by organization",
+            "deals",
+            paginate(
+                deals._build_query(select(DealModel), DealFilters(organization_id=ORGANIZATION_ID)),
+                DealModel,
+                DealFilters(
+                    organization_id=ORGANIZATION_ID,
+                    cursor=PageCursor(
+                        sort_key="created_at",
+                        descending=True,
+                        value=datetime(2026, 1, 1),
+                        oid=uuid4(),
+                    ).encode(),
+                ),
+            ),
+        ),
+        (
+            "deals by contact",
+            "deals",
+            select(DealModel).where(DealModel.contact_id == uuid4()),
+        ),
+        (
+            "contacts by organization and owner",
+            "contacts",
+            contacts._build_query(
+                select(ContactModel),
+                ContactFilters(organization_id=ORGANIZATION_ID, owner_id=OWNER_ID),
+            ).limit(20),
+        ),
+        (
+            "contacts search by substring",
+            "contacts",
+            contacts._build_query(select(ContactModel), ContactFilters(search="ivan")).limit(20),
+        ),
+        (
+            "contacts search by similarity",
+            "contacts",
+            contacts._build_query(
+                select(ContactModel),
+                ContactFilters(search="ivan", search_mode=SearchMode.SIMILARITY),
+            ).limit(20),
+        ),
+        (
+            "deals search by substring",
+            "deals",
+            deals._build_query(select(DealModel), DealFilters(search="renewal")).limit(20),
+        ),
+        (
+            "tasks search by substring",
+            "tasks",
+            tasks._build_query(select(TaskModel), TaskFilters(search="call")).limit(20),
+        ),
+        (
+            "tasks by deal",
+            "tasks",
+            tasks._build_query(select(TaskModel), TaskFilters(deal_id=DEAL_ID)).limit(20),
+        ),
+        (
+            "open tasks by deal",
+            "tasks",
+            tasks._build_query(select(TaskModel), TaskFilters(deal_id=DEAL_ID, only_open=True)).limit(20),
+        ),
+        (
+            "activities by deal",
+            "activities",
+            select(ActivityModel).where(ActivityModel.deal_id == DEAL_ID).order_by(ActivityModel.created_at.desc()),
+        ),
+        (
+            "memberships by user",
+            "organization_members",
+            select(OrganizationMemberModel).where(OrganizationMemberModel.user_id == OWNER_ID),
+        ),
+        (
+            "membership by organization and user",
+            "organization_members",
+            select(OrganizationMemberModel).where(
+                OrganizationMemberModel.organization_id == ORGANIZATION_ID,
+                OrganizationMemberModel.user_id == OWNER_ID,
+            ),
+        ),
+    ]
+
+
+async def _explain(connection: AsyncConnection, stmt: Select) -> str:
+    compiled = stmt.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    res = await connection.execute(text(f"EXPLAIN {compiled}"))
+    return "\n".join(row[0] for row in res.all())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("name", "table", "stmt"),
+    _access_paths(),
+    ids=[name for name, *_ in _access_paths()],
+)
+async def test_access_path_uses_index(
+    postgres_connection: AsyncConnection,
+    name: str,
+    table: str,
+    stmt: Select,
+):
+    # На пустых таблицах планировщик всегда выбирает seq scan, поэтому запрещаем его:
+    # если для запроса нет подходящего индекса, seq scan все равно останется в плане.
+    await postgres_connection.execute(text("SET LOCAL enable_seqscan = off"))
+
+    plan = await _explain(postgres_connection, stmt)
+
+    assert f"Seq Scan on {table}" not in plan, f"{name} falls back to a sequential scan:\n{plan}"
@@ -0,0 +1,166 @@
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.models.organizations import OrganizationModel
+from infrastructure.database.models.sales import (
+    ActivityModel,
+    ContactModel,
+    DealModel,
+    TaskModel,
+)
+from infrastructure.database.models.users import UserModel
+from infrastructure.database.repositories.sales.contacts import SQLAlchemyContactRepository
+from infrastructure.database.repositories.sales.deals import SQLAlchemyDealRepository
+from infrastructure.database.repositories.sales.tasks import SQLAlchemyTaskRepository
+from infrastructure.database.search import TrigramSearchBackend
+
+from domain.base.cursor import PageCursor
+from domain.sales.filters import (
+    ContactFilters,
+    DealFilters,
+    TaskFilters,
+)
+from tests.infrastructure.database.fixtures import (
+    ConnectionDatabase,
+    QueryCounter,
+)
+
+
+PAGE_SIZE = 100
+TASKS_PER_DEAL = 3
+ACTIVITIES_PER_DEAL = 3
+
+
+async def _seed(database: ConnectionDatabase) -> tuple[OrganizationModel, DealModel]:
+    """Организация со 100 сделками, у каждой из которых есть задачи и активности."""
+    async with database.get_session() as session:
+        user = UserModel(oid=uuid4(), email=f"{uuid4()}@example.com", hashed_password="x", name="Owner")
+        organization = OrganizationModel(oid=uuid4(), name="Benchmark")
+        contact = ContactModel(oid=uuid4(), organization_id=organization.oid, owner_id=user.oid, name="Contact")
+        session.add_all([user, organization, contact])
+        await session.flush()
+
+        deals = [
+            DealModel(
+                oid=uuid4(),
+                organization_id=organization.oid,
+                contact_id=contact.oid,
+                owner_id=user.oid,
+                title=f"Deal {i}",
+                amount=100,
+                currency="USD",
+                status="new",
+                stage="qualification",
+            )
+            for i in range(PAGE_SIZE)
+        ]
+        session.add_all(deals)
+        await session.flush()
+
+        for deal in deals:
+            session.add_all(TaskModel(deal_id=deal.oid, title=f"Task {i}") for i in range(TASKS_PER_DEAL))
+            session.add_all(
+                ActivityModel(deal_id=deal.oid, author_id=user.oid, type="comment", payload={})
+                for _ in range(ACTIVITIES_PER_DEAL)
+            )
+        await session.commit()
+        return organization, deals[0]
+
+
+@pytest.mark.asyncio
+async def test_deal_page_fetches_only_deal_rows(database: ConnectionDatabase, query_counter: QueryCounter):
+    organization, _ = await _seed(database)
+    repository = SQLAlchemyDealRepository(database=database, search_backend=TrigramSearchBackend())
+    filters = DealFilters(organization_id=organization.oid, page_size=PAGE_SIZE)
+
+    query_counter.reset()
+    deals = list(await repository.get_list(filters))
+    total = await repository.get_count(filters)
+
+    assert len(deals) == PAGE_SIZE
+    assert total == PAGE_SIZE
+    # Одно выражение на страницу и одно на count, без подгрузки tasks/activities/contact/owner
+    assert len(query_counter.select_statements) == 2
+    assert dict(query_counter.loaded) == {"DealModel": PAGE_SIZE}
+
+
+@pytest.mark.asyncio
+async def test_contact_and_task_pages_fetch_only_own_rows(
+    database: ConnectionDatabase,
+    query_counter: QueryCounter,
+):
+    organization, deal = await _seed(database)
+    search_backend = TrigramSearchBackend()
+    contacts = SQLAlchemyContactRepository(database=database, search_backend=search_backend)
+    tasks = SQLAlchemyTaskRepository(database=database, search_backend=search_backend)
+
+    query_counter.reset()
+    contact_page = list(await contacts.get_list(ContactFilters(organization_id=organization.oid)))
+    task_page = list(await tasks.get_list(TaskFilters(organization_id=organization.oid, deal_id=deal.oid)))
+
+    assert len(contact_page) == 1
+    assert len(task_page) == TASKS_PER_DEAL
+    assert len(query_counter.select_statements) == 2
+    assert dict(query_counter.loaded) == {"ContactModel": 1, "TaskModel": TASKS_PER_DEAL}
+
+
+@pytest.mark.asyncio
+async def test_deal_page_with_total_in_one_statement(database: ConnectionDatabase, query_counter: QueryCounter):
+    organization, _ = await _seed(database)
+    repository = SQLAlchemyDealRepository(database=database, search_backend=TrigramSearchBackend())
+
+    query_counter.reset()
+    deals, total = await repository.get_list_with_count(DealFilters(organization_id=organization.oid, page_size=10))
+
+    assert len(deals) == 10
+    assert total == PAGE_SIZE
+    assert len(query_counter.select_statements) == 1
+
+    # total по курсору - по всей выборке, а не по строкам после курсора
+    cursor = PageCursor.from_entity(deals[-1], "created_at", True).encode()
+    deals, total = await repository.get_list_with_count(
+        DealFilters(organization_id=organization.oid, page_size=10, cursor=cursor),
+    )
+    assert len(deals) == 10
+    assert total == PAGE_SIZE
+
+    # Страница за пределами выборки все равно возвращает total
+    deals, total = await repository.get_list_with_count(
+        DealFilters(organization_id=organization.oid, page_size=10, page=100),
+    )
+    assert deals == []
+    assert total == PAGE_SIZE
+
+
+@pytest.mark.asyncio
+async def test_deal_page_with_estimated_total(database: ConnectionDatabase):
+    organization, _ = await _seed(database)
+    repository = SQLAlchemyDealRepository(database=database, search_backend=TrigramSearchBackend())
+
+    deals, total = await repository.get_list_with_count(
+        DealFilters(organization_id=organization.oid, page_size=10, estimate_total=True),
+    )
+
+    assert len(deals) == 10
+    assert total >= len(deals)
+
+
+@pytest.mark.asyncio
+async def test_deal_and_task_streams_read_whole_selection(database: ConnectionDatabase, query_counter: QueryCounter):
+    organization, deal = await _seed(database)
+    search_backend = TrigramSearchBackend()
+    deals = SQLAlchemyDealRepository(database=database, search_backend=search_backend)
+    tasks = SQLAlchemyTaskRepository(database=database, search_backend=search_backend)
+
+    query_counter.reset()
+    streamed = [item async for item in deals.stream(DealFilters(organization_id=organization.oid))]
+
+    # Фильтры страницы (page_size) к выгрузке не применяются, строки идут одним запросом
+    assert len(streamed) == PAGE_SIZE
+    assert len(query_counter.select_statements) == 1
+    assert dict(query_counter.loaded) == {"DealModel": PAGE_SIZE}
+
+    owned = [item async for item in tasks.stream(TaskFilters(deal_owner_id=deal.owner_id, deal_id=deal.oid))]
+    foreign = [item async for item in tasks.stream(TaskFilters(deal_owner_id=uuid4()))]
+    assert len(owned) == TASKS_PER_DEAL
+    assert foreign == []
@@ -0,0 +1,171 @@
+from collections.abc import (
+    Awaitable,
+    Callable,
+)
+from dataclasses import dataclass
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+import pytest
+from infrastructure.database.models.base import BaseModel
+from infrastructure.database.models.organizations import (
+    OrganizationMemberModel,
+    OrganizationModel,
+)
+from infrastructure.database.models.sales import (
+    ActivityModel,
+    ContactModel,
+    DealModel,
+    TaskModel,
+)
+from infrastructure.database.models.users import UserModel
+from infrastructure.database.repositories.organizations.members import SQLAlchemyOrganizationMemberRepository
+from infrastructure.database.repositories.organizations.organizations import SQLAlchemyOrganizationRepository
+from infrastructure.database.repositories.sales.activities import SQLAlchemyActivityRepository
+from infrastructure.database.repositories.sales.contacts import SQLAlchemyContactRepository
+from infrastructure.database.repositories.sales.deals import SQLAlchemyDealRepository
+from infrastructure.database.repositories.sales.tasks import SQLAlchemyTaskRepository
+from infrastructure.database.repositories.users.users import SQLAlchemyUserRepository
+from infrastructure.database.search import TrigramSearchBackend
+
+from tests.infrastructure.database.fixtures import (
+    ConnectionDatabase,
+    QueryCounter,
+)
+
+
+CONTACTS_PER_USER = 5
+DEALS_PER_CONTACT = 4
+TASKS_PER_DEAL = 3
+ACTIVITIES_PER_DEAL = 3
+
+
+@dataclass(frozen=True)
+class Seed:
+    user_id: UUID
+    email: str
+    organization_id: UUID
+    contact_id: UUID
+    deal_id: UUID
+    task_id: UUID
+
+
+async def _seed(database: ConnectionDatabase) -> Seed:
+    """Пользователь с организацией и полным "портфелем": контакты, сделки,
+    задачи и активности - все, что раньше подтягивалось вместе с ним."""
+    async with database.get_session() as session:
+        email = f"{uuid4()}@example.com"
+        user = UserModel(oid=uuid4(), email=email, hashed_password="x", name="Owner")
+        organization = OrganizationModel(oid=uuid4(), name="Graph")
+        session.add_all([user, organization])
+        await session.flush()
+        session.add(OrganizationMemberModel(organization_id=organization.oid, user_id=user.oid, role="owner"))
+
+        contacts = [
+            ContactModel(oid=uuid4(), organization_id=organization.oid, owner_id=user.oid, name=f"Contact {i}")
+            for i in range(CONTACTS_PER_USER)
+        ]
+        session.add_all(contacts)
+        await session.flush()
+
+        deals = [
+            DealModel(
+                oid=uuid4(),
+                organization_id=organization.oid,
+                contact_id=contact.oid,
+                owner_id=user.oid,
+                title="Deal",
+                amount=100,
+                currency="USD",
+                status="new",
+                stage="qualification",
+            )
+            for contact in contacts
+            for _ in range(DEALS_PER_CONTACT)
+        ]
+        session.add_all(deals)
+        await session.flush()
+
+        tasks = [
+            TaskModel(oid=uuid4(), deal_id=deal.oid, title="Task") for deal in deals for _ in range(TASKS_PER_DEAL)
+        ]
+        session.add_all(tasks)
+        session.add_all(
+            ActivityModel(deal_id=deal.oid, author_id=user.oid, type="comment", payload={})
+            for deal in deals
+            for _ in range(ACTIVITIES_PER_DEAL)
+        )
+        await session.commit()
+
+        return Seed(
+            user_id=user.oid,
+            email=email,
+            organization_id=organization.oid,
+            contact_id=contacts[0].oid,
+            deal_id=deals[0].oid,
+            task_id=tasks[0].oid,
+        )
+
+
+def _repository_calls(database: ConnectionDatabase) -> dict[str, Callable[[Seed], Awaitable]]:
+    search_backend = TrigramSearchBackend()
+    users = SQLAlchemyUserRepository(database=database)
+    organizations = SQLAlchemyOrganizationRepository(database=database)
+    members = SQLAlchemyOrganizationMemberRepository(database=database)
+    contacts = SQLAlchemyContactRepository(database=database, search_backend=search_backend)
+    deals = SQLAlchemyDealRepository(database=database, search_backend=search_backend)
+    tasks = SQLAlchemyTaskRepository(database=database, search_backend=search_backend)
+    activities = SQLAlchemyActivityRepository(database=database)
+
+    return {
+        "users.get_by_email": lambda seed: users.get_by_email(seed.email),
+        "users.get_by_id": lambda seed: users.get_by_id(seed.user_id),
+        "organizations.get_by_id": lambda seed: organizations.get_by_id(seed.organization_id),
+        "members.get_by_organization_and_user": lambda seed: members.get_by_organization_and_user(
+            seed.organization_id,
+            seed.user_id,
+        ),
+        "members.get_by_user": lambda seed: members.get_by_user(seed.user_id),
+        "contacts.get_by_id": lambda seed: contacts.get_by_id(seed.contact_id),
+        "deals.get_by_id": lambda seed: deals.get_by_id(seed.deal_id),
+        "deals.get_by_contact_id": lambda seed: deals.get_by_contact_id(seed.contact_id),
+        "tasks.get_by_id": lambda seed: tasks.get_by_id(seed.task_id),
+        "activities.get_by_deal_id": lambda seed: activities.get_by_deal_id(seed.deal_id),
+    }
+
+
+# Ожидаемый граф каждого вызова: число SELECT и загруженные строки по моделям
+LOAD_GRAPHS: dict[str, tuple[int, dict[str, int]]] = {
+    "users.get_by_email": (1, {"UserModel": 1}),
+    "users.get_by_id": (1, {"UserModel": 1}),
+    "organizations.get_by_id": (1, {"OrganizationModel": 1}),
+    "members.get_by_organization_and_user": (1, {"OrganizationMemberModel": 1}),
+    "members.get_by_user": (2, {"OrganizationMemberModel": 1, "OrganizationModel": 1}),
+    "contacts.get_by_id": (1, {"ContactModel": 1}),
+    "deals.get_by_id": (1, {"DealModel": 1}),
+    "deals.get_by_contact_id": (1, {"DealModel": DEALS_PER_CONTACT}),
+    "tasks.get_by_id": (1, {"TaskModel": 1}),
+    "activities.get_by_deal_id": (1, {"ActivityModel": ACTIVITIES_PER_DEAL}),
+}
+
+
+def test_relationships_do_not_load_implicitly():
+    for mapper in BaseModel.registry.mappers:
+        for relationship in mapper.relationships:
+            assert relationship.lazy == "raise", (
+                f"{mapper.class_.__name__}.{relationship.key} is lazy={relationship.lazy}"
+            )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("call", LOAD_GRAPHS)
+async def test_repository_call_load_graph(database: ConnectionDatabase, query_counter: QueryCounter, call: str):
+    seed = await _seed(database)
+    statements, loaded = LOAD_GRAPHS[call]
+
+    query_counter.reset()
+    await _repository_calls(database)[call](seed)
+
+    query_counter.assert_load_graph(statements, loaded)
@@ -0,0 +1,44 @@
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.repositories.outbox import SQLAlchemyEventOutbox
+
+from domain.sales.events import (
+    DealStageChangedEvent,
+    DealStatusChangedEvent,
+)
+from tests.infrastructure.database.fixtures import ConnectionDatabase
+
+
+@pytest.mark.asyncio
+async def test_outbox_claims_leases_retries_and_publishes(database: ConnectionDatabase):
+    outbox = SQLAlchemyEventOutbox(database=database)
+    deal_id, organization_id = uuid4(), uuid4()
+    status_changed = DealStatusChangedEvent(
+        deal_id=deal_id,
+        organization_id=organization_id,
+        old_status="new",
+        new_status="won",
+    )
+    stage_changed = DealStageChangedEvent(
+        deal_id=deal_id,
+        organization_id=organization_id,
+        old_stage="qualification",
+        new_stage="closed",
+    )
+    await outbox.add([status_changed, stage_changed])
+
+    claimed = await outbox.claim(limit=10, lease=60, max_attempts=3)
+    # События восстанавливаются целиком и в порядке появления
+    assert claimed == [status_changed, stage_changed]
+    assert claimed[0].deal_id == deal_id
+    # Забранные события арендованы и второй раз не выдаются
+    assert await outbox.claim(limit=10, lease=60, max_attempts=3) == []
+
+    await outbox.mark_published([status_changed.event_id])
+    await outbox.mark_failed([stage_changed.event_id], retry_delay=0)
+
+    assert await outbox.claim(limit=10, lease=60, max_attempts=3) == [stage_changed]
+    # Попытки исчерпаны
+    await outbox.mark_failed([stage_changed.event_id], retry_delay=0)
+    assert await outbox.claim(limit=10, lease=60, max_attempts=2) == []
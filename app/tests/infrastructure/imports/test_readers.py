@@ -0,0 +1,68 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from infrastructure.imports import (
+    read_csv,
+    read_ndjson,
+)
+from infrastructure.imports.readers import MAX_RECORD_SIZE
+
+from domain.base.imports import ImportRow
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _collect(rows: AsyncIterator[ImportRow]) -> list[ImportRow]:
+    return [row async for row in rows]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+async def test_read_csv_across_chunk_boundaries(chunk_size: int):
+    data = '\ufeffName,Email\r\nИван,ivan@example.com\r\n"Smith, John","multi\nline"\r\n\r\nbroken\r\n'.encode()
+
+    rows = await _collect(read_csv(_chunks(data, chunk_size)))
+
+    assert [row.number for row in rows] == [1, 2, 3]
+    assert rows[0].data == {"name": "Иван", "email": "ivan@example.com"}
+    assert rows[1].data == {"name": "Smith, John", "email": "multi\nline"}
+    assert rows[2].error == "Expected 2 columns, got 1"
+
+
+@pytest.mark.asyncio
+async def test_read_csv_reports_unterminated_quote():
+    rows = await _collect(read_csv(_chunks(b'name\n"open\n', 1024)))
+
+    assert [(row.number, row.error) for row in rows] == [(1, "Unterminated quoted field")]
+
+
+@pytest.mark.asyncio
+async def test_read_ndjson_reports_invalid_lines():
+    data = b'{"name": "Ivan", "amount": 10.5, "email": null}\n\n{broken\n[1, 2]\n'
+
+    rows = await _collect(read_ndjson(_chunks(data, 7)))
+
+    assert rows[0].data == {"name": "Ivan", "amount": "10.5", "email": None}
+    assert [(row.number, row.error) for row in rows[1:]] == [(2, "Invalid JSON"), (3, "Expected a JSON object")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reader", [read_csv, read_ndjson])
+async def test_readers_stop_at_line_without_newline_over_limit(reader):
+    consumed = 0
+
+    async def endless_line():
+        nonlocal consumed
+        yield b"name\n" if reader is read_csv else b'{"name": "Ivan"}\n'
+        while True:
+            consumed += 1
+            yield b"x" * 64 * 1024
+
+    rows = await _collect(reader(endless_line()))
+
+    assert rows[-1].error == f"Record exceeds {MAX_RECORD_SIZE} characters"
+    # Поток брошен сразу за пределом, а не дочитан до конца
+    assert consumed * 64 * 1024 <= MAX_RECORD_SIZE + 64 * 1024
@@ -0,0 +1,162 @@
+import asyncio
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from infrastructure.database.repositories.dummy.sales.activities import DummyInMemoryActivityRepository
+from infrastructure.database.repositories.dummy.unit_of_work import DummyUnitOfWork
+from infrastructure.journal import QueuedActivityJournal
+
+from domain.sales.entities import ActivityEntity
+from domain.sales.services import ActivityService
+
+
+class RecordingActivityRepository(DummyInMemoryActivityRepository):
+    """Запоминает размеры пачек и может отказать первые failures раз."""
+
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+        self.failures = failures
+
+    async def add_many(self, activities: Sequence[ActivityEntity]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database is unavailable")
+        self.batches.append(len(activities))
+        await super().add_many(activities)
+
+
+class DeferredUnitOfWork(DummyUnitOfWork):
+    """Откладывает after_commit-колбэки до выхода из begin, как SQLAlchemyUnitOfWork."""
+
+    def __init__(self) -> None:
+        self.callbacks = []
+
+    @asynccontextmanager
+    async def begin(self, read_only: bool = False, pool: str | None = None, statement_timeout: float | None = None):
+        self.callbacks = []
+        yield
+        for callback in self.callbacks:
+            await callback()
+
+    async def after_commit(self, callback) -> None:
+        self.callbacks.append(callback)
+
+
+def _activities(count: int) -> list[ActivityEntity]:
+    service = ActivityService(activity_repository=None, activity_journal=None)
+    deal_id = uuid4()
+    return [service.build_status_changed_activity(deal_id, "new", f"status-{i}") for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_journal_writes_inline_when_writer_is_not_started():
+    repository = RecordingActivityRepository()
+    journal = QueuedActivityJournal(activity_repository=repository, unit_of_work=DummyUnitOfWork())
+
+    await journal.record(_activities(3))
+
+    assert repository.batches == [3]
+    assert journal.metrics.inline_writes == 3
+
+
+@pytest.mark.asyncio
+async def test_journal_batches_queued_activities_and_flushes_on_stop():
+    repository = RecordingActivityRepository()
+    journal = QueuedActivityJournal(
+        activity_repository=repository,
+        unit_of_work=DummyUnitOfWork(),
+        batch_size=10,
+        flush_interval=60,
+    )
+    journal.start()
+
+    for _ in range(25):
+        await journal.record(_activities(1))
+    # Запросы не ждут записи: все лежит в очереди или уже в пачках
+    assert journal.metrics.recorded == 25
+
+    await journal.stop()
+
+    assert repository.batches == [10, 10, 5]
+    assert len(repository._saved_activities) == 25
+    assert journal.metrics.written == 25
+    assert journal.metrics.batches == 3
+    assert not journal.is_running
+
+
+@pytest.mark.asyncio
+async def test_journal_flushes_partial_batch_after_interval():
+    repository = RecordingActivityRepository()
+    journal = QueuedActivityJournal(
+        activity_repository=repository,
+        unit_of_work=DummyUnitOfWork(),
+        batch_size=100,
+        flush_interval=0.01,
+    )
+    journal.start()
+
+    await journal.record(_activities(2))
+    await asyncio.sleep(0.05)
+
+    assert repository.batches == [2]
+    await journal.stop()
+
+
+@pytest.mark.asyncio
+async def test_journal_writes_inline_when_queue_stays_full():
+    repository = RecordingActivityRepository()
+    journal = QueuedActivityJournal(
+        activity_repository=repository,
+        unit_of_work=DummyUnitOfWork(),
+        max_queue_size=2,
+        enqueue_timeout=0.01,
+    )
+    # Писатель "занят": очередь никто не разбирает
+    journal._writer = asyncio.get_running_loop().create_future()
+
+    await journal.record(_activities(5))
+
+    assert journal.queue_size == 2
+    assert journal.metrics.recorded == 2
+    assert journal.metrics.inline_writes == 3
+    assert repository.batches == [3]
+
+
+@pytest.mark.asyncio
+async def test_journal_retries_failed_batch():
+    repository = RecordingActivityRepository(failures=2)
+    journal = QueuedActivityJournal(
+        activity_repository=repository,
+        unit_of_work=DummyUnitOfWork(),
+        flush_interval=60,
+        retry_delay=0,
+    )
+    journal.start()
+
+    await journal.record(_activities(4))
+    await journal.stop()
+
+    assert repository.batches == [4]
+    assert journal.metrics.retries == 2
+    assert journal.metrics.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_journal_records_only_after_commit():
+    repository = RecordingActivityRepository()
+    unit_of_work = DeferredUnitOfWork()
+    journal = QueuedActivityJournal(activity_repository=repository, unit_of_work=unit_of_work)
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work.begin():
+            await journal.record(_activities(1))
+            raise RuntimeError
+
+    async with unit_of_work.begin():
+        await journal.record(_activities(2))
+        assert repository.batches == []
+
+    assert repository.batches == [2]
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+import pytest
+from infrastructure.security import BcryptPasswordHasher
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify(executor: ThreadPoolExecutor):
+    hasher = BcryptPasswordHasher(executor=executor, max_concurrency=2, rounds=4)
+
+    hashed = await hasher.hash("secret")
+
+    assert bcrypt.checkpw(b"secret", hashed.encode())
+    assert await hasher.verify("secret", hashed)
+    assert not await hasher.verify("other", hashed)
+
+
+@pytest.mark.asyncio
+async def test_hashing_storm_does_not_block_event_loop(executor: ThreadPoolExecutor):
+    rounds = 10
+    started = time.perf_counter()
+    bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=rounds))
+    inline_hash_duration = time.perf_counter() - started
+
+    hasher = BcryptPasswordHasher(executor=executor, max_concurrency=4, rounds=rounds)
+    lags: list[float] = []
+
+    async def probe(stop: asyncio.Event) -> None:
+        interval = 0.001
+        while not stop.is_set():
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - expected)
+
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop))
+    await asyncio.gather(*(hasher.hash("secret") for _ in range(8)))
+    stop.set()
+    await probe_task
+
+    # Пока хеши считаются в пуле, event loop продолжает отвечать:
+    # задержка пробы заметно меньше одного хеша, выполненного прямо в корутине
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1]
+    assert p99 < inline_hash_duration / 2
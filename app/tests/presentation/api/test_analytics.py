@@ -79,3 +79,10 @@ async def test_get_deal_funnel_with_deal(
     assert json_response["data"]["proposal_count"] == 0
     assert json_response["data"]["negotiation_count"] == 0
     assert json_response["data"]["closed_count"] == 0
+
+    stages = json_response["data"]["stages"]
+    assert [stage["stage"] for stage in stages] == ["qualification", "proposal", "negotiation", "closed"]
+    assert stages[0]["count"] == 1
+    assert stages[0]["amount"] == 1000.0
+    assert stages[0]["conversion_rate"] is None
+    assert stages[1]["conversion_rate"] == 0.0
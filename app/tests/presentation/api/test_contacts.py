@@ -1,3 +1,6 @@
+import csv
+import io
+
 from fastapi import (
     FastAPI,
     status,
@@ -8,6 +11,8 @@ import pytest
 from faker import Faker
 from httpx import Response
 
+from domain.sales.entities import ContactEntity
+
 
 @pytest.mark.asyncio
 async def test_get_contacts_empty(
@@ -89,3 +94,39 @@ async def test_get_contacts_with_contact(
     assert len(json_response["data"]["items"]) == 1
     assert json_response["data"]["items"][0]["id"] == contact_id
     assert json_response["data"]["items"][0]["name"] == name
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_csv(
+    app: FastAPI,
+    org_client: TestClient,
+    faker: Faker,
+):
+    url = app.url_path_for("import_contacts")
+    body = f"name,email\n{faker.name()},{faker.email()}\n,{faker.email()}\n"
+
+    response: Response = org_client.post(url=url, content=body.encode(), headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()["data"]
+    assert (report["processed"], report["imported"], report["failed"]) == (2, 1, 1)
+    assert report["errors"][0]["row"] == 2
+
+    response = org_client.get(url=app.url_path_for("get_contacts"))
+    assert response.json()["data"]["pagination"]["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_export_contacts_csv(
+    app: FastAPI,
+    org_client: TestClient,
+    contact: ContactEntity,
+):
+    url = app.url_path_for("export_contacts")
+
+    response: Response = org_client.get(url=url, params={"format": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["id"], row["email"]) for row in rows] == [(str(contact.oid), contact.email.as_generic_type())]
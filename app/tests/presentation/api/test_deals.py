@@ -1,3 +1,6 @@
+import base64
+import json
+
 from fastapi import (
     FastAPI,
     status,
@@ -17,7 +20,10 @@ from application.sales.commands import (
     CreateContactCommand,
     CreateDealCommand,
 )
-from domain.sales.entities import ContactEntity
+from domain.sales.entities import (
+    ContactEntity,
+    DealEntity,
+)
 
 
 @pytest.mark.asyncio
@@ -176,3 +182,231 @@ async def test_get_deal_by_id_from_another_organization_returns_404(
     response: Response = org_client.get(url=get_url)
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_get_deals_cursor_pagination(
+    app: FastAPI,
+    org_client: TestClient,
+    contact: ContactEntity,
+    faker: Faker,
+):
+    create_url = app.url_path_for("create_deal")
+    for amount in (100.0, 200.0, 300.0, 400.0, 500.0):
+        org_client.post(
+            url=create_url,
+            json={
+                "contact_id": str(contact.oid),
+                "title": faker.sentence(),
+                "amount": amount,
+                "currency": "USD",
+            },
+        )
+
+    url = app.url_path_for("get_deals")
+    params = {"page_size": 2, "order_by": "amount", "order": "asc"}
+    first_page = org_client.get(url=url, params=params).json()["data"]
+    cursor = first_page["pagination"]["next_cursor"]
+    assert [item["amount"] for item in first_page["items"]] == [100.0, 200.0]
+    assert cursor is not None
+
+    # Новая сделка в начале выдачи не сдвигает следующую страницу
+    org_client.post(
+        url=create_url,
+        json={
+            "contact_id": str(contact.oid),
+            "title": faker.sentence(),
+            "amount": 50.0,
+            "currency": "USD",
+        },
+    )
+
+    second_page = org_client.get(url=url, params={**params, "cursor": cursor}).json()["data"]
+    assert [item["amount"] for item in second_page["items"]] == [300.0, 400.0]
+
+    last_page = org_client.get(
+        url=url,
+        params={**params, "cursor": second_page["pagination"]["next_cursor"]},
+    ).json()["data"]
+    assert [item["amount"] for item in last_page["items"]] == [500.0]
+    assert last_page["pagination"]["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_deals_invalid_cursor_returns_400(
+    app: FastAPI,
+    org_client: TestClient,
+):
+    url = app.url_path_for("get_deals")
+
+    response: Response = org_client.get(url=url, params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"][0]["type"] == "InvalidPageCursorException"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("order_by", "value"),
+    [
+        ("amount", {"v": "abc"}),
+        ("created_at", {"v": "2024-01-01T00:00:00+00:00"}),
+        ("updated_at", {"v": 10}),
+    ],
+)
+async def test_get_deals_cursor_with_wrong_value_type_returns_400(
+    app: FastAPI,
+    org_client: TestClient,
+    order_by: str,
+    value: dict,
+):
+    url = app.url_path_for("get_deals")
+    payload = {"k": order_by, "d": True, "id": "00000000-0000-0000-0000-000000000000", **value}
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+    response: Response = org_client.get(url=url, params={"cursor": cursor, "order_by": order_by})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["errors"][0]["type"] == "InvalidPageCursorException"
+
+
+@pytest.mark.asyncio
+async def test_import_deals_ndjson(
+    app: FastAPI,
+    org_client: TestClient,
+    contact: ContactEntity,
+):
+    url = app.url_path_for("import_deals")
+    body = "\n".join(
+        [
+            f'{{"contact_id": "{contact.oid}", "title": "Imported", "amount": 10, "currency": "EUR"}}',
+            f'{{"contact_id": "{contact.oid}", "title": "", "amount": 10, "currency": "EUR"}}',
+        ],
+    )
+
+    response: Response = org_client.post(url=f"{url}?format=ndjson", content=body.encode())
+
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()["data"]
+    assert (report["processed"], report["imported"], report["failed"]) == (2, 1, 1)
+
+    response = org_client.get(url=app.url_path_for("get_deals"))
+    assert [item["title"] for item in response.json()["data"]["items"]] == ["Imported"]
+
+
+@pytest.mark.asyncio
+async def test_export_deals_ndjson(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+):
+    url = app.url_path_for("export_deals")
+
+    response: Response = org_client.get(url=url, params={"format": "ndjson"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [str(deal.oid)]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_deals(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+    contact: ContactEntity,
+):
+    updated_before = deal.updated_at.isoformat()
+    create_response: Response = org_client.post(
+        url=app.url_path_for("create_deal"),
+        json={
+            "contact_id": str(contact.oid),
+            "title": "Second",
+            "amount": 500.0,
+            "currency": "USD",
+        },
+    )
+    deal_ids = [str(deal.oid), create_response.json()["data"]["id"]]
+
+    response: Response = org_client.patch(
+        url=app.url_path_for("batch_update_deals"),
+        json={"deal_ids": deal_ids, "status": "lost", "stage": "closed"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    items = response.json()["data"]["items"]
+    assert [item["id"] for item in items] == deal_ids
+    assert {(item["status"], item["stage"]) for item in items} == {("lost", "closed")}
+    # Время изменения обновлено у каждой сделки набора, а не только у последней
+    assert len({item["updated_at"] for item in items}) == 1
+    assert items[0]["updated_at"] > updated_before
+
+
+@pytest.mark.asyncio
+async def test_batch_update_deals_unknown_deal_returns_404(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+):
+    response: Response = org_client.patch(
+        url=app.url_path_for("batch_update_deals"),
+        json={"deal_ids": [str(deal.oid), "00000000-0000-0000-0000-000000000000"], "status": "lost"},
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = org_client.get(url=app.url_path_for("get_deal", deal_id=deal.oid))
+    assert response.json()["data"]["status"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_get_deal_etag_and_if_none_match(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+):
+    url = app.url_path_for("get_deal", deal_id=deal.oid)
+
+    response: Response = org_client.get(url=url)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert etag == '"1"'
+
+    response = org_client.get(url=url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    org_client.patch(url=app.url_path_for("update_deal", deal_id=deal.oid), json={"status": "in_progress"})
+
+    response = org_client.get(url=url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_update_deal_if_match(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+):
+    url = app.url_path_for("update_deal", deal_id=deal.oid)
+    etag = org_client.get(url=app.url_path_for("get_deal", deal_id=deal.oid)).headers["ETag"]
+
+    response: Response = org_client.patch(url=url, json={"status": "in_progress"}, headers={"If-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    # Второй клиент пишет по устаревшему ETag: изменение отклоняется, а не перезаписывает первое
+    response = org_client.patch(url=url, json={"status": "lost"}, headers={"If-Match": etag})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert response.json()["errors"][0]["type"] == "VersionMismatchException"
+
+    response = org_client.get(url=app.url_path_for("get_deal", deal_id=deal.oid))
+    assert response.json()["data"]["status"] == "in_progress"
+    assert response.headers["ETag"] == new_etag
+
+    response = org_client.patch(url=url, json={"status": "lost"}, headers={"If-Match": 'W/"1"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
@@ -0,0 +1,64 @@
+import asyncio
+from dataclasses import dataclass
+
+from fastapi import (
+    FastAPI,
+    status,
+)
+from fastapi.testclient import TestClient
+
+import pytest
+from httpx import Response
+
+from application.base.query import BaseQueryHandler
+from application.common.exceptions import DatabasePoolExhaustedException
+from application.mediator import Mediator
+from application.sales.queries import GetDealByIdQuery
+from domain.sales.entities import DealEntity
+
+
+@dataclass(frozen=True)
+class StuckDealQueryHandler(BaseQueryHandler[GetDealByIdQuery, DealEntity]):
+    error: Exception | None = None
+
+    async def handle(self, query: GetDealByIdQuery) -> DealEntity:
+        if self.error is not None:
+            raise self.error
+        await asyncio.sleep(5)
+
+
+@pytest.mark.asyncio
+async def test_query_over_budget_returns_gateway_timeout(
+    app: FastAPI,
+    mediator: Mediator,
+    org_client: TestClient,
+    deal: DealEntity,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr("application.mediator.QUERY_CANCEL_GRACE", 0.0)
+    mediator.register_query(GetDealByIdQuery, StuckDealQueryHandler())
+    mediator.set_query_budget(GetDealByIdQuery, 0.05)
+
+    response: Response = org_client.get(url=app.url_path_for("get_deal", deal_id=deal.oid))
+
+    assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+    assert response.headers["retry-after"] == "1"
+    assert response.json()["errors"][0]["type"] == "QueryTimeoutException"
+
+    metrics: Response = org_client.get(url=app.url_path_for("get_metrics"))
+    assert 'mediator_query_timeouts_total{query="GetDealByIdQuery"} 1' in metrics.text
+
+
+@pytest.mark.asyncio
+async def test_exhausted_pool_returns_service_unavailable(
+    app: FastAPI,
+    mediator: Mediator,
+    org_client: TestClient,
+    deal: DealEntity,
+):
+    mediator.register_query(GetDealByIdQuery, StuckDealQueryHandler(error=DatabasePoolExhaustedException()))
+
+    response: Response = org_client.get(url=app.url_path_for("get_deal", deal_id=deal.oid))
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["errors"][0]["type"] == "DatabasePoolExhaustedException"
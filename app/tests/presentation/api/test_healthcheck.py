@@ -0,0 +1,57 @@
+import time
+
+from fastapi import (
+    FastAPI,
+    status,
+)
+from fastapi.testclient import TestClient
+
+import pytest
+from httpx import Response
+from punq import Container
+
+from domain.sales.entities import DealEntity
+from domain.sales.interfaces.repositories import BaseActivityRepository
+
+
+def test_get_status(app: FastAPI, client: TestClient):
+    response: Response = client.get(url=app.url_path_for("get_status"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"] == {"result": True}
+
+
+@pytest.mark.asyncio
+async def test_deal_activity_is_written_by_subscriber_bypassing_journal(
+    app: FastAPI,
+    container: Container,
+    org_client: TestClient,
+    deal: DealEntity,
+):
+    # Контекст клиента запускает lifespan: журнал и relay работают в фоне
+    with org_client:
+        response: Response = org_client.patch(
+            url=app.url_path_for("update_deal", deal_id=deal.oid),
+            json={"status": "in_progress"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        # Активность пишет подписчик события - уже после ответа
+        activity_repository = container.resolve(BaseActivityRepository)
+        for _ in range(50):
+            activities = await activity_repository.get_by_deal_id(deal.oid)
+            if activities:
+                break
+            time.sleep(0.01)
+        assert [activity.type.as_generic_type().value for activity in activities] == ["status_changed"]
+
+        stats: Response = org_client.get(url=app.url_path_for("get_activity_journal_stats"))
+        assert stats.status_code == status.HTTP_200_OK
+        data = stats.json()["data"]
+        assert data["running"] is True
+        # Подписчик пишет в своем unit of work, журнал не задействован
+        assert data["recorded"] == 0
+        assert data["inline_writes"] == 0
+
+    stats = org_client.get(url=app.url_path_for("get_activity_journal_stats"))
+    assert stats.json()["data"]["running"] is False
@@ -0,0 +1,40 @@
+from fastapi import (
+    FastAPI,
+    status,
+)
+from fastapi.testclient import TestClient
+
+import pytest
+from httpx import Response
+
+from domain.sales.entities import DealEntity
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_routes_handlers_and_pools(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+):
+    response: Response = org_client.get(url=app.url_path_for("get_deal", deal_id=deal.oid))
+    assert response.status_code == status.HTTP_200_OK
+
+    metrics: Response = org_client.get(url=app.url_path_for("get_metrics"))
+
+    assert metrics.status_code == status.HTTP_200_OK
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = metrics.text
+    # Метка - шаблон маршрута, а не путь с идентификатором
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/deals/{deal_id}"} 1' in body
+    assert str(deal.oid) not in body
+    assert 'mediator_command_duration_seconds_count{command="CreateDealCommand"} 1' in body
+    assert 'mediator_query_duration_seconds_bucket{query="GetDealByIdQuery",le="+Inf"} 1' in body
+    assert 'mediator_query_cache_misses_total{query="GetDealByIdQuery"} 1' in body
+    assert 'mediator_query_cache_hit_ratio{query="GetDealByIdQuery"} 0.0' in body
+    assert "# TYPE membership_cache_hits_total counter" in body
+    # Тестовый контейнер проверяет членство без кэша
+    assert "membership_cache_misses_total 0" in body
+    assert 'db_pool_size{pool="interactive",engine="primary"} 10' in body
+    assert 'db_pool_size{pool="analytics",engine="primary"} 3' in body
+    assert 'db_pool_checked_out{pool="background",engine="read_only"} 0' in body
+    assert "# TYPE db_statement_duration_seconds histogram" in body
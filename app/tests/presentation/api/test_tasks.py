@@ -1,3 +1,4 @@
+import json
 from datetime import date
 
 from fastapi import (
@@ -180,3 +181,46 @@ async def test_update_task(
     assert json_response["data"]["title"] == new_title
     assert json_response["data"]["description"] == new_description
     assert json_response["data"]["is_done"] is True
+
+
+@pytest.mark.asyncio
+async def test_task_etag_and_if_match(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+    faker: Faker,
+):
+    create_response: Response = org_client.post(
+        url=app.url_path_for("create_task"),
+        json={"deal_id": str(deal.oid), "title": faker.sentence()},
+    )
+    task_id = create_response.json()["data"]["id"]
+    get_url = app.url_path_for("get_task", task_id=task_id)
+    update_url = app.url_path_for("update_task", task_id=task_id)
+
+    etag = org_client.get(url=get_url).headers["ETag"]
+    assert org_client.get(url=get_url, headers={"If-None-Match": etag}).status_code == status.HTTP_304_NOT_MODIFIED
+
+    response: Response = org_client.patch(url=update_url, json={"is_done": True}, headers={"If-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = org_client.patch(url=update_url, json={"is_done": False}, headers={"If-Match": etag})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert org_client.get(url=get_url).json()["data"]["is_done"] is True
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_ndjson(
+    app: FastAPI,
+    org_client: TestClient,
+    deal: DealEntity,
+    faker: Faker,
+):
+    title = faker.sentence()
+    org_client.post(url=app.url_path_for("create_task"), json={"deal_id": str(deal.oid), "title": title})
+
+    response: Response = org_client.get(url=app.url_path_for("export_tasks"))
+
+    assert response.status_code == status.HTTP_200_OK
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [title]